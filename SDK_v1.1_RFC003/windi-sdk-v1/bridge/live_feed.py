@@ -0,0 +1,273 @@
+"""
+WINDI Live Feed v1.0
+Push-based dashboard deltas (Server-Sent Events)
+
+The aggregator publishes every ingested signal here. A coalescer thread
+turns whatever arrived during the last interval into one delta (new
+signals + changed shelf counters + totals), filters it once per
+permission group with SignalFilter, and fans it out to subscribers.
+Each subscriber has a bounded buffer; a slow consumer gets its pending
+deltas compacted into one instead of growing memory or stalling ingest.
+
+Wire format (text/event-stream):
+    event: snapshot   full, filtered dashboard state (on connect)
+    event: delta      {"seq", "ts", "signals", "shelves", "totals", "dropped"}
+    event: expired    Virtue Token expired, stream closed
+    event: revoked    Virtue Token revoked, stream closed
+
+"Authority scales with abstraction. Visibility scales with responsibility."
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from virtue_token import SignalFilter, VirtueToken
+
+# ─── Configuration ───────────────────────────────────────────────
+
+LIVE_FEED_INTERVAL_S = 0.5       # coalescing interval between deltas
+SUBSCRIBER_BUFFER = 64           # pending deltas per subscriber before compaction
+MAX_SIGNALS_PER_DELTA = 500      # compacted deltas keep only the newest signals
+MAX_SUBSCRIBERS = 256
+SSE_HEARTBEAT_S = 15             # comment line to keep idle streams alive
+SSE_RETRY_MS = 3000              # client reconnect delay
+
+
+def _shelf_health(count: int, weight_sum: int) -> Dict[str, Any]:
+    """Same shape as get_dashboard_state()["shelf_health"][shelf]."""
+    if not count:
+        return {"count": 0, "avg_weight": 0, "status": "no_data"}
+    avg = weight_sum / count
+    return {
+        "count": count,
+        "avg_weight": round(avg, 1),
+        "status": "critical" if avg > 75 else "warning" if avg > 50 else "healthy",
+    }
+
+
+def _signal_dict(sig) -> Dict[str, Any]:
+    return {
+        "ts": sig.ts, "shelf": sig.shelf, "code": sig.code,
+        "signal_name": sig.signal_name, "severity": sig.severity,
+        "weight": sig.weight, "event": sig.event,
+    }
+
+
+def sse_frame(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+class _Delta:
+    """One filtered delta; the encoded frame is shared by its whole permission group."""
+    __slots__ = ("seq", "payload", "_frame")
+
+    def __init__(self, seq: int, payload: Dict[str, Any]):
+        self.seq = seq
+        self.payload = payload
+        self._frame: Optional[bytes] = None
+
+    def frame(self) -> bytes:
+        if self._frame is None:
+            self._frame = sse_frame("delta", self.payload, self.seq)
+        return self._frame
+
+
+def _compact(deltas: List[_Delta]) -> _Delta:
+    """Merge consecutive deltas: newest counters win, signals are concatenated and capped."""
+    signals: List[Dict[str, Any]] = []
+    shelves: Dict[str, Any] = {}
+    dropped = 0
+    for d in deltas:
+        signals.extend(d.payload["signals"])
+        shelves.update(d.payload["shelves"])
+        dropped += d.payload["dropped"]
+    if len(signals) > MAX_SIGNALS_PER_DELTA:
+        dropped += len(signals) - MAX_SIGNALS_PER_DELTA
+        signals = signals[-MAX_SIGNALS_PER_DELTA:]
+    last = deltas[-1]
+    return _Delta(last.seq, {
+        "seq": last.seq,
+        "ts": last.payload["ts"],
+        "signals": signals,
+        "shelves": shelves,
+        "totals": last.payload["totals"],
+        "dropped": dropped,
+    })
+
+
+# ─── Subscriber ──────────────────────────────────────────────────
+
+class Subscriber:
+    """Bounded per-connection delta buffer."""
+
+    def __init__(self, token: VirtueToken, max_buffer: int = SUBSCRIBER_BUFFER):
+        self.token = token
+        self.max_buffer = max_buffer
+        self.compactions = 0
+        self.closed = False
+        self._pending: deque = deque()
+        self._cond = threading.Condition()
+
+    @property
+    def key(self):
+        """Permission group: shared by tokens with identical grants, emptied on revoke."""
+        return self.token.permissions()
+
+    def offer(self, delta: _Delta):
+        with self._cond:
+            self._pending.append(delta)
+            if len(self._pending) > self.max_buffer:
+                merged = _compact(list(self._pending))
+                self._pending.clear()
+                self._pending.append(merged)
+                self.compactions += 1
+            self._cond.notify()
+
+    def take(self, timeout: float) -> List[_Delta]:
+        """Wait up to `timeout` for deltas; returns all pending ones (possibly none)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self.closed, timeout)
+            out = list(self._pending)
+            self._pending.clear()
+            return out
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+# ─── Live Feed ───────────────────────────────────────────────────
+
+class LiveFeed:
+    """Coalesces ingested signals into per-permission-group deltas."""
+
+    def __init__(self, shelves, interval_s: float = LIVE_FEED_INTERVAL_S,
+                 max_subscribers: int = MAX_SUBSCRIBERS):
+        self.interval_s = interval_s
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._pending: List[Any] = []
+        self._dirty: set = set()
+        self._shelf_count = {s: 0 for s in shelves}
+        self._shelf_weight = {s: 0 for s in shelves}
+        self._received = 0
+        self._rejected = 0
+        self._weight_sum = 0
+        self._totals_changed = False
+        self._seq = 0
+        self._subscribers: List[Subscriber] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {"deltas": 0, "filtered_groups": 0}
+
+    # ─── Ingest side (called by SignalAggregator, O(1)) ──────────
+
+    def publish(self, sig):
+        with self._lock:
+            self._shelf_count[sig.shelf] += 1
+            self._shelf_weight[sig.shelf] += sig.weight
+            self._received += 1
+            self._weight_sum += sig.weight
+            self._totals_changed = True
+            if self._subscribers:
+                self._pending.append(sig)
+                self._dirty.add(sig.shelf)
+
+    def publish_reject(self):
+        with self._lock:
+            self._rejected += 1
+            self._totals_changed = True
+
+    # ─── Subscribers ─────────────────────────────────────────────
+
+    def subscribe(self, token: VirtueToken) -> Optional[Subscriber]:
+        """Register a stream for `token`; None when the subscriber limit is reached."""
+        sub = Subscriber(token)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.append(sub)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+                self._thread.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        sub.close()
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            subs, self._subscribers = self._subscribers, []
+        for sub in subs:
+            sub.close()
+
+    # ─── Coalescer ───────────────────────────────────────────────
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.tick()
+
+    def tick(self):
+        """Build one delta from everything published since the last tick and fan it out."""
+        with self._lock:
+            revoked = [sub for sub in self._subscribers if sub.token.revoked]
+            if revoked:
+                self._subscribers = [sub for sub in self._subscribers if not sub.token.revoked]
+        for sub in revoked:
+            sub.close()
+
+        with self._lock:
+            if not self._totals_changed or not self._subscribers:
+                return
+            pending, self._pending = self._pending, []
+            dirty, self._dirty = self._dirty, set()
+            shelves = {s: _shelf_health(self._shelf_count[s], self._shelf_weight[s]) for s in dirty}
+            totals = {
+                "received": self._received,
+                "rejected": self._rejected,
+                "avg_weight": round(self._weight_sum / self._received, 1) if self._received else 0,
+            }
+            self._totals_changed = False
+            self._seq += 1
+            seq = self._seq
+            subscribers = list(self._subscribers)
+
+        ts = int(time.time() * 1000)
+        signals = [_signal_dict(s) for s in pending]
+        groups: Dict[Any, _Delta] = {}
+        for sub in subscribers:
+            delta = groups.get(sub.key)
+            if delta is None:
+                token = sub.token
+                delta = _Delta(seq, {
+                    "seq": seq,
+                    "ts": ts,
+                    "signals": SignalFilter.filter_signals(signals, token),
+                    "shelves": {k: v for k, v in shelves.items() if token.can_see_shelf(k)},
+                    "totals": totals,
+                    "dropped": 0,
+                })
+                groups[sub.key] = delta
+            sub.offer(delta)
+        with self._lock:
+            self._stats["deltas"] += 1
+            self._stats["filtered_groups"] += len(groups)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["subscribers"] = len(self._subscribers)
+            stats["compactions"] = sum(s.compactions for s in self._subscribers)
+        stats["interval_s"] = self.interval_s
+        return stats
@@ -9,19 +9,38 @@ Implements:
 - Governance Hold authorization
 - Forensic accountability logging
 
+Tokens compile their permissions once (visible signal/shelf sets and a
+(code, shelf) -> visibility lookup shared by all tokens with the same
+grants), validated tokens are cached until `exp` or until they are
+revoked, and the in-memory issuance log is a bounded ring mirrored to an
+optional JSONL ledger.
+
 "Authority scales with abstraction. Visibility scales with responsibility."
 """
 
 from __future__ import annotations
 
 import base64
+import copy
+import functools
 import hashlib
 import hmac
 import json
+import operator
+import os
 import time
 import threading
+import weakref
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+# ─── Caches & Forensic Log Limits ───────────────────────────────
+
+TOKEN_CACHE_SIZE = 1024            # validated tokens kept per issuer (LRU)
+ISSUANCE_LOG_SIZE = 10_000         # in-memory issuance entries (ring)
+ISSUANCE_LEDGER_MAX_BYTES = 64 * 1024 * 1024   # rotate the JSONL ledger after 64 MiB
+PERMISSIONS_CACHE_SIZE = 256       # distinct (s_level, signals, shelves) grants
 
 
 # ─── S-Level Signal Mapping (RFC-003 Section 5) ─────────────────
@@ -88,6 +107,46 @@ S_LEVEL_CLEARANCE: Dict[int, str] = {
     3: "SOVEREIGN",
 }
 
+# Shelf of each shelf-bound signal (used to auto-derive token shelves)
+SIGNAL_SHELF_MAP: Dict[str, str] = {
+    "ID-CONC": "S1", "ID-CENT": "S1",
+    "IMP-GRAV": "S2", "IMP-SKEW": "S2",
+    "DOM-FRIC": "S3", "DOM-LOOP": "S3",
+    "GOV-DENS": "S4", "GOV-STACK": "S4",
+    "DEC-OVR": "S5", "DEC-INTU": "S5",
+    "TMP-SPIKE": "S6", "TMP-STALL": "S6",
+    "REL-DEPTH": "S7", "REL-NODE": "S7",
+}
+
+
+# ─── Compiled Permissions ────────────────────────────────────────
+
+@dataclass(frozen=True, eq=False)
+class CompiledPermissions:
+    """Precomputed visibility for one (s_level, signals, shelves) grant (hashable by identity)."""
+    s_level: int
+    signals: FrozenSet[str]
+    shelves: FrozenSet[str]
+    # (code, shelf) -> "direct" / "aggregated" / "historical"; absent = not visible
+    visibility: Dict[Tuple[str, str], str]
+
+
+@functools.lru_cache(maxsize=PERMISSIONS_CACHE_SIZE)
+def compile_permissions(s_level: int, signals: Tuple[str, ...],
+                        shelves: Tuple[str, ...]) -> CompiledPermissions:
+    """Compile a grant; tokens with identical grants share the result."""
+    level_signals = S_LEVEL_SIGNALS.get(s_level, {})
+    visibility = {
+        (code, shelf): level_signals[code]
+        for code in signals if code in level_signals
+        for shelf in shelves
+    }
+    return CompiledPermissions(s_level, frozenset(signals), frozenset(shelves), visibility)
+
+
+# What a revoked token compiles to: nothing is visible
+REVOKED_PERMISSIONS = CompiledPermissions(0, frozenset(), frozenset(), {})
+
 
 # ─── Virtue Token ────────────────────────────────────────────────
 
@@ -109,9 +168,10 @@ class VirtueToken:
     exp: int = 0
     clearance: str = ""
     nonce: str = ""
+    revoked: bool = field(default=False, init=False, repr=False, compare=False)
+    _permissions: Optional[CompiledPermissions] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        import os
         self.iat = int(time.time())
         self.exp = self.iat + 86400  # 24h default
         self.clearance = S_LEVEL_CLEARANCE.get(self.s_level, "UNKNOWN")
@@ -124,18 +184,9 @@ class VirtueToken:
         # Auto-derive visible shelves from signals
         if self.shelves is None:
             from_signals = set()
-            signal_shelf_map = {
-                "ID-CONC": "S1", "ID-CENT": "S1",
-                "IMP-GRAV": "S2", "IMP-SKEW": "S2",
-                "DOM-FRIC": "S3", "DOM-LOOP": "S3",
-                "GOV-DENS": "S4", "GOV-STACK": "S4",
-                "DEC-OVR": "S5", "DEC-INTU": "S5",
-                "TMP-SPIKE": "S6", "TMP-STALL": "S6",
-                "REL-DEPTH": "S7", "REL-NODE": "S7",
-            }
             for sig in self.signals:
-                if sig in signal_shelf_map:
-                    from_signals.add(signal_shelf_map[sig])
+                if sig in SIGNAL_SHELF_MAP:
+                    from_signals.add(SIGNAL_SHELF_MAP[sig])
             self.shelves = sorted(from_signals) if from_signals else ["S3", "S6", "S7"]
 
         # Auto-derive temporal scope
@@ -167,13 +218,26 @@ class VirtueToken:
     def is_expired(self) -> bool:
         return int(time.time()) > self.exp
 
+    def revoke(self):
+        """Drop this token's compiled grant; anyone still holding it sees nothing from now on."""
+        self.revoked = True
+        self._permissions = REVOKED_PERMISSIONS
+
+    def permissions(self) -> CompiledPermissions:
+        """Compiled grant (computed once; tokens are only changed by revoke())."""
+        if self._permissions is None:
+            self._permissions = compile_permissions(
+                self.s_level, tuple(self.signals or ()), tuple(self.shelves or ())
+            )
+        return self._permissions
+
     def can_see_signal(self, signal_code: str) -> bool:
         """Check if this token permits visibility of a signal."""
-        return signal_code in (self.signals or [])
+        return signal_code in self.permissions().signals
 
     def can_see_shelf(self, shelf: str) -> bool:
         """Check if this token permits visibility of a shelf."""
-        return shelf in (self.shelves or [])
+        return shelf in self.permissions().shelves
 
     def can_see_domain(self, domain_hash: str, domain_map: Dict[str, str] = None) -> bool:
         """Check if this token permits visibility of a domain."""
@@ -186,7 +250,7 @@ class VirtueToken:
 
     def can_activate_hold(self) -> bool:
         """Check if this token permits Governance Hold activation."""
-        return self.kill_switch_authority and self.s_level >= 2
+        return self.kill_switch_authority and self.s_level >= 2 and not self.revoked
 
 
 # ─── Token Issuer ────────────────────────────────────────────────
@@ -194,10 +258,20 @@ class VirtueToken:
 class VirtueTokenIssuer:
     """Issues and validates Virtue Tokens using HMAC-SHA256 signing."""
 
-    def __init__(self, signing_key_b64: str):
+    def __init__(self, signing_key_b64: str, ledger_path: Optional[str] = None,
+                 cache_size: int = TOKEN_CACHE_SIZE, log_size: int = ISSUANCE_LOG_SIZE):
         self.signing_key = base64.b64decode(signing_key_b64)
-        self._issued: List[Dict] = []  # Forensic log
+        self._issued: deque = deque(maxlen=log_size)  # Forensic log (most recent entries)
+        self._issued_total = 0
+        self._ledger_path = ledger_path               # full log, JSONL, rotated by size
         self._lock = threading.Lock()
+        # signature -> (verified payload copy, token); evicted at exp or by LRU
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], VirtueToken]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_stats = {"hits": 0, "misses": 0}
+        self._revoked: Dict[str, int] = {}           # signature -> exp; dropped once expired
+        # signature -> validated token, while anyone (cache, open stream) still holds it
+        self._tokens: "weakref.WeakValueDictionary[str, VirtueToken]" = weakref.WeakValueDictionary()
 
     def _sign(self, payload: Dict[str, Any]) -> str:
         """Sign JWT payload with HMAC-SHA256."""
@@ -217,26 +291,52 @@ class VirtueTokenIssuer:
         }
 
         # Forensic log
+        entry = {
+            "action": "TOKEN_ISSUED",
+            "sub": token.sub,
+            "s_level": token.s_level,
+            "clearance": token.clearance,
+            "domains": token.domains,
+            "kill_switch": token.kill_switch_authority,
+            "iat": token.iat,
+            "exp": token.exp,
+        }
         with self._lock:
-            self._issued.append({
-                "action": "TOKEN_ISSUED",
-                "sub": token.sub,
-                "s_level": token.s_level,
-                "clearance": token.clearance,
-                "domains": token.domains,
-                "kill_switch": token.kill_switch_authority,
-                "iat": token.iat,
-                "exp": token.exp,
-            })
+            self._issued.append(entry)
+            self._issued_total += 1
+            if self._ledger_path:
+                self._append_ledger(entry)
 
         return signed_token
 
+    def _append_ledger(self, entry: Dict[str, Any]):
+        """Append to the JSONL ledger; full files are renamed aside, never deleted."""
+        try:
+            if os.path.getsize(self._ledger_path) >= ISSUANCE_LEDGER_MAX_BYTES:
+                n = 1
+                while os.path.exists(f"{self._ledger_path}.{n}"):
+                    n += 1
+                os.rename(self._ledger_path, f"{self._ledger_path}.{n}")
+        except FileNotFoundError:
+            pass
+        with open(self._ledger_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, sort_keys=True) + "\n")
+
     def validate(self, signed_token: Dict[str, Any]) -> Tuple[bool, Optional[VirtueToken], str]:
         """Validate a signed Virtue Token. Returns (valid, token, message)."""
         try:
             payload = signed_token.get("payload", {})
             sig = signed_token.get("signature", "")
 
+            # Cached: same signature over an identical payload was verified before
+            cached = self._cache_get(sig)
+            if cached is not None and cached[0] == payload and not cached[1].revoked:
+                if int(time.time()) > cached[1].exp:
+                    with self._lock:
+                        self._cache.pop(sig, None)
+                    return False, None, "AUTH:TOKEN_EXPIRED"
+                return True, cached[1], "OK"
+
             # Verify signature
             expected_sig = self._sign(payload)
             if not hmac.compare_digest(expected_sig, sig):
@@ -246,6 +346,10 @@ class VirtueTokenIssuer:
             if int(time.time()) > payload.get("exp", 0):
                 return False, None, "AUTH:TOKEN_EXPIRED"
 
+            with self._lock:
+                if sig in self._revoked:
+                    return False, None, "AUTH:TOKEN_REVOKED"
+
             # Reconstruct token
             token = VirtueToken(
                 sub=payload["sub"],
@@ -259,19 +363,90 @@ class VirtueTokenIssuer:
             token.iat = payload["iat"]
             token.exp = payload["exp"]
             token.nonce = payload.get("nonce", "")
+            token.permissions()
+
+            with self._lock:
+                if sig in self._revoked:   # revoked while we were verifying
+                    return False, None, "AUTH:TOKEN_REVOKED"
+                # One token object per signature, so revoke() reaches every holder
+                token = self._tokens.setdefault(sig, token)
+                self._cache[sig] = (copy.deepcopy(payload), token)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
 
             return True, token, "OK"
 
         except (KeyError, TypeError) as e:
             return False, None, f"AUTH:MALFORMED_TOKEN:{e}"
 
+    def revoke(self, signed_token: Dict[str, Any], reason: str = "") -> bool:
+        """
+        Revoke a signed Virtue Token until its `exp`. The validated copy is
+        evicted from the cache and its compiled permissions are dropped, so
+        streams and requests already holding the token lose access too.
+        Returns False when the signature does not verify.
+        """
+        try:
+            payload = signed_token["payload"]
+            sig = signed_token["signature"]
+            if not isinstance(sig, str) or not hmac.compare_digest(self._sign(payload), sig):
+                return False
+        except (KeyError, TypeError):
+            return False
+
+        now = int(time.time())
+        entry = {
+            "action": "TOKEN_REVOKED",
+            "sub": payload.get("sub"),
+            "s_level": payload.get("s_level"),
+            "nonce": payload.get("nonce"),
+            "reason": reason,
+            "revoked_at": now,
+            "exp": payload.get("exp", 0),
+        }
+        with self._lock:
+            self._revoked = {s: exp for s, exp in self._revoked.items() if exp >= now}
+            self._revoked[sig] = payload.get("exp", 0)
+            self._cache.pop(sig, None)
+            token = self._tokens.pop(sig, None)
+            self._issued.append(entry)
+            if self._ledger_path:
+                self._append_ledger(entry)
+        if token is not None:
+            token.revoke()
+        return True
+
+    def _cache_get(self, sig: Any) -> Optional[Tuple[Dict[str, Any], VirtueToken]]:
+        with self._lock:
+            cached = self._cache.get(sig) if isinstance(sig, str) else None
+            if cached is None:
+                self._cache_stats["misses"] += 1
+            else:
+                self._cache.move_to_end(sig)
+                self._cache_stats["hits"] += 1
+            return cached
+
     def get_issuance_log(self) -> List[Dict]:
+        """Most recent issuance and revocation entries (up to log_size); the ledger file has all of them."""
         with self._lock:
             return list(self._issued)
 
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "issued_total": self._issued_total,
+                "issuance_log": len(self._issued),
+                "cached_tokens": len(self._cache),
+                "revoked_tokens": len(self._revoked),
+                **self._cache_stats,
+            }
+
 
 # ─── Signal Filter (Server-Side Enforcement) ────────────────────
 
+_CODE_SHELF = operator.itemgetter("code", "shelf")
+
+
 class SignalFilter:
     """
     Server-side signal filtering based on Virtue Token.
@@ -284,31 +459,20 @@ class SignalFilter:
         token: VirtueToken,
     ) -> List[Dict[str, Any]]:
         """Filter a list of decoded signals based on token permissions."""
-        filtered = []
-        for sig in signals:
-            code = sig.get("code", "")
-            shelf = sig.get("shelf", "")
-
-            # Check signal visibility
-            if not token.can_see_signal(code):
-                continue
-
-            # Check shelf visibility
-            if not token.can_see_shelf(shelf):
-                continue
-
-            # Apply abstraction level
-            visibility = S_LEVEL_SIGNALS.get(token.s_level, {}).get(code, None)
-            if visibility is None:
-                continue
-
-            # Annotate with visibility mode
-            enriched = dict(sig)
-            enriched["_visibility"] = visibility  # direct / aggregated / historical
-            enriched["_s_level"] = token.s_level
-            filtered.append(enriched)
+        # Visibility column in one C-level pass: (code, shelf) -> visibility or None.
+        # None means: signal or shelf not granted, or no abstraction at this S-Level.
+        lookup = token.permissions().visibility.get
+        try:
+            visibility = list(map(lookup, map(_CODE_SHELF, signals)))
+        except KeyError:
+            visibility = [lookup((sig.get("code", ""), sig.get("shelf", ""))) for sig in signals]
 
-        return filtered
+        # Annotate with visibility mode (direct / aggregated / historical)
+        s_level = token.s_level
+        return [
+            dict(sig, _visibility=vis, _s_level=s_level)
+            for sig, vis in zip(signals, visibility) if vis is not None
+        ]
 
     @staticmethod
     def filter_dashboard_state(
@@ -317,33 +481,34 @@ class SignalFilter:
     ) -> Dict[str, Any]:
         """Filter complete dashboard state for token holder."""
         filtered = dict(dashboard_state)
+        perms = token.permissions()
 
         # Filter shelf health — only show permitted shelves
         if "shelf_health" in filtered:
             filtered["shelf_health"] = {
                 k: v for k, v in filtered["shelf_health"].items()
-                if token.can_see_shelf(k)
+                if k in perms.shelves
             }
 
         # Filter by_shelf counts
         if "by_shelf" in filtered:
             filtered["by_shelf"] = {
                 k: v for k, v in filtered["by_shelf"].items()
-                if token.can_see_shelf(k)
+                if k in perms.shelves
             }
 
         # Filter live feed
         if "live_feed" in filtered:
             filtered["live_feed"] = [
                 s for s in filtered["live_feed"]
-                if token.can_see_signal(s.get("code", ""))
+                if s.get("code", "") in perms.signals
             ]
 
         # Filter hotspots
         if "hotspots" in filtered:
             filtered["hotspots"] = [
                 h for h in filtered["hotspots"]
-                if token.can_see_signal(h.get("code", ""))
+                if h.get("code", "") in perms.signals
             ]
 
         # Add token metadata
@@ -14,12 +14,17 @@ import base64
 import hashlib
 import hmac
 import json
+import os
 import time
 import threading
 from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from live_feed import LiveFeed, LIVE_FEED_INTERVAL_S, SSE_HEARTBEAT_S, SSE_RETRY_MS, sse_frame
+from virtue_token import SignalFilter, VirtueTokenIssuer
 
 # ─── Configuration ───────────────────────────────────────────────
 
@@ -29,6 +34,10 @@ MAX_TS_DRIFT_SIMULATION_MS = 365 * 24 * 3600 * 1000  # 1 year (simulation mode)
 NONCE_WINDOW_SIZE = 10_000       # remember last 10k nonces per client
 SEQ_GRACE = 50                   # allow seq gaps up to 50 (batch reorder)
 
+# Live feed (RFC-003): streams are filtered per Virtue Token, so they are
+# only served when the token signing key is configured
+VIRTUE_KEY_ENV = "WINDI_VIRTUE_KEY"      # base64 HMAC key shared with windi-core
+
 # Micro-Signal Registry (RFC-001)
 SIGNAL_REGISTRY = {
     "ID-CONC": {"shelf": "S1", "name": "Decisional Concentration",    "severity": "high"},
@@ -137,8 +146,9 @@ class DecodedSignal:
 class SignalAggregator:
     """Thread-safe signal store with shelf-based indexing for dashboards."""
 
-    def __init__(self, max_signals: int = 50_000):
+    def __init__(self, max_signals: int = 50_000, feed: Optional[LiveFeed] = None):
         self._lock = threading.Lock()
+        self.feed = feed
         self._signals: deque = deque(maxlen=max_signals)
         self._by_shelf: Dict[str, List[DecodedSignal]] = {s: [] for s in VALID_SHELVES}
         self._stats = {
@@ -161,10 +171,14 @@ class SignalAggregator:
             self._stats["by_event"][sig.event] += 1
             self._stats["weight_sum"] += sig.weight
             self._stats["weight_count"] += 1
+        if self.feed is not None:
+            self.feed.publish(sig)
 
     def reject(self):
         with self._lock:
             self._stats["total_rejected"] += 1
+        if self.feed is not None:
+            self.feed.publish_reject()
 
     def get_dashboard_state(self) -> Dict[str, Any]:
         """Snapshot for Dashboard consumption."""
@@ -246,10 +260,11 @@ class WindiBridge:
     to the Dashboard aggregator.
     """
 
-    def __init__(self, simulation_mode: bool = False):
+    def __init__(self, simulation_mode: bool = False, feed_interval_s: float = LIVE_FEED_INTERVAL_S):
         self._clients: Dict[str, ClientState] = {}
         self._client_keys: Dict[str, bytes] = {}  # kid -> hmac_key
-        self.aggregator = SignalAggregator()
+        self.feed = LiveFeed(VALID_SHELVES, interval_s=feed_interval_s)
+        self.aggregator = SignalAggregator(feed=self.feed)
         self._lock = threading.Lock()
         self._simulation_mode = simulation_mode
 
@@ -383,6 +398,31 @@ class WindiBridge:
 # ─── HTTP Server ─────────────────────────────────────────────────
 
 bridge = WindiBridge()
+virtue_issuer: Optional[VirtueTokenIssuer] = (
+    VirtueTokenIssuer(os.environ[VIRTUE_KEY_ENV]) if os.environ.get(VIRTUE_KEY_ENV) else None
+)
+
+
+def _read_virtue_token(path: str, headers) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Signed Virtue Token from `Authorization: Bearer <b64>` or `?token=<b64>`
+    (EventSource cannot set headers). <b64> is URL-safe base64 of the token JSON.
+    Returns (signed_token, error).
+    """
+    auth = headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        raw = auth[7:].strip()
+    else:
+        raw = (parse_qs(urlsplit(path).query).get("token") or [""])[0]
+    if not raw:
+        return None, "AUTH:TOKEN_REQUIRED"
+    try:
+        signed = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+    except (ValueError, TypeError):
+        return None, "AUTH:MALFORMED_TOKEN"
+    if not isinstance(signed, dict):
+        return None, "AUTH:MALFORMED_TOKEN"
+    return signed, "OK"
 
 
 class BridgeHandler(BaseHTTPRequestHandler):
@@ -403,6 +443,49 @@ class BridgeHandler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         self._set_headers(204)
 
+    def _stream(self):
+        """GET /api/v1/stream — filtered snapshot, then coalesced deltas (SSE)."""
+        if virtue_issuer is None:
+            self._json_response({"error": f"Live feed disabled: {VIRTUE_KEY_ENV} not set"}, 503)
+            return
+        signed, msg = _read_virtue_token(self.path, self.headers)
+        if signed is not None:
+            ok, token, msg = virtue_issuer.validate(signed)
+        if signed is None or not ok:
+            self._json_response({"error": msg}, 401)
+            return
+        sub = bridge.feed.subscribe(token)
+        if sub is None:
+            self._json_response({"error": "Too many live feed subscribers"}, 503)
+            return
+
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            # Subscribe first, then snapshot: deltas queued meanwhile only repeat newer state
+            snapshot = SignalFilter.filter_dashboard_state(bridge.aggregator.get_dashboard_state(), token)
+            self.wfile.write(f"retry: {SSE_RETRY_MS}\n\n".encode("ascii") + sse_frame("snapshot", snapshot))
+            self.wfile.flush()
+            while True:
+                if token.revoked:
+                    self.wfile.write(sse_frame("revoked", {"error": "AUTH:TOKEN_REVOKED"}))
+                    break
+                if token.is_expired():
+                    self.wfile.write(sse_frame("expired", {"error": "AUTH:TOKEN_EXPIRED"}))
+                    break
+                if sub.closed:
+                    break
+                deltas = sub.take(SSE_HEARTBEAT_S)
+                self.wfile.write(b"".join(d.frame() for d in deltas) if deltas else b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            bridge.feed.unsubscribe(sub)
+
     def do_GET(self):
         if self.path == "/api/v1/health":
             self._json_response({
@@ -410,8 +493,12 @@ class BridgeHandler(BaseHTTPRequestHandler):
                 "protocol": PROTOCOL_VERSION,
                 "ts": int(time.time() * 1000),
                 "motto": "AI processes. Human decides. WINDI guarantees.",
+                "live_feed": bridge.feed.stats() if virtue_issuer is not None else None,
             })
 
+        elif urlsplit(self.path).path == "/api/v1/stream":
+            self._stream()
+
         elif self.path == "/api/v1/dashboard":
             self._json_response(bridge.aggregator.get_dashboard_state())
 
@@ -474,9 +561,12 @@ class BridgeHandler(BaseHTTPRequestHandler):
         pass
 
 
-def run_bridge(host: str = "0.0.0.0", port: int = 8090):
-    """Start the WINDI Bridge API server."""
-    server = HTTPServer((host, port), BridgeHandler)
+def run_bridge(host: str = "0.0.0.0", port: int = 8090,
+               feed_interval_s: float = LIVE_FEED_INTERVAL_S):
+    """Start the WINDI Bridge API server (threaded: live feed streams are long-lived)."""
+    bridge.feed.interval_s = feed_interval_s
+    server = ThreadingHTTPServer((host, port), BridgeHandler)
+    server.daemon_threads = True
     print(f"╔══════════════════════════════════════════════╗")
     print(f"║  WINDI Bridge API v1.0                       ║")
     print(f"║  Listening on {host}:{port}                  ║")
@@ -487,6 +577,8 @@ def run_bridge(host: str = "0.0.0.0", port: int = 8090):
     print(f"  GET  /api/v1/dashboard     — Dashboard state")
     print(f"  GET  /api/v1/shelf/{{S1-S7}} — Shelf detail")
     print(f"  GET  /api/v1/registry      — Signal registry")
+    print(f"  GET  /api/v1/stream        — Live feed (SSE, Virtue Token)"
+          f"{'' if virtue_issuer else f' — disabled, set {VIRTUE_KEY_ENV}'}")
     print(f"  POST /api/v1/telemetry     — Single packet")
     print(f"  POST /api/v1/telemetry/batch — Batch packets")
     print(f"  POST /api/v1/register      — Register client key")
@@ -494,4 +586,11 @@ def run_bridge(host: str = "0.0.0.0", port: int = 8090):
 
 
 if __name__ == "__main__":
-    run_bridge()
+    import argparse
+    parser = argparse.ArgumentParser(description="WINDI Bridge API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--feed-interval", type=float, default=LIVE_FEED_INTERVAL_S,
+                        help="Live feed coalescing interval in seconds")
+    args = parser.parse_args()
+    run_bridge(args.host, args.port, args.feed_interval)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+WINDI Live Feed — Test Suite
+============================
+  TEST 1: One delta per tick, filtered once per permission group
+          and fanned out to every subscriber                   → PASS/FAIL
+  TEST 2: Slow subscriber is compacted, not grown              → PASS/FAIL
+  TEST 3: Unsubscribed streams stop receiving deltas           → PASS/FAIL
+
+Run: python3 test_live_feed.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bridge"))
+
+from live_feed import LiveFeed, MAX_SIGNALS_PER_DELTA, SUBSCRIBER_BUFFER
+from virtue_token import S_LEVEL_SIGNALS, SIGNAL_SHELF_MAP, VirtueToken
+from windi_bridge import DecodedSignal, SignalAggregator, VALID_SHELVES
+
+
+def _header(name):
+    print(f"\n{'─' * 50}")
+    print(f"  {name}")
+    print(f"{'─' * 50}")
+
+
+def _result(test_name, passed, detail=""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status}  {test_name}")
+    if detail:
+        print(f"         {detail}")
+    return passed
+
+
+CODES = sorted(SIGNAL_SHELF_MAP)
+
+
+def _signal(n):
+    code = CODES[n % len(CODES)]
+    return DecodedSignal(
+        ts=1_700_000_000_000 + n, client_id_hash="c" * 16, shelf=SIGNAL_SHELF_MAP[code],
+        code=code, signal_name=code.lower(), severity="medium", weight=n % 100,
+        domain_hash="d" * 16, doc_fingerprint=f"fp-{n}", event="DOC_CREATED",
+    )
+
+
+def _feed():
+    # Long interval: the test drives the coalescer with tick()
+    feed = LiveFeed(VALID_SHELVES, interval_s=3600)
+    return feed, SignalAggregator(feed=feed)
+
+
+def main():
+    results = []
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 1: Fan-out per permission group")
+    feed, agg = _feed()
+    s1a = feed.subscribe(VirtueToken(sub="s1-a", s_level=1, domains=["*"]))
+    s1b = feed.subscribe(VirtueToken(sub="s1-b", s_level=1, domains=["*"]))
+    s2 = feed.subscribe(VirtueToken(sub="s2", s_level=2, domains=["*"]))
+    sent = [_signal(n) for n in range(40)]
+    for sig in sent:
+        agg.ingest(sig)
+    agg.reject()
+    feed.tick()
+
+    got = {name: sub.take(0) for name, sub in (("s1a", s1a), ("s1b", s1b), ("s2", s2))}
+    results.append(_result("each subscriber gets exactly one delta",
+                           all(len(d) == 1 for d in got.values()),
+                           ", ".join(f"{k}={len(v)}" for k, v in got.items())))
+    d1a, d1b, d2 = got["s1a"][0], got["s1b"][0], got["s2"][0]
+    results.append(_result("identical grants share one filtered delta and frame",
+                           d1a is d1b and d1a.frame() is d1b.frame() and d1a is not d2,
+                           f"groups filtered={feed.stats()['filtered_groups']}"))
+
+    for level, delta in ((1, d1a), (2, d2)):
+        allowed = S_LEVEL_SIGNALS[level]
+        expected = [s.code for s in sent if s.code in allowed]
+        codes = [s["code"] for s in delta.payload["signals"]]
+        results.append(_result(f"S{level} receives exactly its signals, in order",
+                               codes == expected
+                               and all(s["_visibility"] == allowed[s["code"]] for s in delta.payload["signals"]),
+                               f"{len(codes)}/{len(sent)} signals"))
+    token_shelves = set(s1a.token.shelves)
+    results.append(_result("shelf counters filtered to the token's shelves",
+                           set(d1a.payload["shelves"]) <= token_shelves
+                           and set(d2.payload["shelves"]) == {s.shelf for s in sent} & set(s2.token.shelves),
+                           f"S1 shelves={sorted(d1a.payload['shelves'])}"))
+    frame = d1a.frame().decode("utf-8")
+    data = json.loads(frame.split("data: ", 1)[1])
+    results.append(_result("SSE frame carries seq, totals and rejections",
+                           frame.startswith(f"id: {d1a.seq}\nevent: delta\n")
+                           and data["totals"]["received"] == len(sent) and data["totals"]["rejected"] == 1,
+                           f"totals={data['totals']}"))
+    feed.close()
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 2: Slow subscriber compaction")
+    feed, agg = _feed()
+    token = VirtueToken(sub="s3", s_level=3, domains=["*"])
+    fast = feed.subscribe(token)
+    slow = feed.subscribe(VirtueToken(sub="s3-slow", s_level=3, domains=["*"]))
+    ticks, per_tick = SUBSCRIBER_BUFFER + 36, 10
+    fast_signals = []
+    n = 0
+    for _ in range(ticks):
+        for _ in range(per_tick):
+            agg.ingest(_signal(n))
+            n += 1
+        feed.tick()
+        fast_signals.extend(s for d in fast.take(0) for s in d.payload["signals"])
+    pending = len(slow._pending)
+    results.append(_result("fast subscriber gets every signal",
+                           len(fast_signals) == n and fast.compactions == 0,
+                           f"{len(fast_signals)}/{n} signals"))
+    results.append(_result("slow buffer stays bounded",
+                           pending <= SUBSCRIBER_BUFFER and slow.compactions == 1,
+                           f"pending={pending}, compactions={slow.compactions}"))
+
+    deltas = slow.take(0)
+    merged = deltas[0].payload
+    received = sum(len(d.payload["signals"]) for d in deltas)
+    dropped = sum(d.payload["dropped"] for d in deltas)
+    results.append(_result("compacted delta caps signals and counts the dropped ones",
+                           len(merged["signals"]) == MAX_SIGNALS_PER_DELTA
+                           and received + dropped == n and dropped == merged["dropped"] > 0,
+                           f"kept={received}, dropped={dropped}, ingested={n}"))
+    newest = [s["ts"] for d in deltas for s in d.payload["signals"]]
+    results.append(_result("compaction keeps the newest signals, in order",
+                           newest == sorted(newest) and newest[-1] == _signal(n - 1).ts,
+                           f"first kept ts={newest[0]}"))
+    state = agg.get_dashboard_state()
+    shelves = {}
+    for d in deltas:
+        shelves.update(d.payload["shelves"])
+    results.append(_result("latest counters and seq survive compaction",
+                           deltas[-1].seq == ticks and shelves
+                           and all(shelves[s] == state["shelf_health"][s] for s in shelves),
+                           f"last seq={deltas[-1].seq}"))
+    feed.close()
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 3: Unsubscribe")
+    feed, agg = _feed()
+    keep = feed.subscribe(VirtueToken(sub="keep", s_level=2, domains=["*"]))
+    gone = feed.subscribe(VirtueToken(sub="gone", s_level=2, domains=["*"]))
+    feed.unsubscribe(gone)
+    agg.ingest(_signal(0))
+    feed.tick()
+    results.append(_result("closed stream gets nothing, the other still does",
+                           gone.closed and gone.take(0) == [] and len(keep.take(0)) == 1
+                           and feed.stats()["subscribers"] == 1,
+                           f"subscribers={feed.stats()['subscribers']}"))
+    feed.close()
+
+    # ═══════════════════════════════════════════════════════════
+    print("\n" + "═" * 50)
+    passed = sum(bool(r) for r in results)
+    total = len(results)
+    print(f"  RESULTS: {passed}/{total} passed")
+    if passed == total:
+        print("  STATUS:  ✅ ALL TESTS PASSED")
+    else:
+        print(f"  STATUS:  ❌ {total - passed} TEST(S) FAILED")
+    print("═" * 50)
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+WINDI Virtue Token Caches — Test Suite
+======================================
+  TEST 1: Identical grants share one compiled permission set   → PASS/FAIL
+  TEST 2: Validated-token cache hits, and rejects a reused
+          signature over a modified payload                    → PASS/FAIL
+  TEST 3: Revoke evicts the cached token and drops its
+          compiled permissions                                 → PASS/FAIL
+  TEST 4: Revoke reaches a token already evicted from the cache → PASS/FAIL
+  TEST 5: Live feed closes revoked streams (SSE "revoked")     → PASS/FAIL
+
+Run: python3 test_virtue_token_cache.py
+"""
+
+import base64
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bridge"))
+
+import windi_bridge
+from virtue_token import REVOKED_PERMISSIONS, VirtueToken, VirtueTokenIssuer
+
+
+def _header(name):
+    print(f"\n{'─' * 50}")
+    print(f"  {name}")
+    print(f"{'─' * 50}")
+
+
+def _result(test_name, passed, detail=""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status}  {test_name}")
+    if detail:
+        print(f"         {detail}")
+    return passed
+
+
+def _issuer(**kwargs):
+    return VirtueTokenIssuer(base64.b64encode(os.urandom(32)).decode("ascii"), **kwargs)
+
+
+def _read_event(resp):
+    """Next SSE event name from a streaming response (comments skipped)."""
+    while True:
+        line = resp.fp.readline().decode("utf-8")
+        if not line:
+            return None
+        if line.startswith("event: "):
+            return line[7:].strip()
+
+
+def main():
+    results = []
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 1: Compiled permissions")
+    a = VirtueToken(sub="a", s_level=2, domains=["*"])
+    b = VirtueToken(sub="b", s_level=2, domains=["*"])
+    c = VirtueToken(sub="c", s_level=1, domains=["*"])
+    results.append(_result("identical grants share one object, other grants do not",
+                           a.permissions() is b.permissions() and a.permissions() is not c.permissions()))
+    results.append(_result("set lookups match the token's lists",
+                           all(a.can_see_signal(s) for s in a.signals) and not c.can_see_signal("ID-CONC")
+                           and all(c.can_see_shelf(s) for s in c.shelves) and not c.can_see_shelf("S1"),
+                           f"S1 shelves={c.shelves}"))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 2: Validated-token cache")
+    issuer = _issuer()
+    signed = issuer.issue(VirtueToken(sub="cached", s_level=2, domains=["*"]))
+    ok1, tok1, _ = issuer.validate(signed)
+    ok2, tok2, _ = issuer.validate(json.loads(json.dumps(signed)))
+    stats = issuer.stats()
+    results.append(_result("second validate is a cache hit returning the same token",
+                           ok1 and ok2 and tok1 is tok2 and stats["hits"] == 1 and stats["cached_tokens"] == 1,
+                           f"hits={stats['hits']}, misses={stats['misses']}"))
+    forged = json.loads(json.dumps(signed))
+    forged["payload"]["s_level"] = 3
+    ok, _, msg = issuer.validate(forged)
+    results.append(_result("reused signature over a modified payload is rejected",
+                           not ok and msg == "AUTH:SIGNATURE_INVALID", msg))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 3: Revoke invalidates both caches")
+    shared = tok1.permissions()
+    twin_signed = issuer.issue(VirtueToken(sub="twin", s_level=2, domains=["*"]))
+    _, twin, _ = issuer.validate(twin_signed)
+    revoked = issuer.revoke(signed, reason="test")
+    stats = issuer.stats()
+    results.append(_result("revoke evicts the validated token",
+                           revoked and stats["cached_tokens"] == 1 and stats["revoked_tokens"] == 1,
+                           f"cached={stats['cached_tokens']}, revoked={stats['revoked_tokens']}"))
+    results.append(_result("held token loses its compiled permissions",
+                           tok1.revoked and tok1.permissions() is REVOKED_PERMISSIONS
+                           and not any(tok1.can_see_signal(s) for s in tok1.signals)
+                           and not tok1.can_see_shelf(tok1.shelves[0]),
+                           f"visible signals={len(tok1.permissions().signals)}"))
+    results.append(_result("tokens with the same grant keep the shared permissions",
+                           twin.permissions() is shared and shared.signals and twin.can_see_signal("ID-CONC")))
+    outcomes = [issuer.validate(json.loads(json.dumps(signed)))[2] for _ in range(2)]
+    results.append(_result("revoked token no longer validates (no cache hit)",
+                           outcomes == ["AUTH:TOKEN_REVOKED"] * 2 and issuer.stats()["cached_tokens"] == 1,
+                           f"{outcomes}"))
+    results.append(_result("revocation is in the forensic log, forged revokes refused",
+                           issuer.get_issuance_log()[-1]["action"] == "TOKEN_REVOKED"
+                           and not issuer.revoke(forged) and issuer.stats()["revoked_tokens"] == 1))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 4: Revoke after cache eviction")
+    issuer = _issuer(cache_size=1)
+    first = issuer.issue(VirtueToken(sub="first", s_level=1, domains=["*"]))
+    second = issuer.issue(VirtueToken(sub="second", s_level=1, domains=["*"]))
+    _, held, _ = issuer.validate(first)
+    issuer.validate(second)                       # evicts `first` from the LRU
+    _, again, _ = issuer.validate(first)          # re-validated: same object
+    issuer.revoke(first)
+    results.append(_result("every holder of the evicted token sees the revoke",
+                           held is again and held.revoked and held.permissions() is REVOKED_PERMISSIONS))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 5: Revoked live feed stream")
+    issuer = _issuer()
+    windi_bridge.virtue_issuer = issuer
+    windi_bridge.bridge.feed.interval_s = 0.05
+    server = ThreadingHTTPServer(("127.0.0.1", 0), windi_bridge.BridgeHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    def open_stream(signed_token):
+        raw = base64.urlsafe_b64encode(json.dumps(signed_token).encode()).decode().rstrip("=")
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", f"/api/v1/stream?token={raw}")
+        return conn, conn.getresponse()
+
+    try:
+        gone_signed = issuer.issue(VirtueToken(sub="gone", s_level=2, domains=["*"]))
+        keep_signed = issuer.issue(VirtueToken(sub="keep", s_level=2, domains=["*"]))
+        streams = {name: open_stream(s) for name, s in (("gone", gone_signed), ("keep", keep_signed))}
+        snapshots = [_read_event(resp) for _, resp in streams.values()]
+        issuer.revoke(gone_signed)
+        started = time.monotonic()
+        event = _read_event(streams["gone"][1])
+        results.append(_result("revoked stream gets 'revoked' and is closed",
+                               snapshots == ["snapshot", "snapshot"] and event == "revoked"
+                               and _read_event(streams["gone"][1]) is None,
+                               f"after {time.monotonic() - started:.2f}s"))
+        deadline = time.monotonic() + 5
+        while windi_bridge.bridge.feed.stats()["subscribers"] != 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        windi_bridge.bridge.aggregator.reject()
+        results.append(_result("other stream with the same grant keeps its deltas",
+                               _read_event(streams["keep"][1]) == "delta"
+                               and windi_bridge.bridge.feed.stats()["subscribers"] == 1))
+        conn, resp = open_stream(gone_signed)
+        results.append(_result("reconnecting with the revoked token is refused",
+                               resp.status == 401 and json.loads(resp.read())["error"] == "AUTH:TOKEN_REVOKED",
+                               f"HTTP {resp.status}"))
+        for conn, _ in streams.values():
+            conn.close()
+    finally:
+        server.shutdown()
+        windi_bridge.bridge.feed.close()
+
+    # ═══════════════════════════════════════════════════════════
+    print("\n" + "═" * 50)
+    passed = sum(bool(r) for r in results)
+    total = len(results)
+    print(f"  RESULTS: {passed}/{total} passed")
+    if passed == total:
+        print("  STATUS:  ✅ ALL TESTS PASSED")
+    else:
+        print(f"  STATUS:  ❌ {total - passed} TEST(S) FAILED")
+    print("═" * 50)
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
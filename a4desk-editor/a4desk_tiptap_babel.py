@@ -14,7 +14,6 @@ import sys
 import json
 import hashlib
 import sqlite3
-import subprocess
 import tempfile
 import base64
 import secrets
@@ -89,7 +88,6 @@ except ImportError as e:
 
 from flask_cors import CORS
 import requests
-from weasyprint import HTML as WeasyHTML
 
 sys.path.insert(0, '/opt/windi/isp')
 sys.path.insert(0, '/opt/windi/templates')
@@ -149,15 +147,24 @@ CONFIG = {
     "db_path": "/opt/windi/data/babel_documents.db",
     "session_timeout_minutes": 10,
     "session_max_hours": 8,
+    "session_backend": os.getenv("WINDI_SESSION_BACKEND", "sqlite"),  # "memory" = single process only
+    "session_db_path": "/opt/windi/data/babel_sessions.db",
     "max_login_attempts": 3
 }
 
-SESSIONS = {}
+# Shared across gunicorn workers (sqlite backend) and expired proactively
+from session_store import create_session_store
+os.makedirs(os.path.dirname(CONFIG["session_db_path"]), exist_ok=True)
+SESSION_STORE = create_session_store(
+    CONFIG["session_backend"],
+    idle_timeout_s=CONFIG["session_timeout_minutes"] * 60,
+    db_path=CONFIG["session_db_path"],
+)
 
 def create_session(user_data):
     session_id = secrets.token_urlsafe(32)
     now = datetime.now(timezone.utc)
-    SESSIONS[session_id] = {
+    SESSION_STORE.create(session_id, {
         "user_id": user_data.get("employee_id", ""),
         "full_name": user_data.get("full_name", ""),
         "department": user_data.get("department", ""),
@@ -170,31 +177,24 @@ def create_session(user_data):
         "user_agent": request.headers.get("User-Agent", ""),
         "reauth_count": 0,
         "actions_count": 0
-    }
+    })
     return session_id
 
 def validate_session(session_id):
-    if not session_id or session_id not in SESSIONS:
-        return None
-    sess = SESSIONS[session_id]
-    now = datetime.now(timezone.utc)
-    expires_at = datetime.fromisoformat(sess["expires_at"].replace('Z', '+00:00'))
-    if now > expires_at:
-        del SESSIONS[session_id]
+    """Session (a copy) if still valid; slides the idle timeout. Persist changes with update_session()."""
+    if not session_id:
         return None
-    last_activity = datetime.fromisoformat(sess["last_activity"].replace('Z', '+00:00'))
-    if (now - last_activity).total_seconds() > CONFIG["session_timeout_minutes"] * 60:
-        del SESSIONS[session_id]
-        return None
-    sess["last_activity"] = now.isoformat()
-    sess["actions_count"] += 1
-    return sess
+    return SESSION_STORE.touch(session_id)
+
+def update_session(session_id, **fields):
+    return SESSION_STORE.update(session_id, fields)
+
+def increment_session(session_id, field, n=1):
+    """Counter update without read-modify-write: safe when workers share the session."""
+    return SESSION_STORE.increment(session_id, field, n)
 
 def invalidate_session(session_id):
-    if session_id in SESSIONS:
-        del SESSIONS[session_id]
-        return True
-    return False
+    return SESSION_STORE.delete(session_id)
 
 def init_db():
     os.makedirs(os.path.dirname(CONFIG["db_path"]), exist_ok=True)
@@ -246,6 +246,28 @@ def get_db():
 
 init_db()
 
+# Public /verify: indexed receipt lookup + deferred verification counters
+from receipt_index import ReceiptIndex, VerificationCounter
+RECEIPT_INDEX = ReceiptIndex(CONFIG["db_path"])
+VERIFY_COUNTERS = VerificationCounter(CONFIG["db_path"])
+
+# Governance bridge: drain submissions left in the outbox by earlier runs
+try:
+    from governance_bridge import start_dispatcher
+    start_dispatcher()
+except Exception as e:
+    print(f"[BRIDGE] Outbox dispatcher not started: {e}")
+
+_submission_registry = None
+
+def get_submission_registry():
+    """SubmissionRegistry compartilhado (abre o registry.db uma vez por processo)"""
+    global _submission_registry
+    if _submission_registry is None:
+        from engine.submission_registry import SubmissionRegistry
+        _submission_registry = SubmissionRegistry("/opt/windi/provenance")
+    return _submission_registry
+
 def get_last_audit_hash():
     conn = get_db()
     cursor = conn.cursor()
@@ -672,6 +694,13 @@ def api_validate_session():
         return jsonify({"valid": False}), 401
     return jsonify({"valid": True, "user": {"employee_id": sess['user_id'], "full_name": sess['full_name']}, "remaining_seconds": CONFIG["session_timeout_minutes"] * 60})
 
+@app.route('/api/auth/sessions/stats', methods=['GET'])
+def api_session_stats():
+    session_id = request.headers.get('X-Session-ID', '')
+    if not validate_session(session_id):
+        return jsonify({"error": "Session expired"}), 401
+    return jsonify(SESSION_STORE.stats())
+
 @app.route('/api/auth/reauth', methods=['POST'])
 def api_reauth():
     session_id = request.headers.get('X-Session-ID', '')
@@ -681,7 +710,7 @@ def api_reauth():
     data = request.json or {}
     success, result = verify_identity(sess['user_id'], data.get('password', ''))
     if success:
-        sess['reauth_count'] += 1
+        increment_session(session_id, 'reauth_count')
         log_audit(None, 'REAUTH_SUCCESS', {'id': sess['user_id'], 'name': sess['full_name'], 'employee_id': sess['user_id']}, session_id=session_id, notes=f"Action: {data.get('action', '')}")
         return jsonify({"success": True})
     log_audit(None, 'REAUTH_FAILED', {'id': sess['user_id'], 'name': sess['full_name'], 'employee_id': sess['user_id']}, session_id=session_id)
@@ -724,6 +753,7 @@ def api_update_profile():
     sess['department'] = data.get('department', sess.get('department', ''))
     sess['position'] = data.get('position', sess.get('position', ''))
     sess['email'] = data.get('email', sess.get('email', ''))
+    update_session(session_id, department=sess['department'], position=sess['position'], email=sess['email'])
     
     log_audit(None, 'PROFILE_UPDATED', {
         'id': employee_id, 
@@ -861,6 +891,7 @@ def finalize_document(doc_id):
     now = datetime.now(timezone.utc).isoformat()
     content_hash = hashlib.sha256(row["content"].encode()).hexdigest()[:12]
     cursor.execute("UPDATE documents SET status = 'finalized', receipt = ?, updated_at = ?, witness = ? WHERE id = ?", (json.dumps(receipt), now, json.dumps(witness_data), doc_id))
+    RECEIPT_INDEX.add(receipt["receipt_id"], doc_id, conn)
     conn.commit()
     conn.close()
 
@@ -908,10 +939,9 @@ def finalize_document(doc_id):
         )
         if bridge_result:
             _corr = bridge_result.get('bridge_correlation_id', '?')
-            _sub = bridge_result.get('submission_id', bridge_result.get('id', '?'))
-            print(f"[BRIDGE] Doc {doc_id} → War Room: submission={_sub} corr={_corr}")
+            print(f"[BRIDGE] Doc {doc_id} → War Room outbox: corr={_corr}")
         else:
-            print(f"[BRIDGE] Doc {doc_id} → War Room: API offline (graceful skip)")
+            print(f"[BRIDGE] Doc {doc_id} → War Room: outbox unavailable (graceful skip)")
     except Exception as bridge_err:
         print(f"[BRIDGE] Non-critical error for {doc_id}: {bridge_err}")
     # ─── END GOVERNANCE BRIDGE ─────────────────────────────────
@@ -928,8 +958,9 @@ def delete_document(doc_id):
     row = cursor.fetchone()
     old_status = row["status"] if row else None
     cursor.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
-    conn.commit()
     deleted = cursor.rowcount > 0
+    RECEIPT_INDEX.remove_document(doc_id, conn)
+    conn.commit()
     conn.close()
     if deleted:
         log_audit(doc_id, 'DOC_DELETED', author_data, session_id=session_id, old_status=old_status)
@@ -963,23 +994,24 @@ def verify_receipt(receipt_id):
     """
     ISP Phase 2 Enhanced Verification Endpoint.
     GET /verify/WINDI-DB-03FEB26-A1B2C3D4
+
+    Leitura pura: consulta indexada (receipt_index + cache TTL); a contagem
+    de verificações é acumulada em memória e gravada em lote.
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM documents WHERE receipt LIKE ?", (f'%{receipt_id}%',))
-    row = cursor.fetchone()
+    row = RECEIPT_INDEX.lookup(receipt_id)
 
     # Check submission registry as fallback
     registry_entry = None
-    try:
-        from engine.submission_registry import SubmissionRegistry
-        registry = SubmissionRegistry("/opt/windi/provenance")
-        registry_entry = registry.lookup(receipt_id)
-    except:
-        pass
+    if not row:
+        try:
+            registry_entry = get_submission_registry().lookup(receipt_id)
+        except Exception:
+            pass
+
+    if row or registry_entry:
+        VERIFY_COUNTERS.record(receipt_id)
 
     if not row and not registry_entry:
-        conn.close()
         # Check if browser request
         accept_header = request.headers.get('Accept', '')
         wants_html = 'text/html' in accept_header and 'application/json' not in accept_header
@@ -1013,7 +1045,6 @@ def verify_receipt(receipt_id):
                 doc_metadata = json.loads(row["metadata"])
         except (KeyError, TypeError, json.JSONDecodeError):
             pass
-    conn.close()
 
     # Extract ISP fields
     isp_profile = receipt_data.get("isp_id") or doc_metadata.get("institutional_profile")
@@ -1177,8 +1208,92 @@ def sanitize_content_html(html):
     html = re.sub(r'v4\.[0-9]+\s*', '', html)  # versões soltas
     return html.strip()
 
+# ============================================
+# EXPORT: content-addressed cache + background jobs
+# ============================================
+from export_cache import ExportCache, ExportJobQueue, export_cache_key, EXPORT_SYNC_WAIT_S
+from conversion_pool import ConversionPool
+EXPORT_CACHE = ExportCache()
+EXPORT_JOBS = ExportJobQueue(EXPORT_CACHE)   # job state shared by all workers via the cache index
+
+# Warm WeasyPrint/pandoc workers (started on the first export)
+CONVERSION_POOL = ConversionPool()
+EXPORT_FORMATS = ['docx', 'pdf', 'odt', 'rtf', 'html', 'md']
+EXPORT_MIME_TYPES = {'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'pdf': 'application/pdf', 'odt': 'application/vnd.oasis.opendocument.text', 'rtf': 'application/rtf', 'md': 'text/markdown', 'html': 'text/html'}
+EXPORT_LAYOUT_VERSION = "4.8"  # bump when the export HTML/footer layout changes
+
+def _export_spec(row, fmt):
+    """
+    Everything that shapes an export, plus its cache key:
+    sha256(content + ISP profile + format + watermark params).
+    The UTC date is part of the key because it is printed on the document.
+    """
+    doc = dict(row)
+    doc_metadata = json.loads(doc["metadata"]) if doc.get("metadata") else {}
+    institutional_profile = doc_metadata.get("institutional_profile")
+    isp_fingerprint = ""
+    apply_watermark = False
+    if institutional_profile:
+        try:
+            from isp_loader import get_isp_fingerprint
+            isp_fingerprint = get_isp_fingerprint(institutional_profile)
+        except Exception:
+            pass
+    if fmt == 'pdf' and WINDI_C14N_AVAILABLE and WINDI_PRINT_LAYER_AVAILABLE:
+        try:
+            from isp_loader import should_apply_watermark
+            apply_watermark = bool(should_apply_watermark(institutional_profile))
+        except Exception as e:
+            print(f"[WINDI] Watermark policy error: {e}", flush=True)
+    key = export_cache_key({
+        "layout": EXPORT_LAYOUT_VERSION,
+        "doc_id": doc["id"],
+        "fmt": fmt,
+        "title": doc.get("title"),
+        "content": doc.get("content"),
+        "content_html": doc.get("content_html"),
+        "receipt": doc.get("receipt"),
+        "metadata": doc.get("metadata"),
+        "isp": [institutional_profile, isp_fingerprint],
+        "watermark": [apply_watermark, WINDI_ISSUER_ID],
+        "envelope": WINDI_C14N_AVAILABLE,
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+    })
+    return {
+        "key": key,
+        "row": row,
+        "fmt": fmt,
+        "doc_id": doc["id"],
+        "doc_metadata": doc_metadata,
+        "receipt_data": json.loads(doc["receipt"]) if doc.get("receipt") else {},
+        "institutional_profile": institutional_profile,
+        "apply_watermark": apply_watermark,
+    }
+
+def _deliver_export(cached):
+    """Send a cached export; governance audit and envelope are recorded per delivery."""
+    from governance_phase3 import save_governance_audit
+    meta = cached.meta
+    save_governance_audit(get_db, meta["doc_id"], meta["governance_stats"], meta["structure_check"], meta["receipt_id"], meta["institutional_profile"])
+    if meta.get("envelope"):
+        save_windi_envelope(meta["doc_id"], meta["envelope"])
+    # Opened before returning: an eviction after this point cannot break the download
+    return send_file(open(cached.path, 'rb'), as_attachment=True, download_name=f"{meta['title']}.{meta['fmt']}", mimetype=meta["mimetype"])
+
+def _export_job_json(job):
+    data = job.to_dict()
+    data["status_url"] = f"/api/export/jobs/{job.id}"
+    if job.status == "done":
+        data["download_url"] = f"/api/export/jobs/{job.id}/download"
+    return data
+
 @app.route('/api/document/<doc_id>/export/<fmt>', methods=['GET'])
 def export_document(doc_id, fmt):
+    """
+    Cache hit: file right away. Cold: rendered on the export worker pool;
+    waits up to EXPORT_SYNC_WAIT_S (or returns 202 + job at once with
+    ?async=1) — poll /api/export/jobs/<job_id>.
+    """
     conn = get_db()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM documents WHERE id = ?", (doc_id,))
@@ -1186,19 +1301,78 @@ def export_document(doc_id, fmt):
     conn.close()
     if not row:
         return jsonify({"error": "Not found"}), 404
-    if fmt not in ['docx', 'pdf', 'odt', 'rtf', 'html', 'md']:
+    if fmt not in EXPORT_FORMATS:
         return jsonify({"error": "Format not supported"}), 400
+    spec = _export_spec(row, fmt)
+    cached = EXPORT_CACHE.get(spec["key"])
+    if cached:
+        return _deliver_export(cached)
+    job = EXPORT_JOBS.submit(spec["key"], lambda job: _render_export(job, spec), label=f"{doc_id}.{fmt}")
+    if job is None:
+        return jsonify({"error": "Export queue full", "retry_after": 5}), 503, {"Retry-After": "5"}
+    if request.args.get('async', '') not in ('', '0', 'false'):
+        return jsonify(_export_job_json(job)), 202
+    job.wait(EXPORT_SYNC_WAIT_S)
+    if job.status == "done":
+        cached = job.result or EXPORT_CACHE.get(job.key)   # rendered by another worker
+        if not cached:
+            return jsonify({"error": "Export evicted, request it again"}), 410
+        return _deliver_export(cached)
+    if job.status == "failed":
+        return jsonify({"error": "Export failed", **_export_job_json(job)}), 500
+    if job.status == "cancelled":
+        return jsonify({"error": "Export cancelled", **_export_job_json(job)}), 409
+    return jsonify(_export_job_json(job)), 202
+
+@app.route('/api/export/jobs/<job_id>', methods=['GET'])
+def export_job_status(job_id):
+    job = EXPORT_JOBS.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(_export_job_json(job))
+
+@app.route('/api/export/jobs/<job_id>', methods=['DELETE'])
+def cancel_export_job(job_id):
+    job = EXPORT_JOBS.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    cancelled = EXPORT_JOBS.cancel(job_id)
+    return jsonify({"cancelled": cancelled, **_export_job_json(job)}), 200 if cancelled else 409
+
+@app.route('/api/export/jobs/<job_id>/download', methods=['GET'])
+def download_export_job(job_id):
+    job = EXPORT_JOBS.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "done":
+        return jsonify(_export_job_json(job)), 409
+    cached = EXPORT_CACHE.get(job.key)
+    if not cached:
+        return jsonify({"error": "Export evicted, request it again"}), 410
+    return _deliver_export(cached)
+
+@app.route('/api/export/stats', methods=['GET'])
+def export_stats():
+    return jsonify({"cache": EXPORT_CACHE.summary(), "jobs": EXPORT_JOBS.summary(), "conversion": CONVERSION_POOL.summary()})
+
+def _render_export(job, spec):
+    """
+    Cold export (worker pool): ISP render, WeasyPrint/pandoc, envelope and
+    print watermark. The result is stored in EXPORT_CACHE; audit and
+    envelope persistence happen on delivery (_deliver_export).
+    """
+    row, fmt, doc_id = spec["row"], spec["fmt"], spec["doc_id"]
     title = row["title"]
     content_html = sanitize_content_html(row["content_html"] if "content_html" in row.keys() else row["content"].replace('\n', '<br>'))
-    receipt_data = json.loads(row["receipt"]) if row["receipt"] else {}
+    receipt_data = spec["receipt_data"]
     receipt_id = receipt_data.get("receipt_id", doc_id)
     receipt_hash = receipt_data.get("hash", "---")
     author_info = receipt_data.get("author", {})
     witness_info = receipt_data.get("witness", {})
     qr_base64 = generate_qr_base64(f"WINDI:{receipt_id}|{receipt_hash}")
     # ========== PHASE 3: GOVERNANCE ==========
-    from governance_phase3 import extract_block_governance, validate_structure, extract_blocks_from_html, build_governance_ledger_html, save_governance_audit
-    doc_metadata = json.loads(row["metadata"]) if "metadata" in row.keys() and row["metadata"] else {}
+    from governance_phase3 import extract_block_governance, validate_structure, extract_blocks_from_html, build_governance_ledger_html
+    doc_metadata = spec["doc_metadata"]
     document_blocks = doc_metadata.get("document_structure", [])
     template_id = doc_metadata.get("template_id", "unknown")
     if not document_blocks:
@@ -1207,7 +1381,7 @@ def export_document(doc_id, fmt):
     structure_check = validate_structure(document_blocks, template_id)
     governance_ledger_html = build_governance_ledger_html(governance_stats, structure_check, template_id)
     # Phase 4: Get ISP from document metadata if available
-    institutional_profile = doc_metadata.get("institutional_profile")
+    institutional_profile = spec["institutional_profile"]
     
     # === ISP Integration v2.0 ===
     # Supports: templates, forms, components, tokens
@@ -1300,7 +1474,6 @@ def export_document(doc_id, fmt):
             import traceback
             print(f"[ISP v2.0] Load error: {e}")
             traceback.print_exc()
-    save_governance_audit(get_db, doc_id, governance_stats, structure_check, receipt_id, institutional_profile)
     # ========== END PHASE 3 ==========
     # v4.7-gov: Human Authorship Notice
     # v4.8: MINIMAL Human Authorship Notice (single line, discrete)
@@ -1382,18 +1555,29 @@ def export_document(doc_id, fmt):
     {footer_html}
 </body>
 </html>'''
+    job.check_cancelled()
+    meta = {
+        "doc_id": doc_id,
+        "title": title,
+        "mimetype": EXPORT_MIME_TYPES[fmt],
+        "receipt_id": receipt_id,
+        "institutional_profile": institutional_profile,
+        "governance_stats": governance_stats,
+        "structure_check": structure_check,
+        "envelope": None,
+    }
     with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
         f.write(html_content)
         html_path = f.name
     try:
         if fmt == 'html':
-            return send_file(html_path, as_attachment=True, download_name=f"{title}.html")
+            return EXPORT_CACHE.put(spec["key"], html_path, fmt, meta)
         output_path = html_path.replace('.html', f'.{fmt}')
-        if fmt == 'pdf':
-            WeasyHTML(filename=html_path, encoding='utf-8').write_pdf(output_path)
-        else:
-            subprocess.run(['pandoc', '-f', 'html', '-t', 'markdown' if fmt == 'md' else fmt, '-o', output_path, html_path], capture_output=True)
-        mime_types = {'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'pdf': 'application/pdf', 'odt': 'application/vnd.oasis.opendocument.text', 'rtf': 'application/rtf', 'md': 'text/markdown'}
+        # ISP CSS stays inline: write_pdf(stylesheets=...) is user origin and
+        # would lose to the template's own <style> rules
+        CONVERSION_POOL.convert(html_path, output_path, fmt)
+        job.check_cancelled()
+        mime_types = EXPORT_MIME_TYPES
         # === WINDI v0.1 Envelope Generation ===
         print(f"[WINDI] DEBUG: fmt={fmt}, output_path={output_path}, C14N={WINDI_C14N_AVAILABLE}", flush=True)
         if WINDI_C14N_AVAILABLE:
@@ -1408,16 +1592,14 @@ def export_document(doc_id, fmt):
                 }
                 envelope = generate_windi_envelope(doc_id, file_bytes, mime_types.get(fmt, 'application/octet-stream'), author_data, f"export.{fmt}")
                 if envelope:
-                    save_windi_envelope(doc_id, envelope)
+                    meta["envelope"] = envelope
                     # === WINDI Print Watermark Layer ===
                     if WINDI_PRINT_LAYER_AVAILABLE and fmt == 'pdf':
                         try:
                             doc_hash = envelope.get('integrity', {}).get('doc_hash', '')
                             if doc_hash:
-                                # v4.8: Check governance level
-                                from isp_loader import should_apply_watermark
-                                apply_wm = should_apply_watermark(institutional_profile)
-                                if apply_wm:
+                                # v4.8: Governance level decided in _export_spec (part of the cache key)
+                                if spec["apply_watermark"]:
                                     with open(output_path, 'rb') as pf:
                                         pdf_bytes = pf.read()
                                     watermarked = embed_print_watermark(pdf_bytes, doc_hash, WINDI_ISSUER_ID)
@@ -1432,10 +1614,11 @@ def export_document(doc_id, fmt):
             except Exception as e:
                 print(f"[WINDI] Export envelope error: {e}", flush=True)
         # === END WINDI ===
-        return send_file(output_path, as_attachment=True, download_name=f"{title}.{fmt}", mimetype=mime_types.get(fmt, 'application/octet-stream'))
+        return EXPORT_CACHE.put(spec["key"], output_path, fmt, meta)
     finally:
-        if os.path.exists(html_path):
-            os.unlink(html_path)
+        for path in (html_path, html_path.replace('.html', f'.{fmt}')):
+            if os.path.exists(path):
+                os.unlink(path)
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -0,0 +1,577 @@
+"""
+WINDI Conversion Pool v1.0 — warm WeasyPrint/pandoc workers for a4Desk BABEL
+============================================================================
+Created: 16 Oct 2026
+
+Before: every PDF export built a fresh weasyprint.HTML(...).write_pdf()
+(font discovery, user-agent stylesheet and ISP CSS parsed again) and every
+DOCX/ODT/RTF/MD export started a new pandoc process.
+
+Now:
+  + long-lived converter processes, started once, that preload WeasyPrint
+    and a shared FontConfiguration (ISP CSS stays inline in the document:
+    extra `stylesheets` are user origin and lose to the template's <style>)
+  + pandoc runs as `pandoc server` inside each worker when available
+    (falls back to one pandoc process per job)
+  + one supervisor thread per worker: per-job timeout (kill + respawn),
+    idle health pings, recycling after CONVERSION_MAX_JOBS_PER_WORKER jobs
+  + each worker leads its own process group, so killing it also takes down
+    its `pandoc server` child
+
+Workers are plain `python conversion_pool.py --worker` processes talking
+over a socketpair, so they never re-import the Flask app.
+
+Benchmark (cold process per document vs warm pool, generated corpus):
+    python conversion_pool.py --bench [--documents 40] [--formats pdf,docx]
+
+"AI processes. Human decides. WINDI guarantees."
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+
+# ═══════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════
+
+CONVERSION_WORKERS = int(os.environ.get("WINDI_CONVERSION_WORKERS", "2"))
+CONVERSION_MAX_JOBS_PER_WORKER = 200   # recycle a worker after this many jobs
+CONVERSION_JOB_TIMEOUT_S = 120         # kill and respawn a worker stuck on one job
+CONVERSION_HEALTH_INTERVAL_S = 30      # ping idle workers this often
+CONVERSION_START_TIMEOUT_S = 60        # worker must report ready within this
+CONVERSION_CSS_CACHE_SIZE = 64         # parsed stylesheets kept per worker
+
+PANDOC_FORMATS = {"docx", "odt", "rtf", "md"}
+CONVERSION_FORMATS = PANDOC_FORMATS | {"pdf", "html"}
+
+
+class ConversionError(Exception):
+    pass
+
+
+class ConversionTimeout(ConversionError):
+    pass
+
+
+def _pandoc_target(fmt):
+    return "markdown" if fmt == "md" else fmt
+
+
+# ═══════════════════════════════════════════════════════════════
+# WORKER SIDE (runs inside the converter process)
+# ═══════════════════════════════════════════════════════════════
+
+class _Converter:
+    """Converter state that lives for the whole worker process."""
+
+    def __init__(self, preload_css=(), warm=True):
+        self.weasyprint = None
+        self.font_config = None
+        self._css = OrderedDict()     # sha256(css text) -> weasyprint.CSS
+        self._pandoc_server = None
+        self._pandoc_url = None
+        try:
+            import weasyprint
+            try:
+                from weasyprint.text.fonts import FontConfiguration
+            except ImportError:       # WeasyPrint < 53
+                from weasyprint.fonts import FontConfiguration
+            self.weasyprint = weasyprint
+            self.font_config = FontConfiguration()
+            for css in preload_css:
+                self._stylesheet(css)
+            if warm:
+                # Warm-up: user-agent stylesheet, font discovery, layout code paths
+                weasyprint.HTML(string="<p>WINDI</p>").write_pdf(font_config=self.font_config)
+        except ImportError:
+            pass
+        if warm:
+            self._start_pandoc_server()
+
+    def _stylesheet(self, css_text):
+        key = hashlib.sha256(css_text.encode("utf-8")).hexdigest()
+        sheet = self._css.get(key)
+        if sheet is None:
+            sheet = self.weasyprint.CSS(string=css_text, font_config=self.font_config)
+            self._css[key] = sheet
+            while len(self._css) > CONVERSION_CSS_CACHE_SIZE:
+                self._css.popitem(last=False)
+        else:
+            self._css.move_to_end(key)
+        return sheet
+
+    def _start_pandoc_server(self):
+        if not shutil.which("pandoc"):
+            return
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        try:
+            proc = subprocess.Popen(
+                ["pandoc", "server", "--port", str(port), "--timeout", str(CONVERSION_JOB_TIMEOUT_S)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            return
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and proc.poll() is None:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                self._pandoc_server = proc
+                self._pandoc_url = f"http://127.0.0.1:{port}/"
+                return
+            except OSError:
+                time.sleep(0.05)
+        proc.kill()                   # pandoc built without server support
+
+    def _pandoc(self, src, out, fmt):
+        if self._pandoc_url:
+            from urllib.request import Request, urlopen
+            with open(src, encoding="utf-8") as f:
+                body = json.dumps({"text": f.read(), "from": "html", "to": _pandoc_target(fmt)})
+            req = Request(self._pandoc_url, data=body.encode("utf-8"), headers={
+                "Content-Type": "application/json", "Accept": "application/octet-stream"})
+            try:
+                with urlopen(req, timeout=CONVERSION_JOB_TIMEOUT_S) as resp:
+                    data = resp.read()
+                with open(out, "wb") as f:
+                    f.write(data)
+                return "pandoc-server"
+            except OSError as e:
+                print(f"[CONVERT] pandoc server failed, using subprocess: {e}", flush=True)
+        result = subprocess.run(["pandoc", "-f", "html", "-t", _pandoc_target(fmt), "-o", out, src],
+                                capture_output=True, timeout=CONVERSION_JOB_TIMEOUT_S)
+        if result.returncode != 0:
+            raise ConversionError(result.stderr.decode("utf-8", "replace").strip() or "pandoc failed")
+        return "pandoc"
+
+    def convert(self, src, out, fmt, stylesheets=()):
+        if fmt == "pdf":
+            if self.weasyprint is None:
+                raise ConversionError("weasyprint is not installed")
+            sheets = [self._stylesheet(css) for css in stylesheets if css]
+            self.weasyprint.HTML(filename=src, encoding="utf-8").write_pdf(
+                out, stylesheets=sheets, font_config=self.font_config)
+            return "weasyprint"
+        if fmt in PANDOC_FORMATS:
+            return self._pandoc(src, out, fmt)
+        if fmt == "html":
+            shutil.copyfile(src, out)
+            return "copy"
+        raise ConversionError(f"Format not supported: {fmt}")
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "weasyprint": self.weasyprint is not None,
+            "pandoc_server": self._pandoc_url is not None and self._pandoc_server.poll() is None,
+            "stylesheets": len(self._css),
+        }
+
+    def close(self):
+        if self._pandoc_server is not None:
+            self._pandoc_server.kill()
+            self._pandoc_server.wait()
+
+
+def _worker_main(fd):
+    conn = Connection(fd)
+    _, preload_css = conn.recv()              # ("init", [css, ...])
+    converter = _Converter(preload_css)
+    conn.send(("ready", converter.status()))
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                return
+            if msg[0] == "stop":
+                return
+            if msg[0] == "ping":
+                conn.send(("pong", converter.status()))
+                continue
+            _, src, out, fmt, stylesheets = msg
+            try:
+                conn.send(("ok", converter.convert(src, out, fmt, stylesheets)))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        converter.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+# POOL SIDE (runs in the Flask process)
+# ═══════════════════════════════════════════════════════════════
+
+class _Worker:
+    """One converter process and the supervisor thread that owns it."""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+        self.proc = None
+        self.conn = None
+        self.jobs = 0                 # jobs on the current process
+        self.total_jobs = 0
+        self.restarts = 0
+        self.last_ok = None
+        self.info = {}
+
+    def spawn(self):
+        parent, child = socket.socketpair()
+        try:
+            self.proc = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--worker", str(child.fileno())],
+                pass_fds=(child.fileno(),), start_new_session=True)
+        finally:
+            child.close()
+        self.conn = Connection(parent.detach())
+        self.jobs = 0
+        self.conn.send(("init", list(self.pool.preload_css())))
+        if not self.conn.poll(CONVERSION_START_TIMEOUT_S):
+            self.kill()
+            raise ConversionError("converter worker did not start")
+        _, self.info = self.conn.recv()
+        self.last_ok = time.time()
+
+    def kill(self):
+        if self.proc is not None:
+            # The worker leads its own process group: SIGKILL the group so its
+            # pandoc server (and port) goes with it
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self.proc.wait()
+            self.proc = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            self.conn.send(("stop",))
+            self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def restart(self, reason):
+        print(f"[CONVERT] Worker {self.index} restart: {reason}", flush=True)
+        self.kill()
+        self.restarts += 1
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def run_job(self, src, out, fmt, stylesheets, timeout):
+        if not self.alive():
+            if self.proc is not None:
+                self.restart("process exited")
+            self.spawn()
+        try:
+            self.conn.send(("convert", src, out, fmt, list(stylesheets)))
+            if not self.conn.poll(timeout):
+                self.restart(f"job timeout after {timeout}s")
+                raise ConversionTimeout(f"{fmt} conversion exceeded {timeout}s")
+            status, detail = self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.restart(f"worker crashed: {e}")
+            raise ConversionError("converter worker crashed") from e
+        self.jobs += 1
+        self.total_jobs += 1
+        self.last_ok = time.time()
+        if self.jobs >= self.pool.max_jobs_per_worker:
+            self.stop()               # respawned on the next job
+        if status != "ok":
+            raise ConversionError(detail)
+        return detail
+
+    def health_check(self):
+        if self.proc is None:
+            return
+        try:
+            if not self.alive():
+                raise EOFError("process exited")
+            self.conn.send(("ping",))
+            if not self.conn.poll(10):
+                raise EOFError("no pong")
+            _, self.info = self.conn.recv()
+            self.last_ok = time.time()
+        except (EOFError, OSError) as e:
+            self.restart(f"health check failed: {e}")
+
+    def loop(self):
+        q = self.pool._queue
+        while True:
+            try:
+                item = q.get(timeout=self.pool.health_interval_s)
+            except queue.Empty:
+                self.health_check()
+                continue
+            if item is None:
+                self.stop()
+                return
+            future, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.run_job(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "alive": self.alive(),
+            "jobs_on_process": self.jobs,
+            "total_jobs": self.total_jobs,
+            "restarts": self.restarts,
+            "last_ok": self.last_ok,
+            **self.info,
+        }
+
+
+class ConversionPool:
+    """
+    Long-lived converter processes fed from one queue.
+
+    Workers start lazily on their first job (safe under preforking servers).
+    preload_css is a list of CSS texts, or a callable returning one, parsed
+    by every worker at start.
+    """
+
+    def __init__(self, workers=CONVERSION_WORKERS, max_jobs_per_worker=CONVERSION_MAX_JOBS_PER_WORKER,
+                 job_timeout_s=CONVERSION_JOB_TIMEOUT_S, health_interval_s=CONVERSION_HEALTH_INTERVAL_S,
+                 preload_css=()):
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout_s = job_timeout_s
+        self.health_interval_s = health_interval_s
+        self._preload_css = preload_css
+        self._workers = [_Worker(self, i) for i in range(workers)]
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+
+    def preload_css(self):
+        css = self._preload_css() if callable(self._preload_css) else self._preload_css
+        return [c for c in css if c]
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._closed:
+                raise ConversionError("conversion pool is closed")
+            if self._threads:
+                return
+            for w in self._workers:
+                t = threading.Thread(target=w.loop, name=f"convert-{w.index}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            atexit.register(self.close)
+
+    def submit(self, src_path, out_path, fmt, stylesheets=(), timeout=None):
+        """Future resolving to the converter used ("weasyprint", "pandoc-server", ...)."""
+        if fmt not in CONVERSION_FORMATS:
+            raise ConversionError(f"Format not supported: {fmt}")
+        self._ensure_started()
+        future = Future()
+        self._queue.put((future, (src_path, out_path, fmt, tuple(stylesheets),
+                                  timeout or self.job_timeout_s)))
+        return future
+
+    def convert(self, src_path, out_path, fmt, stylesheets=(), timeout=None):
+        """Convert an HTML file to out_path; raises ConversionError / ConversionTimeout."""
+        return self.submit(src_path, out_path, fmt, stylesheets, timeout).result()
+
+    def summary(self):
+        return {
+            "started": bool(self._threads),
+            "queued": self._queue.qsize(),
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            "job_timeout_s": self.job_timeout_s,
+            "workers": [w.to_dict() for w in self._workers],
+        }
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for t in threads:
+            t.join(timeout=15)
+
+
+def convert_cold(src_path, out_path, fmt, stylesheets=()):
+    """The pre-pool path: a fresh process pays imports and font setup for one document."""
+    if fmt in PANDOC_FORMATS:
+        result = subprocess.run(["pandoc", "-f", "html", "-t", _pandoc_target(fmt), "-o", out_path, src_path],
+                                capture_output=True)
+        if result.returncode != 0:
+            raise ConversionError(result.stderr.decode("utf-8", "replace").strip() or "pandoc failed")
+        return
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(list(stylesheets), f)
+    try:
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), "--convert",
+                                 src_path, out_path, fmt, f.name], capture_output=True)
+    finally:
+        os.unlink(f.name)
+    if result.returncode != 0:
+        raise ConversionError(result.stderr.decode("utf-8", "replace").strip()[-500:])
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+_BENCH_CSS = """
+@page { size: A4; margin: 2cm; }
+body { font-family: 'DejaVu Sans', Arial, sans-serif; font-size: 11pt; line-height: 1.5; }
+h1 { color: #1a365d; border-bottom: 2px solid #3182ce; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border: 1px solid #999; padding: 4pt; }
+.footer { border-top: 2pt solid #999; font-size: 8pt; }
+"""
+
+
+def _bench_document(i, rng):
+    words = ["Bescheid", "Antrag", "Verwaltung", "Frist", "Gebühr", "Prüfung",
+             "Genehmigung", "Behörde", "Auftrag", "Nachweis", "governance", "receipt"]
+    parts = [f"<h1>WINDI Benchmark Dokument {i}</h1>"]
+    for s in range(rng.randint(2, 6)):
+        parts.append(f"<h2>Abschnitt {s + 1}</h2>")
+        for _ in range(rng.randint(2, 8)):
+            parts.append("<p>" + " ".join(rng.choice(words) for _ in range(rng.randint(30, 120))) + ".</p>")
+        if rng.random() < 0.5:
+            rows = "".join(f"<tr><td>{r}</td><td>{rng.choice(words)}</td><td>{rng.randint(1, 999)} €</td></tr>"
+                           for r in range(rng.randint(3, 15)))
+            parts.append(f"<table><tr><th>#</th><th>Posten</th><th>Betrag</th></tr>{rows}</table>")
+    parts.append(f'<div class="footer">WINDI-RCPT-BENCH-{i:04d}</div>')
+    return ("<!DOCTYPE html><html><head><meta charset=\"UTF-8\"></head><body>"
+            + "".join(parts) + "</body></html>")
+
+
+def _available_formats():
+    formats = []
+    try:
+        import weasyprint  # noqa: F401
+        formats.append("pdf")
+    except ImportError:
+        pass
+    if shutil.which("pandoc"):
+        formats.append("docx")
+    return formats or ["html"]
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def _timings(ms, elapsed):
+    return {
+        "p50_ms": round(_percentile(ms, 50), 2),
+        "p99_ms": round(_percentile(ms, 99), 2),
+        "mean_ms": round(sum(ms) / len(ms), 2) if ms else 0,
+        "docs_per_s": round(len(ms) / elapsed, 1) if elapsed else 0,
+    }
+
+
+def _benchmark(documents=40, formats=None, workers=CONVERSION_WORKERS):
+    """
+    Converts a generated corpus sequentially, once with a cold process per
+    document (the old export path) and once through a warm pool.
+    Only formats whose converter is installed are measured; with none,
+    "html" measures the process and pool overhead alone.
+    """
+    import random
+    rng = random.Random(11)
+    formats = formats or _available_formats()
+    workdir = tempfile.mkdtemp(prefix="windi-convert-bench-")
+    corpus = []
+    for i in range(documents):
+        path = os.path.join(workdir, f"doc{i:04d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_bench_document(i, rng))
+        corpus.append(path)
+
+    report = {"documents": documents, "workers": workers, "formats": {}}
+    pool = ConversionPool(workers=workers, preload_css=[_BENCH_CSS])
+    try:
+        t0 = time.perf_counter()
+        warmup = [pool.submit(corpus[0], f"{corpus[0]}.warmup{i}", "html") for i in range(workers)]
+        for future in warmup:
+            future.result()
+        report["pool_start_s"] = round(time.perf_counter() - t0, 3)
+        for fmt in formats:
+            entry = {}
+            for mode in ("cold", "warm"):
+                ms = []
+                started = time.perf_counter()
+                for path in corpus:
+                    out = f"{path}.{mode}.{fmt}"
+                    t = time.perf_counter()
+                    if mode == "cold":
+                        convert_cold(path, out, fmt, [_BENCH_CSS])
+                    else:
+                        pool.convert(path, out, fmt, [_BENCH_CSS])
+                    ms.append((time.perf_counter() - t) * 1000)
+                entry[mode] = _timings(ms, time.perf_counter() - started)
+            if entry["warm"]["mean_ms"]:
+                entry["speedup"] = round(entry["cold"]["mean_ms"] / entry["warm"]["mean_ms"], 1)
+            report["formats"][fmt] = entry
+        report["pool"] = pool.summary()
+    finally:
+        pool.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="WINDI conversion pool")
+    parser.add_argument("--worker", type=int, metavar="FD", help=argparse.SUPPRESS)
+    parser.add_argument("--convert", nargs=4, metavar=("SRC", "OUT", "FMT", "CSS_JSON"),
+                        help=argparse.SUPPRESS)
+    parser.add_argument("--bench", action="store_true", help="run the cold vs warm conversion benchmark")
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--formats", help="comma-separated, default: every installed converter")
+    parser.add_argument("--workers", type=int, default=CONVERSION_WORKERS)
+    args = parser.parse_args()
+    if args.worker is not None:
+        _worker_main(args.worker)
+    elif args.convert:
+        src, out, fmt, css_json = args.convert
+        with open(css_json, encoding="utf-8") as f:
+            sheets = json.load(f)
+        converter = _Converter(warm=False)
+        try:
+            converter.convert(src, out, fmt, sheets)
+        finally:
+            converter.close()
+    elif args.bench:
+        formats = args.formats.split(",") if args.formats else None
+        print(json.dumps(_benchmark(args.documents, formats, args.workers), indent=2))
+    else:
+        parser.print_help()
@@ -0,0 +1,615 @@
+"""
+WINDI Export Cache v1.0 — content-addressed exports for a4Desk BABEL
+=====================================================================
+Created: 16 Oct 2026
+
+Before: every click on "export" re-rendered the ISP template, ran
+WeasyPrint or pandoc, rebuilt the WINDI envelope and re-embedded the
+print watermark inside the Flask request thread.
+
+Now:
+  + ExportCache: finished exports on disk, keyed by
+    sha256(content + ISP profile + format + watermark params), LRU-evicted
+    by total size across all worker processes; a hit is a file open
+  + ExportJobQueue: cold exports run on a bounded worker pool with job IDs,
+    status polling and cancellation from any worker; identical in-flight
+    exports share one job
+
+Layout (one directory, shared by all worker processes):
+    <key>.<fmt>    rendered file (written via rename, never partially visible)
+    <key>.json     metadata (title, mimetype, envelope, governance stats)
+    index.db       SQLite (WAL): LRU sizes/recency and export job state
+
+Benchmark (synthetic renderer, or a running server with --url):
+    python export_cache.py --bench [--clients 8] [--requests 400] [--render-ms 250]
+
+"AI processes. Human decides. WINDI guarantees."
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# ═══════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════
+
+EXPORT_CACHE_DIR = os.environ.get("WINDI_EXPORT_CACHE_DIR", "/opt/windi/data/export_cache")
+EXPORT_CACHE_MAX_BYTES = 512 * 1024 * 1024   # LRU budget for rendered files
+EXPORT_WORKERS = 2                            # concurrent WeasyPrint/pandoc renders
+EXPORT_QUEUE_MAX = 32                         # queued + running jobs before 503
+EXPORT_JOB_RETENTION_S = 600                  # finished jobs kept for polling
+EXPORT_SYNC_WAIT_S = 60                       # GET export waits this long before answering 202
+EXPORT_JOB_POLL_S = 0.1                       # waiting on another worker's job polls the index
+EXPORT_INDEX_NAME = "index.db"                # cache LRU + export jobs, shared by all workers
+
+
+def export_cache_key(parts):
+    """sha256 over a JSON-serializable description of everything that shapes the output."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════
+# SHARED INDEX — one SQLite file next to the cached exports
+# ═══════════════════════════════════════════════════════════════
+
+_INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS exports (
+        key TEXT PRIMARY KEY,
+        fmt TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_exports_lru ON exports(last_used);
+    CREATE TABLE IF NOT EXISTS export_jobs (
+        id TEXT PRIMARY KEY,
+        key TEXT NOT NULL,
+        label TEXT,
+        status TEXT NOT NULL,
+        error TEXT,
+        cancel_requested INTEGER NOT NULL DEFAULT 0,
+        owner TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_export_jobs_key ON export_jobs(key, status);
+    CREATE INDEX IF NOT EXISTS idx_export_jobs_finished ON export_jobs(finished_at);
+"""
+
+
+class _ExportIndex:
+    """Per-thread connections to the index database shared by all worker processes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self.conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_INDEX_SCHEMA)
+
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def transaction(self, fn):
+        conn = self.conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+# ═══════════════════════════════════════════════════════════════
+# ON-DISK LRU
+# ═══════════════════════════════════════════════════════════════
+
+class CachedExport:
+    __slots__ = ("key", "path", "meta")
+
+    def __init__(self, key, path, meta):
+        self.key = key
+        self.path = path
+        self.meta = meta
+
+
+class ExportCache:
+    """
+    Rendered exports on disk with a size-bounded LRU.
+
+    Sizes and recency live in the shared index (exports table), so every
+    worker process evicts against the same budget and a hit in one
+    process refreshes the entry for all of them. Hit/miss counters in
+    stats are per process.
+    """
+
+    def __init__(self, directory=EXPORT_CACHE_DIR, max_bytes=EXPORT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, EXPORT_INDEX_NAME)
+        self.index = _ExportIndex(self.db_path)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._load()
+
+    def _paths(self, key, fmt):
+        return (os.path.join(self.directory, f"{key}.{fmt}"),
+                os.path.join(self.directory, f"{key}.json"))
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
+
+    def _load(self):
+        """Index files cached before the index existed (first open only)."""
+        def scan(conn):
+            if conn.execute("SELECT 1 FROM exports LIMIT 1").fetchone():
+                return
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                key = name[:-5]
+                try:
+                    with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                        fmt = json.load(f)["fmt"]
+                    st = os.stat(self._paths(key, fmt)[0])
+                except (OSError, ValueError, KeyError):
+                    continue
+                conn.execute("INSERT OR IGNORE INTO exports (key, fmt, size, last_used) VALUES (?, ?, ?, ?)",
+                             (key, fmt, st.st_size, st.st_mtime))
+        self.index.transaction(scan)
+
+    def get(self, key):
+        conn = self.index.conn()
+        row = conn.execute("SELECT fmt FROM exports WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        path, meta_path = self._paths(key, row["fmt"])
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+        except (OSError, ValueError):
+            # Evicted by another process (or damaged): forget it
+            conn.execute("DELETE FROM exports WHERE key = ?", (key,))
+            self._count("misses")
+            return None
+        conn.execute("UPDATE exports SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        return CachedExport(key, path, meta)
+
+    def put(self, key, src_path, fmt, meta):
+        """Move a rendered file into the cache (atomic rename) and evict down to budget."""
+        path, meta_path = self._paths(key, fmt)
+        meta = dict(meta, fmt=fmt, stored_at=time.time())
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        shutil.move(src_path, tmp)           # rename when on the same filesystem
+        os.replace(tmp, path)
+        tmp_meta = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+        size = os.path.getsize(path)
+
+        def store(conn):
+            conn.execute("INSERT OR REPLACE INTO exports (key, fmt, size, last_used) VALUES (?, ?, ?, ?)",
+                         (key, fmt, size, time.time()))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM exports").fetchone()[0]
+            evicted = []
+            for old in conn.execute("SELECT key, fmt, size FROM exports WHERE key != ? ORDER BY last_used",
+                                    (key,)).fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM exports WHERE key = ?", (old["key"],))
+                total -= old["size"]
+                evicted.append((old["key"], old["fmt"]))
+            return evicted
+
+        evicted = self.index.transaction(store)
+        for old_key, old_fmt in evicted:
+            for p in self._paths(old_key, old_fmt):
+                try:
+                    os.unlink(p)
+                except FileNotFoundError:
+                    pass
+        self._count("stores")
+        self._count("evictions", len(evicted))
+        return CachedExport(key, path, meta)
+
+    def summary(self):
+        entries, total = self.index.conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM exports").fetchone()
+        with self._lock:
+            return dict(self.stats, entries=entries, bytes=total, max_bytes=self.max_bytes)
+
+
+# ═══════════════════════════════════════════════════════════════
+# BACKGROUND EXPORT JOBS
+# ═══════════════════════════════════════════════════════════════
+
+class ExportCancelled(Exception):
+    pass
+
+
+_JOB_ACTIVE = ("queued", "running")
+
+
+class ExportJob:
+    """
+    One cold export, as seen by this process. Jobs rendered here carry the
+    result and a local done event; jobs of other workers are read from the
+    shared index. The render function calls check_cancelled() between
+    stages, which sees a cancel requested from any worker.
+    """
+
+    def __init__(self, queue, row, local=False):
+        self._queue = queue
+        self.id = row["id"]
+        self.key = row["key"]
+        self.result = None            # CachedExport when done
+        self._done = threading.Event() if local else None
+        self._update(row)
+
+    def _update(self, row):
+        self.label = row["label"] or ""
+        self.status = row["status"]   # queued, running, done, failed, cancelled
+        self.error = row["error"]
+        self.created_at = row["created_at"]
+        self.started_at = row["started_at"]
+        self.finished_at = row["finished_at"]
+
+    def check_cancelled(self):
+        if self.cancel_requested:
+            raise ExportCancelled(self.id)
+
+    @property
+    def cancel_requested(self):
+        return self._queue._cancel_requested(self.id)
+
+    def wait(self, timeout=None):
+        if self._done is not None:
+            return self._done.wait(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._queue._refresh(self)
+            if self.status not in _JOB_ACTIVE:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(EXPORT_JOB_POLL_S)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "label": self.label,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ExportJobQueue:
+    """
+    Bounded worker pool for cold exports, with in-flight de-duplication by
+    cache key. Job state lives in the cache's shared index, so status,
+    download and cancel work from any worker process, identical exports
+    coalesce across processes, and max_pending bounds the deployment.
+    Each process renders the jobs it accepted on its own pool.
+    """
+
+    def __init__(self, cache, workers=EXPORT_WORKERS, max_pending=EXPORT_QUEUE_MAX,
+                 retention_s=EXPORT_JOB_RETENTION_S):
+        self.cache = cache
+        self.index = cache.index
+        self.max_pending = max_pending
+        self.retention_s = retention_s
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._local = {}         # job_id -> ExportJob rendered by this process
+        self.stats = {"submitted": 0, "coalesced": 0, "rejected": 0,
+                      "done": 0, "failed": 0, "cancelled": 0}
+
+    def _owner_alive(self, owner):
+        host, _, pid = owner.rpartition(":")
+        if host != socket.gethostname():
+            return True                       # cannot tell; trust the other host
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, ValueError):
+            pass
+        return True
+
+    def _reap(self, conn, now):
+        """Drop expired finished jobs; fail active jobs whose worker process died."""
+        conn.execute("DELETE FROM export_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                     (now - self.retention_s,))
+        for row in conn.execute("SELECT id, owner FROM export_jobs WHERE status IN (?, ?)",
+                                _JOB_ACTIVE).fetchall():
+            if row["owner"] != self.owner and not self._owner_alive(row["owner"]):
+                conn.execute("UPDATE export_jobs SET status = 'failed', error = ?, finished_at = ? "
+                             "WHERE id = ?", ("export worker exited", now, row["id"]))
+
+    def submit(self, key, render, label=""):
+        """
+        Queue render(job) -> CachedExport for key. Returns the job (an
+        existing one if the same export is already in flight in any worker),
+        or None when the queue is full.
+        """
+        now = time.time()
+
+        def enqueue(conn):
+            self._reap(conn, now)
+            row = conn.execute(
+                "SELECT * FROM export_jobs WHERE key = ? AND status IN (?, ?) AND cancel_requested = 0 "
+                "ORDER BY created_at DESC LIMIT 1", (key, *_JOB_ACTIVE)).fetchone()
+            if row is not None:
+                return "coalesced", row
+            inflight = conn.execute(
+                "SELECT COUNT(*) FROM export_jobs WHERE status IN (?, ?) AND cancel_requested = 0",
+                _JOB_ACTIVE).fetchone()[0]
+            if inflight >= self.max_pending:
+                return "rejected", None
+            job_id = f"EXP-{uuid.uuid4().hex[:16]}"
+            conn.execute("INSERT INTO export_jobs (id, key, label, status, owner, created_at) "
+                         "VALUES (?, ?, ?, 'queued', ?, ?)", (job_id, key, label, self.owner, now))
+            return "submitted", conn.execute("SELECT * FROM export_jobs WHERE id = ?", (job_id,)).fetchone()
+
+        outcome, row = self.index.transaction(enqueue)
+        with self._lock:
+            self._prune_local()
+            self.stats[outcome] += 1
+            if outcome == "rejected":
+                return None
+            if outcome == "coalesced":
+                return self._local.get(row["id"]) or ExportJob(self, row)
+            job = ExportJob(self, row, local=True)
+            self._local[job.id] = job
+        self._executor.submit(self._run, job, render)
+        return job
+
+    def _set(self, job, **fields):
+        for name, value in fields.items():
+            setattr(job, name, value)
+        self.index.conn().execute(
+            f"UPDATE export_jobs SET {', '.join(f'{n} = ?' for n in fields)} WHERE id = ?",
+            (*fields.values(), job.id))
+
+    def _run(self, job, render):
+        status, error = "failed", None
+        try:
+            job.check_cancelled()
+            self._set(job, status="running", started_at=time.time())
+            job.result = render(job)
+            status = "done"
+        except ExportCancelled:
+            status = "cancelled"
+        except Exception as e:
+            error = str(e)
+            print(f"[EXPORT] Job {job.id} failed: {e}", flush=True)
+        finally:
+            try:
+                self._set(job, status=status, error=error, finished_at=time.time())
+            finally:
+                with self._lock:
+                    self.stats[status] += 1
+                job._done.set()
+
+    def _cancel_requested(self, job_id):
+        row = self.index.conn().execute(
+            "SELECT cancel_requested FROM export_jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def _refresh(self, job):
+        row = self.index.conn().execute("SELECT * FROM export_jobs WHERE id = ?", (job.id,)).fetchone()
+        if row is not None:
+            job._update(row)
+            if job.status == "done" and job.result is None:
+                job.result = self.cache.get(job.key)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._local.get(job_id)
+        if job is not None:
+            return job
+        row = self.index.conn().execute("SELECT * FROM export_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = ExportJob(self, row)
+        if job.status == "done":
+            job.result = self.cache.get(job.key)
+        return job
+
+    def cancel(self, job_id):
+        """Request cancellation; True if the job had not finished yet."""
+        def request(conn):
+            return conn.execute(
+                "UPDATE export_jobs SET cancel_requested = 1 WHERE id = ? AND status IN (?, ?)",
+                (job_id, *_JOB_ACTIVE)).rowcount > 0
+        # A new request for the same key starts fresh (cancelled jobs never coalesce)
+        return self.index.transaction(request)
+
+    def _prune_local(self):
+        cutoff = time.time() - self.retention_s
+        for job_id in [j.id for j in self._local.values()
+                       if j.finished_at is not None and j.finished_at < cutoff]:
+            del self._local[job_id]
+
+    def summary(self):
+        conn = self.index.conn()
+        inflight = conn.execute("SELECT COUNT(*) FROM export_jobs WHERE status IN (?, ?)",
+                                _JOB_ACTIVE).fetchone()[0]
+        tracked = conn.execute("SELECT COUNT(*) FROM export_jobs").fetchone()[0]
+        with self._lock:
+            self._prune_local()
+            return dict(self.stats, inflight=inflight, tracked=tracked, local=len(self._local))
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def _percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def _benchmark(clients=8, requests=400, documents=20, render_ms=250.0, url=None, doc_ids=None):
+    """
+    Concurrent export load: `clients` threads issue `requests` exports spread
+    over `documents` distinct documents (first touch of each is cold).
+
+    Without url, the request path of the Flask handler is reproduced against
+    a synthetic renderer that sleeps render_ms; with url (e.g.
+    http://127.0.0.1:8085/api/document/{doc}/export/pdf and doc_ids)
+    a running server is measured end to end.
+    """
+    import random
+    from urllib.request import urlopen
+
+    latencies = []
+    lock = threading.Lock()
+    if doc_ids:
+        documents = len(doc_ids)
+    rng = random.Random(7)
+    plan = [rng.randrange(documents) for _ in range(requests)]
+
+    if url is None:
+        cache = ExportCache(tempfile.mkdtemp(prefix="windi-export-bench-"))
+        jobs = ExportJobQueue(cache)
+
+        def render(job, doc):
+            time.sleep(render_ms / 1000)
+            job.check_cancelled()
+            fd, path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                f.write(os.urandom(64 * 1024))
+            return cache.put(job.key, path, "pdf", {"title": f"doc-{doc}"})
+
+        def export(doc):
+            key = export_cache_key({"doc": doc, "fmt": "pdf"})
+            hit = cache.get(key)
+            if hit is None:
+                job = jobs.submit(key, lambda job: render(job, doc))
+                job.wait(EXPORT_SYNC_WAIT_S)
+                hit = job.result
+            with open(hit.path, "rb") as f:
+                f.read()
+
+        def export_uncached(doc):
+            # The pre-cache path: every request renders, EXPORT_WORKERS at a time
+            with uncached_slots:
+                time.sleep(render_ms / 1000)
+                fd, path = tempfile.mkstemp(suffix=".pdf")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(os.urandom(64 * 1024))
+            with open(path, "rb") as f:
+                f.read()
+            os.unlink(path)
+
+        uncached_slots = threading.Semaphore(EXPORT_WORKERS)
+    else:
+        def export(doc):
+            with urlopen(url.format(doc=doc_ids[doc] if doc_ids else doc), timeout=120) as resp:
+                resp.read()
+
+    def run(fn, items_plan):
+        latencies.clear()
+
+        def client(items):
+            for doc in items:
+                t0 = time.perf_counter()
+                fn(doc)
+                dt = time.perf_counter() - t0
+                with lock:
+                    latencies.append((doc, dt))
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(items_plan[i::clients],)) for i in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - started
+
+    baseline = None
+    if url is None:
+        # Measured on a sample: the uncached path is slow by construction
+        sample = plan[:max(clients, min(len(plan), 40))]
+        uncached_s = run(export_uncached, sample)
+        baseline = {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / uncached_s, 1) if uncached_s else 0,
+            "p50_ms": round(_percentile([dt * 1000 for _, dt in latencies], 50), 2),
+            "note": f"measured: every request renders ({render_ms} ms) on {EXPORT_WORKERS} workers",
+        }
+    elapsed = run(export, plan)
+
+    ms = [dt * 1000 for _, dt in latencies]
+    report = {
+        "mode": "synthetic" if url is None else url,
+        "clients": clients,
+        "requests": len(ms),
+        "documents": documents,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ms) / elapsed, 1) if elapsed else 0,
+        "latency_ms": {
+            "p50": round(_percentile(ms, 50), 2),
+            "p99": round(_percentile(ms, 99), 2),
+            "max": round(max(ms), 2) if ms else 0,
+        },
+    }
+    if url is None:
+        report["baseline_uncached"] = baseline
+        report["cache"] = cache.summary()
+        report["jobs"] = jobs.summary()
+        shutil.rmtree(cache.directory, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="WINDI export cache")
+    parser.add_argument("--bench", action="store_true", help="run the export latency benchmark")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--render-ms", type=float, default=250.0,
+                        help="synthetic render time per cold export")
+    parser.add_argument("--url", help="live export URL template with {doc}, e.g. "
+                        "http://127.0.0.1:8085/api/document/{doc}/export/pdf")
+    parser.add_argument("--docs", help="comma-separated document ids for --url")
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+    else:
+        doc_ids = args.docs.split(",") if args.docs else None
+        print(json.dumps(_benchmark(args.clients, args.requests, args.documents,
+                                    args.render_ms, args.url, doc_ids), indent=2))
@@ -1,8 +1,20 @@
 """
-WINDI Governance Bridge v1.1 — a4Desk BABEL → Governance API
+WINDI Governance Bridge v1.2 — a4Desk BABEL → Governance API
 =============================================================
 Created: 05 Feb 2026
-Updated: 05 Feb 2026 (v1.1 — Architect Dragon review)
+Updated: 16 Oct 2026 (v1.2 — durable outbox)
+
+v1.2 Changes:
+  + Finalize only writes to a SQLite outbox (no network, no sleep)
+  + Background dispatcher: token-bucket rate limit, batched POSTs to
+    /api/generate-batch, exponential backoff with jitter; every worker
+    starts one, but only the holder of the outbox lease row delivers
+  + Correlation IDs drawn from a shared per-day sequence (unique across
+    worker processes and restarts) and sent as the API idempotency key
+  + Failed submissions are retried, not only logged
+  + Structured evidence store (append-only SQLite, indexed by correlation
+    ID, doc_id, event and time, with trigger-maintained counters): stats
+    and audit queries no longer scan the rotating text log
 
 v1.1 Changes:
   + Dedicated log: /var/log/windi/governance_bridge.log
@@ -13,7 +25,7 @@ v1.1 Changes:
 
 Safety:
   - Bridge errors NEVER break BABEL finalize
-  - If Governance API is down, BABEL still works
+  - If Governance API is down, BABEL still works — submissions wait in the outbox
   - Failed attempts are EVIDENCE of governance intent
 
 "AI processes. Human decides. WINDI guarantees."
@@ -24,21 +36,36 @@ import hashlib
 import logging
 import logging.handlers
 import os
+import random
+import re
+import socket
+import sqlite3
 import time
 import threading
 from datetime import datetime, timezone
 from urllib.request import Request, urlopen
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 
 # ═══════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════
 
 GOVERNANCE_API_URL = "http://127.0.0.1:8080/api/generate"
-BRIDGE_VERSION = "1.1.0"
+GOVERNANCE_BATCH_URL = "http://127.0.0.1:8080/api/generate-batch"
+BRIDGE_VERSION = "1.2.0"
 TIMEOUT_SECONDS = 10
-THROTTLE_SECONDS = 0.2  # Flood protection: min 200ms between submits
-LOG_DIR = "/var/log/windi"
+RATE_LIMIT_PER_SECOND = 5.0  # Flood protection: 5 POSTs/s sustained ...
+RATE_LIMIT_BURST = 5         # ... with bursts of up to 5 (one dispatcher holds the lease,
+                             # so this is the limit for all BABEL workers together)
+BATCH_SIZE = 20              # submissions per POST
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 300.0
+OUTBOX_MAX_ATTEMPTS = 50     # ~4h of retries at the backoff cap, then "dead"
+OUTBOX_POLL_SECONDS = 1.0
+DISPATCHER_LEASE_SECONDS = 3 * TIMEOUT_SECONDS  # renewed before every POST
+OUTBOX_DB_PATH = os.environ.get("WINDI_BRIDGE_OUTBOX_DB", "/opt/windi/data/governance_outbox.db")
+EVIDENCE_DB_PATH = os.environ.get("WINDI_BRIDGE_EVIDENCE_DB", "/opt/windi/data/governance_evidence.db")
+LOG_DIR = os.environ.get("WINDI_BRIDGE_LOG_DIR", "/var/log/windi")
 LOG_FILE = os.path.join(LOG_DIR, "governance_bridge.log")
 LOG_MAX_BYTES = 5 * 1024 * 1024  # 5MB per file
 LOG_BACKUP_COUNT = 5  # Keep 5 rotated logs
@@ -58,6 +85,16 @@ except PermissionError:
     LOG_DIR = "/tmp"
     LOG_FILE = os.path.join(LOG_DIR, "governance_bridge.log")
 
+try:
+    os.makedirs(os.path.dirname(OUTBOX_DB_PATH), exist_ok=True)
+except PermissionError:
+    OUTBOX_DB_PATH = "/tmp/governance_outbox.db"
+
+try:
+    os.makedirs(os.path.dirname(EVIDENCE_DB_PATH), exist_ok=True)
+except PermissionError:
+    EVIDENCE_DB_PATH = "/tmp/governance_evidence.db"
+
 # File handler with rotation (THE governance evidence file)
 try:
     _file_handler = logging.handlers.RotatingFileHandler(
@@ -81,160 +118,769 @@ _console_handler.setFormatter(logging.Formatter(
 _bridge_logger.addHandler(_console_handler)
 
 # ═══════════════════════════════════════════════════════════════
-# THROTTLE — Prevent flood (governance must be stable, not nervous)
+# EVIDENCE STORE — Structured, append-only, indexed
+# The text log stays for humans; audit queries and stats read this.
 # ═══════════════════════════════════════════════════════════════
 
-_last_submit_time = 0.0
-_throttle_lock = threading.Lock()
+_EVIDENCE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS evidence (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts REAL NOT NULL,
+        event TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        correlation_id TEXT,
+        doc_id TEXT,
+        receipt_id TEXT,
+        governance_level TEXT,
+        reason TEXT,
+        submission_id TEXT,
+        attempt INTEGER,
+        elapsed_ms INTEGER,
+        message TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_evidence_corr ON evidence(correlation_id);
+    CREATE INDEX IF NOT EXISTS idx_evidence_doc ON evidence(doc_id);
+    CREATE INDEX IF NOT EXISTS idx_evidence_event ON evidence(event);
+    CREATE INDEX IF NOT EXISTS idx_evidence_ts ON evidence(ts);
+    CREATE TABLE IF NOT EXISTS evidence_counters (
+        event TEXT PRIMARY KEY,
+        n INTEGER NOT NULL
+    );
+    CREATE TRIGGER IF NOT EXISTS evidence_count AFTER INSERT ON evidence BEGIN
+        INSERT INTO evidence_counters (event, n) VALUES (NEW.event, 1)
+        ON CONFLICT(event) DO UPDATE SET n = n + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS evidence_no_update BEFORE UPDATE ON evidence BEGIN
+        SELECT RAISE(ABORT, 'governance evidence is append-only');
+    END;
+    CREATE TRIGGER IF NOT EXISTS evidence_no_delete BEFORE DELETE ON evidence BEGIN
+        SELECT RAISE(ABORT, 'governance evidence is append-only');
+    END;
+"""
 
-# ═══════════════════════════════════════════════════════════════
-# CORRELATION ID GENERATOR
-# Chain of custody: Document → Bridge → API → Ledger → War Room
-# ═══════════════════════════════════════════════════════════════
+_EVIDENCE_FIELDS = ("correlation_id", "doc_id", "receipt_id", "governance_level",
+                    "reason", "submission_id", "attempt", "elapsed_ms")
 
-_daily_counter = 0
-_daily_counter_date = ""
-_counter_lock = threading.Lock()
+_LOG_LINE = re.compile(r"^\[(?P<ts>[\d\- :]+)\] \[BRIDGE\] \[(?P<severity>\w+)\] (?P<message>.*)$")
+_LOG_FIELD = re.compile(r'(\w+)=("[^"]*"|\S+)')
+_LOG_FIELD_NAMES = {"corr": "correlation_id", "doc_id": "doc_id", "receipt": "receipt_id",
+                    "level": "governance_level", "reason": "reason", "submission": "submission_id",
+                    "attempt": "attempt", "elapsed": "elapsed_ms"}
 
 
-def _generate_correlation_id():
+class EvidenceLog:
     """
-    Generate unique Bridge Correlation ID.
-    Format: GBR-BRIDGE-YYYYMMDD-XXXX (sequential per day, resets at midnight UTC)
+    Every bridge event as a row; counters kept by a trigger in the same
+    transaction, so stats are one primary-key read however long the
+    history gets. Updates and deletes are refused by triggers.
     """
-    global _daily_counter, _daily_counter_date
 
-    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    def __init__(self, db_path=EVIDENCE_DB_PATH, import_from=None):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Every BABEL worker opens the store at startup: the "first open"
+        # check, the schema and the text-log import share one write lock, and
+        # the import_marker row makes the import happen exactly once. Stores
+        # created before the marker existed are marked without importing.
+        try:
+            conn.executescript("""
+                BEGIN IMMEDIATE;
+                CREATE TABLE IF NOT EXISTS evidence_meta (key TEXT PRIMARY KEY, value TEXT);
+                INSERT OR IGNORE INTO evidence_meta (key, value)
+                    SELECT 'import_marker', 'pre-existing store'
+                    WHERE EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'evidence');
+            """ + _EVIDENCE_SCHEMA)
+            imported = 0
+            if not conn.execute("SELECT 1 FROM evidence_meta WHERE key = 'import_marker'").fetchone():
+                records = self._read_log_files(import_from) if import_from else []
+                self._insert(conn, records)
+                imported = len(records)
+                conn.execute("INSERT INTO evidence_meta (key, value) VALUES ('import_marker', ?)",
+                             (json.dumps({"from": import_from, "lines": imported, "at": time.time()}),))
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        if imported:
+            _bridge_logger.info(f"EVIDENCE_IMPORT lines={imported} from={import_from}*")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, records):
+        """Insert records (dicts with event, severity, message, optional fields) in one transaction."""
+        conn = self._conn()
+        with conn:
+            self._insert(conn, records)
+
+    @staticmethod
+    def _insert(conn, records):
+        rows = [(r.get("ts") or time.time(), r["event"], r.get("severity", "INFO"),
+                 *(r.get(f) for f in _EVIDENCE_FIELDS), r["message"]) for r in records]
+        conn.executemany(f"""
+            INSERT INTO evidence (ts, event, severity, {", ".join(_EVIDENCE_FIELDS)}, message)
+            VALUES (?, ?, ?, {", ".join("?" * len(_EVIDENCE_FIELDS))}, ?)
+        """, rows)
+
+    def query(self, correlation_id=None, doc_id=None, event=None, since=None, until=None, limit=50):
+        """Newest-first records matching all given filters (since/until: epoch seconds)."""
+        where, args = [], []
+        for column, value in (("correlation_id", correlation_id), ("doc_id", doc_id), ("event", event)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if since is not None:
+            where.append("ts >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("ts < ?")
+            args.append(until)
+        sql = "SELECT * FROM evidence"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._conn().execute(sql + " ORDER BY id DESC LIMIT ?", (*args, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+    def counters(self):
+        return {event: n for event, n in self._conn().execute("SELECT event, n FROM evidence_counters")}
+
+    def import_log_files(self, log_file):
+        """Import the rotating text log, oldest backup first; returns lines imported."""
+        records = self._read_log_files(log_file)
+        if records:
+            self.append(records)
+        return len(records)
+
+    @classmethod
+    def _read_log_files(cls, log_file):
+        paths = [f"{log_file}.{i}" for i in range(LOG_BACKUP_COUNT, 0, -1)] + [log_file]
+        records = []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        record = cls._parse_log_line(line.rstrip("\n"))
+                        if record:
+                            records.append(record)
+            except OSError:
+                continue
+        return records
+
+    @staticmethod
+    def _parse_log_line(line):
+        m = _LOG_LINE.match(line)
+        if not m:
+            return None
+        message = m.group("message")
+        record = {
+            # logging.Formatter writes asctime in local time
+            "ts": time.mktime(time.strptime(m.group("ts"), "%Y-%m-%d %H:%M:%S")),
+            "event": message.split(" ", 1)[0],
+            "severity": m.group("severity"),
+            "message": message,
+        }
+        for key, value in _LOG_FIELD.findall(message):
+            field = _LOG_FIELD_NAMES.get(key)
+            if field:
+                value = value.strip('"')
+                if field in ("attempt", "elapsed_ms"):
+                    value = int(re.sub(r"\D", "", value) or 0)
+                record[field] = value
+        return record
+
+
+_evidence_log = None
+_evidence_lock = threading.Lock()
+
+
+def get_evidence_log():
+    global _evidence_log
+    with _evidence_lock:
+        if _evidence_log is None:
+            # First open carries over the history already in the rotating text log
+            _evidence_log = EvidenceLog(EVIDENCE_DB_PATH, import_from=LOG_FILE)
+        return _evidence_log
+
 
-    with _counter_lock:
-        if today != _daily_counter_date:
-            _daily_counter = 0
-            _daily_counter_date = today
-        _daily_counter += 1
-        seq = _daily_counter
+def _evidence(records):
+    """
+    Write bridge events to the text log and the evidence store.
+    records: dicts with event, severity (logging level name), message and
+    indexed fields. The store never breaks the bridge.
+    """
+    try:
+        store = get_evidence_log()   # opened first: its one-time log import must not see these lines
+    except Exception as e:
+        store = None
+        _bridge_logger.error(f"EVIDENCE_ERROR events={len(records)} error=\"{e}\"")
+    for r in records:
+        _bridge_logger.log(getattr(logging, r["severity"]), r["message"])
+    if store is None:
+        return
+    try:
+        store.append(records)
+    except Exception as e:
+        _bridge_logger.error(f"EVIDENCE_ERROR events={len(records)} error=\"{e}\"")
 
-    return f"GBR-BRIDGE-{today}-{seq:04d}"
+
+def _event(event, severity, message, **fields):
+    return dict(fields, event=event, severity=severity, message=f"{event} {message}")
 
 
 # ═══════════════════════════════════════════════════════════════
-# MAIN SUBMIT FUNCTION
+# TOKEN BUCKET — Rate limit (governance must be stable, not nervous)
 # ═══════════════════════════════════════════════════════════════
 
-def submit_to_governance(doc_id, content_text, language, author_data,
-                         witness_data, receipt, domain_tag="operational",
-                         governance_level=None):
+class TokenBucket:
+    """
+    rate tokens/s, up to capacity. acquire() reserves under the lock and
+    sleeps outside it, so callers never queue up behind a sleeping holder.
     """
-    Submit a finalized document to the Governance API.
 
-    NEVER raises exceptions — BABEL must not break.
-    Failed attempts are logged as governance evidence (intent proof).
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping if the bucket is short; returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
 
-    Returns:
-        dict with submission result + correlation_id, or None on failure
+
+# ═══════════════════════════════════════════════════════════════
+# OUTBOX — Durable queue between BABEL finalize and the Governance API
+# Chain of custody: Document → Outbox → Bridge → API → Ledger → War Room
+# ═══════════════════════════════════════════════════════════════
+
+_OUTBOX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        correlation_id TEXT NOT NULL UNIQUE,
+        doc_id TEXT,
+        receipt_id TEXT,
+        governance_level TEXT,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        created_at TEXT NOT NULL,
+        delivered_at TEXT,
+        submission_id TEXT,
+        last_error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+    CREATE INDEX IF NOT EXISTS idx_outbox_doc ON outbox(doc_id);
+    CREATE TABLE IF NOT EXISTS correlation_seq (
+        day TEXT PRIMARY KEY,
+        seq INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS dispatcher_lease (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+"""
+
+
+def _backoff(attempts):
+    """Exponential backoff with jitter for the given attempt number (1-based)."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)))
+    return delay * (0.5 + random.random() / 2)
+
+
+class GovernanceOutbox:
     """
-    correlation_id = _generate_correlation_id()
-    start_time = time.time()
+    SQLite (WAL) outbox shared by every BABEL worker process.
 
-    try:
-        # ─── THROTTLE ─────────────────────────────────────────
-        global _last_submit_time
-        with _throttle_lock:
-            elapsed = time.time() - _last_submit_time
-            if elapsed < THROTTLE_SECONDS:
-                wait = THROTTLE_SECONDS - elapsed
-                _bridge_logger.debug(
-                    f"THROTTLE doc_id={doc_id} corr={correlation_id} "
-                    f"wait={wait:.3f}s"
-                )
-                time.sleep(wait)
-            _last_submit_time = time.time()
+    Rows: pending → delivered | rejected (API blocked it) | dead (gave up
+    after OUTBOX_MAX_ATTEMPTS; retry_dead() puts them back). A claim pushes
+    next_attempt_at forward by a lease, so rows of a crashed dispatcher
+    simply become due again.
+    """
 
-        # ─── AUTO-DETECT LEVEL ─────────────────────────────────
-        if governance_level is None:
-            governance_level = _detect_level(domain_tag, content_text)
+    def __init__(self, db_path=OUTBOX_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_OUTBOX_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, build_payload, doc_id, receipt_id, governance_level):
+        """
+        Insert one submission. build_payload(correlation_id) returns the
+        payload; the correlation ID (GBR-BRIDGE-YYYYMMDD-XXXX) is drawn from
+        a per-day sequence in the same transaction, so it is unique across
+        processes and restarts. Returns the correlation ID.
+        """
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+
+        def insert(conn):
+            conn.execute("""
+                INSERT INTO correlation_seq (day, seq) VALUES (?, 1)
+                ON CONFLICT(day) DO UPDATE SET seq = seq + 1
+            """, (day,))
+            seq = conn.execute("SELECT seq FROM correlation_seq WHERE day = ?", (day,)).fetchone()[0]
+            correlation_id = f"GBR-BRIDGE-{day}-{seq:04d}"
+            conn.execute("""
+                INSERT INTO outbox (correlation_id, doc_id, receipt_id, governance_level,
+                                    payload, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (correlation_id, doc_id, receipt_id, governance_level,
+                  json.dumps(build_payload(correlation_id), ensure_ascii=False),
+                  time.time(), datetime.now(timezone.utc).isoformat()))
+            return correlation_id
+
+        return self._transaction(insert)
+
+    def claim(self, limit, lease_seconds):
+        """Due pending rows (oldest first), leased to the caller."""
+        now = time.time()
+
+        def take(conn):
+            rows = conn.execute("""
+                SELECT id, correlation_id, doc_id, payload, attempts FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id LIMIT ?
+            """, (now, limit)).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?",
+                [(now + lease_seconds, r["id"]) for r in rows])
+            return [dict(r, attempts=r["attempts"] + 1, payload=json.loads(r["payload"])) for r in rows]
+
+        return self._transaction(take)
+
+    def next_due_in(self):
+        """Seconds until the next pending row is due (None if nothing pending)."""
+        row = self._conn().execute(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def mark_delivered(self, row_id, submission_id):
+        self._conn().execute(
+            "UPDATE outbox SET status = 'delivered', delivered_at = ?, submission_id = ?, last_error = NULL "
+            "WHERE id = ?", (datetime.now(timezone.utc).isoformat(), submission_id, row_id))
+
+    def mark_rejected(self, row_id, error):
+        self._conn().execute(
+            "UPDATE outbox SET status = 'rejected', last_error = ? WHERE id = ?", (error, row_id))
+
+    def mark_retry(self, row_id, attempts, error):
+        """Schedule the next attempt; returns the delay, or None if the row went dead."""
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            self._conn().execute(
+                "UPDATE outbox SET status = 'dead', last_error = ? WHERE id = ?", (error, row_id))
+            return None
+        delay = _backoff(attempts)
+        self._conn().execute(
+            "UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (time.time() + delay, error, row_id))
+        return delay
+
+    def retry_dead(self):
+        """Give dead submissions a fresh set of attempts; returns how many."""
+        return self._conn().execute(
+            "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'",
+            (time.time(),)).rowcount
+
+    def acquire_lease(self, owner, seconds, name="dispatcher"):
+        """Take or renew the named lease for `owner`; False while another owner holds it."""
+        now = time.time()
+
+        def take(conn):
+            row = conn.execute("SELECT owner, expires_at FROM dispatcher_lease WHERE name = ?",
+                               (name,)).fetchone()
+            if row is not None and row["owner"] != owner and row["expires_at"] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO dispatcher_lease (name, owner, expires_at) VALUES (?, ?, ?)",
+                         (name, owner, now + seconds))
+            return True
+
+        return self._transaction(take)
+
+    def release_lease(self, owner, name="dispatcher"):
+        self._conn().execute("DELETE FROM dispatcher_lease WHERE name = ? AND owner = ?", (name, owner))
+
+    def lease_owner(self, name="dispatcher"):
+        row = self._conn().execute(
+            "SELECT owner FROM dispatcher_lease WHERE name = ? AND expires_at > ?",
+            (name, time.time())).fetchone()
+        return row["owner"] if row else None
+
+    def get(self, correlation_id):
+        row = self._conn().execute(
+            "SELECT * FROM outbox WHERE correlation_id = ?", (correlation_id,)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self):
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {"pending": 0, "delivered": 0, "rejected": 0, "dead": 0}
+        counts.update({status: n for status, n in rows})
+        return counts
 
-        # ─── BUILD PAYLOAD ─────────────────────────────────────
-        content_hash = hashlib.sha256(content_text.encode()).hexdigest()
-        receipt_id = receipt.get("receipt_id", "")
 
-        metadata = {
-            # Origin tracing (War Room Decision Card)
-            "source": "a4desk_babel",
-            "bridge_version": BRIDGE_VERSION,
-            "bridge_correlation_id": correlation_id,
-            # Document identity
-            "document_id": doc_id,
-            "language": language,
-            "domain_tag": domain_tag,
-            "content_hash": content_hash,
-            "receipt_id": receipt_id,
-            # Human actors
-            "author_name": author_data.get("name", ""),
-            "author_department": author_data.get("department", ""),
-            "author_employee_id": author_data.get("employee_id", ""),
-            "witness_name": witness_data.get("name", ""),
-            "witness_role": witness_data.get("role", "Prüfer"),
-            # Timestamps
-            "finalized_at": datetime.now(timezone.utc).isoformat(),
-        }
+# ═══════════════════════════════════════════════════════════════
+# DISPATCHER — Drains the outbox in the background
+# ═══════════════════════════════════════════════════════════════
 
-        payload = {
-            "governance_level": governance_level,
-            "document_type": domain_tag,
-            "document_id": doc_id,
-            "correlation_id": correlation_id,
-            "metadata": metadata,
-        }
+class OutboxDispatcher:
+    """
+    Claims due rows, POSTs them in batches (falls back to one POST per
+    submission if the API has no batch endpoint) and records the outcome.
+
+    Delivery is at-least-once (a lease can expire mid-request); the
+    Governance API de-duplicates on correlation_id, which makes ledger
+    entries exactly-once.
+
+    Every BABEL worker starts a dispatcher, but the background thread only
+    delivers while it holds the outbox's dispatcher lease, so the token
+    bucket limits the whole deployment rather than each process. A leader
+    that dies stops renewing and another worker takes over once the lease
+    (DISPATCHER_LEASE_SECONDS) expires.
+    """
 
-        # ─── LOG ATTEMPT (governance evidence of intent) ────────
-        _bridge_logger.info(
-            f"SUBMIT_ATTEMPT doc_id={doc_id} corr={correlation_id} "
-            f"level={governance_level} domain={domain_tag} "
-            f"receipt={receipt_id} hash={content_hash[:12]}"
-        )
+    def __init__(self, outbox, api_url=GOVERNANCE_API_URL, batch_url=GOVERNANCE_BATCH_URL,
+                 batch_size=BATCH_SIZE, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST,
+                 timeout=TIMEOUT_SECONDS):
+        self.outbox = outbox
+        self.api_url = api_url
+        self.batch_url = batch_url
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.lease_seconds = timeout * (batch_size + 1)
+        self._batch_supported = bool(batch_url)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._owner = None
+        self._start_lock = threading.Lock()
+
+    # ─── lifecycle ─────────────────────────────────────────────
+
+    def start(self):
+        """Start (or, after a fork, restart) the background thread."""
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._owner = f"{socket.gethostname()}:{self._pid}:{id(self):x}"
+            self._thread = threading.Thread(target=self._run, name="governance-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._owner is not None:
+            try:
+                self.outbox.release_lease(self._owner)
+            except Exception:
+                pass
+
+    def is_leader(self):
+        return self._owner is not None and self.outbox.lease_owner() == self._owner
+
+    def _renew_lease(self):
+        return self._owner is not None and self.outbox.acquire_lease(self._owner, DISPATCHER_LEASE_SECONDS)
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if not self._renew_lease():
+                    idle = None           # another worker delivers; check again later
+                elif self.run_once():
+                    continue
+                else:
+                    idle = self.outbox.next_due_in()
+            except Exception as e:
+                _evidence([_event("DISPATCH_ERROR", "ERROR", f"error=\"{e}\"")])
+                idle = None
+            self._wake.wait(OUTBOX_POLL_SECONDS if idle is None else min(idle, OUTBOX_POLL_SECONDS))
+            self._wake.clear()
+
+    # ─── delivery ──────────────────────────────────────────────
+
+    def run_once(self):
+        """Deliver one batch of due submissions; returns how many were claimed."""
+        rows = self.outbox.claim(self.batch_size, self.lease_seconds)
+        if not rows:
+            return 0
+        attempts = []
+        for row in rows:
+            p = row["payload"]
+            attempts.append(_event(
+                "SUBMIT_ATTEMPT", "INFO",
+                f"doc_id={row['doc_id']} corr={row['correlation_id']} "
+                f"level={p.get('governance_level')} domain={p.get('document_type')} "
+                f"receipt={p['metadata'].get('receipt_id', '')} "
+                f"hash={p['metadata'].get('content_hash', '')[:12]} attempt={row['attempts']}",
+                **self._fields(row)))
+        _evidence(attempts)
+        start_time = time.time()
+        try:
+            results = self._post(rows)
+        except Exception as e:
+            reason = "api_unreachable" if isinstance(e, (URLError, OSError)) else "unexpected"
+            _evidence([self._retry(row, reason, str(e), start_time) for row in rows])
+            return len(rows)
+        _evidence([self._record(row, result, start_time) for row, result in zip(rows, results)])
+        return len(rows)
+
+    @staticmethod
+    def _fields(row):
+        p = row["payload"]
+        return {
+            "correlation_id": row["correlation_id"],
+            "doc_id": row["doc_id"],
+            "receipt_id": p["metadata"].get("receipt_id", ""),
+            "governance_level": p.get("governance_level"),
+            "attempt": row["attempts"],
+        }
 
-        # ─── POST TO GOVERNANCE API ────────────────────────────
+    def _post_json(self, url, body):
         req = Request(
-            GOVERNANCE_API_URL,
-            data=json.dumps(payload).encode("utf-8"),
+            url,
+            data=json.dumps(body).encode("utf-8"),
             headers={"Content-Type": "application/json"},
             method="POST",
         )
-
-        with urlopen(req, timeout=TIMEOUT_SECONDS) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-
+        with urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def _throttle(self, rows):
+        waited = self.bucket.acquire()
+        self._renew_lease()
+        if waited:
+            _evidence([_event(
+                "THROTTLE", "DEBUG",
+                f"batch={len(rows)} first_corr={rows[0]['correlation_id']} wait={waited:.3f}s",
+                correlation_id=rows[0]["correlation_id"], doc_id=rows[0]["doc_id"])])
+
+    def _post(self, rows):
+        if self._batch_supported:
+            self._throttle(rows)
+            try:
+                results = self._post_json(self.batch_url, {"submissions": [r["payload"] for r in rows]})["results"]
+                if len(results) != len(rows):
+                    raise ValueError(f"batch returned {len(results)} results for {len(rows)} submissions")
+                return results
+            except HTTPError as e:
+                if e.code not in (404, 405):
+                    raise
+                self._batch_supported = False
+                _evidence([_event("BATCH_UNSUPPORTED", "WARNING", "falling back to single submissions")])
+        results = []
+        for row in rows:
+            self._throttle([row])
+            try:
+                results.append(self._post_json(self.api_url, row["payload"]))
+            except HTTPError as e:
+                if e.code != 422:
+                    raise
+                results.append({"status": "BLOCKED", "error": e.read().decode("utf-8", "replace")})
+        return results
+
+    def _record(self, row, result, start_time):
+        """Apply one API result to the outbox; returns its evidence record."""
         elapsed_ms = int((time.time() - start_time) * 1000)
+        corr = row["correlation_id"]
+        level = row["payload"].get("governance_level")
+        status = result.get("status")
+        if status == "BLOCKED":
+            self.outbox.mark_rejected(row["id"], result.get("error", "blocked"))
+            return _event(
+                "SUBMIT_FAILED", "ERROR",
+                f"doc_id={row['doc_id']} corr={corr} reason=blocked "
+                f"error=\"{result.get('error', '')}\" elapsed={elapsed_ms}ms level={level}",
+                reason="blocked", elapsed_ms=elapsed_ms, **self._fields(row))
+        if status == "ERROR":
+            return self._retry(row, "api_error", result.get("error", ""), start_time)
+        # Correlation travels back with the ledger entry
+        if result.get("correlation_id", corr) != corr:
+            return self._retry(row, "correlation_mismatch", result.get("correlation_id"), start_time)
         submission_id = result.get("submission_id", result.get("id", "?"))
+        self.outbox.mark_delivered(row["id"], submission_id)
+        return _event(
+            "SUBMIT_SUCCESS", "INFO",
+            f"doc_id={row['doc_id']} corr={corr} "
+            f"submission={submission_id} level={level} elapsed={elapsed_ms}ms"
+            + (" duplicate=1" if result.get("duplicate") else ""),
+            submission_id=submission_id, elapsed_ms=elapsed_ms, **self._fields(row))
+
+    def _retry(self, row, reason, error, start_time):
+        """Schedule a retry (or give up); returns the evidence record."""
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        delay = self.outbox.mark_retry(row["id"], row["attempts"], f"{reason}: {error}")
+        outcome = "gave_up" if delay is None else f"retry_in={delay:.1f}s"
+        return _event(
+            "SUBMIT_FAILED", "ERROR",
+            f"doc_id={row['doc_id']} corr={row['correlation_id']} "
+            f"reason={reason} error=\"{error}\" elapsed={elapsed_ms}ms "
+            f"level={row['payload'].get('governance_level')} "
+            f"receipt={row['payload']['metadata'].get('receipt_id', '')} "
+            f"attempt={row['attempts']} {outcome}",
+            reason=reason, elapsed_ms=elapsed_ms, **self._fields(row))
 
-        # Inject correlation data into result
-        result["bridge_correlation_id"] = correlation_id
-        result["bridge_version"] = BRIDGE_VERSION
 
-        _bridge_logger.info(
-            f"SUBMIT_SUCCESS doc_id={doc_id} corr={correlation_id} "
-            f"submission={submission_id} level={governance_level} "
-            f"elapsed={elapsed_ms}ms"
-        )
+_outbox = None
+_dispatcher = None
+_singleton_lock = threading.Lock()
 
-        return result
 
-    except URLError as e:
-        elapsed_ms = int((time.time() - start_time) * 1000)
-        _bridge_logger.error(
-            f"SUBMIT_FAILED doc_id={doc_id} corr={correlation_id} "
-            f"reason=api_unreachable error=\"{e}\" elapsed={elapsed_ms}ms "
-            f"level={governance_level} receipt={receipt.get('receipt_id', '')}"
-        )
-        return None
+def get_outbox():
+    global _outbox
+    with _singleton_lock:
+        if _outbox is None:
+            _outbox = GovernanceOutbox(OUTBOX_DB_PATH)
+        return _outbox
+
+
+def get_dispatcher():
+    global _dispatcher
+    outbox = get_outbox()
+    with _singleton_lock:
+        if _dispatcher is None:
+            _dispatcher = OutboxDispatcher(outbox)
+        return _dispatcher
+
+
+def start_dispatcher():
+    """Start draining the outbox in this process (idempotent, fork-safe)."""
+    dispatcher = get_dispatcher()
+    dispatcher.start()
+    return dispatcher
+
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN SUBMIT FUNCTION
+# ═══════════════════════════════════════════════════════════════
+
+def build_payload(doc_id, content_text, language, author_data, witness_data,
+                  receipt, domain_tag, governance_level, correlation_id):
+    """Governance API payload for one finalized document."""
+    content_hash = hashlib.sha256(content_text.encode()).hexdigest()
+    metadata = {
+        # Origin tracing (War Room Decision Card)
+        "source": "a4desk_babel",
+        "bridge_version": BRIDGE_VERSION,
+        "bridge_correlation_id": correlation_id,
+        # Document identity
+        "document_id": doc_id,
+        "language": language,
+        "domain_tag": domain_tag,
+        "content_hash": content_hash,
+        "receipt_id": receipt.get("receipt_id", ""),
+        # Human actors
+        "author_name": author_data.get("name", ""),
+        "author_department": author_data.get("department", ""),
+        "author_employee_id": author_data.get("employee_id", ""),
+        "witness_name": witness_data.get("name", ""),
+        "witness_role": witness_data.get("role", "Prüfer"),
+        # Timestamps
+        "finalized_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return {
+        "governance_level": governance_level,
+        "document_type": domain_tag,
+        "document_id": doc_id,
+        "correlation_id": correlation_id,
+        "metadata": metadata,
+    }
+
+
+def submit_to_governance(doc_id, content_text, language, author_data,
+                         witness_data, receipt, domain_tag="operational",
+                         governance_level=None):
+    """
+    Queue a finalized document for the Governance API.
+
+    One local SQLite insert — no network on the finalize path. The
+    background dispatcher delivers it (rate-limited, batched, retried).
+
+    NEVER raises exceptions — BABEL must not break.
+
+    Returns:
+        dict with status "queued" + bridge_correlation_id, or None if the
+        outbox itself failed
+    """
+    try:
+        # ─── AUTO-DETECT LEVEL ─────────────────────────────────
+        if governance_level is None:
+            governance_level = _detect_level(domain_tag, content_text)
+        receipt_id = receipt.get("receipt_id", "")
+
+        outbox = get_outbox()
+        correlation_id = outbox.enqueue(
+            lambda corr: build_payload(doc_id, content_text, language, author_data, witness_data,
+                                       receipt, domain_tag, governance_level, corr),
+            doc_id, receipt_id, governance_level)
+
+        # ─── LOG QUEUED (governance evidence of intent) ─────────
+        _evidence([_event(
+            "SUBMIT_QUEUED", "INFO",
+            f"doc_id={doc_id} corr={correlation_id} "
+            f"level={governance_level} domain={domain_tag} receipt={receipt_id}",
+            correlation_id=correlation_id, doc_id=doc_id, receipt_id=receipt_id,
+            governance_level=governance_level)])
+        dispatcher = start_dispatcher()
+        dispatcher.notify()
+        return {
+            "status": "queued",
+            "bridge_correlation_id": correlation_id,
+            "bridge_version": BRIDGE_VERSION,
+        }
 
     except Exception as e:
-        elapsed_ms = int((time.time() - start_time) * 1000)
-        _bridge_logger.error(
-            f"SUBMIT_FAILED doc_id={doc_id} corr={correlation_id} "
-            f"reason=unexpected error=\"{e}\" elapsed={elapsed_ms}ms "
-            f"level={governance_level or 'UNKNOWN'}"
-        )
+        _evidence([_event(
+            "SUBMIT_FAILED", "ERROR",
+            f"doc_id={doc_id} corr=none reason=outbox_error "
+            f"error=\"{e}\" level={governance_level or 'UNKNOWN'}",
+            doc_id=doc_id, reason="outbox_error", governance_level=governance_level)])
         return None
 
 
@@ -291,6 +937,7 @@ def health_check():
             "api": data.get("api", "unknown"),
             "bridge_version": BRIDGE_VERSION,
             "log_file": LOG_FILE,
+            "outbox": get_outbox_stats(),
         }
     except Exception as e:
         return {
@@ -298,44 +945,61 @@ def health_check():
             "error": str(e),
             "bridge_version": BRIDGE_VERSION,
             "log_file": LOG_FILE,
+            "outbox": get_outbox_stats(),
         }
 
 
-def get_recent_logs(n=20):
-    """Return last N lines from bridge log."""
+def get_outbox_stats():
+    """Outbox rows by status — pending > 0 while the API is down is expected."""
     try:
-        with open(LOG_FILE, "r") as f:
-            lines = f.readlines()
-        return [l.strip() for l in lines[-n:]]
+        return get_outbox().counts()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _log_line(record):
+    ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["ts"]))   # same clock as the text log
+    return f"[{ts}] [BRIDGE] [{record['severity']}] {record['message']}"
+
+
+def query_evidence(correlation_id=None, doc_id=None, event=None, since=None, until=None, limit=50):
+    """
+    Structured evidence records, newest first. Filters combine (AND);
+    since/until are epoch seconds. Index-backed at any history size.
+    """
+    try:
+        return get_evidence_log().query(correlation_id, doc_id, event, since, until, limit)
     except Exception:
         return []
 
 
+def get_recent_logs(n=20):
+    """Return the last N bridge events as log lines (oldest first)."""
+    return [_log_line(r) for r in reversed(query_evidence(limit=n))]
+
+
 def get_failed_submissions(n=50):
     """
-    Return recent failed submissions from log.
+    Return recent failed submissions as log lines (oldest first).
     This is AUDIT EVIDENCE — proves governance intent
     even when infrastructure failed.
     """
-    try:
-        with open(LOG_FILE, "r") as f:
-            lines = f.readlines()
-        return [l.strip() for l in lines if "SUBMIT_FAILED" in l][-n:]
-    except Exception:
-        return []
+    return [_log_line(r) for r in reversed(query_evidence(event="SUBMIT_FAILED", limit=n))]
 
 
 def get_submission_stats():
-    """Quick stats from log for monitoring."""
+    """Running totals since the evidence store was created (rotation-proof)."""
     try:
-        with open(LOG_FILE, "r") as f:
-            content = f.read()
-        return {
-            "total_attempts": content.count("SUBMIT_ATTEMPT"),
-            "total_success": content.count("SUBMIT_SUCCESS"),
-            "total_failed": content.count("SUBMIT_FAILED"),
-            "total_throttled": content.count("THROTTLE"),
-            "log_file": LOG_FILE,
-        }
-    except Exception:
-        return {"error": "Log not readable"}
+        counters = get_evidence_log().counters()
+    except Exception as e:
+        return {"error": f"Evidence store not readable: {e}"}
+    return {
+        "total_attempts": counters.get("SUBMIT_ATTEMPT", 0),
+        "total_success": counters.get("SUBMIT_SUCCESS", 0),
+        "total_failed": counters.get("SUBMIT_FAILED", 0),
+        "total_throttled": counters.get("THROTTLE", 0),
+        "total_queued": counters.get("SUBMIT_QUEUED", 0),
+        "outbox": get_outbox_stats(),
+        "log_file": LOG_FILE,
+        "evidence_db": EVIDENCE_DB_PATH,
+    }
@@ -0,0 +1,243 @@
+"""
+WINDI Receipt Index v1.0 — public /verify lookups for a4Desk BABEL
+===================================================================
+Created: 16 Oct 2026
+
+Before: every public verification ran
+    SELECT * FROM documents WHERE receipt LIKE '%<id>%'
+(a full scan over receipt JSON blobs that also matched any substring),
+built a fresh SubmissionRegistry, and some variants wrote
+verified_count + 1 on every read.
+
+Now:
+  + receipt_index table (receipt_id → document_id), written in the same
+    transaction that mints the receipt; one-shot backfill on first open
+  + lookup() is a primary-key probe behind a small TTL cache
+  + VerificationCounter accumulates hits in memory and a background
+    thread flushes them in batches — no write on the request path
+
+"AI processes. Human decides. WINDI guarantees."
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+# ═══════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════
+
+RECEIPT_CACHE_SIZE = 1024        # hot receipts kept in memory
+RECEIPT_CACHE_TTL_S = 30         # bounds staleness across worker processes
+VERIFY_FLUSH_INTERVAL_S = 5      # counter flush period
+VERIFY_FLUSH_MAX_PENDING = 500   # ... or earlier once this many hits are pending
+
+# Counter flush statements take rows of (count, last_verified_at, receipt_id)
+RECEIPT_COUNTER_SQL = """
+    INSERT INTO receipt_verifications (verified_count, last_verified_at, receipt_id)
+    VALUES (?, ?, ?)
+    ON CONFLICT(receipt_id) DO UPDATE SET
+        verified_count = verified_count + excluded.verified_count,
+        last_verified_at = excluded.last_verified_at
+"""
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS receipt_index (
+        receipt_id TEXT PRIMARY KEY,
+        document_id TEXT NOT NULL,
+        indexed_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_receipt_index_document ON receipt_index(document_id);
+    CREATE TABLE IF NOT EXISTS receipt_verifications (
+        receipt_id TEXT PRIMARY KEY,
+        verified_count INTEGER NOT NULL DEFAULT 0,
+        last_verified_at TEXT
+    );
+"""
+
+
+def _receipt_id_of(receipt_json):
+    try:
+        return (json.loads(receipt_json) or {}).get("receipt_id")
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════
+# RECEIPT INDEX
+# ═══════════════════════════════════════════════════════════════
+
+class ReceiptIndex:
+    """receipt_id → documents row, via an indexed table and a TTL cache."""
+
+    def __init__(self, db_path, cache_size=RECEIPT_CACHE_SIZE, cache_ttl=RECEIPT_CACHE_TTL_S):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()   # receipt_id -> (expires_at, row dict)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.stats = {"hits": 0, "misses": 0, "not_found": 0}
+        with self._lock:
+            created = not self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'receipt_index'"
+            ).fetchone()
+            self._conn.executescript(_SCHEMA)
+        if created:
+            n = self.backfill()
+            print(f"✅ Receipt index backfilled: {n} receipts")
+
+    def backfill(self):
+        """Index every finalized document that already carries a receipt (idempotent)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, receipt FROM documents WHERE receipt IS NOT NULL AND receipt != ''"
+            ).fetchall()
+            now = datetime.now(timezone.utc).isoformat()
+            entries = [(rid, row["id"], now) for row in rows
+                       for rid in (_receipt_id_of(row["receipt"]),) if rid]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO receipt_index (receipt_id, document_id, indexed_at) VALUES (?, ?, ?)",
+                    entries)
+        return len(entries)
+
+    def add(self, receipt_id, document_id, conn):
+        """
+        Index a freshly minted receipt inside the caller's transaction.
+        A re-finalized document supersedes its earlier receipt, so cached
+        rows of that document are dropped here rather than at TTL expiry.
+        """
+        conn.execute(
+            "INSERT OR REPLACE INTO receipt_index (receipt_id, document_id, indexed_at) VALUES (?, ?, ?)",
+            (receipt_id, document_id, datetime.now(timezone.utc).isoformat()))
+        self._evict_document(document_id)
+
+    def remove_document(self, document_id, conn):
+        """Drop index entries of a deleted document (caller's transaction)."""
+        conn.execute("DELETE FROM receipt_index WHERE document_id = ?", (document_id,))
+        self._evict_document(document_id)
+
+    def _evict_document(self, document_id):
+        with self._lock:
+            for rid in [k for k, (_, row) in self._cache.items() if row["id"] == document_id]:
+                del self._cache[rid]
+
+    def lookup(self, receipt_id):
+        """documents row (as dict) for an exact receipt_id, or None."""
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(receipt_id)
+            if hit and hit[0] > now:
+                self._cache.move_to_end(receipt_id)
+                self.stats["hits"] += 1
+                return hit[1]
+            self.stats["misses"] += 1
+            row = self._conn.execute("""
+                SELECT d.* FROM receipt_index r JOIN documents d ON d.id = r.document_id
+                WHERE r.receipt_id = ?
+            """, (receipt_id,)).fetchone()
+            # A re-finalized document carries a newer receipt; the old id no longer verifies
+            if row is None or _receipt_id_of(row["receipt"]) != receipt_id:
+                self._cache.pop(receipt_id, None)
+                self.stats["not_found"] += 1
+                return None
+            row = dict(row)
+            self._cache[receipt_id] = (now + self.cache_ttl, row)
+            self._cache.move_to_end(receipt_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return row
+
+
+# ═══════════════════════════════════════════════════════════════
+# DEFERRED VERIFICATION COUNTERS
+# ═══════════════════════════════════════════════════════════════
+
+class VerificationCounter:
+    """
+    In-memory verification counts, flushed in batches by a daemon thread.
+
+    record() only touches a dict; flush_sql is run with executemany over
+    rows of (count, last_verified_at, receipt_id). Pending counts are
+    flushed at interpreter exit.
+    """
+
+    def __init__(self, db_path, flush_sql=RECEIPT_COUNTER_SQL,
+                 interval_s=VERIFY_FLUSH_INTERVAL_S, max_pending=VERIFY_FLUSH_MAX_PENDING):
+        self.db_path = db_path
+        self.flush_sql = flush_sql
+        self.interval_s = interval_s
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = {}            # receipt_id -> [count, last_verified_at]
+        self._pending_hits = 0
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {"recorded": 0, "flushed": 0, "flushes": 0, "errors": 0}
+
+    def record(self, receipt_id):
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            entry = self._pending.get(receipt_id)
+            if entry is None:
+                self._pending[receipt_id] = [1, now]
+            else:
+                entry[0] += 1
+                entry[1] = now
+            self._pending_hits += 1
+            self.stats["recorded"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="verify-counter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            if self._pending_hits >= self.max_pending:
+                self._wake.set()
+
+    def pending(self, receipt_id):
+        """Hits recorded but not yet flushed for receipt_id."""
+        with self._lock:
+            entry = self._pending.get(receipt_id)
+            return entry[0] if entry else 0
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all pending counts in one transaction; returns the number of hits flushed."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._pending_hits = 0
+        if not batch:
+            return 0
+        rows = [(count, last, rid) for rid, (count, last) in batch.items()]
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                with conn:
+                    conn.executemany(self.flush_sql, rows)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Counters are statistics, not evidence: keep them for the next attempt
+            print(f"[VERIFY] Counter flush error: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+                for rid, (count, last) in batch.items():
+                    entry = self._pending.setdefault(rid, [0, last])
+                    entry[0] += count
+                    self._pending_hits += count
+            return 0
+        hits = sum(r[0] for r in rows)
+        with self._lock:
+            self.stats["flushed"] += hits
+            self.stats["flushes"] += 1
+        return hits
@@ -0,0 +1,332 @@
+"""
+WINDI Session Store v1.0 — shared, expiring sessions for a4Desk BABEL
+=====================================================================
+Created: 16 Oct 2026
+
+Before: a module-level SESSIONS dict. Sessions vanished on restart, each
+gunicorn worker saw only its own logins, and expired entries stayed in
+memory until someone presented that exact session id again.
+
+Now (same session dicts, same ISO timestamps, pluggable backend):
+  + MemorySessionStore: single process; expiry via a min-heap of deadlines
+    with lazy re-push, so touching a session is O(1) and eviction is
+    amortised O(log n)
+  + SQLiteSessionStore: WAL database shared by every worker process;
+    deadlines live in an indexed column and expired rows are purged by
+    one range DELETE at most every purge_interval_s
+  + both: hits / misses / expired / evictions counters via stats()
+
+A session ends at min(expires_at, last_activity + idle timeout);
+validating it slides last_activity forward.
+
+"AI processes. Human decides. WINDI guarantees."
+"""
+
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+# ═══════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════
+
+SESSION_PURGE_INTERVAL_S = 30     # SQLite: range-delete expired rows at most this often
+
+
+def _iso_to_ts(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def _now_iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class SessionStore:
+    """
+    Backend interface. Sessions are plain dicts carrying at least
+    "expires_at" and "last_activity" (ISO 8601). touch() returns a copy:
+    changes go back through update().
+    """
+
+    def __init__(self, idle_timeout_s):
+        self.idle_timeout_s = idle_timeout_s
+        self._stats_lock = threading.Lock()
+        self._stats = {"created": 0, "hits": 0, "misses": 0, "expired": 0,
+                       "evictions": 0, "deleted": 0}
+
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def _deadline(self, sess):
+        return min(_iso_to_ts(sess["expires_at"]),
+                   _iso_to_ts(sess["last_activity"]) + self.idle_timeout_s)
+
+    def create(self, session_id, sess):
+        raise NotImplementedError
+
+    def touch(self, session_id):
+        """Valid session (copy) with last_activity/actions_count advanced, or None."""
+        raise NotImplementedError
+
+    def update(self, session_id, fields):
+        raise NotImplementedError
+
+    def increment(self, session_id, field, n=1):
+        """Atomically add `n` to a numeric field; returns the new value, or None if no session."""
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def purge_expired(self):
+        """Evict every expired session now; returns how many were removed."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def stats(self):
+        with self._stats_lock:
+            data = dict(self._stats)
+        data.update(backend=self.backend, active=len(self))
+        return data
+
+
+# ═══════════════════════════════════════════════════════════════
+# IN-MEMORY (single process)
+# ═══════════════════════════════════════════════════════════════
+
+class MemorySessionStore(SessionStore):
+    backend = "memory"
+
+    def __init__(self, idle_timeout_s):
+        super().__init__(idle_timeout_s)
+        self._lock = threading.Lock()
+        self._sessions = {}        # session_id -> session dict
+        self._deadlines = {}       # session_id -> current deadline (epoch s)
+        self._heap = []            # (deadline at push time, session_id), possibly stale
+
+    def _evict(self, now):
+        heap = self._heap
+        evicted = 0
+        while heap and heap[0][0] <= now:
+            _, sid = heapq.heappop(heap)
+            deadline = self._deadlines.get(sid)
+            if deadline is None:
+                continue                               # already deleted
+            if deadline > now:
+                heapq.heappush(heap, (deadline, sid))  # was touched: re-arm
+                continue
+            del self._deadlines[sid]
+            del self._sessions[sid]
+            evicted += 1
+        if evicted:
+            self._count("evictions", evicted)
+        return evicted
+
+    def create(self, session_id, sess):
+        deadline = self._deadline(sess)
+        with self._lock:
+            self._evict(time.time())
+            self._sessions[session_id] = dict(sess)
+            self._deadlines[session_id] = deadline
+            heapq.heappush(self._heap, (deadline, session_id))
+        self._count("created")
+
+    def touch(self, session_id):
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            sess = self._sessions.get(session_id)
+            if sess is None:
+                self._count("misses")
+                return None
+            if self._deadlines[session_id] <= now:
+                del self._sessions[session_id]
+                del self._deadlines[session_id]
+                self._count("expired")
+                return None
+            sess["last_activity"] = _now_iso(now)
+            sess["actions_count"] = sess.get("actions_count", 0) + 1
+            # Only the dict is updated; the heap entry is re-armed when it surfaces
+            self._deadlines[session_id] = min(_iso_to_ts(sess["expires_at"]), now + self.idle_timeout_s)
+            self._count("hits")
+            return dict(sess)
+
+    def update(self, session_id, fields):
+        with self._lock:
+            sess = self._sessions.get(session_id)
+            if sess is None:
+                return False
+            sess.update(fields)
+            return True
+
+    def increment(self, session_id, field, n=1):
+        with self._lock:
+            sess = self._sessions.get(session_id)
+            if sess is None:
+                return None
+            sess[field] = sess.get(field, 0) + n
+            return sess[field]
+
+    def delete(self, session_id):
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                return False
+            del self._deadlines[session_id]
+        self._count("deleted")
+        return True
+
+    def purge_expired(self):
+        with self._lock:
+            return self._evict(time.time())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SQLITE WAL (shared across worker processes)
+# ═══════════════════════════════════════════════════════════════
+
+class SQLiteSessionStore(SessionStore):
+    """
+    One row per session; deadline is indexed so purging is a range delete.
+    Counters are per process. Connections are per thread.
+    """
+    backend = "sqlite"
+
+    def __init__(self, db_path, idle_timeout_s, purge_interval_s=SESSION_PURGE_INTERVAL_S):
+        super().__init__(idle_timeout_s)
+        self.db_path = db_path
+        self.purge_interval_s = purge_interval_s
+        self._local = threading.local()
+        self._next_purge = 0.0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                deadline REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_deadline ON sessions(deadline);
+        """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _maybe_purge(self, now):
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval_s
+            self._purge(now)
+
+    def _purge(self, now):
+        evicted = self._conn().execute("DELETE FROM sessions WHERE deadline <= ?", (now,)).rowcount
+        if evicted:
+            self._count("evictions", evicted)
+        return evicted
+
+    def create(self, session_id, sess):
+        now = time.time()
+        self._maybe_purge(now)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, data, deadline) VALUES (?, ?, ?)",
+            (session_id, json.dumps(sess, ensure_ascii=False), self._deadline(sess)))
+        self._count("created")
+
+    def touch(self, session_id):
+        now = time.time()
+        self._maybe_purge(now)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data, deadline FROM sessions WHERE session_id = ?",
+                               (session_id,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                self._count("misses")
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                conn.execute("COMMIT")
+                self._count("expired")
+                return None
+            sess = json.loads(row[0])
+            sess["last_activity"] = _now_iso(now)
+            sess["actions_count"] = sess.get("actions_count", 0) + 1
+            deadline = min(_iso_to_ts(sess["expires_at"]), now + self.idle_timeout_s)
+            conn.execute("UPDATE sessions SET data = ?, deadline = ? WHERE session_id = ?",
+                         (json.dumps(sess, ensure_ascii=False), deadline, session_id))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("hits")
+        return sess
+
+    def update(self, session_id, fields):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is not None:
+                sess = json.loads(row[0])
+                sess.update(fields)
+                conn.execute("UPDATE sessions SET data = ? WHERE session_id = ?",
+                             (json.dumps(sess, ensure_ascii=False), session_id))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def increment(self, session_id, field, n=1):
+        # One UPDATE, so concurrent workers never write back a stale count
+        path = f"$.{field}"
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE sessions SET data = json_set(data, ?, COALESCE(json_extract(data, ?), 0) + ?) "
+                "WHERE session_id = ?", (path, path, n, session_id))
+            row = conn.execute("SELECT json_extract(data, ?) FROM sessions WHERE session_id = ?",
+                               (path, session_id)).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return row[0] if row else None
+
+    def delete(self, session_id):
+        deleted = self._conn().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount
+        if deleted:
+            self._count("deleted")
+        return bool(deleted)
+
+    def purge_expired(self):
+        return self._purge(time.time())
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sessions WHERE deadline > ?",
+                                    (time.time(),)).fetchone()[0]
+
+
+def create_session_store(backend, idle_timeout_s, db_path=None):
+    """"memory" or "sqlite" (needs db_path)."""
+    if backend == "memory":
+        return MemorySessionStore(idle_timeout_s)
+    if backend == "sqlite":
+        return SQLiteSessionStore(db_path, idle_timeout_s)
+    raise ValueError(f"Unknown session backend: {backend}")
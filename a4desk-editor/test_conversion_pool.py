@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+WINDI Conversion Pool — Test Suite
+==================================
+  TEST 1: Inline ISP CSS overrides the export template in PDF → PASS/FAIL
+          (skipped without WeasyPrint)
+  TEST 2: Worker leads its own process group                  → PASS/FAIL
+  TEST 3: Killing a worker also kills its children
+          (the pandoc server would otherwise be orphaned)     → PASS/FAIL
+
+Run: python3 test_conversion_pool.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from conversion_pool import ConversionPool
+
+
+def _header(name):
+    print(f"\n{'─' * 50}")
+    print(f"  {name}")
+    print(f"{'─' * 50}")
+
+
+def _result(test_name, passed, detail=""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status}  {test_name}")
+    if detail:
+        print(f"         {detail}")
+    return passed
+
+
+# Same shape as the fallback export document in _render_export
+_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><style>
+h1 {{ font-size: 14pt; color: #1a365d; }}
+{isp_css}
+</style></head><body><h1>Bescheid</h1><p>WINDI</p></body></html>"""
+_ISP_CSS = "h1 { color: #c00000; }"
+
+
+def _h1_color(document):
+    for page in document.pages:
+        stack = [page._page_box]
+        while stack:
+            box = stack.pop()
+            if getattr(box, "element_tag", None) == "h1":
+                c = box.style["color"]
+                return tuple(round(v * 255) for v in (c.red, c.green, c.blue))
+            stack.extend(getattr(box, "children", []))
+    return None
+
+
+def main():
+    results = []
+    test_dir = tempfile.mkdtemp(prefix="windi-convert-test-")
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 1: ISP CSS cascade in PDF exports")
+    try:
+        import weasyprint
+    except ImportError:
+        weasyprint = None
+        print("  ⏭  SKIP  weasyprint is not installed")
+    if weasyprint is not None:
+        inline = weasyprint.HTML(string=_TEMPLATE.format(isp_css=_ISP_CSS)).render()
+        results.append(_result("inline ISP rule wins over template rule",
+                               _h1_color(inline) == (192, 0, 0), f"h1 color={_h1_color(inline)}"))
+        src = os.path.join(test_dir, "export.html")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(_TEMPLATE.format(isp_css=_ISP_CSS))
+        pool = ConversionPool(workers=1)
+        try:
+            out = os.path.join(test_dir, "export.pdf")
+            used = pool.convert(src, out, "pdf")
+            with open(out, "rb") as f:
+                magic = f.read(5)
+            results.append(_result("pool renders the export to PDF",
+                                   used == "weasyprint" and magic == b"%PDF-", f"converter={used}"))
+        finally:
+            pool.close()
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 2: Worker process group")
+    src = os.path.join(test_dir, "doc.html")
+    with open(src, "w", encoding="utf-8") as f:
+        f.write("<p>WINDI</p>")
+    pool = ConversionPool(workers=1)
+    try:
+        pool.convert(src, src + ".out", "html")
+        worker = pool._workers[0]
+        pid = worker.proc.pid
+        results.append(_result("worker is its process group leader",
+                               os.getpgid(pid) == pid, f"pid={pid} pgid={os.getpgid(pid)}"))
+
+        # ═══════════════════════════════════════════════════════
+        _header("TEST 3: Kill takes the worker's children along")
+        # Stand-in for a worker with its `pandoc server`: a session leader
+        # that starts a child and reports its pid
+        worker.kill()
+        worker.proc = subprocess.Popen(
+            [sys.executable, "-c",
+             "import subprocess, sys, time\n"
+             "c = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+             "print(c.pid, flush=True); time.sleep(60)"],
+            stdout=subprocess.PIPE, text=True, start_new_session=True)
+        grandchild = int(worker.proc.stdout.readline())
+        worker.proc.stdout.close()
+        worker.restart("test")
+        deadline = time.monotonic() + 5
+        alive = True
+        while alive and time.monotonic() < deadline:
+            try:
+                os.kill(grandchild, 0)
+                # still present: a zombie counts as gone (init reaps it)
+                with open(f"/proc/{grandchild}/stat") as f:
+                    alive = f.read().split(") ")[1][0] != "Z"
+            except (ProcessLookupError, FileNotFoundError):
+                alive = False
+            if alive:
+                time.sleep(0.05)
+        results.append(_result("worker's child is killed with it", not alive,
+                               f"child pid={grandchild}"))
+        if alive:
+            os.kill(grandchild, 9)
+        used = pool.convert(src, src + ".out2", "html")
+        results.append(_result("next job respawns the worker",
+                               used == "copy" and worker.alive(), f"restarts={worker.restarts}"))
+    finally:
+        pool.close()
+
+    # ═══════════════════════════════════════════════════════════
+    print("\n" + "═" * 50)
+    passed = sum(bool(r) for r in results)
+    total = len(results)
+    print(f"  RESULTS: {passed}/{total} passed")
+    if passed == total:
+        print("  STATUS:  ✅ ALL TESTS PASSED")
+    else:
+        print(f"  STATUS:  ❌ {total - passed} TEST(S) FAILED")
+    print("═" * 50)
+    shutil.rmtree(test_dir, ignore_errors=True)
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+WINDI Export Cache — Test Suite
+===============================
+Each "worker" is a separate process opening the same cache directory,
+as gunicorn workers do.
+
+  TEST 1: Job started in one worker: status, cancel and
+          coalescing from another                              → PASS/FAIL
+  TEST 2: Finished job downloadable from another worker        → PASS/FAIL
+  TEST 3: Byte budget shared by all workers                    → PASS/FAIL
+  TEST 4: Jobs of a dead worker are failed, not coalesced      → PASS/FAIL
+
+Run: python3 test_export_cache.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from export_cache import ExportCache, ExportJobQueue
+
+
+def _header(name):
+    print(f"\n{'─' * 50}")
+    print(f"  {name}")
+    print(f"{'─' * 50}")
+
+
+def _result(test_name, passed, detail=""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status}  {test_name}")
+    if detail:
+        print(f"         {detail}")
+    return passed
+
+
+# Another worker process: runs `code` with `cache` and `jobs` opened on
+# the same directory, prints one JSON line.
+_WORKER = """
+import json, os, sys, tempfile, time
+sys.path.insert(0, sys.argv[1])
+from export_cache import ExportCache, ExportJobQueue, ExportCancelled
+cache = ExportCache(sys.argv[2], max_bytes=int(sys.argv[3]))
+jobs = ExportJobQueue(cache)
+def blob(size):
+    fd, path = tempfile.mkstemp(dir=sys.argv[2], suffix=".src")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"x" * size)
+    return path
+"""
+
+
+def _worker(cache_dir, max_bytes, code, wait=True):
+    proc = subprocess.Popen([sys.executable, "-c", _WORKER + code, HERE, cache_dir, str(max_bytes)],
+                            stdout=subprocess.PIPE, text=True)
+    if not wait:
+        return proc
+    out, _ = proc.communicate(timeout=60)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _blob(directory, size):
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".src")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+def main():
+    results = []
+    test_dir = tempfile.mkdtemp(prefix="windi-export-test-")
+    budget = 10 * 1024
+    cache = ExportCache(test_dir, max_bytes=budget)
+    jobs = ExportJobQueue(cache)
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 1: Job state shared across workers")
+    # Worker A renders slowly, polling for cancellation
+    slow = _worker(test_dir, budget, """
+def render(job):
+    for _ in range(100):
+        job.check_cancelled()
+        time.sleep(0.05)
+    return cache.put(job.key, blob(100), "pdf", {"title": "slow"})
+job = jobs.submit("key-slow", render, label="slow.pdf")
+print(json.dumps({"job_id": job.id}), flush=True)
+job.wait(30)
+print(json.dumps({"status": job.status}), flush=True)
+""", wait=False)
+    job_id = json.loads(slow.stdout.readline())["job_id"]
+    remote = jobs.get(job_id)
+    coalesced = jobs.submit("key-slow", lambda job: None)
+    results.append(_result("status visible and identical export coalesced",
+                           remote is not None and remote.status in ("queued", "running")
+                           and coalesced.id == job_id,
+                           f"status={remote.status if remote else None}, coalesced={coalesced.id == job_id}"))
+    cancelled = jobs.cancel(job_id)
+    final = json.loads(slow.stdout.readline())["status"]
+    slow.wait(timeout=30)
+    remote.wait(5)
+    results.append(_result("cancel from another worker stops the render",
+                           cancelled and final == "cancelled" and remote.status == "cancelled",
+                           f"cancel={cancelled}, worker saw={final}"))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 2: Download from another worker")
+    done = _worker(test_dir, budget, """
+job = jobs.submit("key-done", lambda job: cache.put(job.key, blob(200), "pdf", {"title": "done"}))
+job.wait(30)
+print(json.dumps({"job_id": job.id, "status": job.status}))
+""")
+    job = jobs.get(done["job_id"])
+    results.append(_result("done job resolves to the cached file here",
+                           job is not None and job.status == "done" and job.result is not None
+                           and os.path.getsize(job.result.path) == 200,
+                           f"status={job.status if job else None}"))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 3: Shared byte budget")
+    for i in range(6):
+        cache.put(f"local-{i}", _blob(test_dir, 1024), "pdf", {"title": f"l{i}"})
+    _worker(test_dir, budget, """
+for i in range(6):
+    cache.put(f"remote-{i}", blob(1024), "pdf", {"title": f"r{i}"})
+print(json.dumps({}))
+""")
+    on_disk = sum(os.path.getsize(os.path.join(test_dir, n)) for n in os.listdir(test_dir)
+                  if n.endswith(".pdf"))
+    summary = cache.summary()
+    results.append(_result("two workers stay within one budget",
+                           on_disk <= budget and summary["bytes"] == on_disk
+                           and cache.get("remote-5") is not None and cache.get("local-0") is None,
+                           f"on disk={on_disk} B, index={summary['bytes']} B, budget={budget} B"))
+
+    # ═══════════════════════════════════════════════════════════
+    _header("TEST 4: Dead worker")
+    dead = _worker(test_dir, budget, """
+job = jobs.submit("key-dead", lambda job: time.sleep(60))
+print(json.dumps({"job_id": job.id}), flush=True)
+os._exit(0)
+""")
+    fresh = jobs.submit("key-dead", lambda job: cache.put(job.key, _blob(test_dir, 10), "pdf", {"title": "d"}))
+    fresh.wait(10)
+    orphan = jobs.get(dead["job_id"])
+    results.append(_result("orphaned job failed, new job rendered",
+                           fresh.id != dead["job_id"] and fresh.status == "done"
+                           and orphan.status == "failed",
+                           f"orphan={orphan.status} ({orphan.error}), fresh={fresh.status}"))
+
+    # ═══════════════════════════════════════════════════════════
+    print("\n" + "═" * 50)
+    passed = sum(bool(r) for r in results)
+    total = len(results)
+    print(f"  RESULTS: {passed}/{total} passed")
+    if passed == total:
+        print("  STATUS:  ✅ ALL TESTS PASSED")
+    else:
+        print(f"  STATUS:  ❌ {total - passed} TEST(S) FAILED")
+    print("═" * 50)
+    shutil.rmtree(test_dir, ignore_errors=True)
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
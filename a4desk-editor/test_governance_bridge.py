@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+WINDI Governance Bridge Outbox — Test Suite
+===========================================
+A local stub of the Governance API (ledger keyed by correlation_id)
+stands in for port 8080.
+
+  TEST 1: Finalize path only enqueues (API down)               → PASS/FAIL
+  TEST 2: Outage → retries scheduled with backoff              → PASS/FAIL
+  TEST 3: Recovery → everything delivered, correlation kept    → PASS/FAIL
+  TEST 4: Lost responses → retried, ledger stays exactly-once  → PASS/FAIL
+  TEST 5: BLOCKED is final; no batch endpoint → single POSTs   → PASS/FAIL
+  TEST 6: Background dispatcher + token bucket + one leader     → PASS/FAIL
+  TEST 7: Evidence store — counters, indexed queries, import   → PASS/FAIL
+  TEST 8: Workers opening a new store at once import once      → PASS/FAIL
+
+Run: python3 test_governance_bridge.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TEST_DIR = tempfile.mkdtemp(prefix="windi_bridge_")
+os.environ["WINDI_BRIDGE_OUTBOX_DB"] = os.path.join(TEST_DIR, "outbox.db")
+os.environ["WINDI_BRIDGE_EVIDENCE_DB"] = os.path.join(TEST_DIR, "evidence.db")
+os.environ["WINDI_BRIDGE_LOG_DIR"] = TEST_DIR
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import governance_bridge as gb
+from governance_bridge import EvidenceLog, OutboxDispatcher, TokenBucket
+
+
+def _header(name):
+    print(f"\n{'─' * 50}")
+    print(f"  {name}")
+    print(f"{'─' * 50}")
+
+
+def _result(test_name, passed, detail=""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status}  {test_name}")
+    if detail:
+        print(f"         {detail}")
+    return passed
+
+
+# ═══════════════════════════════════════════════════════════════
+# STUB GOVERNANCE API
+# ═══════════════════════════════════════════════════════════════
+
+class StubLedger:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}          # correlation_id -> result
+        self.order = []
+        self.requests = {"single": 0, "batch": 0}
+        self.drop_responses = 0    # commit, then close without answering
+        self.batch_enabled = True
+
+    def generate(self, body):
+        corr = body.get("correlation_id")
+        if body["metadata"].get("domain_tag") == "blocked":
+            return {"status": "BLOCKED", "error": "metadata incomplete", "correlation_id": corr}
+        with self.lock:
+            if corr in self.entries:
+                return dict(self.entries[corr], duplicate=True)
+            result = {"status": "SEALED", "submission_id": f"REG-{len(self.order) + 1:05d}",
+                      "correlation_id": corr}
+            self.entries[corr] = result
+            self.order.append(corr)
+            return result
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    ledger = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        ledger = self.ledger
+        if self.path == "/api/generate-batch":
+            if not ledger.batch_enabled:
+                self.send_response(404)
+                self.end_headers()
+                return
+            ledger.requests["batch"] += 1
+            data = {"results": [ledger.generate(item) for item in body["submissions"]]}
+        else:
+            ledger.requests["single"] += 1
+            data = ledger.generate(body)
+        with ledger.lock:
+            drop = ledger.drop_responses > 0
+            ledger.drop_responses -= drop
+        if drop:
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    def __init__(self, ledger, port=0):
+        StubHandler.ledger = ledger
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _submit(i, domain="operational"):
+    return gb.submit_to_governance(
+        doc_id=f"DOC-{i:04d}", content_text=f"Bescheid Nr. {i}", language="de",
+        author_data={"name": "Test Autor", "employee_id": "E1"},
+        witness_data={"name": "Test Prüfer"},
+        receipt={"receipt_id": f"WINDI-RCPT-{i:04d}"}, domain_tag=domain)
+
+
+def _make_due(outbox):
+    outbox._conn().execute("UPDATE outbox SET next_attempt_at = 0 WHERE status = 'pending'")
+
+
+def _drain(dispatcher):
+    total = 0
+    while True:
+        n = dispatcher.run_once()
+        if not n:
+            return total
+        total += n
+
+
+# ═══════════════════════════════════════════════════════════════
+# TESTS
+# ═══════════════════════════════════════════════════════════════
+
+results = []
+ledger = StubLedger()
+server = StubServer(ledger)
+PORT = server.port
+server.stop()                                   # start in an outage
+URL = f"http://127.0.0.1:{PORT}/api/generate"
+BATCH_URL = f"http://127.0.0.1:{PORT}/api/generate-batch"
+
+outbox = gb.get_outbox()
+dispatcher = OutboxDispatcher(outbox, api_url=URL, batch_url=BATCH_URL, batch_size=20,
+                              rate=1000, burst=1000, timeout=2)
+gb._dispatcher = dispatcher                      # module-level submit uses the stub
+dispatcher.start = lambda: None                  # drive it by hand until TEST 6
+
+# ─── TEST 1 ───────────────────────────────────────────────────
+_header("TEST 1: Finalize only enqueues")
+t0 = time.perf_counter()
+queued = [_submit(i) for i in range(50)]
+elapsed_ms = (time.perf_counter() - t0) * 1000
+corrs = [q["bridge_correlation_id"] for q in queued]
+results.append(_result(
+    "50 submits queued with the API down",
+    all(q and q["status"] == "queued" for q in queued) and outbox.counts()["pending"] == 50,
+    f"{elapsed_ms / 50:.2f} ms per submit"))
+results.append(_result(
+    "correlation IDs unique and sequential",
+    len(set(corrs)) == 50 and corrs[0].endswith("-0001") and corrs[-1].endswith("-0050"),
+    f"{corrs[0]} … {corrs[-1]}"))
+
+# ─── TEST 2 ───────────────────────────────────────────────────
+_header("TEST 2: Outage")
+_drain(dispatcher)
+row = outbox.get(corrs[0])
+results.append(_result(
+    "nothing lost, retry scheduled with backoff",
+    outbox.counts()["pending"] == 50 and row["attempts"] == 1 and row["next_attempt_at"] > time.time(),
+    f"attempts={row['attempts']}, last_error={row['last_error'][:50]}"))
+results.append(_result("not due yet → nothing claimed", dispatcher.run_once() == 0))
+
+# ─── TEST 3 ───────────────────────────────────────────────────
+_header("TEST 3: Recovery")
+server = StubServer(ledger, PORT)
+_make_due(outbox)
+_drain(dispatcher)
+counts = outbox.counts()
+row = outbox.get(corrs[7])
+results.append(_result(
+    "all delivered in batches",
+    counts["delivered"] == 50 and counts["pending"] == 0 and ledger.requests["batch"] == 3,
+    f"counts={counts}, requests={ledger.requests}"))
+results.append(_result(
+    "correlation ID preserved end to end",
+    ledger.order == corrs and row["submission_id"] == ledger.entries[corrs[7]]["submission_id"],
+    f"{corrs[7]} → {row['submission_id']}"))
+
+# ─── TEST 4 ───────────────────────────────────────────────────
+_header("TEST 4: Lost responses")
+more = [_submit(100 + i)["bridge_correlation_id"] for i in range(10)]
+ledger.drop_responses = 1                        # API commits, answer never arrives
+_drain(dispatcher)
+pending_after_drop = outbox.counts()["pending"]
+_make_due(outbox)
+_drain(dispatcher)
+results.append(_result(
+    "retried after lost response",
+    pending_after_drop == 10 and all(outbox.get(c)["status"] == "delivered" for c in more),
+    f"pending after drop={pending_after_drop}"))
+results.append(_result(
+    "ledger exactly-once",
+    len(ledger.order) == 60 and len(set(ledger.order)) == 60,
+    f"ledger entries={len(ledger.order)}"))
+
+# ─── TEST 5 ───────────────────────────────────────────────────
+_header("TEST 5: BLOCKED + single-POST fallback")
+blocked = _submit(200, domain="blocked")["bridge_correlation_id"]
+ledger.batch_enabled = False
+singles = [_submit(300 + i)["bridge_correlation_id"] for i in range(3)]
+before = ledger.requests["single"]
+_drain(dispatcher)
+results.append(_result(
+    "BLOCKED submission rejected, not retried",
+    outbox.get(blocked)["status"] == "rejected" and outbox.get(blocked)["attempts"] == 1))
+results.append(_result(
+    "404 on batch → one POST per submission",
+    all(outbox.get(c)["status"] == "delivered" for c in singles)
+    and ledger.requests["single"] - before == 4 and not dispatcher._batch_supported,
+    f"single POSTs={ledger.requests['single'] - before}"))
+
+# ─── TEST 6 ───────────────────────────────────────────────────
+_header("TEST 6: Background dispatcher + token bucket")
+bucket = TokenBucket(rate=20, capacity=1)
+t0 = time.perf_counter()
+for _ in range(11):
+    bucket.acquire()
+bucket_s = time.perf_counter() - t0
+results.append(_result("token bucket paces 11 tokens at 20/s", 0.45 <= bucket_s < 0.8, f"{bucket_s:.2f}s"))
+
+del dispatcher.start                             # back to the real thread
+ledger.batch_enabled = True
+dispatcher._batch_supported = True
+server.stop()
+late = [_submit(400 + i)["bridge_correlation_id"] for i in range(5)]
+time.sleep(0.3)
+server = StubServer(ledger, PORT)
+_make_due(outbox)
+dispatcher.notify()
+deadline = time.time() + 10
+while time.time() < deadline and outbox.counts()["pending"]:
+    time.sleep(0.05)
+results.append(_result(
+    "queued during outage, drained by the thread after recovery",
+    all(outbox.get(c)["status"] == "delivered" for c in late) and len(ledger.order) == 68,
+    f"counts={outbox.counts()}"))
+dispatcher.stop()
+
+# Two workers' dispatchers on one outbox: only the lease holder delivers
+first = OutboxDispatcher(outbox, api_url=URL, batch_url=BATCH_URL, rate=1000, burst=1000, timeout=2)
+second = OutboxDispatcher(outbox, api_url=URL, batch_url=BATCH_URL, rate=1000, burst=1000, timeout=2)
+first.start()
+deadline = time.time() + 5
+while time.time() < deadline and not first.is_leader():
+    time.sleep(0.05)
+second.start()
+time.sleep(0.3)
+one_leader = first.is_leader() and not second.is_leader()
+first.stop()                                     # releases the lease
+deadline = time.time() + 5
+while time.time() < deadline and not second.is_leader():
+    time.sleep(0.05)
+handover = [_submit(500)["bridge_correlation_id"]]
+deadline = time.time() + 5
+while time.time() < deadline and outbox.counts()["pending"]:
+    time.sleep(0.05)
+results.append(_result(
+    "one lease holder delivers; lease passes on when it stops",
+    one_leader and second.is_leader() and outbox.get(handover[0])["status"] == "delivered",
+    f"leader={outbox.lease_owner()}"))
+second.stop()
+server.stop()
+
+# ─── TEST 7 ───────────────────────────────────────────────────
+_header("TEST 7: Evidence store")
+stats = gb.get_submission_stats()
+failed_rows = len(gb.query_evidence(event="SUBMIT_FAILED", limit=10000))
+results.append(_result(
+    "running counters match the records",
+    stats["total_queued"] == 70 and stats["total_success"] == 69
+    and stats["total_failed"] == failed_rows and stats["total_attempts"] >= 70 + failed_rows - 1,
+    f"queued={stats['total_queued']} attempts={stats['total_attempts']} "
+    f"success={stats['total_success']} failed={stats['total_failed']}"))
+trail = gb.query_evidence(correlation_id=more[0])
+results.append(_result(
+    "trail by correlation ID (newest first)",
+    [r["event"] for r in trail] == ["SUBMIT_SUCCESS", "SUBMIT_ATTEMPT", "SUBMIT_FAILED",
+                                    "SUBMIT_ATTEMPT", "SUBMIT_QUEUED"]
+    and trail[0]["submission_id"] == ledger.entries[more[0]]["submission_id"],
+    " ← ".join(r["event"] for r in trail)))
+by_doc = gb.query_evidence(doc_id="DOC-0200")
+window = gb.query_evidence(since=time.time() - 3600, until=time.time() + 1, event="SUBMIT_QUEUED", limit=1000)
+results.append(_result(
+    "queries by doc_id and time range",
+    {r["reason"] for r in by_doc if r["event"] == "SUBMIT_FAILED"} == {"blocked"} and len(window) == 70,
+    f"doc events={len(by_doc)}, queued in window={len(window)}"))
+failed_lines = gb.get_failed_submissions(5)
+results.append(_result(
+    "failure tail rendered as log lines",
+    len(failed_lines) == 5 and all("SUBMIT_FAILED" in l and l.startswith("[") for l in failed_lines)))
+try:
+    gb.get_evidence_log()._conn().execute("DELETE FROM evidence")
+    append_only = False
+except Exception:
+    append_only = True
+results.append(_result("append-only (delete refused)", append_only))
+
+os.makedirs(os.path.join(TEST_DIR, "rotated"))
+log_file = os.path.join(TEST_DIR, "rotated", "governance_bridge.log")
+for suffix, day in (("", "2026-02-07"), (".1", "2026-02-06"), (".2", "2026-02-05")):
+    with open(log_file + suffix, "w") as f:
+        f.write(f"[{day} 10:00:00] [BRIDGE] [INFO] SUBMIT_ATTEMPT doc_id=D{suffix} "
+                f"corr=GBR-BRIDGE-{day.replace('-', '')}-0001 level=HIGH receipt=R1\n")
+        f.write(f"[{day} 10:00:01] [BRIDGE] [ERROR] SUBMIT_FAILED doc_id=D{suffix} "
+                f"corr=GBR-BRIDGE-{day.replace('-', '')}-0001 reason=api_unreachable "
+                f"error=\"timed out\" elapsed=10003ms level=HIGH\n")
+_tz = os.environ.get("TZ")
+os.environ["TZ"] = "Europe/Berlin"                # log asctime is local time (CET = UTC+1)
+time.tzset()
+imported = EvidenceLog(os.path.join(TEST_DIR, "imported.db"))
+n = imported.import_log_files(log_file)
+rows = imported.query(event="SUBMIT_FAILED")
+oldest_line = gb._log_line(rows[-1])
+if _tz is None:
+    del os.environ["TZ"]
+else:
+    os.environ["TZ"] = _tz
+time.tzset()
+results.append(_result(
+    "rotated backups imported, oldest first, fields parsed",
+    n == 6 and imported.counters() == {"SUBMIT_ATTEMPT": 3, "SUBMIT_FAILED": 3}
+    and rows[-1]["correlation_id"] == "GBR-BRIDGE-20260205-0001" and rows[0]["elapsed_ms"] == 10003,
+    f"imported={n}"))
+results.append(_result(
+    "imported timestamps read as local time",
+    rows[-1]["ts"] == 1770282001 and oldest_line.startswith("[2026-02-05 10:00:01]"),
+    f"ts={rows[-1]['ts']:.0f} → {oldest_line[:21]}"))
+
+# ─── TEST 8 ───────────────────────────────────────────────────
+_header("TEST 8: Concurrent first open")
+shared_db = os.path.join(TEST_DIR, "shared.db")
+opener = ("import sys, time; sys.path.insert(0, sys.argv[1]); import governance_bridge as gb; "
+          "time.sleep(max(0.0, float(sys.argv[4]) - time.time())); "
+          "gb.EvidenceLog(sys.argv[2], import_from=sys.argv[3])")
+start_at = str(time.time() + 1.5)
+workers = [subprocess.Popen([sys.executable, "-c", opener, os.path.dirname(os.path.abspath(__file__)),
+                             shared_db, log_file, start_at],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(4)]
+codes = [w.wait(timeout=60) for w in workers]
+shared = EvidenceLog(shared_db, import_from=log_file)
+results.append(_result(
+    "4 workers + 1 reopen: text log imported exactly once",
+    codes == [0] * 4 and shared.counters() == {"SUBMIT_ATTEMPT": 3, "SUBMIT_FAILED": 3},
+    f"exit codes={codes}, counters={shared.counters()}"))
+legacy_db = os.path.join(TEST_DIR, "legacy.db")
+legacy = EvidenceLog(legacy_db)
+legacy._conn().execute("DROP TABLE evidence_meta")
+legacy.append([gb._event("SUBMIT_QUEUED", "INFO", "doc_id=D0")])
+reopened = EvidenceLog(legacy_db, import_from=log_file)
+results.append(_result(
+    "store from before the import marker is not re-imported",
+    reopened.counters() == {"SUBMIT_QUEUED": 1}, f"counters={reopened.counters()}"))
+
+
+# ═══════════════════════════════════════════════════════════════
+# SUMMARY
+# ═══════════════════════════════════════════════════════════════
+
+print("\n" + "═" * 50)
+passed = sum(bool(r) for r in results)
+total = len(results)
+print(f"  RESULTS: {passed}/{total} passed")
+
+if passed == total:
+    print("  STATUS:  ✅ ALL TESTS PASSED")
+else:
+    print(f"  STATUS:  ❌ {total - passed} TEST(S) FAILED")
+
+print("═" * 50)
+
+shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+sys.exit(0 if passed == total else 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+WINDI Session Store — Test Suite
+================================
+  TEST 1: Memory backend create / touch / update / delete     → PASS/FAIL
+  TEST 2: Heap expiry (idle + absolute), touch re-arms        → PASS/FAIL
+  TEST 3: SQLite session created in one process, validated
+          and updated in another                              → PASS/FAIL
+  TEST 4: Concurrent workers touching and re-authenticating
+          one session                                         → PASS/FAIL
+  TEST 5: SQLite expiry purge + counters                      → PASS/FAIL
+
+Run: python3 test_session_store.py
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from session_store import MemorySessionStore, SQLiteSessionStore, create_session_store
+
+
+def _header(name):
+    print(f"\n{'─' * 50}")
+    print(f"  {name}")
+    print(f"{'─' * 50}")
+
+
+def _result(test_name, passed, detail=""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status}  {test_name}")
+    if detail:
+        print(f"         {detail}")
+    return passed
+
+
+def _session(user_id, max_age_s=8 * 3600):
+    now = datetime.now(timezone.utc)
+    return {
+        "user_id": user_id,
+        "full_name": f"Test {user_id}",
+        "created_at": now.isoformat(),
+        "last_activity": now.isoformat(),
+        "expires_at": (now + timedelta(seconds=max_age_s)).isoformat(),
+        "reauth_count": 0,
+        "actions_count": 0,
+    }
+
+
+# ─── Worker-process helpers (must be importable for spawn) ───
+
+def _child_validate(db_path, session_id):
+    store = SQLiteSessionStore(db_path, idle_timeout_s=600)
+    sess = store.touch(session_id)
+    if sess:
+        store.increment(session_id, "reauth_count")
+    return {"pid": os.getpid(), "session": sess, "stats": store.stats()}
+
+
+def _child_touch_many(db_path, session_id, n):
+    store = SQLiteSessionStore(db_path, idle_timeout_s=600)
+    return sum(1 for _ in range(n) if store.touch(session_id))
+
+
+def _child_reauth_many(db_path, session_id, n):
+    # What api_reauth does per successful re-authentication
+    store = SQLiteSessionStore(db_path, idle_timeout_s=600)
+    return sum(1 for _ in range(n) if store.touch(session_id) and store.increment(session_id, "reauth_count"))
+
+
+def main():
+    test_dir = tempfile.mkdtemp(prefix="windi_sessions_")
+    db_path = os.path.join(test_dir, "sessions.db")
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+
+    # ─── TEST 1 ───────────────────────────────────────────────
+    _header("TEST 1: Memory backend basics")
+    mem = create_session_store("memory", idle_timeout_s=600)
+    mem.create("S1", _session("E1"))
+    first = mem.touch("S1")
+    first["full_name"] = "mutated copy"
+    mem.update("S1", {"department": "Recht"})
+    second = mem.touch("S1")
+    results.append(_result(
+        "touch returns copies, update persists",
+        second["full_name"] == "Test E1" and second["department"] == "Recht" and second["actions_count"] == 2,
+        f"actions_count={second['actions_count']}"))
+    results.append(_result(
+        "delete → miss",
+        mem.delete("S1") and mem.touch("S1") is None and mem.stats()["misses"] == 1,
+        str(mem.stats())))
+
+    # ─── TEST 2 ───────────────────────────────────────────────
+    _header("TEST 2: Heap expiry")
+    mem = MemorySessionStore(idle_timeout_s=0.4)
+    for i in range(100):
+        mem.create(f"idle-{i}", _session(f"E{i}"))
+    mem.create("kept", _session("K"))
+    mem.create("absolute", _session("A", max_age_s=0.2))
+    for _ in range(4):
+        time.sleep(0.15)
+        mem.touch("kept")
+    mem.purge_expired()
+    evicted = mem.stats()["evictions"]
+    results.append(_result(
+        "idle and absolute expiry evicted without lookups",
+        evicted == 101 and len(mem) == 1 and mem.stats()["expired"] == 0,
+        f"evicted={evicted}, remaining={len(mem)}"))
+    results.append(_result(
+        "touched session re-armed, still valid",
+        mem.touch("kept") is not None and len(mem._heap) <= 2,
+        f"heap={len(mem._heap)}"))
+
+    # ─── TEST 3 ───────────────────────────────────────────────
+    _header("TEST 3: SQLite shared across processes")
+    store = SQLiteSessionStore(db_path, idle_timeout_s=600)
+    store.create("shared", _session("E42"))
+    with ctx.Pool(2) as pool:
+        child = pool.apply(_child_validate, (db_path, "shared"))
+        missing = pool.apply(_child_validate, (db_path, "never-created"))
+    sess = store.touch("shared")
+    results.append(_result(
+        "created here, validated in another process",
+        child["pid"] != os.getpid() and child["session"] and child["session"]["user_id"] == "E42",
+        f"child pid={child['pid']}"))
+    results.append(_result(
+        "child update visible here",
+        sess["reauth_count"] == 1 and sess["actions_count"] == 2,
+        f"reauth_count={sess['reauth_count']}, actions_count={sess['actions_count']}"))
+    results.append(_result(
+        "unknown session is a miss in the child",
+        missing["session"] is None and missing["stats"]["misses"] == 1))
+    store.delete("shared")
+    with ctx.Pool(1) as pool:
+        after = pool.apply(_child_validate, (db_path, "shared"))
+    results.append(_result("logout here invalidates everywhere", after["session"] is None))
+
+    # ─── TEST 4 ───────────────────────────────────────────────
+    _header("TEST 4: Concurrent workers")
+    store.create("busy", _session("E7"))
+    with ctx.Pool(4) as pool:
+        hits = sum(pool.starmap(_child_touch_many, [(db_path, "busy", 50)] * 4))
+    sess = store.touch("busy")
+    results.append(_result(
+        "no lost updates across 4 processes",
+        hits == 200 and sess["actions_count"] == 201,
+        f"hits={hits}, actions_count={sess['actions_count']}"))
+    with ctx.Pool(4) as pool:
+        reauths = sum(pool.starmap(_child_reauth_many, [(db_path, "busy", 50)] * 4))
+    sess = store.touch("busy")
+    results.append(_result(
+        "no lost reauth increments across 4 processes",
+        reauths == 200 and sess["reauth_count"] == 200,
+        f"reauths={reauths}, reauth_count={sess['reauth_count']}"))
+    mem = MemorySessionStore(idle_timeout_s=600)
+    mem.create("m", _session("M"))
+    results.append(_result(
+        "memory backend increments too, unknown session is None",
+        mem.increment("m", "reauth_count") == 1 and mem.increment("m", "reauth_count", 2) == 3
+        and mem.increment("gone", "reauth_count") is None and store.increment("gone", "reauth_count") is None))
+
+    # ─── TEST 5 ───────────────────────────────────────────────
+    _header("TEST 5: SQLite expiry + counters")
+    short = SQLiteSessionStore(db_path, idle_timeout_s=0.2)
+    for i in range(50):
+        short.create(f"short-{i}", _session(f"E{i}"))
+    time.sleep(0.3)
+    expired_lookup = short.touch("short-0")
+    evicted = short.purge_expired()
+    stats = short.stats()
+    results.append(_result(
+        "expired on lookup, rest purged by range delete",
+        expired_lookup is None and stats["expired"] == 1 and evicted >= 49,
+        f"evicted={evicted}, stats={stats}"))
+
+    # ═══════════════════════════════════════════════════════════
+    print("\n" + "═" * 50)
+    passed = sum(bool(r) for r in results)
+    total = len(results)
+    print(f"  RESULTS: {passed}/{total} passed")
+    if passed == total:
+        print("  STATUS:  ✅ ALL TESTS PASSED")
+    else:
+        print(f"  STATUS:  ❌ {total - passed} TEST(S) FAILED")
+    print("═" * 50)
+    shutil.rmtree(test_dir, ignore_errors=True)
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -12,6 +12,7 @@ Architecture:
     ├── deepfake_risk.py         → resilience scoring (0-100)
     ├── pdf_metadata_embed.py    → XMP/custom metadata embedding in PDFs
     ├── registry_provenance.py   → provenance registry for HIGH/MEDIUM
+    ├── provenance_index.py      → shared in-memory index + write-ahead journal
     └── README.md                → department documentation
 
 Principle: "Deepfake copies appearance. We protect origin."
@@ -11,7 +11,7 @@ Each document receives a provenance record proving:
 
 Storage:
     /opt/windi/provenance/records/{submission_id}.json
-    /opt/windi/provenance/index.json
+    /opt/windi/provenance/index.json      (+ index.journal, see provenance_index)
 """
 
 import os
@@ -21,6 +21,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from .structural_hash import compute_structural_hash, compute_content_structural_hash
+from .provenance_index import get_provenance_index
 
 PROVENANCE_VERSION = "1.0.0"
 
@@ -57,13 +58,7 @@ def _safe_write_json(path: str, data: Any) -> None:
 
 
 def _load_index() -> Dict[str, Any]:
-    if not os.path.exists(INDEX_FILE):
-        return {}
-    with open(INDEX_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            return {}
+    return dict(get_provenance_index(INDEX_FILE).items())
 
 
 def _update_index(
@@ -73,16 +68,14 @@ def _update_index(
     governance_level: str,
     resilience_score: int
 ) -> None:
-    idx = _load_index()
-    idx[submission_id] = {
+    get_provenance_index(INDEX_FILE).put(submission_id, {
         "record_path": record_path,
         "structural_hash": structural_hash,
         "governance_level": governance_level,
         "resilience_score": resilience_score,
         "updated_at": _utc_now(),
         "prov_version": PROVENANCE_VERSION,
-    }
-    _safe_write_json(INDEX_FILE, idx)
+    })
 
 
 def _ensure_storage() -> None:
@@ -286,8 +279,7 @@ def persist_provenance_record(record: Dict[str, Any]) -> Optional[str]:
 
 def load_provenance_record(submission_id: str) -> Optional[Dict[str, Any]]:
     """Load a provenance record by submission ID."""
-    idx = _load_index()
-    entry = idx.get(submission_id)
+    entry = get_provenance_index(INDEX_FILE).get(submission_id)
     if not entry:
         return None
     
@@ -0,0 +1,226 @@
+"""
+WINDI DeepDOCFakes — Provenance Index Service
+===============================================
+Shared in-memory view of the provenance index.
+
+provenance_engine, verify_engine and registry_provenance all read the same
+index. Instead of each re-parsing index.json on every call, they share one
+ProvenanceIndex per index path that:
+
+- loads index.json once, then replays the write-ahead journal
+- reloads when the snapshot's inode/mtime/size changes, and tails the
+  journal when another process appended to it
+- keeps structural hashes in a sorted array, so prefix lookups are a
+  binary search instead of a scan over every entry; when several entries
+  share a prefix the one inserted first wins, as with the v1.0 scan
+- appends new entries to the journal (one JSON line each) instead of
+  rewriting the whole index, and folds the journal back into index.json
+  once it grows past COMPACT_EVERY entries
+
+Storage:
+    /opt/windi/provenance/index.json      ← snapshot (same format as v1.0)
+    /opt/windi/provenance/index.journal   ← {"submission_id": ..., "entry": {...}} per line
+"""
+
+import os
+import json
+import bisect
+import fcntl
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+JOURNAL_SUFFIX = ".journal"
+COMPACT_EVERY = 1000
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class ProvenanceIndex:
+    """In-memory, mtime-invalidated provenance index with O(log n) hash-prefix lookup."""
+
+    def __init__(self, index_file: str, compact_every: int = COMPACT_EVERY):
+        self.index_file = index_file
+        self.journal_file = index_file.replace(".json", "") + JOURNAL_SUFFIX
+        self.lock_file = index_file + ".lock"
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._hashes: List[Tuple[str, str]] = []   # sorted (structural_hash, submission_id)
+        self._order: Dict[str, int] = {}            # submission_id → insertion position
+        self._index_sig = None
+        self._journal_ino = None
+        self._journal_offset = 0
+        self._journal_count = 0
+        self._loaded = False
+
+    # ─── Loading ──────────────────────────────────────────────
+
+    def _reset_from_snapshot(self) -> None:
+        entries = {}
+        if os.path.exists(self.index_file):
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                try:
+                    entries = json.load(f)
+                except Exception:
+                    entries = {}
+        self._index_sig = _file_signature(self.index_file)
+        self._entries = entries
+        self._hashes = sorted(
+            (e.get("structural_hash", ""), sid) for sid, e in entries.items()
+        )
+        self._order = {sid: n for n, sid in enumerate(entries)}
+        self._journal_ino = None
+        self._journal_offset = 0
+        self._journal_count = 0
+
+    def _apply(self, submission_id: str, entry: Dict[str, Any]) -> None:
+        old = self._entries.get(submission_id)
+        if old is not None:
+            key = (old.get("structural_hash", ""), submission_id)
+            i = bisect.bisect_left(self._hashes, key)
+            if i < len(self._hashes) and self._hashes[i] == key:
+                del self._hashes[i]
+        else:
+            # Rewriting an entry keeps its position, like a dict update
+            self._order[submission_id] = len(self._order)
+        self._entries[submission_id] = entry
+        bisect.insort(self._hashes, (entry.get("structural_hash", ""), submission_id))
+
+    def _tail_journal(self) -> None:
+        """Apply journal lines written since the last read (by any process)."""
+        sig = _file_signature(self.journal_file)
+        if sig is None:
+            self._journal_ino, self._journal_offset, self._journal_count = None, 0, 0
+            return
+        ino, _, size = sig
+        if self._journal_ino is not None and (ino != self._journal_ino or size < self._journal_offset):
+            # Journal was compacted/replaced: entries are now in the snapshot
+            self._reset_from_snapshot()
+        self._journal_ino = ino
+        if size == self._journal_offset:
+            return
+        with open(self.journal_file, "rb") as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+        # Only consume complete lines; a concurrent writer may be mid-append
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            self._apply(rec["submission_id"], rec["entry"])
+            self._journal_count += 1
+        self._journal_offset += end
+
+    def refresh(self) -> None:
+        """Reload if index.json changed on disk; tail the journal otherwise."""
+        with self._lock:
+            if not self._loaded or _file_signature(self.index_file) != self._index_sig:
+                self._reset_from_snapshot()
+                self._loaded = True
+            self._tail_journal()
+
+    # ─── Queries ──────────────────────────────────────────────
+
+    def get(self, submission_id: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            entry = self._entries.get(submission_id)
+            return dict(entry) if entry else None
+
+    def find_by_hash_prefix(self, hash_prefix: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """First (submission_id, entry) whose structural_hash starts with `hash_prefix`.
+
+        "First" is insertion order, as in the v1.0 scan over index.json: the
+        binary search finds the matching range, and the earliest entry in it wins.
+        """
+        self.refresh()
+        with self._lock:
+            i = bisect.bisect_left(self._hashes, (hash_prefix, ""))
+            best = None
+            while i < len(self._hashes) and self._hashes[i][0].startswith(hash_prefix):
+                sid = self._hashes[i][1]
+                if best is None or self._order[sid] < self._order[best]:
+                    best = sid
+                i += 1
+            if best is not None:
+                return best, dict(self._entries[best])
+        return None
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Snapshot of all entries in insertion order."""
+        self.refresh()
+        with self._lock:
+            return [(sid, dict(e)) for sid, e in self._entries.items()]
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._entries)
+
+    # ─── Writes ───────────────────────────────────────────────
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self.lock_file) or ".", exist_ok=True)
+        with open(self.lock_file, "a") as lf:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def put(self, submission_id: str, entry: Dict[str, Any]) -> None:
+        """Append one entry to the journal (fsync'd) and to the in-memory view."""
+        line = json.dumps(
+            {"submission_id": submission_id, "entry": entry}, ensure_ascii=False
+        ).encode("utf-8") + b"\n"
+        with self._lock, self._file_lock():
+            self.refresh()
+            with open(self.journal_file, "ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._tail_journal()
+            if self._journal_count >= self.compact_every:
+                self._compact()
+
+    def compact(self) -> None:
+        """Fold the journal into index.json."""
+        with self._lock, self._file_lock():
+            self.refresh()
+            self._compact()
+
+    def _compact(self) -> None:
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_file)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._index_sig = _file_signature(self.index_file)
+        self._journal_ino, self._journal_offset, self._journal_count = None, 0, 0
+
+
+_indexes: Dict[str, ProvenanceIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_provenance_index(index_file: str) -> ProvenanceIndex:
+    """Return the process-wide ProvenanceIndex for `index_file`."""
+    path = os.path.abspath(index_file)
+    with _indexes_lock:
+        idx = _indexes.get(path)
+        if idx is None:
+            idx = ProvenanceIndex(path)
+            _indexes[path] = idx
+        return idx
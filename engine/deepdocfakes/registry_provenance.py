@@ -19,19 +19,15 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from .provenance_index import get_provenance_index
+
 PROV_DIR = os.environ.get("WINDI_PROVENANCE_DIR", "/opt/windi/provenance")
 INDEX_FILE = os.path.join(PROV_DIR, "index.json")
 RECORDS_DIR = os.path.join(PROV_DIR, "records")
 
 
 def _load_index() -> Dict[str, Any]:
-    if not os.path.exists(INDEX_FILE):
-        return {}
-    with open(INDEX_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            return {}
+    return dict(get_provenance_index(INDEX_FILE).items())
 
 
 def registry_stats() -> Dict[str, Any]:
@@ -121,11 +117,10 @@ def find_by_hash_prefix(hash_prefix: str) -> Optional[Dict[str, Any]]:
     Find a record by structural hash prefix.
     Useful for verification from PDF metadata where only the hash is available.
     """
-    idx = _load_index()
-    
-    for sid, entry in idx.items():
-        if entry.get("structural_hash", "").startswith(hash_prefix):
-            return {"submission_id": sid, **entry}
+    match = get_provenance_index(INDEX_FILE).find_by_hash_prefix(hash_prefix)
+    if match:
+        sid, entry = match
+        return {"submission_id": sid, **entry}
     
     return None
 
@@ -23,6 +23,7 @@ from enum import Enum
 from typing import Any, Dict, Optional
 
 from .structural_hash import compute_structural_hash
+from .provenance_index import get_provenance_index
 
 PROV_DIR = os.environ.get("WINDI_PROVENANCE_DIR", "/opt/windi/provenance")
 RECORDS_DIR = os.path.join(PROV_DIR, "records")
@@ -40,16 +41,6 @@ class VerificationStatus(str, Enum):
     TAMPERED = "TAMPERED"
 
 
-def _load_index() -> Dict[str, Any]:
-    if not os.path.exists(INDEX_FILE):
-        return {}
-    with open(INDEX_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            return {}
-
-
 def _load_record(path: str) -> Optional[Dict[str, Any]]:
     if not os.path.exists(path):
         return None
@@ -85,8 +76,7 @@ def verify_by_submission_id(
     }
     
     # Check 1: Index lookup
-    idx = _load_index()
-    entry = idx.get(submission_id)
+    entry = get_provenance_index(INDEX_FILE).get(submission_id)
     
     if not entry:
         result["status"] = VerificationStatus.UNKNOWN
@@ -183,12 +173,9 @@ def verify_by_hash(provenance_hash_prefix: str) -> Dict[str, Any]:
     Verify by provenance hash prefix (first 32 chars).
     Useful when only the hash is available (e.g., from PDF metadata).
     """
-    idx = _load_index()
-    
-    for submission_id, entry in idx.items():
-        stored_hash = entry.get("structural_hash", "")
-        if stored_hash.startswith(provenance_hash_prefix):
-            return verify_by_submission_id(submission_id)
+    match = get_provenance_index(INDEX_FILE).find_by_hash_prefix(provenance_hash_prefix)
+    if match:
+        return verify_by_submission_id(match[0])
     
     return {
         "status": VerificationStatus.UNKNOWN,
@@ -265,7 +265,8 @@ class EvolutionAPIHandler(BaseHTTPRequestHandler):
 
     def _handle_events_stats(self, params):
         stats = event_log.get_event_stats()
-        integrity = event_log.verify_chain_integrity()
+        full = params.get("full", ["0"])[0] in ("1", "true")
+        integrity = event_log.verify_chain_integrity(full=full)
         stats["chain_integrity"] = integrity
         self._send_json(stats)
 
@@ -31,6 +31,8 @@ import logging
 import threading
 import datetime
 import traceback
+import concurrent.futures
+from collections import deque
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
@@ -68,7 +70,12 @@ VIRTUE_DB = os.path.join(WINDI_BASE, "data", "virtue_history.db")
 
 # Timing (in seconds)
 HEALTH_CHECK_INTERVAL = 120      # 2 minutes
-CHAIN_CHECK_INTERVAL = 300       # 5 minutes
+HEALTH_PROBE_TIMEOUT = 10        # Per-request urllib timeout
+HEALTH_CYCLE_DEADLINE = 15       # Whole probe cycle (all services concurrently)
+LATENCY_WINDOW = 500             # Samples kept per service for p50/p95/p99
+CHAIN_CHECK_INTERVAL = 300       # 5 minutes (incremental: new rows only)
+CHAIN_FULL_SWEEP_INTERVAL = 86400  # 24 hours (re-verify every row)
+CHAIN_FETCH_BATCH = 1000         # Rows per fetchmany() while walking a chain
 ISP_SCAN_INTERVAL = 900          # 15 minutes
 FLOW_CHECK_INTERVAL = 600        # 10 minutes
 REPORT_INTERVAL = 604800         # 7 days (weekly)
@@ -214,6 +221,27 @@ def init_guard_db():
         )
     """)
 
+    # Hourly per-service counters, updated in the same transaction as
+    # health_checks so uptime never needs to scan the raw table
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS health_rollups (
+            hour TEXT NOT NULL,
+            service TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            healthy INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (hour, service)
+        )
+    """)
+    c.execute("SELECT 1 FROM health_rollups LIMIT 1")
+    if c.fetchone() is None:
+        # One-time backfill from pre-rollup history
+        c.execute("""
+            INSERT INTO health_rollups (hour, service, total, healthy)
+            SELECT substr(timestamp, 1, 13), service, COUNT(*),
+                   SUM(CASE WHEN status = 'HEALTHY' THEN 1 ELSE 0 END)
+            FROM health_checks GROUP BY substr(timestamp, 1, 13), service
+        """)
+
     c.execute("""
         CREATE TABLE IF NOT EXISTS alerts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -250,6 +278,30 @@ def init_guard_db():
             details TEXT
         )
     """)
+    # v1.5 columns: incremental verification metrics
+    c.execute("PRAGMA table_info(chain_checks)")
+    chain_cols = {row[1] for row in c.fetchall()}
+    for col, ddl in (("mode", "TEXT DEFAULT 'full'"),
+                     ("records_scanned", "INTEGER"),
+                     ("cycle_ms", "REAL"),
+                     ("records_per_sec", "REAL")):
+        if col not in chain_cols:
+            c.execute(f"ALTER TABLE chain_checks ADD COLUMN {col} {ddl}")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_chain_checks_mode ON chain_checks(mode, timestamp)")
+
+    # Last verified position per chain table, so each cycle only walks new rows
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS chain_cursors (
+            source TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            last_rowid INTEGER NOT NULL DEFAULT 0,
+            records_verified INTEGER NOT NULL DEFAULT 0,
+            legacy_excluded INTEGER NOT NULL DEFAULT 0,
+            last_value TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (source, table_name)
+        )
+    """)
 
     c.execute("""
         CREATE TABLE IF NOT EXISTS guard_reports (
@@ -295,16 +347,48 @@ def init_guard_db():
 # MODULE 1: HEALTH PROBE
 # ─────────────────────────────────────────────
 
+class LatencyHistogram:
+    """Rolling window of response times for one service."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+
+    def add(self, ms: float):
+        self._samples.append(ms)
+
+    def percentiles(self) -> Dict:
+        if not self._samples:
+            return {"p50": None, "p95": None, "p99": None, "samples": 0}
+        ordered = sorted(self._samples)
+        n = len(ordered)
+
+        def pct(q: float) -> float:
+            return ordered[min(n - 1, int(q * n))]
+
+        return {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "samples": n}
+
+
 class HealthProbe:
     """
     Pings all WINDI APIs across 9 ports.
     Tracks uptime, latency, and service degradation.
+
+    All services are probed concurrently; a cycle never takes longer than
+    HEALTH_CYCLE_DEADLINE — services still pending at the deadline are
+    recorded as DOWN. Each cycle is written in a single transaction.
     """
 
     def __init__(self, alert_engine: "AlertEngine"):
         self.alert_engine = alert_engine
         self.last_results: Dict[str, HealthCheckResult] = {}
         self._consecutive_failures: Dict[str, int] = {}
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        # Twice the service count so a hung request from the previous cycle
+        # cannot starve the next one
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2 * len(WINDI_PORTS), thread_name_prefix="HealthProbe"
+        )
 
     def check_service(self, name: str, config: Dict) -> HealthCheckResult:
         """Check a single service endpoint."""
@@ -321,10 +405,9 @@ class HealthProbe:
         try:
             req = urllib.request.Request(url, method="GET")
             req.add_header("User-Agent", "WINDI-GovernanceGuard/1.2")
-            with urllib.request.urlopen(req, timeout=10) as resp:
+            with urllib.request.urlopen(req, timeout=HEALTH_PROBE_TIMEOUT) as resp:
                 elapsed_ms = (time.time() - start) * 1000
                 status = ServiceStatus.HEALTHY if resp.status == 200 else ServiceStatus.DEGRADED
-                self._consecutive_failures[name] = 0
                 return HealthCheckResult(
                     service=name, port=port, status=status,
                     response_ms=round(elapsed_ms, 2), timestamp=now,
@@ -332,7 +415,6 @@ class HealthProbe:
                 )
         except urllib.error.URLError as e:
             elapsed_ms = (time.time() - start) * 1000
-            self._consecutive_failures[name] = self._consecutive_failures.get(name, 0) + 1
             return HealthCheckResult(
                 service=name, port=port, status=ServiceStatus.DOWN,
                 response_ms=round(elapsed_ms, 2), timestamp=now,
@@ -340,24 +422,55 @@ class HealthProbe:
             )
         except Exception as e:
             elapsed_ms = (time.time() - start) * 1000
-            self._consecutive_failures[name] = self._consecutive_failures.get(name, 0) + 1
             return HealthCheckResult(
                 service=name, port=port, status=ServiceStatus.DOWN,
                 response_ms=round(elapsed_ms, 2), timestamp=now,
                 error=str(e), critical=critical
             )
 
-    def run_full_check(self) -> Dict[str, HealthCheckResult]:
-        """Run health checks on all services."""
+    def _probe_all(self, deadline: float) -> Dict[str, HealthCheckResult]:
+        """Probe every service concurrently, giving up on stragglers at the deadline."""
+        started = time.time()
+        futures = {
+            name: self._pool.submit(self.check_service, name, config)
+            for name, config in WINDI_PORTS.items()
+        }
+        done, _ = concurrent.futures.wait(futures.values(), timeout=deadline)
+
         results = {}
         for name, config in WINDI_PORTS.items():
-            result = self.check_service(name, config)
-            results[name] = result
-            self.last_results[name] = result
+            future = futures[name]
+            if future in done:
+                results[name] = future.result()
+            else:
+                # Left running in the pool; its late result is discarded
+                future.cancel()
+                results[name] = HealthCheckResult(
+                    service=name, port=config["port"], status=ServiceStatus.DOWN,
+                    response_ms=round((time.time() - started) * 1000, 2),
+                    timestamp=datetime.datetime.utcnow().isoformat() + "Z",
+                    error=f"No response within cycle deadline ({deadline}s)",
+                    critical=config.get("critical", False)
+                )
+        return results
 
-            # Store in DB
-            self._store_result(result)
+    def run_full_check(self, deadline: float = HEALTH_CYCLE_DEADLINE) -> Dict[str, HealthCheckResult]:
+        """Run health checks on all services."""
+        results = self._probe_all(deadline)
+
+        with self._lock:
+            for name, result in results.items():
+                self.last_results[name] = result
+                if result.status == ServiceStatus.DOWN:
+                    self._consecutive_failures[name] = self._consecutive_failures.get(name, 0) + 1
+                else:
+                    self._consecutive_failures[name] = 0
+                    self._latency.setdefault(name, LatencyHistogram()).add(result.response_ms)
 
+        # Store in DB — one transaction for the whole cycle
+        self._store_results(list(results.values()))
+
+        for name, result in results.items():
             # Generate alerts
             if result.status == ServiceStatus.DOWN:
                 failures = self._consecutive_failures.get(name, 1)
@@ -402,31 +515,41 @@ class HealthProbe:
 
         return results
 
-    def _store_result(self, result: HealthCheckResult):
+    def latency_percentiles(self) -> Dict[str, Dict]:
+        """p50/p95/p99 response time (ms) per service over the rolling window."""
+        with self._lock:
+            return {name: h.percentiles() for name, h in self._latency.items()}
+
+    def _store_results(self, results: List[HealthCheckResult]):
         try:
             conn = sqlite3.connect(GUARD_DB, timeout=30)
-            conn.execute(
-                "INSERT INTO health_checks (timestamp, service, port, status, response_ms, error, critical) VALUES (?,?,?,?,?,?,?)",
-                (result.timestamp, result.service, result.port, result.status.value,
-                 result.response_ms, result.error, 1 if result.critical else 0)
-            )
-            conn.commit()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO health_checks (timestamp, service, port, status, response_ms, error, critical) VALUES (?,?,?,?,?,?,?)",
+                    [(r.timestamp, r.service, r.port, r.status.value,
+                      r.response_ms, r.error, 1 if r.critical else 0) for r in results]
+                )
+                conn.executemany(
+                    """INSERT INTO health_rollups (hour, service, total, healthy) VALUES (?,?,1,?)
+                       ON CONFLICT(hour, service) DO UPDATE SET
+                           total = total + 1, healthy = healthy + excluded.healthy""",
+                    [(r.timestamp[:13], r.service,
+                      1 if r.status == ServiceStatus.HEALTHY else 0) for r in results]
+                )
             conn.close()
         except Exception as e:
-            log.error("Failed to store health check: %s", e)
+            log.error("Failed to store health checks: %s", e)
 
     def get_uptime_pct(self, hours: int = 168) -> float:
-        """Calculate uptime percentage over given hours (default: 1 week)."""
+        """Calculate uptime percentage over given hours (default: 1 week), from hourly rollups."""
         try:
-            since = (datetime.datetime.utcnow() - datetime.timedelta(hours=hours)).isoformat()
+            since = (datetime.datetime.utcnow() - datetime.timedelta(hours=hours)).isoformat()[:13]
             conn = sqlite3.connect(GUARD_DB, timeout=30)
             c = conn.cursor()
-            c.execute("SELECT COUNT(*) FROM health_checks WHERE timestamp > ?", (since,))
-            total = c.fetchone()[0]
-            c.execute("SELECT COUNT(*) FROM health_checks WHERE timestamp > ? AND status = 'HEALTHY'", (since,))
-            healthy = c.fetchone()[0]
+            c.execute("SELECT SUM(total), SUM(healthy) FROM health_rollups WHERE hour >= ?", (since,))
+            total, healthy = c.fetchone()
             conn.close()
-            return round((healthy / total * 100) if total > 0 else 0, 2)
+            return round((healthy / total * 100) if total else 0, 2)
         except Exception:
             return 0.0
 
@@ -442,19 +565,176 @@ class ChainWatcher:
     Zero-Knowledge: only verifies hashes, never reads sensitive data.
     """
 
+    LEGACY_COLUMNS = ["domain_tag", "source", "origin", "tag"]
+
     def __init__(self, alert_engine: "AlertEngine"):
         self.alert_engine = alert_engine
         self.last_check: Optional[Dict] = None
 
-    def verify_virtue_chain(self) -> Dict:
-        """Verify the integrity of the virtue receipt chain."""
+    # ─── Cursors ──────────────────────────────────────────────
+
+    @staticmethod
+    def _new_cursor() -> Dict:
+        return {"last_rowid": 0, "records_verified": 0, "legacy_excluded": 0, "last_value": None}
+
+    def _load_cursors(self) -> Dict[Tuple[str, str], Dict]:
+        cursors = {}
+        try:
+            conn = sqlite3.connect(GUARD_DB, timeout=30)
+            for source, table, last_rowid, verified, legacy, last_value in conn.execute(
+                "SELECT source, table_name, last_rowid, records_verified, legacy_excluded, last_value FROM chain_cursors"
+            ):
+                cursors[(source, table)] = {
+                    "last_rowid": last_rowid, "records_verified": verified,
+                    "legacy_excluded": legacy, "last_value": last_value
+                }
+            conn.close()
+        except Exception as e:
+            log.error("Failed to load chain cursors: %s", e)
+        return cursors
+
+    def _full_sweep_due(self) -> bool:
+        """True when no full sweep has been stored within CHAIN_FULL_SWEEP_INTERVAL."""
+        try:
+            conn = sqlite3.connect(GUARD_DB, timeout=30)
+            row = conn.execute("SELECT MAX(timestamp) FROM chain_checks WHERE mode = 'full'").fetchone()
+            conn.close()
+        except Exception:
+            return True
+        if not row or not row[0]:
+            return True
+        last = datetime.datetime.fromisoformat(row[0].rstrip("Z"))
+        return (datetime.datetime.utcnow() - last).total_seconds() >= CHAIN_FULL_SWEEP_INTERVAL
+
+    # ─── Chain walks ──────────────────────────────────────────
+
+    def _walk_hash_table(self, c, table: str, cursor: Dict, result: Dict,
+                         count_only: bool = False) -> Dict:
+        """
+        Verify rows of `table` past the cursor; return the advanced cursor.
+        Only rowid, the first hash column and the legacy tag are read.
+        The cursor never moves past a broken row, so the break is reported
+        again on every cycle until the row is fixed.
+
+        `records_checked` and `legacy_excluded` in `result` grow by the whole
+        table (as before cursors existed); `records_scanned` by the rows
+        actually walked in this cycle.
+        """
+        c.execute(f"PRAGMA table_info([{table}])")
+        columns = [col[1] for col in c.fetchall()]
+        hash_cols = [col for col in columns if "hash" in col.lower()]
+        legacy_col = next((col for col in self.LEGACY_COLUMNS if col in columns), None)
+
+        last = cursor["last_rowid"]
+        c.execute(f"SELECT MAX(rowid) FROM [{table}]")
+        max_rowid = c.fetchone()[0] or 0
+        if max_rowid < last:
+            result["details"].append(
+                f"Table '{table}' shrank below verified rowid {last} — re-verifying from start"
+            )
+            cursor, last = self._new_cursor(), 0
+
+        checked = legacy = 0
+        held = None   # (rowid, checked, legacy) just before the first break
+        if count_only or not hash_cols:
+            c.execute(f"SELECT COUNT(*) FROM [{table}] WHERE rowid > ? AND rowid <= ?", (last, max_rowid))
+            checked = c.fetchone()[0]
+            last = max_rowid
+        else:
+            legacy_expr = f"[{legacy_col}]" if legacy_col else "NULL"
+            c.execute(
+                f"SELECT rowid, [{hash_cols[0]}], {legacy_expr} FROM [{table}] WHERE rowid > ? ORDER BY rowid",
+                (last,)
+            )
+            while True:
+                rows = c.fetchmany(CHAIN_FETCH_BATCH)
+                if not rows:
+                    break
+                for rowid, current_hash, legacy_val in rows:
+                    if current_hash is None or current_hash == "":
+                        if legacy_val == "legacy":
+                            # Exclude legacy pre-chain records (before hash system was implemented)
+                            legacy += 1
+                            last = rowid
+                            continue
+                        result["breaks_found"] += 1
+                        result["details"].append(f"Null hash at rowid {rowid} in {table}")
+                        if held is None:
+                            held = (last, checked, legacy)
+                    checked += 1
+                    last = rowid
+
+        result["records_scanned"] += checked
+        result["records_checked"] += cursor["records_verified"] + checked
+        result["legacy_excluded"] += cursor["legacy_excluded"] + legacy
+        if held is not None:
+            last, checked, legacy = held
+        return {
+            "last_rowid": last,
+            "records_verified": cursor["records_verified"] + checked,
+            "legacy_excluded": cursor["legacy_excluded"] + legacy,
+            "last_value": None,
+        }
+
+    def _walk_temporal_table(self, c, table: str, cursor: Dict, result: Dict) -> Dict:
+        """
+        Check that timestamps never go backwards, continuing from the cursor.
+        Like _walk_hash_table, the cursor stops just before the first break.
+        """
+        last, prev_ts, checked = cursor["last_rowid"], cursor["last_value"], 0
+        held = None   # (id, timestamp, checked) just before the first break
+        c.execute(f"SELECT id, timestamp FROM [{table}] WHERE id > ? ORDER BY id", (last,))
+        while True:
+            rows = c.fetchmany(CHAIN_FETCH_BATCH)
+            if not rows:
+                break
+            for row_id, ts in rows:
+                if prev_ts and ts < prev_ts:
+                    result["breaks_found"] += 1
+                    result["details"].append(f"Temporal break at record {row_id}: {ts} < {prev_ts}")
+                    if held is None:
+                        held = (last, prev_ts, checked)
+                prev_ts = ts
+                checked += 1
+                last = row_id
+
+        result["records_scanned"] += checked
+        result["records_checked"] += cursor["records_verified"] + checked
+        if held is not None:
+            last, prev_ts, checked = held
+        return {
+            "last_rowid": last,
+            "records_verified": cursor["records_verified"] + checked,
+            "legacy_excluded": 0,
+            "last_value": prev_ts,
+        }
+
+    def verify_virtue_chain(self, full: Optional[bool] = None) -> Dict:
+        """
+        Verify the integrity of the virtue receipt chain.
+
+        Incremental by default: only rows added since the last verified
+        rowid (per table, kept in chain_cursors) are walked. Every
+        CHAIN_FULL_SWEEP_INTERVAL — or when `full=True` — all rows are
+        re-verified from the start.
+
+        `records_checked` is the number of records in the chain, whatever the
+        mode; `records_scanned` is how many of them this cycle walked.
+        """
         now = datetime.datetime.utcnow().isoformat() + "Z"
+        started = time.time()
+        if full is None:
+            full = self._full_sweep_due()
         result = {
             "timestamp": now,
+            "mode": "full" if full else "incremental",
             "integrity_valid": True,
             "records_checked": 0,
+            "records_scanned": 0,
             "breaks_found": 0,
             "legacy_excluded": 0,
+            "cycle_ms": 0.0,
+            "records_per_sec": 0.0,
             "details": []
         }
 
@@ -464,6 +744,9 @@ class ChainWatcher:
             self._store_result(result)
             return result
 
+        cursors = {} if full else self._load_cursors()
+        advanced: Dict[Tuple[str, str], Dict] = {}
+
         try:
             conn = sqlite3.connect(VIRTUE_DB)
             c = conn.cursor()
@@ -484,74 +767,39 @@ class ChainWatcher:
                     babel_tables = [row[0] for row in c2.fetchall()]
 
                     if "governance_audit" in babel_tables:
-                        c2.execute("SELECT COUNT(*) FROM governance_audit")
-                        count = c2.fetchone()[0]
-                        result["records_checked"] = count
-                        result["details"].append(f"Governance audit chain: {count} records found")
-
-                        # Verify sequential integrity
-                        c2.execute("SELECT id, timestamp FROM governance_audit ORDER BY id")
-                        rows = c2.fetchall()
-                        prev_ts = None
-                        for row_id, ts in rows:
-                            if prev_ts and ts < prev_ts:
-                                result["breaks_found"] += 1
-                                result["details"].append(
-                                    f"Temporal break at record {row_id}: {ts} < {prev_ts}"
-                                )
-                            prev_ts = ts
+                        key = ("babel", "governance_audit")
+                        before = result["records_checked"]
+                        cur = self._walk_temporal_table(
+                            c2, "governance_audit", cursors.get(key, self._new_cursor()), result
+                        )
+                        advanced[key] = cur
+                        result["details"].append(
+                            f"Governance audit chain: {result['records_checked'] - before} records found"
+                        )
 
                     if "document_audit" in babel_tables:
-                        c2.execute("SELECT COUNT(*) FROM document_audit")
-                        doc_count = c2.fetchone()[0]
-                        result["records_checked"] += doc_count
-                        result["details"].append(f"Document audit chain: {doc_count} records found")
+                        key = ("babel", "document_audit")
+                        before = result["records_checked"]
+                        cur = self._walk_hash_table(
+                            c2, "document_audit", cursors.get(key, self._new_cursor()), result,
+                            count_only=True
+                        )
+                        advanced[key] = cur
+                        result["details"].append(
+                            f"Document audit chain: {result['records_checked'] - before} records found"
+                        )
 
                     conn2.close()
             else:
                 for table in receipt_tables:
-                    c.execute(f"SELECT COUNT(*) FROM [{table}]")
-                    count = c.fetchone()[0]
-                    result["records_checked"] += count
-                    result["details"].append(f"Table '{table}': {count} records")
-
-                    # Verify hash chain if hash columns exist
-                    c.execute(f"PRAGMA table_info([{table}])")
-                    columns = [col[1] for col in c.fetchall()]
-                    hash_cols = [col for col in columns if "hash" in col.lower()]
-
-                    if hash_cols:
-                        c.execute(f"SELECT * FROM [{table}] ORDER BY rowid")
-                        rows = c.fetchall()
-                        prev_hash = None
-                        # Check for domain_tag/source column to identify legacy records
-                        legacy_col_names = ["domain_tag", "source", "origin", "tag"]
-                        legacy_idx = None
-                        for col_name in legacy_col_names:
-                            if col_name in columns:
-                                legacy_idx = columns.index(col_name)
-                                break
-
-                        for i, row in enumerate(rows):
-                            # Check for null hashes
-                            hash_idx = columns.index(hash_cols[0])
-                            current_hash = row[hash_idx] if hash_idx < len(row) else None
-
-                            # Check if this is a legacy pre-chain record
-                            is_legacy = False
-                            if legacy_idx is not None and legacy_idx < len(row):
-                                legacy_val = row[legacy_idx]
-                                if legacy_val == "legacy" and (current_hash is None or current_hash == ""):
-                                    is_legacy = True
-
-                            if current_hash is None or current_hash == "":
-                                if is_legacy:
-                                    # Exclude legacy pre-chain records (before hash system was implemented)
-                                    result["legacy_excluded"] += 1
-                                    result["records_checked"] -= 1  # Don't count legacy in verified records
-                                else:
-                                    result["breaks_found"] += 1
-                                    result["details"].append(f"Null hash at row {i+1} in {table}")
+                    key = ("virtue", table)
+                    before = result["records_checked"], result["records_scanned"]
+                    cur = self._walk_hash_table(c, table, cursors.get(key, self._new_cursor()), result)
+                    advanced[key] = cur
+                    result["details"].append(
+                        f"Table '{table}': {result['records_checked'] - before[0]} records"
+                        f" ({result['records_scanned'] - before[1]} new)"
+                    )
 
             conn.close()
 
@@ -559,6 +807,11 @@ class ChainWatcher:
             result["integrity_valid"] = False
             result["details"].append(f"Chain verification error: {str(e)}")
             log.error("ChainWatcher error: %s", e)
+            advanced = {}   # Do not move cursors past rows that were not verified
+
+        elapsed = time.time() - started
+        result["cycle_ms"] = round(elapsed * 1000, 2)
+        result["records_per_sec"] = round(result["records_scanned"] / elapsed, 1) if elapsed > 0 else 0.0
 
         # Set integrity flag
         if result["breaks_found"] > 0:
@@ -574,12 +827,13 @@ class ChainWatcher:
         else:
             legacy_note = f" ({result['legacy_excluded']} legacy excluded)" if result.get("legacy_excluded", 0) > 0 else ""
             log.info(
-                "ChainWatcher: %d records verified, 0 breaks%s. Chain INTACT.",
-                result["records_checked"], legacy_note
+                "ChainWatcher [%s]: %d records verified (%d new), 0 breaks%s, %.0f rec/s. Chain INTACT.",
+                result["mode"], result["records_checked"], result["records_scanned"],
+                legacy_note, result["records_per_sec"]
             )
 
         self.last_check = result
-        self._store_result(result)
+        self._store_result(result, advanced)
         return result
 
     def verify_config_hash(self) -> Dict:
@@ -657,16 +911,24 @@ class ChainWatcher:
 
         return {"timestamp": now, "tampered": tampered, "new": new_profiles, "checked": checked}
 
-    def _store_result(self, result: Dict):
+    def _store_result(self, result: Dict, cursors: Optional[Dict[Tuple[str, str], Dict]] = None):
         try:
             conn = sqlite3.connect(GUARD_DB, timeout=30)
-            conn.execute(
-                "INSERT INTO chain_checks (timestamp, integrity_valid, records_checked, breaks_found, details) VALUES (?,?,?,?,?)",
-                (result["timestamp"], 1 if result["integrity_valid"] else 0,
-                 result["records_checked"], result["breaks_found"],
-                 json.dumps(result["details"]))
-            )
-            conn.commit()
+            with conn:
+                conn.execute(
+                    "INSERT INTO chain_checks (timestamp, integrity_valid, records_checked, breaks_found, details, mode, records_scanned, cycle_ms, records_per_sec) VALUES (?,?,?,?,?,?,?,?,?)",
+                    (result["timestamp"], 1 if result["integrity_valid"] else 0,
+                     result["records_checked"], result["breaks_found"],
+                     json.dumps(result["details"]), result.get("mode", "full"),
+                     result.get("records_scanned"), result.get("cycle_ms"), result.get("records_per_sec"))
+                )
+                # Cursors advance in the same transaction as the check they belong to
+                conn.executemany(
+                    "INSERT OR REPLACE INTO chain_cursors (source, table_name, last_rowid, records_verified, legacy_excluded, last_value, updated_at) VALUES (?,?,?,?,?,?,?)",
+                    [(source, table, cur["last_rowid"], cur["records_verified"],
+                      cur["legacy_excluded"], cur["last_value"], result["timestamp"])
+                     for (source, table), cur in (cursors or {}).items()]
+                )
             conn.close()
         except Exception as e:
             log.error("Failed to store chain check: %s", e)
@@ -1803,6 +2065,9 @@ def create_guard_api(guard: GovernanceGuard):
                 "response_ms": result.response_ms,
                 "critical": result.critical
             }
+        for name, latency in guard.health_probe.latency_percentiles().items():
+            if name in health_summary:
+                health_summary[name]["latency_ms"] = latency
         return jsonify({
             "guard_status": "running" if guard.running else "stopped",
             "services": health_summary,
@@ -1845,6 +2110,7 @@ Examples:
   python governance_guard.py health          # Health check only
   python governance_guard.py isp             # ISP scan only
   python governance_guard.py chain           # Chain integrity only
+  python governance_guard.py chain --full    # Re-verify the whole chain
 
 "AI processes. Human decides. WINDI guarantees."
         """
@@ -1858,6 +2124,10 @@ Examples:
         "--api", action="store_true",
         help="Start REST API on port 8091 (daemon mode only)"
     )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Re-verify every chain record instead of only new ones (chain mode only)"
+    )
 
     args = parser.parse_args()
     guard = GovernanceGuard()
@@ -1903,9 +2173,12 @@ Examples:
 
     elif args.command == "chain":
         init_guard_db()
-        result = guard._run_chain_check()
+        result = guard.chain_watcher.verify_virtue_chain(full=True if args.full else None)
+        guard.chain_watcher.verify_config_hash()
         icon = "🟢" if result["integrity_valid"] else "🔴"
-        print(f"{icon} Chain: {result['records_checked']} records, {result['breaks_found']} breaks")
+        print(f"{icon} Chain [{result['mode']}]: {result['records_checked']} records "
+              f"({result['records_scanned']} new), {result['breaks_found']} breaks "
+              f"({result['records_per_sec']} rec/s, {result['cycle_ms']}ms)")
         for detail in result["details"]:
             print(f"   → {detail}")
 
@@ -0,0 +1,139 @@
+"""
+WINDI Governance Guard — ChainWatcher cursor test.
+A detected break must stay reported on every following incremental cycle.
+AI processes. Human decides. WINDI guarantees.
+"""
+import os, sys, shutil, sqlite3
+
+TEST_DIR = "/tmp/windi-guard-test"
+if os.path.exists(TEST_DIR): shutil.rmtree(TEST_DIR)
+os.makedirs(os.path.join(TEST_DIR, "data"), exist_ok=True)
+os.environ["WINDI_BASE"] = TEST_DIR
+os.environ["GUARD_DATA"] = os.path.join(TEST_DIR, "guard")
+os.environ["GUARD_LOG"] = os.path.join(TEST_DIR, "guard.log")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import governance_guard as gg
+
+passed = failed = 0
+def test(name, fn):
+    global passed, failed
+    try:
+        fn(); print(f"  PASS  {name}"); passed += 1
+    except Exception as e:
+        print(f"  FAIL  {name}\n        {e}"); failed += 1
+
+print("=" * 70)
+print("WINDI Governance Guard — ChainWatcher Test")
+print("=" * 70)
+
+gg.init_guard_db()
+watcher = gg.ChainWatcher(gg.AlertEngine())
+
+def reset_guard():
+    conn = sqlite3.connect(gg.GUARD_DB)
+    with conn:
+        conn.execute("DELETE FROM chain_cursors")
+        conn.execute("DELETE FROM chain_checks")
+    conn.close()
+
+def make_virtue_db(tampered_rowid=None):
+    if os.path.exists(gg.VIRTUE_DB): os.remove(gg.VIRTUE_DB)
+    conn = sqlite3.connect(gg.VIRTUE_DB)
+    conn.execute("CREATE TABLE virtue_receipts (id INTEGER PRIMARY KEY, receipt_hash TEXT, domain_tag TEXT)")
+    conn.executemany("INSERT INTO virtue_receipts VALUES (?,?,?)",
+                     [(i, f"h{i:04d}", "operational") for i in range(1, 101)])
+    if tampered_rowid:
+        conn.execute("UPDATE virtue_receipts SET receipt_hash = NULL WHERE id = ?", (tampered_rowid,))
+    conn.commit()
+    conn.close()
+
+def make_babel_db(backwards_id=None):
+    if os.path.exists(gg.VIRTUE_DB): os.remove(gg.VIRTUE_DB)
+    sqlite3.connect(gg.VIRTUE_DB).close()          # no receipt tables → BABEL audit
+    if os.path.exists(gg.BABEL_DB): os.remove(gg.BABEL_DB)
+    conn = sqlite3.connect(gg.BABEL_DB)
+    conn.execute("CREATE TABLE governance_audit (id INTEGER PRIMARY KEY, timestamp TEXT)")
+    conn.executemany("INSERT INTO governance_audit VALUES (?,?)",
+                     [(i, f"2026-02-01T00:{i // 60:02d}:{i % 60:02d}Z") for i in range(1, 101)])
+    if backwards_id:
+        conn.execute("UPDATE governance_audit SET timestamp = '2026-01-01T00:00:00Z' WHERE id = ?",
+                     (backwards_id,))
+    conn.commit()
+    conn.close()
+
+def append_virtue_rows(start, n):
+    conn = sqlite3.connect(gg.VIRTUE_DB)
+    conn.executemany("INSERT INTO virtue_receipts VALUES (?,?,?)",
+                     [(i, f"h{i:04d}", "operational") for i in range(start, start + n)])
+    conn.commit()
+    conn.close()
+
+def test_intact_chain_advances():
+    reset_guard(); make_virtue_db()
+    full = watcher.verify_virtue_chain(full=True)
+    assert full["integrity_valid"] and full["records_checked"] == 100, full
+    assert full["records_scanned"] == 100, full
+    append_virtue_rows(101, 5)
+    inc = watcher.verify_virtue_chain(full=False)
+    assert inc["integrity_valid"] and inc["records_scanned"] == 5, inc
+    assert inc["records_checked"] == 105, inc
+
+def test_hash_break_persists():
+    reset_guard(); make_virtue_db(tampered_rowid=40)
+    full = watcher.verify_virtue_chain(full=True)
+    assert not full["integrity_valid"] and full["breaks_found"] == 1, full
+    for cycle in (1, 2):
+        inc = watcher.verify_virtue_chain(full=False)
+        assert inc["mode"] == "incremental", inc
+        assert not inc["integrity_valid"] and inc["breaks_found"] == 1, f"cycle {cycle}: {inc}"
+        assert inc["records_checked"] == full["records_checked"] == 100, f"cycle {cycle}: {inc}"
+    cursors = watcher._load_cursors()
+    assert cursors[("virtue", "virtue_receipts")]["last_rowid"] == 39, cursors
+
+def test_hash_break_clears_after_fix():
+    conn = sqlite3.connect(gg.VIRTUE_DB)
+    conn.execute("UPDATE virtue_receipts SET receipt_hash = 'h0040' WHERE id = 40")
+    conn.commit(); conn.close()
+    inc = watcher.verify_virtue_chain(full=False)
+    assert inc["integrity_valid"] and inc["records_scanned"] == 61, inc
+    assert inc["records_checked"] == 100, inc
+    assert watcher._load_cursors()[("virtue", "virtue_receipts")]["last_rowid"] == 100
+
+def test_temporal_break_persists():
+    reset_guard(); make_babel_db(backwards_id=70)
+    full = watcher.verify_virtue_chain(full=True)
+    assert not full["integrity_valid"] and full["breaks_found"] == 1, full
+    for cycle in (1, 2):
+        inc = watcher.verify_virtue_chain(full=False)
+        assert not inc["integrity_valid"] and inc["breaks_found"] == 1, f"cycle {cycle}: {inc}"
+        assert inc["records_checked"] == 100, f"cycle {cycle}: {inc}"
+    assert watcher._load_cursors()[("babel", "governance_audit")]["last_rowid"] == 69
+
+def test_legacy_rows_excluded():
+    reset_guard(); make_virtue_db()
+    conn = sqlite3.connect(gg.VIRTUE_DB)
+    conn.execute("UPDATE virtue_receipts SET receipt_hash = NULL, domain_tag = 'legacy' WHERE id <= 10")
+    conn.commit(); conn.close()
+    full = watcher.verify_virtue_chain(full=True)
+    assert full["records_checked"] == 90 and full["legacy_excluded"] == 10, full
+    append_virtue_rows(101, 5)
+    inc = watcher.verify_virtue_chain(full=False)
+    assert inc["records_checked"] == 95 and inc["legacy_excluded"] == 10, inc
+    assert inc["records_scanned"] == 5, inc
+    conn = sqlite3.connect(gg.GUARD_DB)
+    stored = conn.execute("SELECT records_checked, records_scanned FROM chain_checks ORDER BY id DESC LIMIT 1").fetchone()
+    conn.close()
+    assert stored == (95, 5), stored
+
+test("Intact chain: incremental cycle walks only new rows", test_intact_chain_advances)
+test("Null hash: break reported on two incremental cycles in a row", test_hash_break_persists)
+test("Null hash repaired: cursor resumes to the end", test_hash_break_clears_after_fix)
+test("Temporal break: reported on two incremental cycles in a row", test_temporal_break_persists)
+test("Legacy rows: excluded from the chain total in every mode", test_legacy_rows_excluded)
+
+print("=" * 70)
+print(f"Results: {passed} passed, {failed} failed")
+print("=" * 70)
+shutil.rmtree(TEST_DIR, ignore_errors=True)
+sys.exit(1 if failed else 0)
@@ -4,9 +4,34 @@
 # "A ordem temporal não importa. A ordem decisória continua humana."
 
 import asyncio
+import threading
 import time
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass, field
+
+# Um pool por backend (claude/gpt/gemini): uma thread presa num backend
+# que não responde — run_in_executor não consegue interrompê-la — só ocupa
+# vagas do próprio backend, nunca as dos outros.
+DEFAULT_WORKERS_PER_BACKEND = 4
+DEFAULT_BACKEND_TIMEOUT_S = 60.0
+DEFAULT_QUEUE_TIMEOUT_S = 60.0
+
+_pool_lock = threading.Lock()
+_backend_pools: Dict[str, ThreadPoolExecutor] = {}
+
+
+def get_worker_pool(backend: str, max_workers: int = DEFAULT_WORKERS_PER_BACKEND) -> ThreadPoolExecutor:
+    """Retorna o pool do backend neste processo (criado sob demanda)."""
+    with _pool_lock:
+        pool = _backend_pools.get(backend)
+        if pool is None:
+            pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"windi-dragon-{backend}"
+            )
+            _backend_pools[backend] = pool
+        return pool
+
 
 @dataclass
 class ParallelResult:
@@ -17,6 +42,32 @@ class ParallelResult:
     total_time_s: float
     partial_failure: bool
     failed_backends: list
+    latencies_s: Dict[str, float] = field(default_factory=dict)
+    timed_out_backends: list = field(default_factory=list)
+    cancelled_backends: list = field(default_factory=list)
+    quorum: Optional[int] = None
+    quorum_reached: bool = True
+
+    def answered_backends(self) -> list:
+        """Backends que responderam sem fail_closed."""
+        return [b for b in self.latencies_s if b not in self.failed_backends]
+
+    def divergence_inputs(self) -> Dict[str, str]:
+        """
+        Textos para TriDivergenceDetector.detect(...).
+
+        Backends ausentes (timeout, cancelados, falha) viram "" — o detector
+        continua rodando sobre o que chegou; a decisão segue humana.
+        """
+        responses = {
+            "claude": self.claude_response,
+            "gpt": self.gpt_response,
+            "gemini": self.gemini_response,
+        }
+        return {
+            backend: (resp or {}).get("response", "") if backend not in self.failed_backends else ""
+            for backend, resp in responses.items()
+        }
 
 
 class ParallelExecutor:
@@ -25,21 +76,49 @@ class ParallelExecutor:
     
     REGRA: Ordem temporal não afeta ordem decisória.
     BENEFÍCIO: Reduz ~28s para ~15s em dual-run.
+
+    Todos os backends são agendados de uma vez, cada um no seu pool; cada
+    um tem seu próprio deadline, contado a partir do momento em que a
+    chamada começa a rodar (a espera na fila do pool tem limite próprio,
+    queue_timeout_s). Com `quorum`, retorna assim que N backends
+    responderam e cancela os restantes (stragglers).
     """
     
-    def __init__(self, orchestrator):
+    def __init__(
+        self,
+        orchestrator,
+        backend_timeout_s: Union[float, Dict[str, float]] = DEFAULT_BACKEND_TIMEOUT_S,
+        pool: Optional[ThreadPoolExecutor] = None,
+        queue_timeout_s: float = DEFAULT_QUEUE_TIMEOUT_S
+    ):
         self.orch = orchestrator
+        self.backend_timeout_s = backend_timeout_s
+        self.pool = pool
+        self.queue_timeout_s = queue_timeout_s
+    
+    def _pool_for(self, backend: str) -> ThreadPoolExecutor:
+        return self.pool or get_worker_pool(backend)
+    
+    def _timeout_for(self, backend: str) -> Optional[float]:
+        if isinstance(self.backend_timeout_s, dict):
+            return self.backend_timeout_s.get(backend, DEFAULT_BACKEND_TIMEOUT_S)
+        return self.backend_timeout_s
     
-    async def _call_worker_async(
+    def _call_worker(
         self,
         backend: str,
         query: str,
         system_prompt: str,
         receipt_id: str,
         classification: Dict
-    ) -> Dict[str, Any]:
-        """Wrapper async para chamada síncrona do worker."""
-        loop = asyncio.get_event_loop()
+    ) -> tuple:
+        """
+        Agenda a chamada síncrona do worker no pool do backend.
+
+        Retorna (started, call): `started` resolve quando a thread começa a
+        executar; `call` resolve com a resposta. None se o backend não existe.
+        """
+        loop = asyncio.get_running_loop()
         
         if backend == "claude":
             worker = self.orch.claude_worker
@@ -48,16 +127,60 @@ class ParallelExecutor:
         elif backend == "gemini":
             worker = self.orch.gemini_worker
         else:
-            return {"error": f"Unknown backend: {backend}", "fail_closed": True}
+            return None
+        
+        started = loop.create_future()
         
-        # Executa em thread separada para não bloquear
-        return await loop.run_in_executor(
-            None,
-            lambda: worker.chat(
+        def run():
+            loop.call_soon_threadsafe(
+                lambda: started.done() or started.set_result(time.monotonic())
+            )
+            return worker.chat(
                 query, system_prompt, self.orch.canon,
                 receipt_id, classification
             )
-        )
+        
+        # Executa no pool do backend para não bloquear o loop
+        return started, loop.run_in_executor(self._pool_for(backend), run)
+    
+    async def _timed_call(self, backend: str, *args) -> tuple:
+        """Executa um backend com deadline próprio. Retorna (backend, resposta, latência)."""
+        t0 = time.monotonic()
+        timeout = self._timeout_for(backend)
+        scheduled = self._call_worker(backend, *args)
+        if scheduled is None:
+            response = {"error": f"Unknown backend: {backend}", "fail_closed": True,
+                        "flags": {"fail_closed": True, "fail_reason": "unknown_backend"}}
+            return backend, response, round(time.monotonic() - t0, 3)
+        started, call = scheduled
+        try:
+            # Espera na fila não conta para o deadline do backend
+            await asyncio.wait_for(asyncio.shield(started), timeout=self.queue_timeout_s)
+            response = await asyncio.wait_for(call, timeout=timeout)
+        except asyncio.TimeoutError:
+            if not started.done():
+                call.cancel()             # ainda na fila: nunca chega a rodar
+                response = {
+                    "error": f"{backend} did not start within {self.queue_timeout_s}s "
+                             f"(worker pool saturated)",
+                    "flags": {"fail_closed": True, "fail_reason": "queue_timeout"},
+                    "timed_out": True,
+                }
+            else:
+                response = {
+                    "error": f"{backend} timed out after {timeout}s",
+                    "flags": {"fail_closed": True, "fail_reason": "timeout"},
+                    "timed_out": True,
+                }
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except Exception as e:
+            response = {
+                "error": str(e),
+                "flags": {"fail_closed": True, "fail_reason": str(e)}
+            }
+        return backend, response, round(time.monotonic() - t0, 3)
     
     async def dual_run(
         self,
@@ -65,7 +188,8 @@ class ParallelExecutor:
         system_prompt: str,
         receipt_id: str,
         classification: Dict,
-        backends: list = ["claude", "gpt"]
+        backends: list = ["claude", "gpt"],
+        quorum: Optional[int] = None
     ) -> ParallelResult:
         """
         Executa dois backends em paralelo.
@@ -76,45 +200,71 @@ class ParallelExecutor:
             receipt_id: WINDI receipt
             classification: Risk classification dict
             backends: Lista de backends a executar
+            quorum: Se definido, retorna quando N backends responderam
+                    com sucesso; os demais são cancelados
             
         Returns:
-            ParallelResult com respostas de ambos
+            ParallelResult com respostas e latência por backend
         """
-        t0 = time.time()
+        t0 = time.monotonic()
+        args = (query, system_prompt, receipt_id, classification)
         
-        tasks = []
-        for backend in backends:
-            task = self._call_worker_async(
-                backend, query, system_prompt, receipt_id, classification
-            )
-            tasks.append((backend, task))
+        # Agenda todos de uma vez — antes eram aguardados um a um
+        pending = {
+            asyncio.ensure_future(self._timed_call(backend, *args)): backend
+            for backend in backends
+        }
         
-        # Executa todos em paralelo
         results = {}
+        latencies = {}
         failed = []
+        timed_out = []
+        answered = 0
         
-        for backend, task in tasks:
-            try:
-                results[backend] = await task
-                if results[backend].get("flags", {}).get("fail_closed"):
-                    failed.append(backend)
-            except Exception as e:
-                results[backend] = {
-                    "error": str(e),
-                    "flags": {"fail_closed": True, "fail_reason": str(e)}
-                }
-                failed.append(backend)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending.keys(), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.pop(task)
+                    backend, response, latency = task.result()
+                    results[backend] = response
+                    latencies[backend] = latency
+                    if response.get("timed_out"):
+                        timed_out.append(backend)
+                    if response.get("flags", {}).get("fail_closed"):
+                        failed.append(backend)
+                    else:
+                        answered += 1
+                if quorum is not None and answered >= quorum:
+                    break
+        finally:
+            # Cancela stragglers: chamadas ainda na fila não rodam; a thread
+            # de uma chamada em curso termina sozinha e o resultado é descartado
+            for task in pending:
+                task.cancel()
         
-        t1 = time.time()
+        cancelled = [pending[task] for task in pending]
+        for backend in cancelled:
+            results[backend] = {
+                "error": f"{backend} cancelled after quorum",
+                "flags": {"fail_closed": True, "fail_reason": "cancelled"},
+            }
         
         return ParallelResult(
             claude_response=results.get("claude"),
             gpt_response=results.get("gpt"),
             gemini_response=results.get("gemini"),
             parallel=True,
-            total_time_s=round(t1 - t0, 3),
-            partial_failure=len(failed) > 0,
-            failed_backends=failed
+            total_time_s=round(time.monotonic() - t0, 3),
+            partial_failure=len(failed) > 0 or len(cancelled) > 0,
+            failed_backends=failed,
+            latencies_s=latencies,
+            timed_out_backends=timed_out,
+            cancelled_backends=cancelled,
+            quorum=quorum,
+            quorum_reached=quorum is None or answered >= quorum
         )
     
     async def tri_run(
@@ -122,12 +272,19 @@ class ParallelExecutor:
         query: str,
         system_prompt: str,
         receipt_id: str,
-        classification: Dict
+        classification: Dict,
+        quorum: Optional[int] = None
     ) -> ParallelResult:
-        """Executa três backends em paralelo."""
+        """
+        Executa três backends em paralelo.
+
+        quorum=2 retorna quando 2 de 3 responderam; TriDivergenceDetector
+        pode rodar sobre result.divergence_inputs().
+        """
         return await self.dual_run(
             query, system_prompt, receipt_id, classification,
-            backends=["claude", "gpt", "gemini"]
+            backends=["claude", "gpt", "gemini"],
+            quorum=quorum
         )
 
 
@@ -148,9 +305,38 @@ if __name__ == "__main__":
     print("=" * 60)
     print("WINDI PARALLEL EXECUTOR - Module loaded")
     print("=" * 60)
-    print("\nUsage:")
-    print("  from engine.parallel import ParallelExecutor")
-    print("  executor = ParallelExecutor(orchestrator)")
-    print("  result = await executor.dual_run(...)")
+
+    class _SlowWorker:
+        def __init__(self, name, delay):
+            self.name, self.delay = name, delay
+
+        def chat(self, *args):
+            time.sleep(self.delay)
+            return {"response": f"{self.name} answer", "flags": {}}
+
+    class _MockOrchestrator:
+        canon = None
+        claude_worker = _SlowWorker("claude", 0.3)
+        gpt_worker = _SlowWorker("gpt", 0.3)
+        gemini_worker = _SlowWorker("gemini", 2.0)
+
+    executor = ParallelExecutor(_MockOrchestrator(), backend_timeout_s={"gemini": 1.0})
+    dual = asyncio.run(executor.dual_run("q", "sp", "R-1", {}))
+    print(f"\nDual-run:   {dual.total_time_s}s  latencies={dual.latencies_s}")
+    tri = asyncio.run(executor.tri_run("q", "sp", "R-1", {}))
+    print(f"Tri-run:    {tri.total_time_s}s  timed_out={tri.timed_out_backends}")
+    quorum = asyncio.run(executor.tri_run("q", "sp", "R-1", {}, quorum=2))
+    print(f"Quorum 2/3: {quorum.total_time_s}s  cancelled={quorum.cancelled_backends}")
+    print(f"Divergence inputs: {quorum.divergence_inputs()}")
+
+    # Gemini travado: ocupa só o próprio pool; claude/gpt seguem no prazo
+    _MockOrchestrator.gemini_worker = _SlowWorker("gemini", 5.0)
+    hung = ParallelExecutor(_MockOrchestrator(), backend_timeout_s={"gemini": 0.2},
+                            queue_timeout_s=0.5)
+    for i in range(DEFAULT_WORKERS_PER_BACKEND + 2):
+        run = asyncio.run(hung.tri_run("q", "sp", f"R-{i}", {}))
+        reasons = {b: (getattr(run, f"{b}_response") or {}).get("flags", {}).get("fail_reason")
+                   for b in run.failed_backends}
+        print(f"Hung gemini #{i + 1}: {run.total_time_s}s  failed={reasons}")
     print("\nBenefício esperado: ~28s → ~15s em dual-run")
     print("=" * 60)
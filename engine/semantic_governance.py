@@ -17,8 +17,11 @@ Principle: "The system that governs documents must also govern
 its own communication about those documents."
 """
 
+import os
 import re
+import html
 import json
+import bisect
 import hashlib
 from datetime import datetime, timezone
 from dataclasses import dataclass, field, asdict
@@ -69,7 +72,7 @@ class ScanReport:
     document_name: str
     scan_timestamp: str
     scan_hash: str
-    engine_version: str = "1.0.0"
+    engine_version: str = "1.1.0"
     findings: List[Finding] = field(default_factory=list)
     overall_risk: RiskLevel = RiskLevel.NONE
     score: int = 100  # Semantic Governance Score (100 = clean)
@@ -189,6 +192,18 @@ AUTONOMY_PATTERNS = [
     (r'\b(?:automatisch\s+(?:genehmigt|abgelehnt|zertifiziert))\b', "DE: Automated authority claim"),
 ]
 
+# Keywords that mark a disclosure/transparency block around an entity
+DISCLOSURE_CONTEXT_KEYWORDS = [
+    "transparency notice", "governance disclosure",
+    "hinweis", "not affiliated", "not endorsed",
+    "not published by", "independently produced",
+    "keine veröffentlichung", "nicht verbunden",
+    "editorial format", "editorial-style",
+    "journalistischen stil",
+    "no impersonation", "prohibited",
+]
+DISCLOSURE_CONTEXT_WINDOW = 500
+
 # WINDI Invariant definitions for mapping
 INVARIANTS = {
     "I1": {"name": "Sovereignty", "desc": "No borrowed institutional authority"},
@@ -202,6 +217,272 @@ INVARIANTS = {
 }
 
 
+# ════════════════════════════════════════════════════════════
+# COMPILED MATCHERS
+# ════════════════════════════════════════════════════════════
+
+_LETTER = r'[A-Za-zÀ-ÿ]'
+
+
+def _entity_pattern(entity: str) -> str:
+    """Boundary rule per entity (same as the v1.0 per-entity regex)."""
+    # e.g. "BILD" should not match "Erscheinungsbild"
+    # Short entities (<=3 chars) require strict boundaries
+    if len(entity) <= 3:
+        return r'(?<!' + _LETTER + r')' + re.escape(entity) + r'(?!' + _LETTER + r')'
+    return r'\b' + re.escape(entity) + r'\b'
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Case-folded character trie rendered as a regex.
+
+    At each offset the regex engine follows one trie path instead of
+    trying every alternative; longer continuations are tried first.
+    """
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w.lower():
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(child)
+                for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+def _can_shadow(inner: str, outer: str) -> bool:
+    """
+    True if a match of `outer` can swallow an occurrence of `inner`.
+
+    A single alternation pass never reports overlapping matches, so
+    `inner` could be hidden when it starts at a word start inside `outer`
+    (e.g. "Morgan Stanley" inside "JP Morgan Stanley").
+    """
+    for p in range(len(outer)):
+        if p and outer[p - 1].isalnum():
+            continue
+        tail = outer[p:]
+        if tail.startswith(inner) and (p > 0 or len(inner) < len(outer)):
+            return True
+        if p > 0 and inner.startswith(tail):
+            return True
+    return False
+
+
+class EntityMatcher:
+    """
+    All sensitive entities compiled into one case-insensitive trie regex.
+
+    find_first() makes one pass over the text and returns the first match
+    offset for every entity. Entities that another entity's match could
+    swallow are precomputed and re-checked with their own pattern, so the
+    result equals a separate re.search per entity.
+    """
+
+    def __init__(self, entities: List[str]):
+        self.entities = list(entities)
+        unique = sorted(set(self.entities), key=lambda e: (-len(e), e))
+        long_entities = [e for e in unique if len(e) > 3]
+        short_entities = [e for e in unique if len(e) <= 3]
+        branches = []
+        if long_entities:
+            branches.append(r'\b(?:' + _trie_pattern(long_entities) + r')\b')
+        if short_entities:
+            branches.append(r'(?<!' + _LETTER + r')(?:' + _trie_pattern(short_entities)
+                            + r')(?!' + _LETTER + r')')
+        self._regex = re.compile("|".join(branches), re.IGNORECASE) if branches else None
+        self._unique_count = len(unique)
+        self._by_key: Dict[str, List[str]] = {}
+        for e in unique:
+            self._by_key.setdefault(e.lower(), []).append(e)
+        self._patterns = {
+            e: re.compile(_entity_pattern(e), re.IGNORECASE) for e in unique
+        }
+        lowered = [e.lower() for e in unique]
+        self._shadowable = [
+            e for e, el in zip(unique, lowered)
+            if any(o != el and _can_shadow(el, o) for o in lowered)
+        ]
+
+    def finditer(self, entity: str, text: str):
+        """All boundary-respecting matches of one entity."""
+        return self._patterns[entity].finditer(text)
+
+    def find_first(self, text: str) -> Dict[str, int]:
+        """Map entity -> offset of its first boundary-respecting match."""
+        first: Dict[str, int] = {}
+        if self._regex is None:
+            return first
+        for m in self._regex.finditer(text):
+            matched = self._by_key.get(m.group().lower())
+            if matched is None:
+                # Case folding that str.lower() does not mirror
+                matched = [e for e, rx in self._patterns.items()
+                           if rx.fullmatch(m.group())]
+            for entity in matched:
+                first.setdefault(entity, m.start())
+            if len(first) == self._unique_count:
+                break
+        for entity in self._shadowable:
+            m = self._patterns[entity].search(text)
+            if m and (entity not in first or m.start() < first[entity]):
+                first[entity] = m.start()
+        return first
+
+
+_DISCLOSURE_CONTEXT_REGEX = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in
+                      sorted(DISCLOSURE_CONTEXT_KEYWORDS, key=len)) + "))"
+)
+
+
+class DisclosureIndex:
+    """Disclosure keyword spans in the lowercased raw document, found once."""
+
+    def __init__(self, raw: str):
+        self.raw_lower = raw.lower()
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for m in _DISCLOSURE_CONTEXT_REGEX.finditer(self.raw_lower):
+            self._starts.append(m.start())
+            self._ends.append(m.start() + len(m.group(1)))
+
+    def near(self, idx: int) -> bool:
+        """True if a keyword lies fully inside the ±window around idx."""
+        lo = max(0, idx - DISCLOSURE_CONTEXT_WINDOW)
+        hi = min(len(self.raw_lower), idx + DISCLOSURE_CONTEXT_WINDOW)
+        i = bisect.bisect_left(self._starts, lo)
+        while i < len(self._starts) and self._starts[i] < hi:
+            if self._ends[i] <= hi:
+                return True
+            i += 1
+        return False
+
+    def entity_in_context(self, entity: str) -> bool:
+        """Any occurrence of `entity` in the raw text near a keyword."""
+        if not self._starts:
+            return False
+        needle = entity.lower()
+        idx = self.raw_lower.find(needle)
+        while idx != -1:
+            if self.near(idx):
+                return True
+            idx = self.raw_lower.find(needle, idx + 1)
+        return False
+
+
+class LineIndex:
+    """Newline offsets of a text, for O(log n) offset -> line lookups."""
+
+    def __init__(self, text: str):
+        self._newlines = [m.start() for m in re.finditer("\n", text)]
+
+    def line_of(self, offset: int) -> str:
+        if offset < 0:
+            return "Unknown"
+        return f"~Line {bisect.bisect_left(self._newlines, offset) + 1}"
+
+
+# ════════════════════════════════════════════════════════════
+# HTML TEXT EXTRACTION
+# ════════════════════════════════════════════════════════════
+
+_HTML_TOKEN = re.compile(r"""
+    (?P<drop><script\b[^>]*>.*?</script>|<style\b[^>]*>.*?</style>|<!--.*?-->)
+  | (?P<tag><[^>]+>)
+  | (?P<entity>&(?:\#[xX][0-9A-Fa-f]+|\#[0-9]+|[A-Za-z][A-Za-z0-9]*);?)
+  | (?P<space>\s+)
+  | (?P<text>[^<&\s]+|[<&])
+""", re.IGNORECASE | re.DOTALL | re.VERBOSE)
+
+
+class CleanText:
+    """
+    Text content of an HTML document plus an offset map back to the raw input.
+
+    Segments are (clean_start, raw_start, linear): for linear segments
+    (plain text runs) clean offset i maps to raw_start + (i - clean_start);
+    for decoded entities and collapsed whitespace every clean offset maps
+    to raw_start.
+    """
+
+    def __init__(self, text: str, seg_clean: List[int], seg_raw: List[int],
+                 seg_linear: List[bool]):
+        self.text = text
+        self._seg_clean = seg_clean
+        self._seg_raw = seg_raw
+        self._seg_linear = seg_linear
+
+    def to_raw(self, offset: int) -> int:
+        """Raw-document offset for a clean-text offset."""
+        i = bisect.bisect_right(self._seg_clean, offset) - 1
+        if i < 0:
+            return 0
+        if self._seg_linear[i]:
+            return self._seg_raw[i] + (offset - self._seg_clean[i])
+        return self._seg_raw[i]
+
+
+def extract_text(raw: str) -> CleanText:
+    """
+    Single-pass HTML to text.
+
+    Drops script, style and comments; replaces tags with a space; decodes
+    every HTML5 named and numeric entity (html.unescape rules); collapses
+    whitespace runs to one space and trims the ends — all in one scan,
+    recording where each piece of output came from.
+    """
+    out: List[str] = []
+    seg_clean: List[int] = []
+    seg_raw: List[int] = []
+    seg_linear: List[bool] = []
+    length = 0
+    pending_space = -1      # raw offset of a pending collapsed space
+
+    def emit(piece: str, raw_at: int, linear: bool):
+        nonlocal length, pending_space
+        if pending_space >= 0 and length:
+            out.append(" ")
+            seg_clean.append(length); seg_raw.append(pending_space); seg_linear.append(False)
+            length += 1
+        pending_space = -1
+        out.append(piece)
+        seg_clean.append(length); seg_raw.append(raw_at); seg_linear.append(linear)
+        length += len(piece)
+
+    for m in _HTML_TOKEN.finditer(raw):
+        kind = m.lastgroup
+        if kind == "text":
+            emit(m.group(), m.start(), True)
+        elif kind == "space" or kind == "tag":
+            if pending_space < 0:
+                pending_space = m.start()
+        elif kind == "entity":
+            decoded = html.unescape(m.group())
+            # Decoded whitespace (e.g. &nbsp;) collapses like literal whitespace
+            for part in re.split(r"(\s+)", decoded):
+                if not part:
+                    continue
+                if part.isspace():
+                    if pending_space < 0:
+                        pending_space = m.start()
+                else:
+                    emit(part, m.start(), False)
+        # "drop": script/style/comment vanish without leaving a space
+
+    return CleanText("".join(out), seg_clean, seg_raw, seg_linear)
+
+
 # ════════════════════════════════════════════════════════════
 # CORE ENGINE
 # ════════════════════════════════════════════════════════════
@@ -219,7 +500,7 @@ class SemanticGovernanceEngine:
         print(report.to_json())
     """
 
-    VERSION = "1.0.0"
+    VERSION = "1.1.0"
 
     def __init__(self, custom_entities: List[str] = None,
                  strict_mode: bool = False):
@@ -232,6 +513,7 @@ class SemanticGovernanceEngine:
         if custom_entities:
             self.entities.extend(custom_entities)
         self.strict_mode = strict_mode
+        self._entity_matcher = EntityMatcher(self.entities)
 
     def scan_file(self, filepath: str) -> ScanReport:
         """Scan a file and return a governance report."""
@@ -249,7 +531,8 @@ class SemanticGovernanceEngine:
         start = datetime.now(timezone.utc)
 
         # Strip HTML tags for semantic analysis but keep structure info
-        clean_text = self._strip_html(text)
+        extracted = extract_text(text)
+        clean_text = extracted.text
         is_html = bool(re.search(r'<[^>]+>', text))
 
         # Generate scan hash
@@ -265,7 +548,7 @@ class SemanticGovernanceEngine:
         )
 
         # Run all detection layers
-        self._layer1_entity_detection(clean_text, text, report)
+        self._layer1_entity_detection(clean_text, text, report, extracted)
         self._layer2_authority_claims(clean_text, report)
         self._layer3_journalistic_format(clean_text, text, report)
         self._layer4_disclosure_check(text, clean_text, report)
@@ -283,30 +566,34 @@ class SemanticGovernanceEngine:
     # ── Layer 1: Sensitive Entity Detection ──
 
     def _layer1_entity_detection(self, text: str, raw: str,
-                                  report: ScanReport):
+                                  report: ScanReport,
+                                  extracted: Optional["CleanText"] = None):
         """Detect references to sensitive external entities."""
-        for entity in self.entities:
-            # Use word boundary regex to avoid false positives
-            # e.g. "BILD" should not match "Erscheinungsbild"
-            # Short entities (<=3 chars) require strict boundaries
-            if len(entity) <= 3:
-                pattern = r'(?<![A-Za-zÀ-ÿ])' + re.escape(entity) + r'(?![A-Za-zÀ-ÿ])'
-            else:
-                pattern = r'\b' + re.escape(entity) + r'\b'
+        # One pass for all entities (word-boundary rules compiled in)
+        first_match = self._entity_matcher.find_first(text)
+        if not first_match:
+            return
+        lines = LineIndex(text)
+        disclosure = DisclosureIndex(raw)
 
-            match = re.search(pattern, text, re.IGNORECASE)
-            if not match:
+        for entity in self.entities:
+            idx = first_match.get(entity)
+            if idx is None:
                 continue
 
-            idx = match.start()
             context_start = max(0, idx - 60)
             context_end = min(len(text), idx + len(entity) + 60)
             context = text[context_start:context_end].strip()
 
             # Determine if inside a disclosure/transparency block
-            in_disclosure = self._is_in_disclosure_context(
-                raw, entity, idx
-            )
+            if extracted is not None:
+                # Exact raw positions of every visible occurrence
+                in_disclosure = any(
+                    disclosure.near(extracted.to_raw(m.start()))
+                    for m in self._entity_matcher.finditer(entity, text)
+                )
+            else:
+                in_disclosure = disclosure.entity_in_context(entity)
 
             # Determine entity type for risk assessment
             if entity in MEDIA_ENTITIES:
@@ -358,7 +645,7 @@ class SemanticGovernanceEngine:
                 title=f"{entity_type} Reference: {entity}",
                 description=description,
                 evidence=f"...{context}...",
-                location=self._find_line(text, entity),
+                location=lines.line_of(idx),
                 invariants_impacted=invariants,
                 recommended_action=action,
             ))
@@ -462,8 +749,9 @@ class SemanticGovernanceEngine:
         )
 
         if has_journal_format or has_entity_refs:
+            text_lower = text.lower()
             disclosure_found = any(
-                marker.lower() in text.lower()
+                marker.lower() in text_lower
                 for marker in DISCLOSURE_MARKERS
             )
 
@@ -534,8 +822,9 @@ class SemanticGovernanceEngine:
             "Jober Mögele Correa", "Chief Governance Officer",
         ]
 
+        text_lower, raw_lower = text.lower(), raw.lower()
         has_authorship = any(
-            marker.lower() in text.lower() or marker.lower() in raw.lower()
+            marker.lower() in text_lower or marker.lower() in raw_lower
             for marker in authorship_markers
         )
 
@@ -600,34 +889,23 @@ class SemanticGovernanceEngine:
 
     def _strip_html(self, html: str) -> str:
         """Remove HTML tags but preserve text content."""
-        text = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL)
-        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL)
-        text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-        text = re.sub(r'<[^>]+>', ' ', text)
-        # Decode common HTML entities
-        text = text.replace('&amp;', '&')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&mdash;', '—')
-        text = text.replace('&ndash;', '–')
-        text = text.replace('&ldquo;', '"')
-        text = text.replace('&rdquo;', '"')
-        text = text.replace('&lsquo;', "'")
-        text = text.replace('&rsquo;', "'")
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&ouml;', 'ö')
-        text = text.replace('&auml;', 'ä')
-        text = text.replace('&uuml;', 'ü')
-        text = text.replace('&szlig;', 'ß')
-        # Numeric entities
-        text = re.sub(r'&#x([0-9A-Fa-f]+);',
-                       lambda m: chr(int(m.group(1), 16)), text)
-        text = re.sub(r'&#(\d+);',
-                       lambda m: chr(int(m.group(1))), text)
-        # Collapse whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return extract_text(html).text
+
+    def pattern_set_hash(self) -> str:
+        """Fingerprint of every rule that influences a scan result."""
+        rules = {
+            "version": self.VERSION,
+            "strict_mode": self.strict_mode,
+            "entities": self.entities,
+            "authority": AUTHORITY_PATTERNS,
+            "journalistic": JOURNALISTIC_PATTERNS,
+            "disclosure": DISCLOSURE_MARKERS,
+            "disclosure_context": DISCLOSURE_CONTEXT_KEYWORDS,
+            "autonomy": AUTONOMY_PATTERNS,
+        }
+        return hashlib.sha256(
+            json.dumps(rules, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
 
     def _find_line(self, text: str, needle: str) -> str:
         """Find approximate line number of text."""
@@ -640,37 +918,7 @@ class SemanticGovernanceEngine:
     def _is_in_disclosure_context(self, raw: str, entity: str,
                                    approx_idx: int) -> bool:
         """Check if entity reference is within a disclosure block."""
-        raw_lower = raw.lower()
-        entity_lower = entity.lower()
-
-        # Find all occurrences
-        search_start = 0
-        while True:
-            idx = raw_lower.find(entity_lower, search_start)
-            if idx == -1:
-                break
-
-            # Check surrounding context (500 chars before and after)
-            context_start = max(0, idx - 500)
-            context_end = min(len(raw), idx + 500)
-            context = raw_lower[context_start:context_end]
-
-            disclosure_keywords = [
-                "transparency notice", "governance disclosure",
-                "hinweis", "not affiliated", "not endorsed",
-                "not published by", "independently produced",
-                "keine veröffentlichung", "nicht verbunden",
-                "editorial format", "editorial-style",
-                "journalistischen stil",
-                "no impersonation", "prohibited",
-            ]
-
-            if any(kw in context for kw in disclosure_keywords):
-                return True
-
-            search_start = idx + 1
-
-        return False
+        return DisclosureIndex(raw).entity_in_context(entity)
 
 
 # ════════════════════════════════════════════════════════════
@@ -781,6 +1029,101 @@ def format_html_badge(report: ScanReport) -> str:
     )
 
 
+# ════════════════════════════════════════════════════════════
+# BATCH SCANNING
+# ════════════════════════════════════════════════════════════
+
+# One engine per worker process, built by _batch_worker_init
+_batch_engine: Optional[SemanticGovernanceEngine] = None
+_batch_cache_dir: Optional[Path] = None
+_batch_rules_hash = ""
+
+
+def _batch_worker_init(strict: bool, custom_entities: Optional[List[str]],
+                       cache_dir: Optional[str]):
+    global _batch_engine, _batch_cache_dir, _batch_rules_hash
+    _batch_engine = SemanticGovernanceEngine(
+        custom_entities=custom_entities, strict_mode=strict
+    )
+    _batch_rules_hash = _batch_engine.pattern_set_hash()
+    _batch_cache_dir = Path(cache_dir) if cache_dir else None
+
+
+def _batch_scan_one(filepath: str) -> tuple:
+    """Scan one file (or reuse the cached report). Returns (dict, bytes, hit)."""
+    raw = Path(filepath).read_bytes()
+    cache_file = None
+    if _batch_cache_dir is not None:
+        key = hashlib.sha256(
+            raw + f"|{_batch_engine.VERSION}|{_batch_rules_hash}".encode()
+        ).hexdigest()
+        cache_file = _batch_cache_dir / key[:2] / f"{key}.json"
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding="utf-8"))
+                cached["document_path"] = filepath
+                cached["document_name"] = Path(filepath).name
+                return cached, len(raw), True
+            except ValueError:
+                pass
+
+    result = _batch_engine.scan_text(
+        raw.decode("utf-8", errors="replace"), filepath
+    ).to_dict()
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, cache_file)
+    return result, len(raw), False
+
+
+def scan_batch(paths: List[str], workers: int = None, cache_dir: str = None,
+               strict: bool = False, custom_entities: List[str] = None,
+               stats: dict = None):
+    """
+    Scan many documents on a process pool, yielding report dicts as they finish.
+
+    Each worker builds one SemanticGovernanceEngine. With `cache_dir`,
+    reports are cached by SHA-256 of the content + engine VERSION +
+    pattern-set hash, so unchanged documents are not re-scanned.
+    Pass a dict as `stats` to receive docs/bytes/cache_hits/seconds and
+    docs_per_sec / mb_per_sec once the generator is exhausted.
+    """
+    import multiprocessing
+    import time
+
+    stats = stats if stats is not None else {}
+    stats.update(docs=0, bytes=0, cache_hits=0)
+    t0 = time.perf_counter()
+    initargs = (strict, custom_entities, cache_dir)
+
+    if workers == 1:
+        _batch_worker_init(*initargs)
+        results = map(_batch_scan_one, paths)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, _batch_worker_init, initargs)
+        chunk = max(1, min(64, len(paths) // ((workers or os.cpu_count() or 1) * 4)))
+        results = pool.imap_unordered(_batch_scan_one, paths, chunksize=chunk)
+
+    try:
+        for result, size, hit in results:
+            stats["docs"] += 1
+            stats["bytes"] += size
+            stats["cache_hits"] += 1 if hit else 0
+            yield result
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        elapsed = time.perf_counter() - t0
+        stats["seconds"] = round(elapsed, 3)
+        stats["docs_per_sec"] = round(stats["docs"] / elapsed, 1) if elapsed else 0.0
+        stats["mb_per_sec"] = round(stats["bytes"] / 1e6 / elapsed, 2) if elapsed else 0.0
+
+
 # ════════════════════════════════════════════════════════════
 # MODULE ENTRY POINT
 # ════════════════════════════════════════════════════════════
@@ -796,25 +1139,52 @@ if __name__ == "__main__":
         print("  --json     Output as JSON")
         print("  --strict   Flag all external entity references")
         print("  --badge    Output HTML badge only")
+        print("  --batch    Process pool, JSON Lines output, throughput on stderr")
+        print("  --workers N         Worker processes for --batch (default: CPUs)")
+        print("  --cache DIR         Skip unchanged documents (--batch)")
+        print("  --recursive         Include *.html in subdirectories")
         sys.exit(0)
 
     target = sys.argv[1]
     output_json = "--json" in sys.argv
     strict = "--strict" in sys.argv
     badge_only = "--badge" in sys.argv
+    batch = "--batch" in sys.argv
+    recursive = "--recursive" in sys.argv
 
-    engine = SemanticGovernanceEngine(strict_mode=strict)
+    def _opt(name):
+        if name in sys.argv and sys.argv.index(name) + 1 < len(sys.argv):
+            return sys.argv[sys.argv.index(name) + 1]
+        return None
 
     paths = []
     target_path = Path(target)
     if target_path.is_dir():
-        paths = sorted(target_path.glob("*.html"))
+        pattern = "**/*.html" if recursive else "*.html"
+        paths = sorted(target_path.glob(pattern))
     elif target_path.is_file():
         paths = [target_path]
     else:
         print(f"Error: {target} not found")
         sys.exit(1)
 
+    if batch:
+        workers = _opt("--workers")
+        stats = {}
+        for result in scan_batch([str(p) for p in paths],
+                                 workers=int(workers) if workers else None,
+                                 cache_dir=_opt("--cache"), strict=strict,
+                                 stats=stats):
+            print(json.dumps(result, ensure_ascii=False))
+        sys.stdout.flush()
+        print(f"SGE batch: {stats['docs']} docs, {stats['bytes'] / 1e6:.2f} MB "
+              f"in {stats['seconds']}s — {stats['docs_per_sec']} docs/sec, "
+              f"{stats['mb_per_sec']} MB/sec, {stats['cache_hits']} cache hits",
+              file=sys.stderr)
+        sys.exit(0)
+
+    engine = SemanticGovernanceEngine(strict_mode=strict)
+
     for p in paths:
         report = engine.scan_file(str(p))
         if badge_only:
@@ -1,30 +1,236 @@
 """
-WINDI Submission Registry v1.0
+WINDI Submission Registry v1.1
 Heritage: IPFS anchor -> audit registry. Queryable submission storage.
 AI processes. Human decides. WINDI guarantees.
+
+Storage: single-file SQLite (registry.db) keyed on submission_id, with
+secondary indexes on governance_level, isp_profile and registered_at. The
+entity filter keeps v1.0's case-insensitive substring semantics, which no
+index can serve, so it scans. Stats counters are updated in the same
+transaction as each insert, so get_stats() never scans entries. A legacy
+registry.json in the same directory is imported once on first open.
 """
-import json, os
+import json, os, sqlite3, threading, warnings
 from datetime import datetime, timezone
 
+DB_NAME = "registry.db"
+LEGACY_JSON = "registry.json"
+
+# Stats dimensions kept as counters: (dimension, key) -> count
+_STATS_DIMENSIONS = ("by_level", "by_entity", "by_isp")
+
+
 class SubmissionRegistry:
     def __init__(self, storage_dir):
         self.storage_dir = storage_dir
-        self.file = os.path.join(storage_dir, "registry.json")
+        self.file = os.path.join(storage_dir, LEGACY_JSON)
+        self.db_path = os.path.join(storage_dir, DB_NAME)
         os.makedirs(storage_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+        self._migrate_legacy_json()
+
+    def _init_db(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    submission_id TEXT PRIMARY KEY,
+                    registered_at TEXT NOT NULL DEFAULT '',
+                    governance_level TEXT NOT NULL DEFAULT '',
+                    reporting_entity TEXT NOT NULL DEFAULT '',
+                    reporting_entity_key TEXT NOT NULL DEFAULT '',
+                    isp_profile TEXT NOT NULL DEFAULT '',
+                    sealed INTEGER NOT NULL DEFAULT 0,
+                    entry_json TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_sub_level ON submissions(governance_level, registered_at);
+                DROP INDEX IF EXISTS idx_sub_entity;
+                CREATE INDEX IF NOT EXISTS idx_sub_isp ON submissions(isp_profile, registered_at);
+                CREATE INDEX IF NOT EXISTS idx_sub_registered ON submissions(registered_at);
+                CREATE TABLE IF NOT EXISTS registry_stats (
+                    dimension TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (dimension, key)
+                );
+                CREATE TABLE IF NOT EXISTS registry_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            # v1.1 registries: add the casefolded entity used by query(entity=...)
+            columns = {r[1] for r in self._conn.execute("PRAGMA table_info(submissions)")}
+            if "reporting_entity_key" not in columns:
+                self._conn.execute("ALTER TABLE submissions ADD COLUMN "
+                                   "reporting_entity_key TEXT NOT NULL DEFAULT ''")
+                self._conn.create_function("py_casefold", 1, lambda v: (v or "").casefold())
+                self._conn.execute(
+                    "UPDATE submissions SET reporting_entity_key = py_casefold(reporting_entity)")
+
+    # ─── Storage primitives ────────────────────────────────────────
 
-    def _load(self):
-        if os.path.exists(self.file):
-            with open(self.file) as f:
-                return json.load(f)
-        return {"entries": [], "stats": {"total": 0, "by_level": {}, "by_entity": {}}}
+    def _bump(self, dimension, key, n=1):
+        self._conn.execute("""
+            INSERT INTO registry_stats (dimension, key, count) VALUES (?, ?, ?)
+            ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count
+        """, (dimension, key, n))
 
-    def _save(self, data):
-        data["last_updated"] = datetime.now(timezone.utc).isoformat()
-        with open(self.file, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO registry_meta (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _counters_for(entry):
+        """
+        Stats dimensions an entry counts towards, as v1.0 kept them:
+        register() entries count by_entity, ISP receipts count by_isp.
+        """
+        counters = [("by_level", entry.get("governance_level") or "")]
+        if "reporting_entity" in entry:
+            counters.append(("by_entity", entry.get("reporting_entity") or "unknown"))
+        if "isp_profile" in entry:
+            counters.append(("by_isp", entry.get("isp_profile") or "unknown"))
+        return counters
+
+    def _insert(self, entry, counters, key=None):
+        """
+        Insert one entry and bump its counters in the same transaction.
+
+        Entries are keyed on submission_id; a duplicate keeps the first entry
+        (what lookup() always returned) and leaves the counters untouched.
+        `key` overrides the stored submission_id column (legacy migration of
+        duplicate ids); entry_json is stored unchanged. reporting_entity_key
+        is the casefolded entity: SQLite's lower() only folds ASCII, which
+        would miss umlauts. Caller holds the lock and transaction.
+        """
+        cur = self._conn.execute("""
+            INSERT OR IGNORE INTO submissions (
+                submission_id, registered_at, governance_level,
+                reporting_entity, reporting_entity_key, isp_profile, sealed, entry_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            key if key is not None else (entry.get("submission_id") or ""),
+            entry.get("registered_at") or "",
+            entry.get("governance_level") or "",
+            entry.get("reporting_entity") or "",
+            (entry.get("reporting_entity") or "").casefold(),
+            entry.get("isp_profile") or "",
+            1 if entry.get("integrity_hash") else 0,
+            json.dumps(entry, default=str),
+        ))
+        if cur.rowcount == 0:
+            return False
+        self._bump("total", "", 1)
+        self._bump("sealed", "", 1 if entry.get("integrity_hash") else 0)
+        for dimension, key in counters:
+            self._bump(dimension, key, 1)
+        self._set_meta("last_updated", datetime.now(timezone.utc).isoformat())
+        return True
+
+    def _select(self, where="1=1", params=(), order="registered_at DESC, rowid ASC", limit=None):
+        sql = f"SELECT entry_json FROM submissions WHERE {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = tuple(params) + (int(limit),)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def _counter(self, dimension, key=""):
+        row = self._conn.execute(
+            "SELECT count FROM registry_stats WHERE dimension = ? AND key = ?",
+            (dimension, key)).fetchone()
+        return row[0] if row else 0
+
+    # ─── Legacy JSON migration ─────────────────────────────────────
+
+    def _migrated(self):
+        return self._conn.execute(
+            "SELECT value FROM registry_meta WHERE key = 'migrated_from_json'").fetchone() is not None
+
+    def _migrate_legacy_json(self):
+        if not os.path.exists(self.file):
+            return
+        with self._lock:
+            if self._migrated():
+                return
+            # Every worker opens registry.db at startup: take the write lock
+            # before re-checking, so exactly one process imports the file
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = None if self._migrated() else self._import_json(self.file)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        if result and result["duplicate_ids"]:
+            warnings.warn(
+                f"{self.file}: {len(result['duplicate_ids'])} submission_id(s) occur more "
+                f"than once; later entries kept as '<id>#<n>': "
+                f"{', '.join(result['duplicate_ids'][:10])}", stacklevel=2)
+
+    def migrate_from_json(self, path):
+        """
+        One-shot import of a legacy registry.json.
+
+        Entries are inserted in file order and counted exactly as register()
+        and register_isp_submission() would have, so the counters always
+        match the rows in the table. v1.0 appended blindly, so a file can
+        hold several entries with one submission_id: the first keeps the id
+        (what lookup() always returned) and each later one is stored under
+        "<id>#<n>" with its entry unchanged. Colliding ids are recorded in
+        the migrated_from_json meta row and returned. The JSON file is left
+        in place.
+        """
+        with self._lock, self._conn:
+            return self._import_json(path)
+
+    def _import_json(self, path):
+        """Body of migrate_from_json(); caller holds the lock and transaction."""
+        with open(path) as f:
+            data = json.load(f)
+        entries = data.get("entries", [])
+        imported, collisions = 0, {}
+        for e in entries:
+            sid = e.get("submission_id") or ""
+            key = None
+            if self._conn.execute("SELECT 1 FROM submissions WHERE submission_id = ?",
+                                  (sid,)).fetchone():
+                n = collisions.get(sid, 1) + 1
+                while self._conn.execute("SELECT 1 FROM submissions WHERE submission_id = ?",
+                                         (f"{sid}#{n}",)).fetchone():
+                    n += 1
+                collisions[sid] = n
+                key = f"{sid}#{n}"
+            imported += 1 if self._insert(e, self._counters_for(e), key=key) else 0
+        self._set_meta("migrated_from_json", json.dumps({
+            "path": os.path.abspath(path),
+            "entries": len(entries),
+            "imported": imported,
+            "duplicate_ids": sorted(collisions),
+            "at": datetime.now(timezone.utc).isoformat(),
+        }))
+        if data.get("last_updated"):
+            self._set_meta("last_updated", data["last_updated"])
+        return {"entries": len(entries), "imported": imported,
+                "duplicate_ids": sorted(collisions)}
+
+    def _register(self, entry, counters):
+        """
+        Store `entry`; returns it, or the entry already registered under
+        that submission_id marked duplicate=True (nothing was stored).
+        """
+        with self._lock, self._conn:
+            if self._insert(entry, counters):
+                return entry
+        return dict(self.lookup(entry.get("submission_id") or ""), duplicate=True)
+
+    # ─── Public API ────────────────────────────────────────────────
 
     def register(self, submission_id, audit_record, document_id=None):
-        data = self._load()
         meta = audit_record.get("metadata", {})
         entry = {
             "submission_id": submission_id,
@@ -38,46 +244,46 @@ class SubmissionRegistry:
             "reference_period": meta.get("reference_period", ""),
             "validation_status": meta.get("validation_status", ""),
         }
-        data["entries"].append(entry)
-        # Stats
-        data["stats"]["total"] = len(data["entries"])
-        lv = entry["governance_level"]
-        data["stats"]["by_level"][lv] = data["stats"]["by_level"].get(lv, 0) + 1
-        ent = entry["reporting_entity"] or "unknown"
-        data["stats"]["by_entity"][ent] = data["stats"]["by_entity"].get(ent, 0) + 1
-        self._save(data)
-        return entry
+        return self._register(entry, self._counters_for(entry))
 
     def lookup(self, submission_id):
-        for e in self._load()["entries"]:
-            if e["submission_id"] == submission_id:
-                return e
-        return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry_json FROM submissions WHERE submission_id = ?",
+                (submission_id,)).fetchone()
+        return json.loads(row[0]) if row else None
 
     def query(self, level=None, entity=None, after=None, before=None, limit=50):
-        results = self._load()["entries"]
+        conditions, params = [], []
         if level:
-            results = [e for e in results if e.get("governance_level") == level.upper()]
+            conditions.append("governance_level = ?"); params.append(level.upper())
         if entity:
-            el = entity.lower()
-            results = [e for e in results if el in e.get("reporting_entity", "").lower()]
+            conditions.append("instr(reporting_entity_key, ?) > 0"); params.append(entity.casefold())
         if after:
-            results = [e for e in results if e.get("registered_at", "") >= after]
+            conditions.append("registered_at >= ?"); params.append(after)
         if before:
-            results = [e for e in results if e.get("registered_at", "") <= before]
-        results.sort(key=lambda e: e.get("registered_at", ""), reverse=True)
-        return results[:limit]
+            conditions.append("registered_at <= ?"); params.append(before)
+        return self._select(" AND ".join(conditions) or "1=1", params, limit=limit)
 
     def get_stats(self):
-        return self._load().get("stats", {})
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dimension, key, count FROM registry_stats").fetchall()
+        stats = {"total": 0, "by_level": {}, "by_entity": {}}
+        for dimension, key, count in rows:
+            if dimension == "total":
+                stats["total"] = count
+            elif dimension in _STATS_DIMENSIONS:
+                stats.setdefault(dimension, {})[key] = count
+        return stats
 
     def export_audit(self, path=None):
-        data = self._load()
+        stats = self.get_stats()
         export = {
             "exported_at": datetime.now(timezone.utc).isoformat(),
-            "total": data["stats"]["total"],
-            "stats": data["stats"],
-            "entries": data["entries"],
+            "total": stats["total"],
+            "stats": stats,
+            "entries": self._select(order="rowid ASC"),
         }
         if path:
             with open(path, "w") as f:
@@ -85,9 +291,9 @@ class SubmissionRegistry:
         return export
 
     def verify_chain(self):
-        entries = self._load()["entries"]
-        total = len(entries)
-        sealed = sum(1 for e in entries if e.get("integrity_hash"))
+        with self._lock:
+            total = self._counter("total")
+            sealed = self._counter("sealed")
         return sealed == total, {"total": total, "sealed": sealed, "complete": sealed == total}
 
     def register_isp_submission(self, receipt):
@@ -108,9 +314,9 @@ class SubmissionRegistry:
                 - witness: Witness information dict
 
         Returns:
-            Registered entry dict
+            Registered entry dict (the existing one, with duplicate=True,
+            if receipt_id was already registered)
         """
-        data = self._load()
         entry = {
             "submission_id": receipt.get("receipt_id", ""),
             "document_id": receipt.get("document_id", ""),
@@ -128,30 +334,92 @@ class SubmissionRegistry:
             "policy_version": "2.2.0",
             "validation_status": "registered",
         }
-        data["entries"].append(entry)
-
-        # Update stats
-        data["stats"]["total"] = len(data["entries"])
-        lv = entry["governance_level"]
-        data["stats"]["by_level"][lv] = data["stats"]["by_level"].get(lv, 0) + 1
-
-        # Track ISP profiles
-        if "by_isp" not in data["stats"]:
-            data["stats"]["by_isp"] = {}
-        isp = entry["isp_profile"] or "unknown"
-        data["stats"]["by_isp"][isp] = data["stats"]["by_isp"].get(isp, 0) + 1
 
-        self._save(data)
-        return entry
+        return self._register(entry, self._counters_for(entry))
 
     def query_by_isp(self, isp_id, limit=50):
         """Query submissions by ISP profile."""
-        results = self._load()["entries"]
-        results = [e for e in results if e.get("isp_profile") == isp_id]
-        results.sort(key=lambda e: e.get("registered_at", ""), reverse=True)
-        return results[:limit]
+        return self._select("isp_profile = ?", (isp_id,), limit=limit)
 
     def get_isp_stats(self):
         """Get statistics grouped by ISP profile."""
-        data = self._load()
-        return data.get("stats", {}).get("by_isp", {})
+        return self.get_stats().get("by_isp", {})
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _benchmark(n=100000, legacy_sample=50):
+    """
+    Register/lookup/query/stats timings at `n` entries.
+
+    The legacy path is measured by appending `legacy_sample` entries to an
+    n-entry registry.json the way v1.0 did (load, append, dump indent=2).
+    """
+    import random, tempfile, time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reg = SubmissionRegistry(os.path.join(tmp, "db"))
+        levels = ("LOW", "MEDIUM", "HIGH")
+        t0 = time.perf_counter()
+        for i in range(n):
+            reg.register(f"REG-BENCH-{i:07d}", {
+                "governance_level": levels[i % 3], "integrity_hash": "x",
+                "metadata": {"reporting_entity": f"Entity {i % 200}"}})
+        register_s = time.perf_counter() - t0
+
+        ids = [f"REG-BENCH-{random.randrange(n):07d}" for _ in range(1000)]
+        t0 = time.perf_counter()
+        for sid in ids:
+            reg.lookup(sid)
+        lookup_us = (time.perf_counter() - t0) / len(ids) * 1e6
+
+        t0 = time.perf_counter()
+        for _ in range(100):
+            reg.query(level="HIGH", limit=50)
+        query_ms = (time.perf_counter() - t0) / 100 * 1e3
+
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            reg.get_stats()
+        stats_us = (time.perf_counter() - t0) / 1000 * 1e6
+        reg.close()
+
+        legacy_path = os.path.join(tmp, LEGACY_JSON)
+        with open(legacy_path, "w") as f:
+            json.dump({"entries": [{"submission_id": f"REG-{i}", "governance_level": "LOW"}
+                                   for i in range(n)],
+                       "stats": {"total": n, "by_level": {}, "by_entity": {}}}, f, indent=2)
+        t0 = time.perf_counter()
+        for i in range(legacy_sample):
+            with open(legacy_path) as f:
+                data = json.load(f)
+            data["entries"].append({"submission_id": f"REG-NEW-{i}"})
+            with open(legacy_path, "w") as f:
+                json.dump(data, f, indent=2, default=str)
+        legacy_register_ms = (time.perf_counter() - t0) / legacy_sample * 1e3
+
+    return {
+        "entries": n,
+        "register_per_sec": round(n / register_s),
+        "lookup_us": round(lookup_us, 1),
+        "query_level_limit50_ms": round(query_ms, 2),
+        "get_stats_us": round(stats_us, 1),
+        "legacy_json_register_ms_at_n": round(legacy_register_ms, 1),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+        print(json.dumps(_benchmark(n), indent=2))
+    elif len(sys.argv) > 2 and sys.argv[1] == "--migrate":
+        reg = SubmissionRegistry(sys.argv[2])
+        row = reg._conn.execute(
+            "SELECT value FROM registry_meta WHERE key = 'migrated_from_json'").fetchone()
+        print(json.dumps({"migration": json.loads(row[0]) if row else None,
+                          "stats": reg.get_stats()}, indent=2))
+    else:
+        print("Usage: submission_registry.py --bench [N] | --migrate STORAGE_DIR")
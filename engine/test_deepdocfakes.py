@@ -2,7 +2,7 @@
 """
 WINDI DeepDOCFakes — Test Suite
 ==================================
-7 tests covering all critical paths:
+7 tests covering all critical paths (plus bonus checks):
 
   TEST 1: HIGH generates record and validates          → PASS/FAIL
   TEST 2: MEDIUM generates record with identity gov    → PASS/FAIL
@@ -34,6 +34,8 @@ from deepdocfakes.verify_engine import verify_by_submission_id, verify_by_hash,
 from deepdocfakes.deepfake_risk import compute_resilience_score, resilience_rating, resilience_factors
 from deepdocfakes.pdf_metadata_embed import build_pdf_metadata, verify_pdf_provenance
 from deepdocfakes.registry_provenance import registry_stats, registry_integrity_check
+from deepdocfakes.provenance_index import ProvenanceIndex, get_provenance_index
+from deepdocfakes.provenance_engine import INDEX_FILE
 
 
 def _header(name):
@@ -243,6 +245,41 @@ results.append(_result(
 ))
 
 
+# ─── BONUS: Index journal & reload ───────────────────────────
+_header("BONUS: Provenance index journal, reload & compaction")
+
+# A second instance stands in for another worker process
+other = ProvenanceIndex(INDEX_FILE)
+found = other.find_by_hash_prefix(hash_prefix)
+results.append(_result(
+    "Journaled entries visible to a fresh reader",
+    found is not None and found[0] == record_high["submission_id"],
+    f"Journal: {os.path.exists(other.journal_file)}"
+))
+
+get_provenance_index(INDEX_FILE).compact()
+other.put("HIGH-TEST-LATE", {"structural_hash": "ffff" + "0" * 60, "governance_level": "HIGH"})
+shared = get_provenance_index(INDEX_FILE)
+results.append(_result(
+    "Compaction + foreign append picked up without restart",
+    shared.get("HIGH-TEST-LATE") is not None and shared.get(record_high["submission_id"]) is not None,
+    f"Entries: {len(shared)}"
+))
+
+# Shared prefix: the entry inserted first wins, as in the v1.0 scan
+other.put("TIE-Z-FIRST", {"structural_hash": "eeee" + "9" * 60, "governance_level": "LOW"})
+other.put("TIE-A-SECOND", {"structural_hash": "eeee" + "1" * 60, "governance_level": "LOW"})
+journaled = ProvenanceIndex(INDEX_FILE).find_by_hash_prefix("eeee")
+other.compact()
+compacted = ProvenanceIndex(INDEX_FILE).find_by_hash_prefix("eeee")
+results.append(_result(
+    "Prefix ties resolve to the earliest inserted entry",
+    journaled is not None and journaled[0] == "TIE-Z-FIRST"
+    and compacted is not None and compacted[0] == "TIE-Z-FIRST",
+    f"Journal: {journaled and journaled[0]}, snapshot: {compacted and compacted[0]}"
+))
+
+
 # ═══════════════════════════════════════════════════════════════
 # SUMMARY
 # ═══════════════════════════════════════════════════════════════
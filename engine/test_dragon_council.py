@@ -1,8 +1,8 @@
 """
-WINDI Dragon Council Integration Test — 8 tests covering full pipeline.
+WINDI Dragon Council Integration Test — 9 tests covering full pipeline.
 AI processes. Human decides. WINDI guarantees.
 """
-import os, sys, json, shutil
+import os, sys, json, shutil, subprocess, time
 
 TEST_DIR = "/tmp/windi-dc-test"
 ENGINE = os.path.dirname(os.path.abspath(__file__))
@@ -126,6 +126,41 @@ def t8():
         assert "biweekly" in str(e) and "Allowed" in str(e)
 test("8. Rejects invalid allowed values", t8)
 
+# Another process opening the registry (a4desk worker, API, dashboard)
+_OPEN_REGISTRY = """
+import os, sys, time
+sys.path.insert(0, sys.argv[1])
+from submission_registry import SubmissionRegistry
+while not os.path.exists(sys.argv[3]): time.sleep(0.001)
+SubmissionRegistry(sys.argv[2])
+"""
+
+def t9():
+    legacy = os.path.join(TEST_DIR, "legacy")
+    os.makedirs(legacy)
+    entries = [{"submission_id": f"REG-{i:05d}", "governance_level": "HIGH",
+                "reporting_entity": "ECB", "registered_at": f"2026-01-01T00:00:{i % 60:02d}Z"}
+               for i in range(5000)]
+    entries.append(dict(entries[7]))               # one genuine v1.0 duplicate
+    with open(os.path.join(legacy, "registry.json"), "w") as f:
+        json.dump({"entries": entries}, f)
+    go = os.path.join(TEST_DIR, "go")
+    procs = [subprocess.Popen([sys.executable, "-c", _OPEN_REGISTRY, ENGINE, legacy, go],
+                              stderr=subprocess.PIPE, text=True) for _ in range(4)]
+    time.sleep(0.5)
+    open(go, "w").close()
+    warned = [p.communicate(timeout=120)[1] for p in procs]
+    assert all(p.returncode == 0 for p in procs), warned
+    reg = SubmissionRegistry(legacy)
+    rows = reg._conn.execute("SELECT COUNT(*), SUM(submission_id LIKE '%#%') FROM submissions").fetchone()
+    assert rows == (5001, 1), rows
+    assert reg.get_stats()["total"] == 5001, reg.get_stats()["total"]
+    meta = json.loads(reg._conn.execute(
+        "SELECT value FROM registry_meta WHERE key = 'migrated_from_json'").fetchone()[0])
+    assert meta["duplicate_ids"] == ["REG-00007"], meta["duplicate_ids"]
+    assert sum("occur more than once" in w for w in warned) == 1, warned
+test("9. Legacy registry.json imported once by concurrent first opens", t9)
+
 print()
 print("=" * 70)
 total = passed + failed
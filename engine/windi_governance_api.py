@@ -4,6 +4,7 @@ HTTP endpoints connecting the React dashboard to the real engine.
 
 Endpoints:
   POST /api/generate         — Generate governed document
+  POST /api/generate-batch   — Same, for {"submissions": [...]} (governance bridge)
   GET  /api/submissions      — List submissions (with filters)
   GET  /api/submissions/<id> — Lookup specific submission
   GET  /api/dashboard        — Audit dashboard overview
@@ -17,6 +18,7 @@ AI processes. Human decides. WINDI guarantees.
 
 import json
 import os
+import sqlite3
 import sys
 import traceback
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -29,7 +31,6 @@ ISP_DIR = "/opt/windi/isp"
 sys.path.insert(0, ENGINE_DIR)
 
 from isp_governance_loader import ISPLoader
-from submission_registry import SubmissionRegistry
 from audit_dashboard import AuditDashboard
 from governance_validator import GovernanceValidator
 from governance_validator import validate_metadata_by_block, validate_institutional_metadata
@@ -44,6 +45,43 @@ loader.load_all()
 dashboard = AuditDashboard(SUBMISSIONS_DIR)
 validator = GovernanceValidator(CONFIG_PATH)
 
+
+
+# --- Correlation receipts (idempotency for the governance bridge) ---
+# The bridge delivers at-least-once; a correlation_id seen before returns
+# the original result instead of a second ledger entry.
+CORRELATION_DB = os.path.join(SUBMISSIONS_DIR, "correlation_receipts.db")
+
+
+class CorrelationReceipts:
+
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS correlation_receipts (
+                correlation_id TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+
+    def get(self, correlation_id):
+        row = self.conn.execute(
+            "SELECT result FROM correlation_receipts WHERE correlation_id = ?", (correlation_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, correlation_id, result):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO correlation_receipts (correlation_id, result, created_at) VALUES (?, ?, ?)",
+                (correlation_id, json.dumps(result, default=str), datetime.now(timezone.utc).isoformat()),
+            )
+
+
+correlation_receipts = CorrelationReceipts(CORRELATION_DB)
+
 print(f"[WINDI-API] Engine loaded. Profiles: {loader.discover()}")
 print(f"[WINDI-API] Config hash: {validator.config_hash()[:16]}...")
 
@@ -147,6 +185,10 @@ class GovernanceAPIHandler(BaseHTTPRequestHandler):
                 body = self._read_body()
                 self._json(200, self._generate(body))
 
+            elif path == "/api/generate-batch":
+                body = self._read_body()
+                self._json(200, {"results": [self._generate_item(item) for item in body.get("submissions", [])]})
+
             elif path == "/api/export":
                 export_path = os.path.join(SUBMISSIONS_DIR, f"export-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.json")
                 data = dashboard.export(export_path)
@@ -168,8 +210,23 @@ class GovernanceAPIHandler(BaseHTTPRequestHandler):
 
     # --- Endpoint implementations ---
 
+    def _generate_item(self, body):
+        """One submission of a batch; failures stay per item."""
+        try:
+            return self._generate(body)
+        except ValueError as e:
+            return {"status": "BLOCKED", "error": str(e), "correlation_id": body.get("correlation_id")}
+        except Exception as e:
+            traceback.print_exc()
+            return {"status": "ERROR", "error": str(e), "correlation_id": body.get("correlation_id")}
+
     def _generate(self, body):
         """POST /api/generate — Core document generation."""
+        correlation_id = body.get("correlation_id")
+        if correlation_id:
+            previous = correlation_receipts.get(correlation_id)
+            if previous is not None:
+                return dict(previous, duplicate=True)
         level = body.get("governance_level", "LOW").upper()
         metadata = body.get("metadata", None)
         profile_name = body.get("isp_profile", None)
@@ -236,6 +293,9 @@ class GovernanceAPIHandler(BaseHTTPRequestHandler):
             "metadata": audit.get("metadata"),
             "identity_governance": package.get("identity_governance"),
         }
+        if correlation_id:
+            result["correlation_id"] = correlation_id
+            correlation_receipts.put(correlation_id, result)
         return result
 
     def _list_submissions(self, params):
@@ -246,7 +306,7 @@ class GovernanceAPIHandler(BaseHTTPRequestHandler):
         before = params.get("before", [None])[0]
         limit = int(params.get("limit", [50])[0])
 
-        registry = SubmissionRegistry(SUBMISSIONS_DIR)
+        registry = loader.registry  # one registry.db connection per process
         results = registry.query(level=level, entity=entity, after=after, before=before, limit=limit)
         stats = registry.get_stats()
 
@@ -298,6 +358,7 @@ def main():
     print()
     print(f"  Endpoints:")
     print(f"    POST /api/generate")
+    print(f"    POST /api/generate-batch")
     print(f"    GET  /api/submissions")
     print(f"    GET  /api/submissions/<id>")
     print(f"    GET  /api/dashboard")
@@ -14,11 +14,27 @@ New in v2.0:
 - list_templates() - Available templates
 - list_forms() - Available forms
 - render_isp_template() - Jinja2 rendering
+
+New in v2.1 (asset cache):
+- Perfis, tokens, CSS, logos (já em base64), templates/forms/componentes
+  e templates Jinja2 compilados ficam em memória por perfil
+- Invalidação pela assinatura (mtime/tamanho) do diretório do perfil,
+  revalidada no máximo a cada ISP_CACHE_CHECK_INTERVAL_S segundos
+- Um único Environment Jinja2 com bytecode cache em disco
+- profile_id validado contra os perfis existentes; cache limitado (LRU)
 """
 import os
 import sys
+import re
+import copy
 import json
 import base64
+import functools
+import hashlib
+import stat
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 
@@ -30,6 +46,7 @@ if ISP_PATH not in sys.path:
 # Jinja2 for template rendering
 try:
     from jinja2 import Template, Environment, FileSystemLoader
+    from jinja2 import BaseLoader, FileSystemBytecodeCache, TemplateNotFound
     JINJA2_AVAILABLE = True
 except ImportError:
     JINJA2_AVAILABLE = False
@@ -37,6 +54,249 @@ except ImportError:
 
 ISP_BASE_PATH = Path("/opt/windi/isp")
 
+ISP_CACHE_CHECK_INTERVAL_S = 1.0   # revalida assinatura de um perfil no máximo 1x/s
+ISP_CACHE_MAX_PATHS = 128          # perfis (diretórios) mantidos no cache de ativos
+ISP_CACHE_MAX_VALUES = 256         # valores por perfil (ex.: um por nome de template)
+JINJA_CACHE_SIZE = 400             # templates compilados mantidos em memória
+# None: diretório padrão do Jinja2 (por usuário, 0700, dono verificado)
+JINJA_BYTECODE_DIR = os.environ.get("WINDI_ISP_JINJA_CACHE")
+
+# profile_id vem da URL: só slugs, nunca separadores ou ".."
+PROFILE_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# ============================================================
+# ISP ASSET CACHE
+# ============================================================
+
+def _path_signature(path):
+    """Assinatura de um arquivo ou árvore de diretório: (caminho, mtime_ns, tamanho) de cada entrada."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if not os.path.isdir(path):
+        return ((str(path), st.st_mtime_ns, st.st_size),)
+    sig = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        sig.append((root, os.stat(root).st_mtime_ns, 0))
+        for name in sorted(files):
+            try:
+                st = os.stat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            sig.append((os.path.join(root, name), st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+class ISPAssetCache:
+    """
+    Cache de ativos por caminho (diretório do perfil ou arquivo global).
+
+    Cada caminho guarda sua assinatura e um dict de valores já carregados.
+    Dentro do intervalo de verificação nenhuma chamada toca o disco; depois
+    dele a assinatura é recalculada e, se mudou, os valores do caminho são
+    descartados. Caminhos e valores por caminho são LRU limitados.
+    Valores são compartilhados — não modificar.
+    """
+
+    def __init__(self, check_interval=ISP_CACHE_CHECK_INTERVAL_S,
+                 max_paths=ISP_CACHE_MAX_PATHS, max_values=ISP_CACHE_MAX_VALUES):
+        self.check_interval = check_interval
+        self.max_paths = max_paths
+        self.max_values = max_values
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # path -> [signature, checked_at, values]
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def _entry(self, path):
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is None:
+            entry = [_path_signature(path), now, OrderedDict()]
+            self._entries[path] = entry
+            while len(self._entries) > self.max_paths:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        else:
+            self._entries.move_to_end(path)
+            if now - entry[1] >= self.check_interval:
+                sig = _path_signature(path)
+                if sig != entry[0]:
+                    entry[0], entry[2] = sig, OrderedDict()
+                    self.stats["invalidations"] += 1
+                entry[1] = now
+        return entry
+
+    def get(self, path, key, loader):
+        path = str(path)
+        with self._lock:
+            values = self._entry(path)[2]
+            if key in values:
+                self.stats["hits"] += 1
+                values.move_to_end(key)
+                return values[key]
+        value = loader()
+        with self._lock:
+            self.stats["misses"] += 1
+            value = values.setdefault(key, value)
+            while len(values) > self.max_values:
+                values.popitem(last=False)
+                self.stats["evictions"] += 1
+            return value
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+
+
+_asset_cache = ISPAssetCache()
+_known_profiles = [None, 0.0, frozenset()]   # [mtime_ns do ISP_BASE_PATH, checked_at, ids]
+_known_profiles_lock = threading.Lock()
+
+
+def _profile_dir(profile_id):
+    if not is_known_profile(profile_id):
+        raise ValueError(f"Unknown ISP profile: {profile_id!r}")
+    return ISP_BASE_PATH / profile_id
+
+
+def is_known_profile(profile_id):
+    """profile_id é um slug válido com diretório em ISP_BASE_PATH (revalidado como o cache)"""
+    if not isinstance(profile_id, str) or not PROFILE_ID_RE.match(profile_id):
+        return False
+    now = time.monotonic()
+    with _known_profiles_lock:
+        if now - _known_profiles[1] >= ISP_CACHE_CHECK_INTERVAL_S:
+            try:
+                mtime = os.stat(ISP_BASE_PATH).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != _known_profiles[0]:
+                ids = frozenset()
+                if mtime is not None:
+                    ids = frozenset(f.name for f in ISP_BASE_PATH.iterdir()
+                                    if f.is_dir() and f.name != "__pycache__"
+                                    and PROFILE_ID_RE.match(f.name))
+                _known_profiles[0], _known_profiles[2] = mtime, ids
+            _known_profiles[1] = now
+        return profile_id in _known_profiles[2]
+
+
+def invalidate_isp_cache(profile_id=None):
+    """Descarta ativos em cache de um perfil (ou de todos)"""
+    if profile_id is None:
+        _known_profiles[1] = 0.0
+        _asset_cache.invalidate()
+    else:
+        _asset_cache.invalidate(ISP_BASE_PATH / str(profile_id))
+
+
+def _profile_asset(default=None):
+    """
+    Decorator: resultado de func(profile_id, *args) fica em cache até o
+    diretório do perfil mudar. O valor é compartilhado — não modificar.
+    Um profile_id desconhecido (ou que não é slug) não toca o disco nem o
+    cache: devolve uma cópia de `default`, o mesmo valor de um perfil ausente.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(profile_id, *args):
+            if not is_known_profile(profile_id):
+                return copy.deepcopy(default)
+            return _asset_cache.get(_profile_dir(profile_id), (func.__name__,) + args,
+                                    lambda: func(profile_id, *args))
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def get_isp_cache_stats():
+    """Contadores do cache de ativos (hits, misses, invalidations)"""
+    return dict(_asset_cache.stats)
+
+
+@_profile_asset("")
+def get_isp_fingerprint(profile_id):
+    """Hash da assinatura do diretório do perfil — muda quando qualquer arquivo do ISP muda"""
+    signature = _path_signature(_profile_dir(profile_id))
+    return hashlib.sha256(repr(signature).encode("utf-8")).hexdigest()[:16]
+
+
+if JINJA2_AVAILABLE:
+    class _SourceLoader(BaseLoader):
+        """Templates identificados pelo hash do próprio código-fonte (LRU limitado)."""
+
+        def __init__(self, max_sources=JINJA_CACHE_SIZE):
+            self._sources = OrderedDict()
+            self._max_sources = max_sources
+            self._lock = threading.Lock()
+
+        def add(self, source):
+            name = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            with self._lock:
+                self._sources[name] = source
+                self._sources.move_to_end(name)
+                if len(self._sources) > self._max_sources:
+                    self._sources.popitem(last=False)
+            return name
+
+        def get_source(self, environment, name):
+            with self._lock:
+                source = self._sources.get(name)
+            if source is None:
+                raise TemplateNotFound(name)
+            return source, None, lambda: True
+
+_jinja_env = None
+_jinja_env_lock = threading.Lock()
+
+
+def _check_private_dir(path):
+    """Bytecode é carregado e executado: o diretório tem de ser nosso e 0700"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise OSError(f"{path} is not a directory")
+    if st.st_uid != os.getuid():
+        raise OSError(f"{path} is owned by uid {st.st_uid}, not {os.getuid()}")
+    if st.st_mode & 0o077:
+        raise OSError(f"{path} is accessible by other users (mode {stat.S_IMODE(st.st_mode):o})")
+
+
+def _get_jinja_env():
+    """Environment Jinja2 compartilhado (templates compilados + bytecode cache em disco)"""
+    global _jinja_env
+    with _jinja_env_lock:
+        if _jinja_env is None:
+            bytecode_cache = None
+            try:
+                if JINJA_BYTECODE_DIR:
+                    _check_private_dir(JINJA_BYTECODE_DIR)
+                    bytecode_cache = FileSystemBytecodeCache(JINJA_BYTECODE_DIR)
+                else:
+                    bytecode_cache = FileSystemBytecodeCache()
+            except (OSError, RuntimeError) as e:
+                print(f"[ISP] Jinja2 bytecode cache disabled: {e}")
+            # Custom env: prevent {# in CSS from being parsed as Jinja2 comment
+            _jinja_env = Environment(
+                loader=_SourceLoader(),
+                comment_start_string='{##', comment_end_string='##}',
+                auto_reload=False,
+                cache_size=JINJA_CACHE_SIZE,
+                bytecode_cache=bytecode_cache,
+            )
+        return _jinja_env
+
+
+def _compile_template(template_html):
+    """Template compilado para um código-fonte (compila uma vez por processo)"""
+    env = _get_jinja_env()
+    return env.get_template(env.loader.add(template_html))
+
 def list_profiles():
     """Lista todos os ISPs disponíveis (supports both legacy and canonical schema)"""
     profiles = []
@@ -45,8 +305,7 @@ def list_profiles():
             profile_file = folder / "profile.json"
             if profile_file.exists():
                 try:
-                    with open(profile_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = load_profile(folder.name)
                     # Canonical schema: isp_profile wrapper
                     if "isp_profile" in data:
                         isp = data["isp_profile"]
@@ -74,6 +333,7 @@ def list_profiles():
                     print(f"[ISP] Error loading {folder.name}: {e}")
     return profiles
 
+@_profile_asset(None)
 def load_profile(profile_id):
     """Carrega um ISP completo"""
     profile_path = ISP_BASE_PATH / profile_id / "profile.json"
@@ -82,6 +342,7 @@ def load_profile(profile_id):
     with open(profile_path, 'r') as f:
         return json.load(f)
 
+@_profile_asset("")
 def load_css(profile_id):
     """Carrega o CSS de um ISP"""
     css_path = ISP_BASE_PATH / profile_id / "styles.css"
@@ -103,12 +364,7 @@ def generate_html_header(profile_id, doc_title=""):
     if not profile:
         return ""
     
-    logo_path = get_logo_path(profile_id)
-    logo_b64 = ""
-    if logo_path and logo_path.exists():
-        import base64
-        with open(logo_path, 'rb') as f:
-            logo_b64 = base64.b64encode(f.read()).decode()
+    logo_b64 = get_logo_base64(profile_id)
     
     colors = profile.get("colors", {})
     primary = colors.get("primary", "#000000")
@@ -147,6 +403,7 @@ def generate_styled_html(profile_id, title, content, date_str=""):
 # ISP TEMPLATES v2.0 - New Template System
 # ============================================================
 
+@_profile_asset({})
 def load_tokens(profile_id):
     """
     Carrega design tokens de um ISP.
@@ -168,6 +425,7 @@ def load_tokens(profile_id):
         return {}
 
 
+@_profile_asset(None)
 def load_template(profile_id, template_name):
     """
     Carrega um template HTML de um ISP.
@@ -190,6 +448,7 @@ def load_template(profile_id, template_name):
         return None
 
 
+@_profile_asset("")
 def load_component(profile_id, component_name):
     """
     Carrega um componente HTML reutilizável de um ISP.
@@ -212,6 +471,7 @@ def load_component(profile_id, component_name):
         return ""
 
 
+@_profile_asset(None)
 def load_form(profile_id, form_name):
     """
     Carrega um formulário institucional específico.
@@ -234,6 +494,7 @@ def load_form(profile_id, form_name):
         return None
 
 
+@_profile_asset([])
 def list_templates(profile_id):
     """
     Lista todos os templates disponíveis para um ISP.
@@ -284,6 +545,7 @@ def list_templates(profile_id):
     return results
 
 
+@_profile_asset([])
 def list_forms(profile_id):
     """
     Lista todos os formulários disponíveis para um ISP.
@@ -332,6 +594,7 @@ def list_forms(profile_id):
     return results
 
 
+@_profile_asset([])
 def list_components(profile_id):
     """
     Lista todos os componentes disponíveis para um ISP.
@@ -348,6 +611,7 @@ def list_components(profile_id):
     return [f.stem for f in components_dir.glob("*.html")]
 
 
+@_profile_asset("")
 def get_logo_base64(profile_id):
     """
     Retorna o logo em base64 para embedding em HTML.
@@ -387,18 +651,41 @@ def render_isp_template(profile_id, template_html, context=None):
     if context is None:
         context = {}
 
-    # Load tokens and profile for default context
-    tokens = load_tokens(profile_id)
-    profile = load_profile(profile_id)
-
-    # Build default context
+    now = datetime.now()
     default_context = {
         # Metadata
         "profile_id": profile_id,
-        "doc_date": datetime.now().strftime("%d.%m.%Y"),
-        "doc_datetime": datetime.now().isoformat(),
-        "year": datetime.now().year,
+        "doc_date": now.strftime("%d.%m.%Y"),
+        "doc_datetime": now.isoformat(),
+        "year": now.year,
+        # perfil desconhecido: contexto padrão, sem cache
+        **(_profile_context(profile_id) or _profile_context.uncached(profile_id)),
+
+        # WINDI defaults
+        "windi_level": "LOW",
+        "windi_receipt": "",
+        "windi_timestamp": now.isoformat(),
+        "show_windi": True,
+    }
+
+    # Merge with provided context (provided context takes precedence)
+    final_context = {**default_context, **context}
 
+    try:
+        template = _compile_template(template_html)
+        return template.render(**final_context)
+    except Exception as e:
+        print(f"[ISP] Template render error: {e}")
+        return template_html
+
+
+@_profile_asset(None)
+def _profile_context(profile_id):
+    """Parte do contexto padrão que depende só do perfil (tokens, organização, logo)"""
+    tokens = load_tokens(profile_id)
+    profile = load_profile(profile_id)
+
+    return {
         # Organization from profile
         "org_name": profile.get("organization", {}).get("organization_name", "") if profile else "",
         "org_type": profile.get("organization", {}).get("organization_type", "") if profile else "",
@@ -416,26 +703,8 @@ def render_isp_template(profile_id, template_html, context=None):
         # Typography from tokens
         "font_family": tokens.get("typography", {}).get("font_family", {}).get("primary", "Arial, sans-serif"),
         "font_size_base": tokens.get("typography", {}).get("font_size", {}).get("base", "9pt"),
-
-        # WINDI defaults
-        "windi_level": "LOW",
-        "windi_receipt": "",
-        "windi_timestamp": datetime.now().isoformat(),
-        "show_windi": True,
     }
 
-    # Merge with provided context (provided context takes precedence)
-    final_context = {**default_context, **context}
-
-    try:
-        # Custom env: prevent {# in CSS from being parsed as Jinja2 comment
-        env = Environment(comment_start_string='{##', comment_end_string='##}')
-        template = env.from_string(template_html)
-        return template.render(**final_context)
-    except Exception as e:
-        print(f"[ISP] Template render error: {e}")
-        return template_html
-
 
 def build_full_document(profile_id, content_html, template_type="letter", form_id=None, context=None):
     """
@@ -523,13 +792,16 @@ print("✓ ISP Templates v2.0 loaded")
 
 GOVERNANCE_LEVELS_FILE = ISP_BASE_PATH / "governance_levels.json"
 
-def load_governance_levels():
-    """Carrega configuração global de níveis de governança"""
+def _read_governance_levels():
     if not GOVERNANCE_LEVELS_FILE.exists():
         return None
     with open(GOVERNANCE_LEVELS_FILE, 'r') as f:
         return json.load(f)
 
+def load_governance_levels():
+    """Carrega configuração global de níveis de governança (cache por mtime do arquivo)"""
+    return _asset_cache.get(GOVERNANCE_LEVELS_FILE, "governance_levels", _read_governance_levels)
+
 def get_governance_config(profile_id, doc_type=None):
     """Determina configuração de governança para um documento."""
     global_config = load_governance_levels()
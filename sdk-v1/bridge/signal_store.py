@@ -0,0 +1,276 @@
+"""
+WINDI Bridge Signal Store v1.0
+Append-only segment log for validated telemetry
+
+Records are written by a background flusher thread with group commit
+(one write + fsync per group), so ingest only pays for a bounded queue
+put. Segments roll by size or age; each carries a sparse timestamp index
+so range scans seek instead of reading whole segments. On startup the
+bridge replays recent segments to rebuild aggregates and nonce windows.
+
+Layout (one directory):
+    00000001.seg   records: >IIq (payload length, crc32, t_ms) + JSON payload
+    00000001.idx   sparse index: >qq (t_ms, byte offset) every INDEX_EVERY records
+
+"Flow is Truth. Content is Sovereign."
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# ─── Configuration ───────────────────────────────────────────────
+
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024   # roll after 64 MiB
+SEGMENT_MAX_AGE_S = 3600               # ... or after 1 hour
+INDEX_EVERY = 256                      # one sparse index entry per N records
+STORE_QUEUE_SIZE = 10_000              # pending appends (records or record lists)
+STORE_PUT_TIMEOUT_S = 0.05             # max time ingest waits on a full queue
+GROUP_COMMIT_MAX = 512                 # queue items per commit
+GROUP_COMMIT_WINDOW_S = 0.005          # wait this long for more items before commit
+
+_REC_HEADER = struct.Struct(">IIq")
+_IDX_ENTRY = struct.Struct(">qq")
+_STOP = object()
+
+
+def _segment_path(directory: str, number: int, ext: str) -> str:
+    return os.path.join(directory, f"{number:08d}.{ext}")
+
+
+def _read_records(f) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield (offset, t_ms, payload) from the current position; stops at a torn/corrupt record."""
+    offset = f.tell()
+    while True:
+        head = f.read(_REC_HEADER.size)
+        if len(head) < _REC_HEADER.size:
+            return
+        length, crc, t_ms = _REC_HEADER.unpack(head)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        yield offset, t_ms, payload
+        offset += _REC_HEADER.size + length
+
+
+class SignalStore:
+    """Durable, append-only record log with group commit and sparse time index."""
+
+    def __init__(self, directory: str,
+                 segment_max_bytes: int = SEGMENT_MAX_BYTES,
+                 segment_max_age_s: float = SEGMENT_MAX_AGE_S,
+                 queue_size: int = STORE_QUEUE_SIZE,
+                 put_timeout_s: float = STORE_PUT_TIMEOUT_S):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age_s = segment_max_age_s
+        self.put_timeout_s = put_timeout_s
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()          # guards segment list / index for readers
+        self._stats = {"appended": 0, "dropped": 0, "commits": 0, "bytes": 0}
+        self._last_t = 0
+        self._active_count = 0
+
+        self._segments: List[int] = sorted(
+            int(name[:-4]) for name in os.listdir(directory) if name.endswith(".seg")
+        )
+        if self._segments:
+            self._recover_tail()
+        else:
+            self._segments.append(1)
+        self._open_active()
+
+        self._thread = threading.Thread(target=self._run, name="signal-store-flusher", daemon=True)
+        self._thread.start()
+
+    # ─── Startup ─────────────────────────────────────────────────
+
+    def _recover_tail(self):
+        """Truncate a torn last record and rebuild the active segment's index."""
+        number = self._segments[-1]
+        seg = _segment_path(self.directory, number, "seg")
+        entries, end, count = [], 0, 0
+        with open(seg, "rb") as f:
+            for offset, t_ms, payload in _read_records(f):
+                if count % INDEX_EVERY == 0:
+                    entries.append((t_ms, offset))
+                count += 1
+                end = offset + _REC_HEADER.size + len(payload)
+                self._last_t = max(self._last_t, t_ms)
+        if os.path.getsize(seg) != end:
+            with open(seg, "r+b") as f:
+                f.truncate(end)
+        with open(_segment_path(self.directory, number, "idx"), "wb") as f:
+            f.write(b"".join(_IDX_ENTRY.pack(t, o) for t, o in entries))
+        self._active_count = count
+
+    def _open_active(self):
+        number = self._segments[-1]
+        self._seg_file = open(_segment_path(self.directory, number, "seg"), "ab")
+        self._idx_file = open(_segment_path(self.directory, number, "idx"), "ab")
+        self._active_size = self._seg_file.tell()
+        self._active_started = time.time()
+
+    def _roll(self):
+        for f in (self._seg_file, self._idx_file):
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+        with self._lock:
+            self._segments.append(self._segments[-1] + 1)
+        self._active_count = 0
+        self._open_active()
+
+    # ─── Writes ──────────────────────────────────────────────────
+
+    def append(self, record: Dict[str, Any]) -> bool:
+        """Queue one record. Returns False if dropped because the queue stayed full."""
+        return self._put(record, 1)
+
+    def append_many(self, records: List[Dict[str, Any]]) -> bool:
+        """Queue records as one item (kept together in a single commit)."""
+        return self._put(records, len(records)) if records else True
+
+    def _put(self, item, n: int) -> bool:
+        try:
+            self._queue.put(item, timeout=self.put_timeout_s)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += n
+            return False
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + GROUP_COMMIT_WINDOW_S
+            while len(batch) < GROUP_COMMIT_MAX and batch[-1] is not _STOP:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0)) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = []
+            for item in batch:
+                if item is _STOP:
+                    continue
+                if isinstance(item, list):
+                    records.extend(item)
+                else:
+                    records.append(item)
+            try:
+                if records:
+                    self._commit(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is _STOP:
+                return
+
+    def _commit(self, records: List[Dict[str, Any]]):
+        """Group commit: encode, one write per file, one fsync."""
+        if (self._active_size >= self.segment_max_bytes
+                or (self._active_count and time.time() - self._active_started >= self.segment_max_age_s)):
+            self._roll()
+        t_ms = max(int(time.time() * 1000), self._last_t)
+        self._last_t = t_ms
+        chunks, idx = [], []
+        offset = self._active_size
+        for rec in records:
+            payload = json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            if self._active_count % INDEX_EVERY == 0:
+                idx.append(_IDX_ENTRY.pack(t_ms, offset))
+            chunks.append(_REC_HEADER.pack(len(payload), zlib.crc32(payload), t_ms))
+            chunks.append(payload)
+            offset += _REC_HEADER.size + len(payload)
+            self._active_count += 1
+        self._seg_file.write(b"".join(chunks))
+        self._seg_file.flush()
+        os.fsync(self._seg_file.fileno())
+        if idx:
+            self._idx_file.write(b"".join(idx))
+            self._idx_file.flush()
+        with self._lock:
+            self._stats["appended"] += len(records)
+            self._stats["commits"] += 1
+            self._stats["bytes"] += offset - self._active_size
+        self._active_size = offset
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit pending records and stop the flusher."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        for f in (self._seg_file, self._idx_file):
+            if not f.closed:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+
+    # ─── Reads ───────────────────────────────────────────────────
+
+    def _load_index(self, number: int) -> List[Tuple[int, int]]:
+        try:
+            with open(_segment_path(self.directory, number, "idx"), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        usable = len(data) - len(data) % _IDX_ENTRY.size
+        return [_IDX_ENTRY.unpack_from(data, i) for i in range(0, usable, _IDX_ENTRY.size)]
+
+    def scan(self, start_ms: Optional[int] = None,
+             end_ms: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (t_ms, record) with start_ms <= t_ms <= end_ms, oldest first.
+        Segments outside the range are skipped; inside a segment the sparse
+        index is used to seek close to start_ms.
+        """
+        with self._lock:
+            segments = list(self._segments)
+        indexes = {n: self._load_index(n) for n in segments}
+        firsts = [indexes[n][0][0] if indexes[n] else None for n in segments]
+
+        for pos, number in enumerate(segments):
+            index = indexes[number]
+            if not index:
+                continue
+            if end_ms is not None and index[0][0] > end_ms:
+                break
+            next_first = next((t for t in firsts[pos + 1:] if t is not None), None)
+            if start_ms is not None and next_first is not None and next_first < start_ms:
+                continue        # whole segment precedes the range
+            offset = 0
+            if start_ms is not None:
+                i = bisect.bisect_left(index, (start_ms, -1)) - 1
+                offset = index[max(i, 0)][1]
+            with open(_segment_path(self.directory, number, "seg"), "rb") as f:
+                f.seek(offset)
+                for _, t_ms, payload in _read_records(f):
+                    if start_ms is not None and t_ms < start_ms:
+                        continue
+                    if end_ms is not None and t_ms > end_ms:
+                        return
+                    yield t_ms, json.loads(payload)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["segments"] = len(self._segments)
+        stats["queued"] = self._queue.qsize()
+        stats["avg_group"] = round(stats["appended"] / stats["commits"], 1) if stats["commits"] else 0
+        return stats
@@ -11,9 +11,14 @@ decodes Micro-Signals and routes them to the Dashboard aggregator.
 from __future__ import annotations
 
 import base64
-import hashlib
+import heapq
 import hmac
+import itertools
 import json
+import multiprocessing
+import os
+import queue
+import signal
 import time
 import threading
 from collections import deque
@@ -21,6 +26,8 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+from signal_store import SignalStore
+
 # ─── Configuration ───────────────────────────────────────────────
 
 PROTOCOL_VERSION = "1.0"
@@ -28,6 +35,31 @@ MAX_TS_DRIFT_MS = 300_000        # 5 minutes max clock drift (production)
 MAX_TS_DRIFT_SIMULATION_MS = 365 * 24 * 3600 * 1000  # 1 year (simulation mode)
 NONCE_WINDOW_SIZE = 10_000       # remember last 10k nonces per client
 SEQ_GRACE = 50                   # allow seq gaps up to 50 (batch reorder)
+SHELF_RING_SIZE = 1_000          # per-shelf signal ring (detail view + window avg)
+HOTSPOT_WINDOW = 200             # hotspots are ranked over the last N signals
+HOTSPOT_TOP_K = 5
+
+# Batch pipeline
+PARALLEL_VERIFY_MIN = 2_000      # batches at least this large verify HMACs on the pool
+VERIFY_WORKERS = os.cpu_count() or 1
+VERIFY_CHUNK = 500               # packets per verification task
+
+# HTTP server limits
+MAX_BODY_BYTES = 64 * 1024                 # single packet / register
+MAX_BATCH_BODY_BYTES = 8 * 1024 * 1024     # /api/v1/telemetry/batch
+SERVER_WORKERS = 16              # concurrent mode worker threads
+SERVER_QUEUE_SIZE = 64           # accepted connections waiting for a worker
+KEEPALIVE_TIMEOUT_S = 5          # slow client read timeout within a request
+KEEPALIVE_IDLE_S = 2             # idle keep-alive: close if no next request by then
+KEEPALIVE_MAX_REQUESTS = 100     # requests per keep-alive connection before Connection: close
+RETRY_AFTER_S = 1                # Retry-After on 429 when the queue is full
+DRAIN_TIMEOUT_S = 30             # graceful shutdown: max wait for in-flight work
+
+# Durable signal store
+STORE_DIR = os.environ.get("WINDI_BRIDGE_DATA",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+REPLAY_WINDOW_S = 24 * 3600      # startup replay: rebuild state from the last 24h
+REPLAY_CHUNK = 10_000            # signals per aggregator lock during replay
 
 # Micro-Signal Registry (RFC-001)
 SIGNAL_REGISTRY = {
@@ -63,11 +95,56 @@ def _b64d(s: str) -> bytes:
 def _b64e(b: bytes) -> str:
     return base64.b64encode(b).decode("ascii")
 
+_CANONICAL_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
 def _canonical_json(obj: Any) -> bytes:
-    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return _CANONICAL_ENCODER.encode(obj).encode("utf-8")
 
 def _hmac_sha256(key: bytes, msg: bytes) -> bytes:
-    return hmac.new(key, msg, hashlib.sha256).digest()
+    return hmac.digest(key, msg, "sha256")
+
+def _error(e: Exception) -> str:
+    return f"ERROR:{type(e).__name__}:{str(e)}"
+
+def _verify_signature(key: bytes, header: Dict, payload: Dict, sig_b64: str) -> Optional[str]:
+    """Returns error string or None if the HMAC matches."""
+    sig_expected = _hmac_sha256(key, _canonical_json({"header": header, "payload": payload}))
+    if not hmac.compare_digest(sig_expected, _b64d(sig_b64)):
+        return "AUTH:HMAC_INVALID"
+    return None
+
+def _verify_chunk(items: List[Tuple[bytes, Dict, Dict, str]]) -> List[Optional[str]]:
+    """Pool task: verify a chunk of (key, header, payload, sig_b64)."""
+    out = []
+    for key, header, payload, sig_b64 in items:
+        try:
+            out.append(_verify_signature(key, header, payload, sig_b64))
+        except Exception as e:
+            out.append(_error(e))
+    return out
+
+
+_verify_pool = None
+_verify_pool_lock = threading.Lock()
+
+def _get_verify_pool():
+    """Process pool for batch HMAC verification (created on first large batch)."""
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is None:
+            import concurrent.futures
+            _verify_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=VERIFY_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _verify_pool
+
+def _reset_verify_pool():
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is not None:
+            _verify_pool.shutdown(wait=False, cancel_futures=True)
+        _verify_pool = None
 
 
 # ─── Anti-Replay State ──────────────────────────────────────────
@@ -92,27 +169,62 @@ class ClientState:
             return f"REPLAY:TS_DRIFT ts={ts} drift={drift}ms max={MAX_TS_DRIFT_MS}ms"
 
         with self.lock:
-            # Nonce uniqueness
-            if nonce in self.nonce_set:
-                return f"REPLAY:NONCE_REUSE nonce={nonce[:8]}..."
-
-            # Sequence monotonicity (with grace for batch reorder)
-            if seq <= self.last_seq - SEQ_GRACE:
-                return f"REPLAY:SEQ_REGRESSION seq={seq} last={self.last_seq}"
+            return self._check_locked(seq, nonce)
 
-            # All checks passed — update state
+    def check_and_update_many(self, items: List[Tuple[Any, Any, Any]]) -> List[Optional[str]]:
+        """
+        check_and_update for (seq, nonce, ts) items in order, under a single
+        lock acquisition. Per-item exceptions become "ERROR:..." strings.
+        """
+        now_ms = int(time.time() * 1000)
+        max_drift = MAX_TS_DRIFT_SIMULATION_MS if self.simulation_mode else MAX_TS_DRIFT_MS
+        out: List[Optional[str]] = []
+        with self.lock:
+            for seq, nonce, ts in items:
+                try:
+                    drift = abs(now_ms - ts)
+                    if drift > max_drift:
+                        out.append(f"REPLAY:TS_DRIFT ts={ts} drift={drift}ms max={MAX_TS_DRIFT_MS}ms")
+                    else:
+                        out.append(self._check_locked(seq, nonce))
+                except Exception as e:
+                    out.append(_error(e))
+        return out
+
+    def _check_locked(self, seq: int, nonce: str) -> Optional[str]:
+        # Nonce uniqueness
+        if nonce in self.nonce_set:
+            return f"REPLAY:NONCE_REUSE nonce={nonce[:8]}..."
+
+        # Sequence monotonicity (with grace for batch reorder)
+        if seq <= self.last_seq - SEQ_GRACE:
+            return f"REPLAY:SEQ_REGRESSION seq={seq} last={self.last_seq}"
+
+        # All checks passed — update state
+        if seq > self.last_seq:
+            self.last_seq = seq
+
+        # Rotate nonce window
+        if len(self.nonces) >= NONCE_WINDOW_SIZE:
+            evicted = self.nonces[0]
+            self.nonce_set.discard(evicted)
+        self.nonces.append(nonce)
+        self.nonce_set.add(nonce)
+
+        return None
+
+    def restore(self, seq: int, nonce: str):
+        """Re-apply an already accepted packet during startup replay (no checks)."""
+        with self.lock:
             if seq > self.last_seq:
                 self.last_seq = seq
-
-            # Rotate nonce window
+            if nonce in self.nonce_set:
+                return
             if len(self.nonces) >= NONCE_WINDOW_SIZE:
-                evicted = self.nonces[0]
-                self.nonce_set.discard(evicted)
+                self.nonce_set.discard(self.nonces[0])
             self.nonces.append(nonce)
             self.nonce_set.add(nonce)
 
-            return None
-
 
 # ─── Signal Aggregator (Dashboard Feed) ─────────────────────────
 
@@ -134,13 +246,41 @@ class DecodedSignal:
     seq: int = 0
 
 
+@dataclass
+class ShelfStats:
+    """Running per-shelf aggregates, updated in O(1) at ingest time."""
+    count: int = 0
+    weight_sum: int = 0
+    ring: deque = field(default_factory=lambda: deque(maxlen=SHELF_RING_SIZE))
+    window_sum: int = 0
+
+    def add(self, sig: "DecodedSignal"):
+        self.count += 1
+        self.weight_sum += sig.weight
+        if len(self.ring) == self.ring.maxlen:
+            self.window_sum -= self.ring[0].weight
+        self.ring.append(sig)
+        self.window_sum += sig.weight
+
+
 class SignalAggregator:
-    """Thread-safe signal store with shelf-based indexing for dashboards."""
+    """
+    Thread-safe signal store with shelf-based indexing for dashboards.
+
+    Everything the dashboard shows is maintained incrementally at ingest:
+    per-shelf bounded rings with running and sliding-window weight sums,
+    and a max-heap over the last HOTSPOT_WINDOW signals for hotspots.
+    Snapshot cost does not depend on how many signals were received.
+    """
 
     def __init__(self, max_signals: int = 50_000):
         self._lock = threading.Lock()
         self._signals: deque = deque(maxlen=max_signals)
-        self._by_shelf: Dict[str, List[DecodedSignal]] = {s: [] for s in VALID_SHELVES}
+        self._by_shelf: Dict[str, ShelfStats] = {s: ShelfStats() for s in VALID_SHELVES}
+        # Hotspot heap entries: (-weight, ingest_no, signal). Entries older
+        # than HOTSPOT_WINDOW are dropped lazily when they reach the top.
+        self._hot_heap: List[Tuple[int, int, DecodedSignal]] = []
+        self._ingest_no = 0
         self._stats = {
             "total_received": 0,
             "total_rejected": 0,
@@ -153,87 +293,169 @@ class SignalAggregator:
 
     def ingest(self, sig: DecodedSignal):
         with self._lock:
-            self._signals.append(sig)
-            self._by_shelf[sig.shelf].append(sig)
-            self._stats["total_received"] += 1
-            self._stats["by_shelf"][sig.shelf] += 1
-            self._stats["by_severity"][sig.severity] += 1
-            self._stats["by_event"][sig.event] += 1
-            self._stats["weight_sum"] += sig.weight
-            self._stats["weight_count"] += 1
-
-    def reject(self):
+            self._ingest_locked(sig)
+
+    def ingest_many(self, sigs: List[DecodedSignal]):
+        """Ingest signals in order under a single lock acquisition."""
+        with self._lock:
+            for sig in sigs:
+                self._ingest_locked(sig)
+
+    def _ingest_locked(self, sig: DecodedSignal):
+        self._signals.append(sig)
+        self._by_shelf[sig.shelf].add(sig)
+        self._stats["total_received"] += 1
+        self._stats["by_shelf"][sig.shelf] += 1
+        self._stats["by_severity"][sig.severity] += 1
+        self._stats["by_event"][sig.event] += 1
+        self._stats["weight_sum"] += sig.weight
+        self._stats["weight_count"] += 1
+
+        self._ingest_no += 1
+        heapq.heappush(self._hot_heap, (-sig.weight, self._ingest_no, sig))
+        if len(self._hot_heap) > 4 * HOTSPOT_WINDOW:
+            # Rebuild from live entries; amortised O(1) per ingest
+            floor = self._ingest_no - HOTSPOT_WINDOW
+            self._hot_heap = [e for e in self._hot_heap if e[1] > floor]
+            heapq.heapify(self._hot_heap)
+
+    def reject(self, count: int = 1):
         with self._lock:
-            self._stats["total_rejected"] += 1
+            self._stats["total_rejected"] += count
+
+    def _top_hotspots(self) -> List[DecodedSignal]:
+        """Top-K by weight (earliest first on ties) among the last HOTSPOT_WINDOW signals."""
+        floor = self._ingest_no - HOTSPOT_WINDOW
+        heap = self._hot_heap
+        top = []
+        while heap and len(top) < HOTSPOT_TOP_K:
+            entry = heapq.heappop(heap)
+            if entry[1] > floor:
+                top.append(entry)
+        for entry in top:
+            heapq.heappush(heap, entry)
+        return [entry[2] for entry in top]
 
     def get_dashboard_state(self) -> Dict[str, Any]:
         """Snapshot for Dashboard consumption."""
         with self._lock:
-            avg_weight = (
-                round(self._stats["weight_sum"] / self._stats["weight_count"], 1)
-                if self._stats["weight_count"] > 0 else 0
-            )
-
-            # Last 20 signals for live feed
-            recent = list(self._signals)[-20:]
-            recent_dicts = [
-                {
-                    "ts": s.ts, "shelf": s.shelf, "code": s.code,
-                    "signal_name": s.signal_name, "severity": s.severity,
-                    "weight": s.weight, "event": s.event,
-                }
-                for s in recent
-            ]
-
-            # Shelf health (avg weight per shelf, higher = more stress)
-            shelf_health = {}
-            for shelf_id, signals in self._by_shelf.items():
-                if signals:
-                    shelf_avg = sum(s.weight for s in signals) / len(signals)
-                    shelf_health[shelf_id] = {
-                        "count": len(signals),
-                        "avg_weight": round(shelf_avg, 1),
-                        "status": "critical" if shelf_avg > 75 else "warning" if shelf_avg > 50 else "healthy",
-                    }
-                else:
-                    shelf_health[shelf_id] = {"count": 0, "avg_weight": 0, "status": "no_data"}
-
-            # Top 5 hottest signals (highest weight recent)
-            hot = sorted(list(self._signals)[-200:], key=lambda s: s.weight, reverse=True)[:5]
-            hotspots = [
-                {"code": s.code, "signal_name": s.signal_name, "weight": s.weight, "event": s.event}
-                for s in hot
-            ]
-
-            return {
-                "meta": {
-                    "snapshot_ts": int(time.time() * 1000),
-                    "protocol": PROTOCOL_VERSION,
-                },
-                "totals": {
-                    "received": self._stats["total_received"],
-                    "rejected": self._stats["total_rejected"],
-                    "avg_weight": avg_weight,
-                },
+            stats = {
+                "received": self._stats["total_received"],
+                "rejected": self._stats["total_rejected"],
+                "weight_sum": self._stats["weight_sum"],
+                "weight_count": self._stats["weight_count"],
                 "by_shelf": self._stats["by_shelf"].copy(),
                 "by_severity": self._stats["by_severity"].copy(),
                 "by_event": self._stats["by_event"].copy(),
-                "shelf_health": shelf_health,
-                "hotspots": hotspots,
-                "live_feed": recent_dicts,
             }
+            shelves = {
+                shelf_id: (st.count, st.weight_sum, len(st.ring), st.window_sum)
+                for shelf_id, st in self._by_shelf.items()
+            }
+            # Last 20 signals for live feed
+            recent = list(itertools.islice(reversed(self._signals), 20))[::-1]
+            hot = self._top_hotspots()
+
+        # Formatting happens outside the lock so ingest is not held up
+        avg_weight = (
+            round(stats["weight_sum"] / stats["weight_count"], 1)
+            if stats["weight_count"] > 0 else 0
+        )
+
+        recent_dicts = [
+            {
+                "ts": s.ts, "shelf": s.shelf, "code": s.code,
+                "signal_name": s.signal_name, "severity": s.severity,
+                "weight": s.weight, "event": s.event,
+            }
+            for s in recent
+        ]
+
+        # Shelf health (avg weight per shelf, higher = more stress)
+        shelf_health = {}
+        for shelf_id, (count, weight_sum, window_count, window_sum) in shelves.items():
+            if count:
+                shelf_avg = weight_sum / count
+                shelf_health[shelf_id] = {
+                    "count": count,
+                    "avg_weight": round(shelf_avg, 1),
+                    "window_count": window_count,
+                    "window_avg_weight": round(window_sum / window_count, 1),
+                    "status": "critical" if shelf_avg > 75 else "warning" if shelf_avg > 50 else "healthy",
+                }
+            else:
+                shelf_health[shelf_id] = {"count": 0, "avg_weight": 0, "status": "no_data"}
+
+        # Top 5 hottest signals (highest weight recent)
+        hotspots = [
+            {"code": s.code, "signal_name": s.signal_name, "weight": s.weight, "event": s.event}
+            for s in hot
+        ]
+
+        return {
+            "meta": {
+                "snapshot_ts": int(time.time() * 1000),
+                "protocol": PROTOCOL_VERSION,
+            },
+            "totals": {
+                "received": stats["received"],
+                "rejected": stats["rejected"],
+                "avg_weight": avg_weight,
+            },
+            "by_shelf": stats["by_shelf"],
+            "by_severity": stats["by_severity"],
+            "by_event": stats["by_event"],
+            "shelf_health": shelf_health,
+            "hotspots": hotspots,
+            "live_feed": recent_dicts,
+        }
 
     def get_shelf_detail(self, shelf: str, limit: int = 50) -> List[Dict]:
         with self._lock:
-            signals = self._by_shelf.get(shelf, [])[-limit:]
-            return [
-                {
-                    "ts": s.ts, "code": s.code, "signal_name": s.signal_name,
-                    "weight": s.weight, "event": s.event, "severity": s.severity,
-                    "domain_hash": s.domain_hash[:12] + "...",
-                }
-                for s in signals
-            ]
+            st = self._by_shelf.get(shelf)
+            signals = list(itertools.islice(reversed(st.ring), limit))[::-1] if st else []
+        return [
+            {
+                "ts": s.ts, "code": s.code, "signal_name": s.signal_name,
+                "weight": s.weight, "event": s.event, "severity": s.severity,
+                "domain_hash": s.domain_hash[:12] + "...",
+            }
+            for s in signals
+        ]
+
+
+def _benchmark(n: int = 1_000_000, snapshots: int = 200):
+    """Ingest throughput and snapshot latency with `n` signals already received."""
+    import random
+    random.seed(7)
+    codes = list(SIGNAL_REGISTRY)
+    events = sorted(VALID_EVENTS)
+    signals = []
+    for i in range(n):
+        code = codes[i % len(codes)]
+        meta = SIGNAL_REGISTRY[code]
+        signals.append(DecodedSignal(
+            ts=i, client_id_hash="bench", shelf=meta["shelf"], code=code,
+            signal_name=meta["name"], severity=meta["severity"],
+            weight=random.randint(0, 100), domain_hash="0" * 64,
+            doc_fingerprint="", event=events[i % len(events)], seq=i,
+        ))
+
+    agg = SignalAggregator()
+    t0 = time.perf_counter()
+    for sig in signals:
+        agg.ingest(sig)
+    ingest_s = time.perf_counter() - t0
+
+    lat = []
+    for _ in range(snapshots):
+        t = time.perf_counter()
+        agg.get_dashboard_state()
+        lat.append((time.perf_counter() - t) * 1000)
+    lat.sort()
+
+    print(f"ingest:   {n:,} signals in {ingest_s:.2f}s ({n / ingest_s:,.0f} signals/s)")
+    print(f"snapshot: p50 {lat[len(lat) // 2]:.3f}ms  p99 {lat[int(len(lat) * 0.99)]:.3f}ms  (at {n:,} signals)")
 
 
 # ─── Bridge Core ─────────────────────────────────────────────────
@@ -246,12 +468,58 @@ class WindiBridge:
     to the Dashboard aggregator.
     """
 
-    def __init__(self, simulation_mode: bool = False):
+    def __init__(self, simulation_mode: bool = False, store: Optional[SignalStore] = None):
         self._clients: Dict[str, ClientState] = {}
         self._client_keys: Dict[str, bytes] = {}  # kid -> hmac_key
         self.aggregator = SignalAggregator()
         self._lock = threading.Lock()
         self._simulation_mode = simulation_mode
+        self.store = store
+
+    def attach_store(self, store: SignalStore,
+                     replay_window_s: Optional[float] = REPLAY_WINDOW_S) -> Dict[str, int]:
+        """
+        Rebuild aggregates and nonce windows from the store's recent segments,
+        then persist every accepted signal / rejection to it from now on.
+        replay_window_s=None replays the whole store; 0 replays nothing.
+        """
+        if replay_window_s is None:
+            records = store.scan()
+        elif replay_window_s > 0:
+            records = store.scan(int((time.time() - replay_window_s) * 1000))
+        else:
+            records = ()
+        replayed = {"signals": 0, "rejected": 0}
+        chunk: List[DecodedSignal] = []
+        for _, rec in records:
+            kind = rec.pop("k", None)
+            if kind == "rej":
+                self.aggregator.reject(rec.get("n", 1))
+                replayed["rejected"] += rec.get("n", 1)
+            elif kind == "sig":
+                nonce = rec.pop("nonce", None)
+                sig = DecodedSignal(**rec)
+                if nonce:
+                    self._client_state(sig.client_id_hash).restore(sig.seq, nonce)
+                chunk.append(sig)
+                if len(chunk) >= REPLAY_CHUNK:
+                    self.aggregator.ingest_many(chunk)
+                    chunk = []
+                replayed["signals"] += 1
+        self.aggregator.ingest_many(chunk)
+        self.store = store
+        return replayed
+
+    @staticmethod
+    def _signal_record(sig: DecodedSignal, nonce: str) -> Dict[str, Any]:
+        rec = {"k": "sig", "nonce": nonce}
+        rec.update(vars(sig))
+        return rec
+
+    def _reject(self, count: int = 1):
+        self.aggregator.reject(count)
+        if self.store is not None:
+            self.store.append({"k": "rej", "n": count})
 
     def register_client(self, client_id_hash: str, key_id: str, hmac_key_b64: str):
         """Register a client's HMAC key for signature verification."""
@@ -260,6 +528,82 @@ class WindiBridge:
             if client_id_hash not in self._clients:
                 self._clients[client_id_hash] = ClientState(simulation_mode=self._simulation_mode)
 
+    def _client_state(self, cid: str) -> ClientState:
+        with self._lock:
+            if cid not in self._clients:
+                self._clients[cid] = ClientState(simulation_mode=self._simulation_mode)
+            return self._clients[cid]
+
+    def _precheck(self, packet: Dict[str, Any]) -> Tuple[Optional[str], Optional[Tuple]]:
+        """
+        Schema validation and key lookup (everything before the HMAC).
+        Returns (error, None) or (None, (header, payload, hmac_key, sig_b64)).
+        """
+        # ── Step 1: Schema validation ──
+        header = packet.get("header")
+        payload = packet.get("payload")
+        auth = packet.get("auth")
+
+        if not all([header, payload, auth]):
+            return "SCHEMA:MISSING_FIELDS", None
+
+        if header.get("v") != PROTOCOL_VERSION:
+            return f"SCHEMA:VERSION_MISMATCH v={header.get('v')}", None
+
+        kid = header.get("kid")
+        cid = header.get("cid")
+        ts = header.get("ts")
+        nonce = header.get("nonce")
+        seq = header.get("seq")
+
+        if not all([kid, cid, ts, nonce, seq is not None]):
+            return "SCHEMA:HEADER_INCOMPLETE", None
+
+        shelf = payload.get("shelf")
+        weight = payload.get("weight")
+        event = payload.get("event")
+
+        if shelf not in VALID_SHELVES:
+            return f"SCHEMA:INVALID_SHELF shelf={shelf}", None
+
+        if event not in VALID_EVENTS:
+            return f"SCHEMA:INVALID_EVENT event={event}", None
+
+        if not isinstance(weight, int) or weight < 0 or weight > 100:
+            return f"SCHEMA:INVALID_WEIGHT weight={weight}", None
+
+        # ── Step 2a: Key lookup ──
+        hmac_key = self._client_keys.get(kid)
+        if hmac_key is None:
+            return f"AUTH:UNKNOWN_KEY kid={kid}", None
+
+        return None, (header, payload, hmac_key, auth["sig"])
+
+    @staticmethod
+    def _decode(header: Dict[str, Any], payload: Dict[str, Any]) -> DecodedSignal:
+        code = payload.get("code")
+        signal_meta = SIGNAL_REGISTRY.get(code, {})
+        ctx = payload.get("ctx", {})
+        return DecodedSignal(
+            ts=header.get("ts"),
+            client_id_hash=header.get("cid"),
+            shelf=payload.get("shelf"),
+            code=code,
+            signal_name=signal_meta.get("name", f"UNKNOWN:{code}"),
+            severity=signal_meta.get("severity", "unknown"),
+            weight=payload.get("weight"),
+            domain_hash=payload.get("domain_hash", ""),
+            doc_fingerprint=payload.get("doc_fingerprint", ""),
+            event=payload.get("event"),
+            ctx_window=ctx.get("window"),
+            ctx_flags=ctx.get("flags", 0),
+            seq=header.get("seq"),
+        )
+
+    @staticmethod
+    def _ok_message(sig: DecodedSignal) -> str:
+        return f"OK shelf={sig.shelf} code={sig.code} w={sig.weight} seq={sig.seq}"
+
     def validate_and_ingest(self, packet: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Full validation pipeline:
@@ -270,113 +614,126 @@ class WindiBridge:
         Returns (success, message)
         """
         try:
-            # ── Step 1: Schema validation ──
-            header = packet.get("header")
-            payload = packet.get("payload")
-            auth = packet.get("auth")
-
-            if not all([header, payload, auth]):
-                self.aggregator.reject()
-                return False, "SCHEMA:MISSING_FIELDS"
-
-            if header.get("v") != PROTOCOL_VERSION:
-                self.aggregator.reject()
-                return False, f"SCHEMA:VERSION_MISMATCH v={header.get('v')}"
-
-            kid = header.get("kid")
-            cid = header.get("cid")
-            ts = header.get("ts")
-            nonce = header.get("nonce")
-            seq = header.get("seq")
-
-            if not all([kid, cid, ts, nonce, seq is not None]):
-                self.aggregator.reject()
-                return False, "SCHEMA:HEADER_INCOMPLETE"
-
-            shelf = payload.get("shelf")
-            code = payload.get("code")
-            weight = payload.get("weight")
-            event = payload.get("event")
-
-            if shelf not in VALID_SHELVES:
-                self.aggregator.reject()
-                return False, f"SCHEMA:INVALID_SHELF shelf={shelf}"
-
-            if event not in VALID_EVENTS:
-                self.aggregator.reject()
-                return False, f"SCHEMA:INVALID_EVENT event={event}"
-
-            if not isinstance(weight, int) or weight < 0 or weight > 100:
-                self.aggregator.reject()
-                return False, f"SCHEMA:INVALID_WEIGHT weight={weight}"
-
-            # ── Step 2: HMAC Verification ──
-            hmac_key = self._client_keys.get(kid)
-            if hmac_key is None:
-                self.aggregator.reject()
-                return False, f"AUTH:UNKNOWN_KEY kid={kid}"
-
-            sig_expected = _hmac_sha256(
-                hmac_key,
-                _canonical_json({"header": header, "payload": payload})
-            )
-            sig_received = _b64d(auth["sig"])
-
-            if not hmac.compare_digest(sig_expected, sig_received):
-                self.aggregator.reject()
-                return False, "AUTH:HMAC_INVALID"
+            err, checked = self._precheck(packet)
+            if err:
+                self._reject()
+                return False, err
+            header, payload, hmac_key, sig_b64 = checked
+
+            # ── Step 2b: HMAC Verification ──
+            err = _verify_signature(hmac_key, header, payload, sig_b64)
+            if err:
+                self._reject()
+                return False, err
 
             # ── Step 3: Anti-Replay ──
-            with self._lock:
-                if cid not in self._clients:
-                    self._clients[cid] = ClientState(simulation_mode=self._simulation_mode)
-                client_state = self._clients[cid]
-
-            replay_err = client_state.check_and_update(seq, nonce, ts)
+            client_state = self._client_state(header.get("cid"))
+            replay_err = client_state.check_and_update(header.get("seq"), header.get("nonce"), header.get("ts"))
             if replay_err:
-                self.aggregator.reject()
+                self._reject()
                 return False, replay_err
 
             # ── Step 4: Decode & Ingest ──
-            signal_meta = SIGNAL_REGISTRY.get(code, {})
-            signal_name = signal_meta.get("name", f"UNKNOWN:{code}")
-            severity = signal_meta.get("severity", "unknown")
-
-            ctx = payload.get("ctx", {})
-
-            decoded = DecodedSignal(
-                ts=ts,
-                client_id_hash=cid,
-                shelf=shelf,
-                code=code,
-                signal_name=signal_name,
-                severity=severity,
-                weight=weight,
-                domain_hash=payload.get("domain_hash", ""),
-                doc_fingerprint=payload.get("doc_fingerprint", ""),
-                event=event,
-                ctx_window=ctx.get("window"),
-                ctx_flags=ctx.get("flags", 0),
-                seq=seq,
-            )
-
+            decoded = self._decode(header, payload)
             self.aggregator.ingest(decoded)
-            return True, f"OK shelf={shelf} code={code} w={weight} seq={seq}"
+            if self.store is not None:
+                self.store.append(self._signal_record(decoded, header.get("nonce")))
+            return True, self._ok_message(decoded)
 
         except Exception as e:
-            self.aggregator.reject()
-            return False, f"ERROR:{type(e).__name__}:{str(e)}"
+            self._reject()
+            return False, _error(e)
+
+    def _verify_many(self, checked: Dict[int, Tuple]) -> Dict[int, Optional[str]]:
+        """HMAC-verify prechecked packets; large batches go to the process pool."""
+        indices = list(checked)
+        items = [(key, header, payload, sig) for header, payload, key, sig in checked.values()]
+        results = None
+        if len(items) >= PARALLEL_VERIFY_MIN and VERIFY_WORKERS > 1:
+            chunks = [items[i:i + VERIFY_CHUNK] for i in range(0, len(items), VERIFY_CHUNK)]
+            try:
+                results = [r for part in _get_verify_pool().map(_verify_chunk, chunks) for r in part]
+            except Exception:
+                # Broken/unavailable pool: verify inline rather than fail the batch
+                _reset_verify_pool()
+        if results is None:
+            results = _verify_chunk(items)
+        return dict(zip(indices, results))
 
     def ingest_batch(self, packets: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Process a batch of telemetry packets."""
-        results = {"accepted": 0, "rejected": 0, "errors": []}
+        """
+        Process a batch of telemetry packets.
+
+        Staged pipeline with the same per-packet results as calling
+        validate_and_ingest on each packet in order:
+        1. schema check + key lookup for every packet
+        2. HMAC verification (process pool for large batches)
+        3. anti-replay per client, one lock acquisition per client group,
+           packets of a client in batch order
+        4. decode, then ingest accepted signals in batch order under one lock
+        """
+        errors: List[Optional[str]] = [None] * len(packets)
+
+        # ── Stage 1 ──
+        checked: Dict[int, Tuple] = {}
         for i, pkt in enumerate(packets):
-            ok, msg = self.validate_and_ingest(pkt)
-            if ok:
-                results["accepted"] += 1
+            try:
+                err, item = self._precheck(pkt)
+            except Exception as e:
+                err, item = _error(e), None
+            if err:
+                errors[i] = err
+            else:
+                checked[i] = item
+
+        # ── Stage 2 ──
+        verified = self._verify_many(checked)
+
+        # ── Stage 3 ──
+        groups: Dict[str, List[int]] = {}
+        for i, err in verified.items():
+            if err:
+                errors[i] = err
             else:
+                groups.setdefault(checked[i][0].get("cid"), []).append(i)
+
+        accepted: List[Tuple[int, DecodedSignal]] = []   # (packet index, signal)
+        for cid, idxs in groups.items():
+            try:
+                state = self._client_state(cid)
+            except Exception as e:
+                for i in idxs:
+                    errors[i] = _error(e)
+                continue
+            headers = [checked[i][0] for i in idxs]
+            replay = state.check_and_update_many(
+                [(h.get("seq"), h.get("nonce"), h.get("ts")) for h in headers]
+            )
+            for i, err in zip(idxs, replay):
+                if err:
+                    errors[i] = err
+                    continue
+                try:
+                    accepted.append((i, self._decode(checked[i][0], checked[i][1])))
+                except Exception as e:
+                    errors[i] = _error(e)
+
+        # ── Stage 4 ──
+        accepted.sort(key=lambda item: item[0])
+        self.aggregator.ingest_many([sig for _, sig in accepted])
+
+        results = {"accepted": len(accepted), "rejected": 0, "errors": []}
+        for i, err in enumerate(errors):
+            if err:
                 results["rejected"] += 1
-                results["errors"].append({"index": i, "reason": msg})
+                results["errors"].append({"index": i, "reason": err})
+        if results["rejected"]:
+            self.aggregator.reject(results["rejected"])
+        if self.store is not None:
+            records = [self._signal_record(sig, checked[i][0].get("nonce")) for i, sig in accepted]
+            if results["rejected"]:
+                records.append({"k": "rej", "n": results["rejected"]})
+            self.store.append_many(records)
         return results
 
 
@@ -388,20 +745,30 @@ bridge = WindiBridge(simulation_mode=True)
 class BridgeHandler(BaseHTTPRequestHandler):
     """Minimal HTTP handler for the WINDI Bridge API."""
 
-    def _set_headers(self, status=200, content_type="application/json"):
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
         self.send_response(status)
         self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        if getattr(self.server, "draining", False) or self.close_connection or self._release_worker():
+            # Shutting down or others waiting: finish this request, then let the client reconnect
+            self.send_header("Connection", "close")
+            self.close_connection = True
         self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _release_worker(self) -> bool:
+        """Whether to end the connection after this response (keep-alive only)."""
+        return False
 
     def _json_response(self, data: Any, status=200):
-        self._set_headers(status)
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self._send(status, json.dumps(data, ensure_ascii=False).encode("utf-8"))
 
     def do_OPTIONS(self):
-        self._set_headers(204)
+        self._send(204, b"")
 
     def do_GET(self):
         if self.path == "/api/v1/health":
@@ -410,6 +777,7 @@ class BridgeHandler(BaseHTTPRequestHandler):
                 "protocol": PROTOCOL_VERSION,
                 "ts": int(time.time() * 1000),
                 "motto": "AI processes. Human decides. WINDI guarantees.",
+                "store": bridge.store.stats() if bridge.store is not None else None,
             })
 
         elif self.path == "/api/v1/dashboard":
@@ -426,15 +794,33 @@ class BridgeHandler(BaseHTTPRequestHandler):
             self._json_response(SIGNAL_REGISTRY)
 
         elif self.path == "/":
-            self._set_headers(200, "text/html")
-            self.wfile.write(b"<h1>WINDI Bridge v1.0</h1><p>Flow is Truth. Content is Sovereign.</p>")
+            self._send(200, b"<h1>WINDI Bridge v1.0</h1><p>Flow is Truth. Content is Sovereign.</p>", "text/html")
 
         else:
             self._json_response({"error": "Not found"}, 404)
 
+    def _read_body(self) -> Optional[bytes]:
+        """Read the request body within the size limit; sends the error and returns None otherwise."""
+        limit = MAX_BATCH_BODY_BYTES if self.path == "/api/v1/telemetry/batch" else MAX_BODY_BYTES
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self.close_connection = True
+            self._json_response({"error": "Invalid Content-Length"}, 400)
+            return None
+        if content_length > limit:
+            # Body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self._json_response({"error": "Payload too large", "max_bytes": limit}, 413)
+            return None
+        return self.rfile.read(content_length)
+
     def do_POST(self):
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length)
+        body = self._read_body()
+        if body is None:
+            return
 
         if self.path == "/api/v1/telemetry":
             try:
@@ -474,14 +860,165 @@ class BridgeHandler(BaseHTTPRequestHandler):
         pass
 
 
-def run_bridge(host: str = "0.0.0.0", port: int = 8090):
-    """Start the WINDI Bridge API server."""
-    server = HTTPServer((host, port), BridgeHandler)
+class KeepAliveBridgeHandler(BridgeHandler):
+    """
+    HTTP/1.1 persistent connections. A connection holds a worker thread,
+    so it is released after KEEPALIVE_IDLE_S without a next request, after
+    KEEPALIVE_MAX_REQUESTS requests, or as soon as other connections are
+    queued for a worker. Slow clients time out mid-request.
+    """
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT_S
+
+    def setup(self):
+        super().setup()
+        self.requests_served = 0
+
+    def handle_one_request(self):
+        if self.requests_served:
+            # Between requests the shorter idle timeout applies; parse_request restores it
+            self.connection.settimeout(KEEPALIVE_IDLE_S)
+        super().handle_one_request()
+
+    def parse_request(self) -> bool:
+        self.connection.settimeout(self.timeout)
+        self.requests_served += 1
+        return super().parse_request()
+
+    def _release_worker(self) -> bool:
+        return (self.requests_served >= KEEPALIVE_MAX_REQUESTS
+                or getattr(self.server, "waiting", lambda: 0)() > 0)
+
+
+class ConcurrentBridgeServer(HTTPServer):
+    """
+    HTTPServer with a fixed pool of worker threads fed by a bounded queue
+    of accepted connections.
+
+    When the queue is full, new connections are answered with
+    429 + Retry-After straight from the accept loop instead of waiting.
+    While connections are queued, keep-alive connections are closed after
+    their current response so idle clients cannot pin every worker.
+    drain() stops accepting, lets queued and in-flight requests finish,
+    and closes keep-alive connections after their current request.
+    """
+
+    request_queue_size = 128        # listen() backlog
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class,
+                 workers: int = SERVER_WORKERS, queue_size: int = SERVER_QUEUE_SIZE):
+        super().__init__(server_address, handler_class)
+        self.draining = False
+        self.rejected_busy = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"bridge-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._workers:
+            t.start()
+
+    def waiting(self) -> int:
+        """Accepted connections still waiting for a worker."""
+        return self._queue.qsize()
+
+    def process_request(self, request, client_address):
+        try:
+            self._queue.put_nowait((request, client_address))
+        except queue.Full:
+            self._reject_busy(request)
+
+    def _reject_busy(self, request):
+        self.rejected_busy += 1
+        body = json.dumps({"error": "Bridge busy", "retry_after_s": RETRY_AFTER_S}).encode("utf-8")
+        head = (
+            "HTTP/1.1 429 Too Many Requests\r\n"
+            f"Retry-After: {RETRY_AFTER_S}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("ascii")
+        try:
+            request.sendall(head + body)
+            # Discard whatever request bytes already arrived so close() does
+            # not turn into a reset that swallows the 429
+            request.setblocking(False)
+            while request.recv(65536):
+                pass
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                self._queue.task_done()
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT_S) -> bool:
+        """
+        Graceful shutdown (call from a thread other than serve_forever's).
+        Returns True if all in-flight work finished within `timeout`.
+        """
+        self.draining = True
+        self.shutdown()
+        self.server_close()
+        deadline = time.time() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._queue.all_tasks_done.wait(remaining)
+            drained = self._queue.unfinished_tasks == 0
+        for _ in self._workers:
+            self._queue.put(None)
+        return drained
+
+
+def run_bridge(host: str = "0.0.0.0", port: int = 8090, workers: int = 0,
+               queue_size: int = SERVER_QUEUE_SIZE, data_dir: Optional[str] = STORE_DIR,
+               replay_window_s: Optional[float] = REPLAY_WINDOW_S):
+    """
+    Start the WINDI Bridge API server.
+
+    workers=0 keeps the original single-threaded server; workers>0 runs
+    ConcurrentBridgeServer with HTTP/1.1 keep-alive, 429 backpressure and
+    graceful drain on SIGINT/SIGTERM.
+
+    data_dir enables the durable signal store (None keeps signals in memory
+    only): state from the last replay_window_s seconds is replayed on
+    startup. replay_window_s=0 skips replay, None replays everything.
+    """
+    store = None
+    if data_dir:
+        store = SignalStore(data_dir)
+        t0 = time.perf_counter()
+        replayed = bridge.attach_store(store, replay_window_s)
+        print(f"→ Replayed {replayed['signals']} signals / {replayed['rejected']} rejections "
+              f"from {data_dir} in {time.perf_counter() - t0:.2f}s")
+    if workers > 0:
+        server = ConcurrentBridgeServer((host, port), KeepAliveBridgeHandler, workers, queue_size)
+        mode = f"concurrent, {workers} workers"
+    else:
+        server = HTTPServer((host, port), BridgeHandler)
+        mode = "single-threaded"
     print(f"╔══════════════════════════════════════════════╗")
     print(f"║  WINDI Bridge API v1.0                       ║")
     print(f"║  Listening on {host}:{port}                  ║")
     print(f"║  Flow is Truth. Content is Sovereign.        ║")
     print(f"╚══════════════════════════════════════════════╝")
+    print(f"\nMode: {mode}")
     print(f"\nEndpoints:")
     print(f"  GET  /api/v1/health        — System health")
     print(f"  GET  /api/v1/dashboard     — Dashboard state")
@@ -490,8 +1027,51 @@ def run_bridge(host: str = "0.0.0.0", port: int = 8090):
     print(f"  POST /api/v1/telemetry     — Single packet")
     print(f"  POST /api/v1/telemetry/batch — Batch packets")
     print(f"  POST /api/v1/register      — Register client key")
-    server.serve_forever()
+    if workers <= 0:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if store is not None:
+                store.close()
+        return
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    threading.Thread(target=server.serve_forever, name="bridge-accept", daemon=True).start()
+    while not stop.wait(0.5):
+        pass
+    print("\n→ Draining in-flight requests...")
+    drained = server.drain()
+    print(f"  {'✓ Drained' if drained else '✗ Drain timed out'} "
+          f"(429 responses sent: {server.rejected_busy})")
+    if store is not None:
+        store.close()
+        print(f"  ✓ Signal store closed {store.stats()}")
 
 
 if __name__ == "__main__":
-    run_bridge()
+    import argparse
+    parser = argparse.ArgumentParser(description="WINDI Bridge API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Concurrent mode with N worker threads (0 = single-threaded)")
+    parser.add_argument("--queue-size", type=int, default=SERVER_QUEUE_SIZE,
+                        help="Connections waiting for a worker before answering 429")
+    parser.add_argument("--data-dir", default=STORE_DIR,
+                        help="Signal store directory (env WINDI_BRIDGE_DATA)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Keep signals in memory only (no persistence, no replay)")
+    parser.add_argument("--replay-hours", type=float, default=REPLAY_WINDOW_S / 3600,
+                        help="Replay this many hours of stored signals on startup (0 = none)")
+    parser.add_argument("--bench", type=int, nargs="?", const=1_000_000, metavar="N",
+                        help="Benchmark the signal aggregator with N signals and exit")
+    args = parser.parse_args()
+    if args.bench:
+        _benchmark(args.bench)
+    else:
+        run_bridge(args.host, args.port, args.workers, args.queue_size,
+                   None if args.no_store else args.data_dir, args.replay_hours * 3600)
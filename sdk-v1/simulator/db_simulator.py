@@ -18,13 +18,16 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import http.client
 import json
 import os
 import random
 import sys
+import threading
 import time
+import urllib.parse
 import urllib.request
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 # Add parent path for emitter import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "emitters", "python"))
@@ -332,6 +335,140 @@ def run_simulation_to_bridge(
         print(f"  Dashboard fetch failed: {e}")
 
 
+def generate_client_streams(
+    n_clients: int, n_signals: int, seed: int = 42, first_client: int = 0
+) -> List[Tuple[WindiEmitterConfig, str, List[Dict[str, Any]]]]:
+    """
+    Split n_signals across n_clients independent emitters (own key, own
+    seq counter). Each client's packets stay in emit order, so the bridge's
+    per-client anti-replay checks accept them when sent sequentially.
+    Clients are numbered from first_client (distinct ids across calls).
+    """
+    random.seed(seed)
+    base_ts = int(time.time() * 1000) - (30 * 24 * 3600 * 1000)
+    time_span_ms = 30 * 24 * 3600 * 1000
+    keys = list(SCENARIOS.keys())
+    weights = [SCENARIOS[k]["weight"] for k in keys]
+
+    streams = []
+    for c in range(first_client, first_client + n_clients):
+        csalt = base64.b64encode(os.urandom(32)).decode()
+        hmac_key = base64.b64encode(os.urandom(32)).decode()
+        cfg = WindiEmitterConfig(
+            client_id=f"deutsche-bahn-ag-loadtest-{c:03d}",
+            key_id=f"db-load-key-{c:03d}",
+            csalt_b64=csalt,
+            hmac_key_b64=hmac_key,
+        )
+        emitter = WindiEmitter(cfg)
+        k = c - first_client
+        n = n_signals // n_clients + (1 if k < n_signals % n_clients else 0)
+        packets = []
+        for i in range(n):
+            scenario_key = random.choices(keys, weights)[0]
+            scenario = SCENARIOS[scenario_key]
+            offset = int((i / max(n, 1)) * time_span_ms)
+            packets.append(_generate_signal(
+                emitter, csalt, scenario_key, random.choice(scenario["signals"]),
+                random.choice(scenario["domains"]), base_ts, offset,
+            ))
+        streams.append((cfg, hmac_key, packets))
+    return streams
+
+
+def run_load_test(
+    bridge_url: str = "http://localhost:8090",
+    n_signals: int = 20_000,
+    n_clients: int = 8,
+    batch_size: int = 50,
+) -> Dict[str, Any]:
+    """
+    Closed-loop load test: n_clients threads, each on one keep-alive
+    connection, send their stream in batches as fast as the bridge answers.
+    429 responses are retried after Retry-After.
+    """
+    print(f"→ Generating {n_signals} signals for {n_clients} clients...")
+    streams = generate_client_streams(n_clients, n_signals)
+    url = urllib.parse.urlparse(bridge_url)
+
+    for cfg, hmac_key, _ in streams:
+        reg = json.dumps({
+            "client_id_hash": base64.b64encode(hashlib.sha256(cfg.client_id.encode()).digest()).decode(),
+            "key_id": cfg.key_id,
+            "hmac_key_b64": hmac_key,
+        }).encode()
+        urllib.request.urlopen(urllib.request.Request(
+            f"{bridge_url}/api/v1/register", data=reg,
+            headers={"Content-Type": "application/json"},
+        )).read()
+
+    lock = threading.Lock()
+    totals = {"accepted": 0, "rejected": 0, "throttled": 0, "errors": 0}
+    latencies: List[float] = []
+
+    def client(packets: List[Dict[str, Any]]):
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        local_lat, local = [], {"accepted": 0, "rejected": 0, "throttled": 0, "errors": 0}
+        for start in range(0, len(packets), batch_size):
+            body = json.dumps({"packets": packets[start:start + batch_size]}).encode()
+            for _attempt in range(20):
+                t0 = time.perf_counter()
+                try:
+                    conn.request("POST", "/api/v1/telemetry/batch", body,
+                                 {"Content-Type": "application/json"})
+                    resp = conn.getresponse()
+                    data = resp.read()
+                except (OSError, http.client.HTTPException):
+                    # Server closed the keep-alive connection; reconnect and resend
+                    conn.close()
+                    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+                    local["errors"] += 1
+                    continue
+                if resp.status == 429:
+                    local["throttled"] += 1
+                    conn.close()
+                    time.sleep(float(resp.getheader("Retry-After", "1")))
+                    continue
+                local_lat.append((time.perf_counter() - t0) * 1000)
+                result = json.loads(data)
+                local["accepted"] += result.get("accepted", 0)
+                local["rejected"] += result.get("rejected", 0)
+                if resp.getheader("Connection", "").lower() == "close":
+                    conn.close()
+                break
+        conn.close()
+        with lock:
+            latencies.extend(local_lat)
+            for k, v in local.items():
+                totals[k] += v
+
+    threads = [threading.Thread(target=client, args=(pk,)) for _, _, pk in streams]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    pct = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2) if latencies else None
+    report = {
+        **totals,
+        "clients": n_clients,
+        "batch_size": batch_size,
+        "elapsed_s": round(elapsed, 3),
+        "accepted_per_s": round(totals["accepted"] / elapsed, 1),
+        "requests": len(latencies),
+        "latency_ms": {"p50": pct(0.50), "p99": pct(0.99), "max": pct(1.0)},
+    }
+    print(f"\n═══ LOAD TEST ═══")
+    print(f"  Accepted:       {totals['accepted']} ({report['accepted_per_s']:,.0f} packets/s)")
+    print(f"  Rejected:       {totals['rejected']}")
+    print(f"  429 throttled:  {totals['throttled']}")
+    print(f"  Batch latency:  p50 {report['latency_ms']['p50']}ms  p99 {report['latency_ms']['p99']}ms")
+    return report
+
+
 def export_simulation_json(path: str = "db_simulation_1000.json", n_signals: int = 1000):
     """Export simulation data as JSON for offline use."""
     packets, cfg, csalt, hmac_key = generate_db_simulation(n_signals)
@@ -359,13 +496,34 @@ def export_simulation_json(path: str = "db_simulation_1000.json", n_signals: int
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="WINDI DB Governance Simulator")
-    parser.add_argument("--mode", choices=["bridge", "export"], default="export")
+    parser.add_argument("--mode", choices=["bridge", "export", "loadtest", "bench"], default="export")
     parser.add_argument("--signals", type=int, default=1000)
-    parser.add_argument("--bridge-url", default="http://localhost:8090")
+    parser.add_argument("--bridge-url", default=None,
+                        help="Bridge to target (default http://localhost:8090; bench spawns one)")
     parser.add_argument("--output", default="db_simulation_1000.json")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients (loadtest)")
+    parser.add_argument("--batch-size", type=int, default=50)
+    bench = parser.add_argument_group("bench (multi-process load generator)")
+    bench.add_argument("--workers", type=int, default=4, help="Load generator processes")
+    bench.add_argument("--connections", type=int, default=4, help="Clients (keep-alive connections) per worker")
+    bench.add_argument("--rate", type=float, default=0, help="Target packets/s in total (0 = unlimited)")
+    bench.add_argument("--loop", choices=["closed", "open"], default="closed")
+    bench.add_argument("--presign-dir", default=None, help="Reuse/keep pre-signed packets in this directory")
+    bench.add_argument("--bridge-pid", type=int, default=None, help="Sample RSS of an external bridge")
+    bench.add_argument("--bridge-workers", type=int, default=16, help="Workers of the spawned bridge")
+    bench.add_argument("--report", default="bench_report.json", help="JSON report path")
     args = parser.parse_args()
 
-    if args.mode == "bridge":
-        run_simulation_to_bridge(args.bridge_url, args.signals)
+    if args.mode == "bench":
+        from load_generator import run_benchmark
+        report = run_benchmark(args.bridge_url, args.signals, args.workers, args.connections,
+                               args.batch_size, args.rate, args.loop, args.presign_dir,
+                               args.bridge_pid, args.bridge_workers, args.report)
+        if not report["complete"]:
+            sys.exit(1)
+    elif args.mode == "loadtest":
+        run_load_test(args.bridge_url or "http://localhost:8090", args.signals, args.clients, args.batch_size)
+    elif args.mode == "bridge":
+        run_simulation_to_bridge(args.bridge_url or "http://localhost:8090", args.signals)
     else:
         export_simulation_json(args.output, args.signals)
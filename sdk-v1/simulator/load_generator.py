@@ -0,0 +1,420 @@
+"""
+WINDI Bridge Load Generator v1.0
+Multi-process benchmark harness built on the DB simulator
+
+1. Pre-sign: every client (own emitter, own HMAC key) is generated and
+   signed in parallel into <dir>/client-NNN.json (registration data) and
+   client-NNN.batches (one ready-to-send batch body per line), so signing
+   and JSON encoding never run inside the measured window.
+2. Run: N worker processes, each driving one keep-alive connection per
+   client it owns. Sends follow a schedule derived from the target rate:
+     closed  — next batch after the previous answer (paced by the rate if set);
+               latency = response time of the request
+     open    — batches are due at fixed times regardless of answers;
+               latency is measured from the scheduled time, so queueing
+               behind a slow bridge is counted (no coordinated omission)
+3. Report: JSON with throughput, latency percentiles, rejection reasons
+   (REPLAY / AUTH / SCHEMA / ...), HTTP throttling, batches dropped after
+   MAX_RETRIES ("complete": false) and bridge RSS over time.
+
+Nonces are single-use: a pre-signed directory can be replayed against a
+fresh bridge only (against the same bridge every packet is a REPLAY).
+A reused directory signed for another --signals / --batch-size is re-signed.
+
+"Flow is Truth. Content is Sovereign."
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import http.client
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from db_simulator import generate_client_streams
+
+# ─── Configuration ───────────────────────────────────────────────
+
+RSS_SAMPLE_INTERVAL_S = 0.5
+START_DELAY_S = 1.0              # workers load their files, then all start together
+MAX_RETRIES = 20                 # per batch (429 / dropped connection)
+BRIDGE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bridge", "windi_bridge.py")
+
+
+# ─── Pre-signing ─────────────────────────────────────────────────
+
+def _client_paths(directory: str, client: int) -> Tuple[str, str]:
+    base = os.path.join(directory, f"client-{client:03d}")
+    return base + ".json", base + ".batches"
+
+
+def _presign_client(args: Tuple[str, int, int, int, int]) -> int:
+    """Pool task: generate, sign and encode one client's stream."""
+    directory, client, n_signals, batch_size, seed = args
+    ((cfg, hmac_key, packets),) = generate_client_streams(1, n_signals, seed + client, first_client=client)
+    meta_path, batches_path = _client_paths(directory, client)
+    with open(batches_path, "wb") as f:
+        for start in range(0, len(packets), batch_size):
+            f.write(json.dumps({"packets": packets[start:start + batch_size]}).encode("utf-8") + b"\n")
+    with open(meta_path, "w") as f:
+        json.dump({
+            "client_id_hash": base64.b64encode(hashlib.sha256(cfg.client_id.encode()).digest()).decode(),
+            "key_id": cfg.key_id,
+            "hmac_key_b64": hmac_key,
+            "packets": len(packets),
+            "batch_size": batch_size,
+        }, f)
+    return len(packets)
+
+
+def presign(directory: str, n_clients: int, n_signals: int, batch_size: int = 50,
+            seed: int = 42, processes: Optional[int] = None) -> List[int]:
+    """Pre-sign n_signals split over n_clients into `directory`; returns client numbers."""
+    os.makedirs(directory, exist_ok=True)
+    per_client = [n_signals // n_clients + (1 if c < n_signals % n_clients else 0) for c in range(n_clients)]
+    tasks = [(directory, c, per_client[c], batch_size, seed) for c in range(n_clients)]
+    with multiprocessing.Pool(processes or min(n_clients, os.cpu_count() or 1)) as pool:
+        pool.map(_presign_client, tasks)
+    return list(range(n_clients))
+
+
+def _presigned_clients(directory: str) -> List[int]:
+    return sorted(
+        int(name[7:10]) for name in os.listdir(directory)
+        if name.startswith("client-") and name.endswith(".json")
+    )
+
+
+def _presign_mismatch(directory: str, clients: List[int], n_signals: int,
+                      batch_size: int) -> Optional[str]:
+    """Why the first len(clients) pre-signed clients do not match the run, or None."""
+    packets = 0
+    for c in clients:
+        with open(_client_paths(directory, c)[0]) as f:
+            meta = json.load(f)
+        if meta["batch_size"] != batch_size:
+            return f"client {c} was signed with batch size {meta['batch_size']}, not {batch_size}"
+        packets += meta["packets"]
+    if packets != n_signals:
+        return f"{len(clients)} clients hold {packets} packets, not {n_signals}"
+    return None
+
+
+# ─── Worker ──────────────────────────────────────────────────────
+
+def _category(reason: str) -> str:
+    """REPLAY:NONCE_REUSE ... -> REPLAY; ERROR:KeyError:... -> ERROR."""
+    return reason.split(":", 1)[0] if reason else "UNKNOWN"
+
+
+def _drive_client(host: str, port: int, batches: List[bytes], interval: float, start_at: float,
+                  open_loop: bool, out: Dict[str, Any]):
+    """Send one client's batches in order over a keep-alive connection."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    headers = {"Content-Type": "application/json"}
+    next_free = start_at
+    for i, body in enumerate(batches):
+        scheduled = start_at + i * interval if interval else next_free
+        delay = scheduled - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        sent = time.time()
+        for _attempt in range(MAX_RETRIES):
+            try:
+                conn.request("POST", "/api/v1/telemetry/batch", body, headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+                out["http_errors"] += 1
+                continue
+            if resp.status == 429:
+                out["throttled"] += 1
+                conn.close()
+                time.sleep(float(resp.getheader("Retry-After", "1")))
+                continue
+            if resp.getheader("Connection", "").lower() == "close":
+                conn.close()
+            break
+        else:
+            out["failed_batches"] += 1
+            continue
+        done = time.time()
+        next_free = done
+        out["latencies"].append((done - (scheduled if open_loop else sent)) * 1000)
+        second = int(done - start_at)
+        try:
+            result = json.loads(data)
+        except ValueError:
+            out["http_errors"] += 1
+            continue
+        if resp.status != 200:
+            out["rejections"][f"HTTP_{resp.status}"] = out["rejections"].get(f"HTTP_{resp.status}", 0) + 1
+            continue
+        out["accepted"] += result.get("accepted", 0)
+        out["rejected"] += result.get("rejected", 0)
+        out["timeline"][second] = out["timeline"].get(second, 0) + result.get("accepted", 0)
+        for err in result.get("errors", []):
+            cat = _category(err.get("reason", ""))
+            out["rejections"][cat] = out["rejections"].get(cat, 0) + 1
+    conn.close()
+
+
+def _worker(directory: str, clients: List[int], bridge_url: str, client_rate: float,
+            open_loop: bool, ready, go, results):
+    """Worker process: load pre-signed batches, wait for the common start, drive clients."""
+    url = urllib.parse.urlparse(bridge_url)
+    streams = []
+    for c in clients:
+        meta_path, batches_path = _client_paths(directory, c)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(batches_path, "rb") as f:
+            batches = f.read().splitlines()
+        interval = meta["batch_size"] / client_rate if client_rate else 0.0
+        streams.append((batches, interval))
+    ready.put(os.getpid())
+    go.wait()
+    start_at = float(go.start_at.value)
+
+    outs = []
+    threads = []
+    for batches, interval in streams:
+        out = {"accepted": 0, "rejected": 0, "throttled": 0, "http_errors": 0, "failed_batches": 0,
+               "latencies": [], "rejections": {}, "timeline": {}}
+        outs.append(out)
+        threads.append(threading.Thread(
+            target=_drive_client,
+            args=(url.hostname, url.port or 80, batches, interval, start_at, open_loop, out),
+        ))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results.put(outs)
+
+
+class _Go:
+    """Start barrier shared with workers: an event plus the common start time."""
+
+    def __init__(self, ctx):
+        self.event = ctx.Event()
+        self.start_at = ctx.Value("d", 0.0)
+
+    def wait(self):
+        self.event.wait()
+
+    def set(self, start_at: float):
+        self.start_at.value = start_at
+        self.event.set()
+
+
+# ─── Bridge process ──────────────────────────────────────────────
+
+def _rss_kb(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _sample_rss(pid: int, t0: float, samples: List[List[float]], stop: threading.Event):
+    while True:
+        rss = _rss_kb(pid)
+        if rss is not None:
+            samples.append([round(time.time() - t0, 2), rss])
+        if stop.wait(RSS_SAMPLE_INTERVAL_S):
+            return
+
+
+def spawn_bridge(workers: int = 16) -> Tuple[subprocess.Popen, str]:
+    """Start a local in-memory bridge (no signal store) on a free port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, BRIDGE_SCRIPT, "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-store"],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{url}/api/v1/health", timeout=1).read()
+            return proc, url
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("bridge did not start")
+
+
+# ─── Benchmark ───────────────────────────────────────────────────
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(q * len(values)))], 2)
+
+
+def run_benchmark(
+    bridge_url: Optional[str] = None,
+    n_signals: int = 100_000,
+    n_workers: int = 4,
+    connections: int = 4,
+    batch_size: int = 50,
+    rate: float = 0,
+    loop: str = "closed",
+    presign_dir: Optional[str] = None,
+    bridge_pid: Optional[int] = None,
+    bridge_workers: int = 16,
+    report_path: Optional[str] = None,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Benchmark a local bridge. Without bridge_url a bridge is spawned (and
+    its RSS sampled); with bridge_url pass bridge_pid to sample RSS.
+    rate is the total target in packets/s (0 = as fast as possible,
+    closed loop only).
+    """
+    if loop not in ("closed", "open"):
+        raise ValueError("loop must be 'closed' or 'open'")
+    if loop == "open" and rate <= 0:
+        raise ValueError("open loop needs a target rate")
+
+    n_clients = n_workers * connections
+    own_dir = presign_dir is None
+    directory = presign_dir or tempfile.mkdtemp(prefix="windi-presigned-")
+    clients = _presigned_clients(directory) if os.path.isdir(directory) else []
+    if len(clients) >= n_clients:
+        mismatch = _presign_mismatch(directory, clients[:n_clients], n_signals, batch_size)
+        if mismatch:
+            print(f"⚠ {directory} does not match this run ({mismatch}); re-signing")
+            for c in clients:
+                for path in _client_paths(directory, c):
+                    os.remove(path)
+            clients = []
+    if len(clients) < n_clients:
+        t = time.perf_counter()
+        clients = presign(directory, n_clients, n_signals, batch_size, seed)
+        print(f"→ Pre-signed {n_signals} packets for {n_clients} clients in {time.perf_counter() - t:.1f}s")
+    clients = clients[:n_clients]
+    metas = []
+    for c in clients:
+        with open(_client_paths(directory, c)[0]) as f:
+            metas.append(json.load(f))
+
+    proc = None
+    if bridge_url is None:
+        proc, bridge_url = spawn_bridge(bridge_workers)
+        bridge_pid = proc.pid
+        print(f"→ Spawned bridge pid={proc.pid} at {bridge_url}")
+    try:
+        for meta in metas:
+            reg = json.dumps({k: meta[k] for k in ("client_id_hash", "key_id", "hmac_key_b64")}).encode()
+            urllib.request.urlopen(urllib.request.Request(
+                f"{bridge_url}/api/v1/register", data=reg,
+                headers={"Content-Type": "application/json"},
+            )).read()
+
+        ctx = multiprocessing.get_context()
+        ready, results, go = ctx.Queue(), ctx.Queue(), _Go(ctx)
+        client_rate = rate / n_clients if rate else 0
+        procs = [
+            ctx.Process(target=_worker, args=(
+                directory, clients[w::n_workers], bridge_url, client_rate, loop == "open", ready, go, results,
+            ))
+            for w in range(n_workers)
+        ]
+        for p in procs:
+            p.start()
+        for _ in procs:
+            ready.get()
+
+        rss: List[List[float]] = []
+        stop = threading.Event()
+        start_at = time.time() + START_DELAY_S
+        if bridge_pid:
+            threading.Thread(target=_sample_rss, args=(bridge_pid, start_at, rss, stop), daemon=True).start()
+        go.set(start_at)
+        outs = [out for _ in procs for out in results.get()]
+        elapsed = time.time() - start_at
+        for p in procs:
+            p.join()
+        stop.set()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+        if own_dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    latencies = sorted(l for o in outs for l in o["latencies"])
+    totals = {k: sum(o[k] for o in outs) for k in ("accepted", "rejected", "throttled", "http_errors", "failed_batches")}
+    rejections: Dict[str, int] = {}
+    timeline: Dict[int, int] = {}
+    for o in outs:
+        for k, v in o["rejections"].items():
+            rejections[k] = rejections.get(k, 0) + v
+        for k, v in o["timeline"].items():
+            timeline[k] = timeline.get(k, 0) + v
+
+    report = {
+        "config": {
+            "bridge_url": bridge_url, "loop": loop, "workers": n_workers, "connections": connections,
+            "clients": n_clients, "batch_size": batch_size, "target_rate": rate,
+            "packets": sum(m["packets"] for m in metas),
+        },
+        "elapsed_s": round(elapsed, 3),
+        "requests": len(latencies),
+        **totals,
+        "throughput": {
+            "accepted_per_s": round(totals["accepted"] / elapsed, 1),
+            "packets_per_s": round((totals["accepted"] + totals["rejected"]) / elapsed, 1),
+            "requests_per_s": round(len(latencies) / elapsed, 1),
+        },
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.50), "p90": _percentile(latencies, 0.90),
+            "p99": _percentile(latencies, 0.99), "p999": _percentile(latencies, 0.999),
+            "max": _percentile(latencies, 1.0),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+        },
+        "complete": totals["failed_batches"] == 0,
+        "rejections": rejections,
+        "accepted_timeline": [timeline.get(s, 0) for s in range(max(timeline) + 1)] if timeline else [],
+        "bridge_rss_kb": rss,
+    }
+
+    print(f"\n═══ BENCHMARK ({loop} loop, {n_workers}×{connections} clients) ═══")
+    print(f"  Accepted:       {totals['accepted']} ({report['throughput']['accepted_per_s']:,.0f} packets/s)")
+    print(f"  Rejected:       {totals['rejected']} {rejections or ''}")
+    print(f"  429 throttled:  {totals['throttled']}")
+    print(f"  Failed batches: {totals['failed_batches']} (gave up after {MAX_RETRIES} tries)"
+          f"  HTTP errors: {totals['http_errors']}")
+    if totals["failed_batches"]:
+        print("  ⚠ INCOMPLETE: dropped batches are missing from the throughput above")
+    lat = report["latency_ms"]
+    print(f"  Batch latency:  p50 {lat['p50']}ms  p99 {lat['p99']}ms  p99.9 {lat['p999']}ms")
+    if rss:
+        print(f"  Bridge RSS:     {rss[0][1] // 1024} → {max(r[1] for r in rss) // 1024} MiB")
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Report:         {report_path}")
+    return report
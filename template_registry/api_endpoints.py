@@ -395,8 +395,8 @@ def generate_document():
         
         registry = get_registry()
         
-        # Buscar template para validar human_only ANTES de gerar
-        template = registry.find_template(
+        # Buscar template (fill plan compilado) para validar human_only ANTES de gerar
+        template = registry.find_fill_plan(
             data['tenant'], 
             data['department'], 
             data['doctype']
@@ -408,7 +408,7 @@ def generate_document():
             }), 404
         
         # GOVERNANÇA: Bloquear campos human_only no payload
-        human_only_codes = {h['field_code'] for h in template['human_only']}
+        human_only_codes = template['human_only_codes']
         inputs = data.get('inputs', {})
         
         blocked_fields = [f for f in inputs.keys() if f in human_only_codes]
@@ -457,6 +457,94 @@ def generate_document():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@documents_bp.route('/generate-batch', methods=['POST'])
+@require_json
+@require_generate_key
+def generate_documents_batch():
+    """
+    POST /api/documents/generate-batch
+    
+    Gera vários documentos em uma única transação (tudo ou nada).
+    
+    GOVERNANÇA: Mesmas regras de /generate para cada item — se algum item
+    enviar campos human_only, o lote inteiro é rejeitado e logado.
+    
+    Body: {documents: [{tenant, department, doctype, inputs, created_by?, language?}, ...]}
+    """
+    try:
+        data = request.json
+        ctx = get_request_context()
+        
+        items = data.get('documents')
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Field 'documents' must be a non-empty list"}), 400
+        
+        from template_registry import MAX_BATCH_DOCUMENTS
+        if len(items) > MAX_BATCH_DOCUMENTS:
+            return jsonify({
+                "error": f"Batch too large: {len(items)} documents (max {MAX_BATCH_DOCUMENTS})"
+            }), 400
+        
+        registry = get_registry()
+        required = ['tenant', 'department', 'doctype', 'inputs']
+        plans = {}
+        for index, item in enumerate(items):
+            missing = [f for f in required if f not in item]
+            if missing:
+                return jsonify({
+                    "error": f"Missing required fields: {missing}",
+                    "index": index
+                }), 400
+            
+            key = (item['tenant'], item['department'], item['doctype'])
+            if key not in plans:
+                plans[key] = registry.find_fill_plan(*key)
+            template = plans[key]
+            if not template:
+                return jsonify({
+                    "error": f"Template not found: {key[0]}/{key[1]}/{key[2]}",
+                    "index": index
+                }), 404
+            
+            # GOVERNANÇA: Bloquear campos human_only no payload
+            blocked_fields = [f for f in item['inputs'].keys() if f in template['human_only_codes']]
+            if blocked_fields:
+                registry.log_security_event(
+                    event_type="human_only_violation_attempt",
+                    severity="warning",
+                    endpoint=request.path,
+                    method=request.method,
+                    ip_address=ctx.get('ip_address'),
+                    user_agent=ctx.get('user_agent'),
+                    details={
+                        "template_id": template['id'],
+                        "blocked_fields": blocked_fields,
+                        "batch_index": index,
+                        "user": item.get('created_by', 'anonymous'),
+                        "governance_rule": "ai_must_not_decide_human_only"
+                    },
+                    request_id=ctx.get('request_id')
+                )
+                return jsonify({
+                    "error": "Governance violation",
+                    "message": f"Fields {blocked_fields} are HUMAN_ONLY and cannot be provided via API",
+                    "governance_rule": "ai_must_not_decide_human_only",
+                    "blocked_fields": blocked_fields,
+                    "index": index
+                }), 400
+        
+        results = registry.generate_documents_batch(items, request_context=ctx)
+        
+        return jsonify({
+            "success": True,
+            "count": len(results),
+            "documents": results
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @documents_bp.route('/<document_id>', methods=['GET'])
 def get_document(document_id):
     """GET /api/documents/<document_id>"""
@@ -732,6 +820,7 @@ if __name__ == "__main__":
     print("  GET  /api/registry/tenants")
     print("  GET  /api/registry/templates")
     print("  POST /api/documents/generate")
+    print("  POST /api/documents/generate-batch")
     print("  etc.")
     print("\n")
     
@@ -15,13 +15,21 @@ Melhorias v1.2.0:
 - Documentos finalizados são imutáveis (write-once via triggers SQL)
 - Proteção contra template confusion (validação tenant)
 - Request ID para correlação de logs
+
+Performance:
+- Templates publicados são compilados em "fill plans" (caminhos dos nós de
+  texto + segmentos de placeholder), em cache por template_id
+- generate_documents_batch(): muitos documentos + auditoria em uma transação
 """
 
 import sqlite3
 import json
 import hashlib
+import re
+import threading
 import uuid
 import os
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict, List, Any
 from pathlib import Path
@@ -41,6 +49,9 @@ SCHEMA_PATH = os.environ.get(
 
 VERSION = "1.2.0"
 
+FILL_PLAN_CACHE_SIZE = 256      # templates compilados mantidos em memória
+MAX_BATCH_DOCUMENTS = 500       # limite de documentos por generate_documents_batch
+
 # ============================================================================
 # TEMPLATE REGISTRY CLASS
 # ============================================================================
@@ -60,6 +71,8 @@ class TemplateRegistry:
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or DEFAULT_DB_PATH
+        self._plans = OrderedDict()     # template_id -> fill plan (templates publicados)
+        self._plans_lock = threading.Lock()
         self._ensure_db()
     
     def _ensure_db(self):
@@ -482,7 +495,9 @@ class TemplateRegistry:
             )
             conn.commit()
         
-        return self.get_template(template_id)
+        published = self.get_template(template_id)
+        self._store_plan(self._compile_plan(published))
+        return published
     
     def find_template(self, tenant_id: str, department_code: str, 
                       doctype_code: str, version: str = None) -> Optional[dict]:
@@ -562,23 +577,77 @@ class TemplateRegistry:
         Returns:
             Dict com document_id, status, content_json, human_only_missing, receipt
         """
+        return self.generate_documents_batch([{
+            "tenant": tenant_id,
+            "department": department_code,
+            "doctype": doctype_code,
+            "inputs": inputs,
+            "created_by": created_by,
+            "language": language,
+        }], request_context=request_context)[0]
+    
+    def generate_documents_batch(self, items: List[dict],
+                                 request_context: dict = None) -> List[dict]:
+        """
+        Gera vários documentos em uma única transação (documentos + audit_log).
+        
+        Args:
+            items: Lista de {tenant, department, doctype, inputs,
+                   created_by?, language?}
+        
+        GOVERNANÇA: tudo ou nada — se algum template não existir, nenhum
+        documento é gravado. Todos os eventos compartilham o request_id.
+        
+        Returns:
+            Lista de resultados no formato de generate_document(), na mesma ordem
+        """
         ctx = request_context or {}
         request_id = ctx.get('request_id', str(uuid.uuid4()))
+        if len(items) > MAX_BATCH_DOCUMENTS:
+            raise ValueError(f"Lote excede {MAX_BATCH_DOCUMENTS} documentos: {len(items)}")
         
-        # Encontra template (já valida tenant)
-        template = self.find_template(tenant_id, department_code, doctype_code)
-        if not template:
-            raise ValueError(f"Template não encontrado: {tenant_id}/{department_code}/{doctype_code}")
-        
-        # Identifica campos human_only
-        human_only_codes = {h['field_code'] for h in template['human_only']}
+        results, doc_rows, audit_rows = [], [], []
+        with self._get_conn() as conn:
+            plans = {}
+            for item in items:
+                key = (item['tenant'], item['department'], item['doctype'])
+                if key not in plans:
+                    plans[key] = self._find_plan(conn, *key)
+                    if not plans[key]:
+                        raise ValueError(f"Template não encontrado: {key[0]}/{key[1]}/{key[2]}")
+                result, doc_row, audit_row = self._build_document(
+                    plans[key], item['inputs'], item.get('created_by'),
+                    item.get('language', 'de'), ctx, request_id
+                )
+                results.append(result)
+                doc_rows.append(doc_row)
+                audit_rows.append(audit_row)
+            
+            conn.executemany("""
+                INSERT INTO documents (
+                    id, template_id, template_version, status,
+                    content_json, content_hash, windi_receipt,
+                    created_by, input_data_json, human_fields_complete
+                ) VALUES (?, ?, ?, 'pending_human', ?, ?, ?, ?, ?, 0)
+            """, doc_rows)
+            conn.executemany("""
+                INSERT INTO audit_log 
+                (request_id, action, entity_type, entity_id, actor_type, actor_id, 
+                 details_json, ip_address, user_agent)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, audit_rows)
+            conn.commit()
         
-        # Preenche campos permitidos
-        filled_content = self._fill_template(template, inputs, human_only_codes)
+        return results
+    
+    def _build_document(self, plan: dict, inputs: dict, created_by: str,
+                        language: str, ctx: dict, request_id: str):
+        """Preenche um documento; retorna (resultado, linha documents, linha audit_log)"""
+        filled_content = self._fill_template(plan, inputs)
         
         # Campos human_only faltantes
         human_only_missing = []
-        for hof in template['human_only']:
+        for hof in plan['human_only']:
             if hof['field_code'] not in inputs:
                 human_only_missing.append({
                     'field_code': hof['field_code'],
@@ -592,14 +661,13 @@ class TemplateRegistry:
         content_str = json.dumps(filled_content, sort_keys=True)
         content_hash = hashlib.sha256(content_str.encode()).hexdigest()[:16].upper()
         
-        # Cria documento no banco
         doc_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
         
         receipt = {
             "document_id": doc_id,
-            "template_id": template['id'],
-            "template_version": template['version'],
+            "template_id": plan['id'],
+            "template_version": plan['version'],
             "content_hash": content_hash,
             "generated_at": now,
             "human_fields_pending": len(human_only_missing),
@@ -608,41 +676,27 @@ class TemplateRegistry:
         
         windi_receipt = f"WINDI-RECEIPT-{content_hash}-{now[:10].replace('-','')}"
         
-        with self._get_conn() as conn:
-            conn.execute("""
-                INSERT INTO documents (
-                    id, template_id, template_version, status,
-                    content_json, content_hash, windi_receipt,
-                    created_by, input_data_json, human_fields_complete
-                ) VALUES (?, ?, ?, 'pending_human', ?, ?, ?, ?, ?, 0)
-            """, (
-                doc_id, template['id'], template['version'],
-                json.dumps(filled_content), content_hash, windi_receipt,
-                created_by, json.dumps(inputs)
-            ))
-            
-            self.log_event(
-                action="document_generated",
-                entity_type="document",
-                entity_id=doc_id,
-                actor_type="ai",
-                details={
-                    "template_id": template['id'],
-                    "template_version": template['version'],
-                    "content_hash": content_hash,
-                    "human_only_pending": len(human_only_missing),
-                    "human_only_fields": [h['field_code'] for h in human_only_missing],
-                    "input_fields_provided": list(inputs.keys()),
-                    "created_by": created_by,
-                    "language": language
-                },
-                ip_address=ctx.get('ip_address'),
-                request_id=request_id,
-                conn=conn
-            )
-            conn.commit()
+        doc_row = (
+            doc_id, plan['id'], plan['version'],
+            json.dumps(filled_content), content_hash, windi_receipt,
+            created_by, json.dumps(inputs)
+        )
+        details = {
+            "template_id": plan['id'],
+            "template_version": plan['version'],
+            "content_hash": content_hash,
+            "human_only_pending": len(human_only_missing),
+            "human_only_fields": [h['field_code'] for h in human_only_missing],
+            "input_fields_provided": list(inputs.keys()),
+            "created_by": created_by,
+            "language": language
+        }
+        audit_row = (
+            request_id, "document_generated", "document", doc_id, "ai", None,
+            json.dumps(details), ctx.get('ip_address'), None
+        )
         
-        return {
+        result = {
             "document_id": doc_id,
             "status": "pending_human" if human_only_missing else "ready",
             "content_json": filled_content,
@@ -650,44 +704,172 @@ class TemplateRegistry:
             "receipt": receipt,
             "windi_receipt": windi_receipt,
             "template": {
-                "id": template['id'],
-                "title_de": template['title_de'],
-                "version": template['version'],
-                "disclosure_de": template.get('disclosure_de')
+                "id": plan['id'],
+                "title_de": plan['title_de'],
+                "version": plan['version'],
+                "disclosure_de": plan['disclosure_de']
             }
         }
+        return result, doc_row, audit_row
     
-    def _fill_template(self, template: dict, inputs: dict, 
-                       human_only_codes: set) -> dict:
-        """Preenche template Tiptap com inputs."""
-        tiptap = json.loads(json.dumps(template['tiptap_json']))  # Deep copy
-        
-        def replace_placeholders(node):
-            if isinstance(node, dict):
-                if node.get('type') == 'text' and 'text' in node:
-                    text = node['text']
-                    for field in template['fields']:
-                        code = field['field_code']
-                        placeholder = f"{{{{{code}}}}}"
-                        
-                        if placeholder in text:
-                            if code in human_only_codes:
-                                replacement = f"[NUR MENSCH: {field['label_de']}]"
-                            elif code in inputs:
-                                replacement = str(inputs[code])
-                            else:
-                                replacement = f"[{field['label_de']}]"
-                            
-                            text = text.replace(placeholder, replacement)
-                    node['text'] = text
-                
-                if 'content' in node:
-                    for child in node['content']:
-                        replace_placeholders(child)
+    # ========================================================================
+    # FILL PLANS (templates compilados)
+    # ========================================================================
+    
+    def find_fill_plan(self, tenant_id: str, department_code: str,
+                       doctype_code: str) -> Optional[dict]:
+        """Fill plan do template publicado mais recente (None se não existir)"""
+        with self._get_conn() as conn:
+            return self._find_plan(conn, tenant_id, department_code, doctype_code)
+    
+    def _find_plan(self, conn, tenant_id, department_code, doctype_code):
+        """
+        Resolve o template publicado (1 query) e devolve o plano em cache.
+        
+        Templates publicados são imutáveis, então o plano por template_id
+        nunca fica obsoleto; a query garante que uma nova versão publicada
+        (inclusive por outro processo) é vista imediatamente.
+        """
+        row = conn.execute("""
+            SELECT id FROM templates 
+            WHERE tenant_id = ? AND department_id = ? AND doctype_id = ?
+            AND status = 'published'
+            ORDER BY published_at DESC LIMIT 1
+        """, (tenant_id, f"{tenant_id}_{department_code}", doctype_code)).fetchone()
+        if not row:
+            return None
+        
+        with self._plans_lock:
+            plan = self._plans.get(row['id'])
+            if plan is not None:
+                self._plans.move_to_end(row['id'])
+        if plan is None:
+            plan = self._store_plan(self._compile_plan(self.get_template(row['id'])))
+        
+        # SEGURANÇA: Validação adicional contra template confusion
+        if plan['tenant_id'] != tenant_id:
+            self.log_security_event(
+                event_type="template_confusion_detected",
+                severity="critical",
+                details={
+                    "requested_tenant": tenant_id,
+                    "template_tenant": plan['tenant_id'],
+                    "template_id": plan['id']
+                }
+            )
+            return None
+        return plan
+    
+    def _store_plan(self, plan: dict) -> dict:
+        with self._plans_lock:
+            self._plans[plan['id']] = plan
+            self._plans.move_to_end(plan['id'])
+            while len(self._plans) > FILL_PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+    
+    def invalidate_fill_plans(self, template_id: str = None):
+        """Descarta planos compilados (de um template ou todos)"""
+        with self._plans_lock:
+            if template_id is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(template_id, None)
+    
+    @staticmethod
+    def _compile_plan(template: dict) -> dict:
+        """
+        Compila um template em fill plan: lista plana de (caminho, segmentos)
+        para cada nó de texto com placeholders. O caminho são os índices em
+        'content' a partir da raiz; nos segmentos, posições ímpares são
+        field_codes e pares são texto literal.
+        """
+        human_only_codes = {h['field_code'] for h in template['human_only']}
+        markers = {}
+        for field in template['fields']:
+            code = field['field_code']
+            if code not in markers:
+                label = field['label_de']
+                markers[code] = (
+                    f"[NUR MENSCH: {label}]" if code in human_only_codes else None,
+                    f"[{label}]"
+                )
+        
+        slots = []
+        if markers:
+            pattern = re.compile(
+                r"\{\{(" + "|".join(re.escape(code) for code in markers) + r")\}\}"
+            )
+            
+            def walk(node, path):
+                if not isinstance(node, dict):
+                    return
+                text = node.get('text')
+                if node.get('type') == 'text' and isinstance(text, str):
+                    parts = pattern.split(text)
+                    if len(parts) > 1:
+                        slots.append((path, tuple(parts)))
+                children = node.get('content')
+                if isinstance(children, list):
+                    for i, child in enumerate(children):
+                        walk(child, path + (i,))
             
+            walk(template['tiptap_json'], ())
+        
+        return {
+            "id": template['id'],
+            "tenant_id": template['tenant_id'],
+            "version": template['version'],
+            "title_de": template['title_de'],
+            "disclosure_de": template.get('disclosure_de'),
+            "human_only": template['human_only'],
+            "human_only_codes": frozenset(human_only_codes),
+            "markers": markers,
+            "tree": template['tiptap_json'],
+            "slots": slots,
+        }
+    
+    @staticmethod
+    def _fill_template(plan: dict, inputs: dict) -> dict:
+        """
+        Preenche o plano com inputs numa única passada pelos slots.
+        
+        Só os nós no caminho de um slot são copiados; o restante da árvore é
+        compartilhado com o plano em cache (somente leitura).
+        """
+        markers = plan['markers']
+        values = {}
+        for code, (human_marker, default_marker) in markers.items():
+            if human_marker is not None:
+                values[code] = human_marker
+            elif code in inputs:
+                values[code] = str(inputs[code])
+            else:
+                values[code] = default_marker
+        
+        def copy_node(node):
+            node = dict(node)
+            if isinstance(node.get('content'), list):
+                node['content'] = list(node['content'])
             return node
         
-        return replace_placeholders(tiptap)
+        root = copy_node(plan['tree'])
+        copies = {(): root}
+        for path, parts in plan['slots']:
+            node = root
+            for depth in range(len(path)):
+                key = path[:depth + 1]
+                child = copies.get(key)
+                if child is None:
+                    child = copy_node(node['content'][path[depth]])
+                    node['content'][path[depth]] = child
+                    copies[key] = child
+                node = child
+            segments = list(parts)
+            for i in range(1, len(segments), 2):
+                segments[i] = values[segments[i]]
+            node['text'] = "".join(segments)
+        return root
     
     def fill_human_field(self, document_id: str, field_code: str, 
                          value: Any, filled_by: str,
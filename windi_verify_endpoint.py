@@ -10,20 +10,23 @@ with open(FILE, 'r') as f:
 
 # Add verify endpoint after health endpoint
 verify_endpoint = '''
+# Read-only verification: counters are accumulated and flushed in batches
+REGISTRY_VERIFY_COUNTERS = VerificationCounter(
+    '/opt/windi/data/template_registry.db',
+    flush_sql="""
+        UPDATE documents_registry
+        SET verified_count = verified_count + ?, last_verified_at = ?
+        WHERE receipt_number = ?
+    """)
+
 @app.route('/api/verify/<receipt_id>', methods=['GET'])
 def verify_receipt(receipt_id):
     """Public endpoint to verify WINDI-RECEIPT authenticity"""
-    # First check babel_documents.db
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, title, status, language, receipt, created_at, updated_at 
-        FROM documents WHERE receipt LIKE ?
-    """, (f'%{receipt_id}%',))
-    row = cursor.fetchone()
-    conn.close()
+    # First check babel_documents.db (indexed, cached)
+    row = RECEIPT_INDEX.lookup(receipt_id)
     
     if row:
+        VERIFY_COUNTERS.record(receipt_id)
         receipt_data = json.loads(row["receipt"]) if row["receipt"] else {}
         return jsonify({
             "verified": True,
@@ -52,15 +55,11 @@ def verify_receipt(receipt_id):
         """, (receipt_id,))
         reg_row = reg_cursor.fetchone()
         
+        reg_conn.close()
+        
         if reg_row:
-            # Update verification count
-            reg_cursor.execute("""
-                UPDATE documents_registry 
-                SET verified_count = verified_count + 1, last_verified_at = ?
-                WHERE receipt_number = ?
-            """, (datetime.now(timezone.utc).isoformat(), receipt_id))
-            reg_conn.commit()
-            reg_conn.close()
+            # Deferred verification count (no write on the request path)
+            REGISTRY_VERIFY_COUNTERS.record(receipt_id)
             
             return jsonify({
                 "verified": True,
@@ -71,11 +70,10 @@ def verify_receipt(receipt_id):
                 "generated_at": reg_row["generated_at"],
                 "file_hash": reg_row["file_hash"],
                 "validation_status": reg_row["validation_status"],
-                "verified_count": reg_row["verified_count"] + 1,
+                "verified_count": reg_row["verified_count"] + REGISTRY_VERIFY_COUNTERS.pending(receipt_id),
                 "principle": "KI verarbeitet. Mensch entscheidet. WINDI garantiert.",
                 "verification_timestamp": datetime.now(timezone.utc).isoformat()
             })
-        reg_conn.close()
     except Exception as e:
         pass
     